@@ -1,18 +1,37 @@
 import requests
 import logging
 import logging.handlers
-from functools import wraps
 from urllib.parse import urlparse, parse_qs
 import time
-from collections import defaultdict
+import threading
+from collections import deque
 from flask import current_app, g
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 import os
 
+# Configured by setup_api_logging; defined here so calls made before setup don't fail
+api_logger = logging.getLogger('api_calls')
+
+# Connection pooling and concurrency per host. Every host gets its own adapter so a
+# burst against one (e.g. parallel scrapers) can't exhaust the connections of another.
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_HOST_CONCURRENCY = 8
+# (connect, read) seconds for the hosts in HOST_LIMITS when the caller passes none. Other hosts
+# (self-hosted indexers like Jackett can take minutes) keep requests' default of no timeout.
+DEFAULT_TIMEOUT = (10, 30)
+HOST_LIMITS = {
+    'api.real-debrid.com': {'pool_maxsize': 8, 'concurrency': 4},
+    'api.trakt.tv': {'pool_maxsize': 6, 'concurrency': 4},
+    'torrentio.strem.fun': {'pool_maxsize': 8, 'concurrency': 6},
+}
+
 def setup_api_logging():
     print("Setting up API logging")
     global api_logger
     api_logger = logging.getLogger('api_calls')
+    if api_logger.handlers:
+        return
     api_logger.setLevel(logging.INFO)
     api_logger.propagate = False  # Prevent propagation to root logger
     
@@ -50,25 +69,6 @@ def setup_api_logging():
     
     api_logger.addHandler(handler)
 
-def log_api_call(func):
-    @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        try:
-            url = args[0] if args else kwargs.get('url')
-            if not isinstance(url, str):
-                return func(self, *args, **kwargs)
-                
-            method = func.__name__.upper()
-            parsed = urlparse(url)
-            # Only log domain and path, skip query parameters
-            domain = parsed.netloc
-            path = parsed.path
-            api_logger.info(f"{method} {domain}{path}")
-        except Exception as e:
-            api_logger.error(f"Error in log_api_call: {str(e)}")
-        return func(self, *args, **kwargs)
-    return wrapper
-
 class Args:
     def __init__(self, query_params):
         self._params = query_params
@@ -88,40 +88,119 @@ class Args:
         
         return value
 
+# Sliding-window budgets per monitored domain as (window seconds, max calls). Domains
+# without an entry get the default five minute and hourly budgets.
+DEFAULT_RATE_LIMITS = ((300, 1000), (3600, 2000))
+DOMAIN_RATE_LIMITS = {
+    'api.real-debrid.com': ((60, 250), (300, 1000), (3600, 2000)),  # Real-Debrid allows 250 calls/minute
+    'api.trakt.tv': ((300, 1000), (3600, 2000)),
+    'torrentio.strem.fun': ((300, 1000), (3600, 2000)),
+}
+# Callers wait for budget up to this long before the call is refused
+MAX_RATE_LIMIT_WAIT = 120
+
+class RateLimitExceeded(RequestException):
+    pass
+
 class APIRateLimiter:
+    """
+    Sliding-window call budgets per domain. Each window keeps a deque of call times,
+    so pruning expired calls and recording a new one is amortised O(1). A caller
+    over budget is blocked until the oldest call leaves the window.
+    """
+
     def __init__(self):
         self.hourly_limit = 2000
         self.five_minute_limit = 1000
-        self.hourly_calls = defaultdict(list)
-        self.five_minute_calls = defaultdict(list)
+        self.max_wait = MAX_RATE_LIMIT_WAIT
+        self._windows = {}
+        self._lock = threading.Lock()
         self.blocked_domains = set()
 
-    def check_limits(self, domain):
-        current_time = time.time()
-        
-        # Clean up old calls
-        self.hourly_calls[domain] = [t for t in self.hourly_calls[domain] if current_time - t < 3600]
-        self.five_minute_calls[domain] = [t for t in self.five_minute_calls[domain] if current_time - t < 300]
-        
-        # Add current call
-        self.hourly_calls[domain].append(current_time)
-        self.five_minute_calls[domain].append(current_time)
-        
-        # Track if limits are exceeded but don't enforce
-        hourly_exceeded = len(self.hourly_calls[domain]) > self.hourly_limit
-        five_min_exceeded = len(self.five_minute_calls[domain]) > self.five_minute_limit
-        
+    def _get_windows(self, domain):
+        windows = self._windows.get(domain)
+        if windows is None:
+            windows = [(seconds, limit, deque()) for seconds, limit in DOMAIN_RATE_LIMITS.get(domain, DEFAULT_RATE_LIMITS)]
+            self._windows[domain] = windows
+        return windows
+
+    @staticmethod
+    def _prune(calls, seconds, now):
+        while calls and now - calls[0] >= seconds:
+            calls.popleft()
+
+    def _wait_time(self, domain, now):
+        """Seconds until a call to domain fits in every window, 0 if it fits now"""
+        wait = 0
+        for seconds, limit, calls in self._get_windows(domain):
+            self._prune(calls, seconds, now)
+            if len(calls) >= limit:
+                wait = max(wait, calls[len(calls) - limit] + seconds - now)
+        return wait
+
+    def check_limits(self, domain, block=True):
+        """
+        Record a call to domain, waiting for budget if it is exhausted. Raises
+        RateLimitExceeded if the wait would exceed max_wait, or if block is False.
+        """
+        deadline = time.time() + self.max_wait
+        throttled = False
+        while True:
+            with self._lock:
+                now = time.time()
+                wait = self._wait_time(domain, now)
+                if wait <= 0:
+                    for _, _, calls in self._get_windows(domain):
+                        calls.append(now)
+                    self.blocked_domains.discard(domain)
+                    break
+                if not block or now + wait > deadline:
+                    self.blocked_domains.add(domain)
+                    self._set_warning(True)
+                    api_logger.warning(f"Rate limit exceeded for {domain}, budget frees up in {wait:.0f}s")
+                    raise RateLimitExceeded(f"Rate limit exceeded for {domain}")
+            if not throttled:
+                api_logger.info(f"Rate limit reached for {domain}, waiting {wait:.1f}s")
+                throttled = True
+            time.sleep(wait)
+
+        self._set_warning(throttled)
+        return True
+
+    @staticmethod
+    def _set_warning(value):
         # Only try to set g.rate_limit_warning if we're in a request context
         try:
-            if hourly_exceeded or five_min_exceeded:
-                g.rate_limit_warning = True
-            else:
-                g.rate_limit_warning = False
+            g.rate_limit_warning = value
         except RuntimeError:
             # We're outside of request context, just continue
             pass
-            
-        return True
+
+    def get_remaining(self, domain):
+        """Calls that can be made to domain right now without waiting"""
+        with self._lock:
+            now = time.time()
+            remaining = None
+            for seconds, limit, calls in self._get_windows(domain):
+                self._prune(calls, seconds, now)
+                window_remaining = max(0, limit - len(calls))
+                remaining = window_remaining if remaining is None else min(remaining, window_remaining)
+            return remaining
+
+    def get_budget(self, domain):
+        """Usage of each window for domain, keyed by window length in seconds"""
+        with self._lock:
+            now = time.time()
+            budget = {}
+            for seconds, limit, calls in self._get_windows(domain):
+                self._prune(calls, seconds, now)
+                budget[seconds] = {
+                    'count': len(calls),
+                    'limit': limit,
+                    'remaining': max(0, limit - len(calls)),
+                    'resets_in': round(calls[0] + seconds - now, 1) if calls else 0,
+                }
+            return budget
 
     def stop_program(self):
         try:
@@ -133,14 +212,22 @@ class APIRateLimiter:
             api_logger.error(f"Failed to stop program: {str(e)}")
 
     def reset_limits(self):
-        self.hourly_calls.clear()
-        self.five_minute_calls.clear()
-        self.blocked_domains.clear()
+        with self._lock:
+            self._windows.clear()
+            self.blocked_domains.clear()
         api_logger.info("Rate limits have been manually reset.")
 
 class APITracker:
+    """
+    The shared HTTP client. One keep-alive session with a connection pool per host,
+    a cap on concurrent requests per host, default timeouts for known hosts, rate limit tracking for
+    monitored domains and a line in the API log for every call.
+    """
+
     def __init__(self):
         self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_maxsize=DEFAULT_POOL_MAXSIZE))
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=DEFAULT_POOL_MAXSIZE))
         self.cookies = requests.cookies
         self.exceptions = requests.exceptions
         self.utils = requests.utils
@@ -149,6 +236,9 @@ class APITracker:
         self._args = None
         self.rate_limiter = APIRateLimiter()
         self.monitored_domains = {'api.real-debrid.com', 'api.trakt.tv', 'torrentio.strem.fun'}
+        self._hosts_lock = threading.Lock()
+        self._host_semaphores = {}
+        self._pool_connections = {}
 
     @property
     def args(self):
@@ -156,71 +246,66 @@ class APITracker:
             self._args = Args(self.get_query_params())
         return self._args
 
-    @log_api_call
-    def get(self, url, **kwargs):
-        domain = urlparse(url).netloc
+    def _get_host_semaphore(self, scheme, host):
+        """Mount the host's connection pool on first use and return its concurrency semaphore"""
+        with self._hosts_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                limits = HOST_LIMITS.get(host, {})
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limits.get('pool_maxsize', DEFAULT_POOL_MAXSIZE))
+                for prefix_scheme in {scheme or 'https', 'https'}:
+                    self.session.mount(f'{prefix_scheme}://{host}/', adapter)
+                semaphore = threading.BoundedSemaphore(limits.get('concurrency', DEFAULT_HOST_CONCURRENCY))
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _connection_reused(self, response):
+        """Whether the response was served over an existing pooled connection"""
+        pool = getattr(response.raw, '_pool', None)
+        if not isinstance(getattr(pool, 'num_connections', None), int):
+            return None
+        with self._hosts_lock:
+            seen = self._pool_connections.get(id(pool), 0)
+            self._pool_connections[id(pool)] = pool.num_connections
+        return pool.num_connections <= seen
+
+    def request(self, method, url, raise_for_status=True, **kwargs):
+        parsed = urlparse(url)
+        domain = parsed.netloc
         if domain in self.monitored_domains:
             self.rate_limiter.check_limits(domain)
-        
+        if domain in HOST_LIMITS:
+            kwargs.setdefault('timeout', HOST_LIMITS[domain].get('timeout', DEFAULT_TIMEOUT))
+        semaphore = self._get_host_semaphore(parsed.scheme, domain)
+
         try:
             self.current_url = url
             self._args = None
-            response = self.session.get(url, **kwargs)
-            response.raise_for_status()
+            start_time = time.time()
+            with semaphore:
+                response = self.session.request(method, url, **kwargs)
+            reused = self._connection_reused(response)
+            connection = 'reused' if reused else 'new' if reused is not None else 'unknown'
+            # Only log domain and path, skip query parameters
+            api_logger.info(f"{method} {domain}{parsed.path} {response.status_code} {(time.time() - start_time) * 1000:.0f}ms conn={connection}")
+            if raise_for_status:
+                response.raise_for_status()
             return response
         except RequestException as e:
             api_logger.error(f"Error: {domain} - {str(e)}")
             raise
 
-    @log_api_call
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
     def post(self, url, **kwargs):
-        domain = urlparse(url).netloc
-        if domain in self.monitored_domains:
-            self.rate_limiter.check_limits(domain)
-        
-        try:
-            self.current_url = url
-            self._args = None
-            response = self.session.post(url, **kwargs)
-            response.raise_for_status()
-            return response
-        except RequestException as e:
-            api_logger.error(f"Error: {domain} - {str(e)}")
-            raise
+        return self.request('POST', url, **kwargs)
 
-    @log_api_call
     def put(self, url, **kwargs):
-        domain = urlparse(url).netloc
-        if domain in self.monitored_domains:
-            self.rate_limiter.check_limits(domain)
-        
-        try:
-            self.current_url = url
-            self._args = None
-            response = self.session.put(url, **kwargs)
-            response.raise_for_status()
-            return response
-        except RequestException as e:
-            api_logger.error(f"Error: {domain} - {str(e)}")
-            raise
+        return self.request('PUT', url, **kwargs)
 
-    @log_api_call
     def delete(self, url, **kwargs):
-        domain = urlparse(url).netloc
-        if domain in self.monitored_domains:
-            self.rate_limiter.check_limits(domain)
-        
-        try:
-            self.current_url = url
-            self._args = None
-            response = self.session.delete(url, **kwargs)
-            response.raise_for_status()
-            return response
-        except RequestException as e:
-            api_logger.error(f"Error: {domain} - {str(e)}")
-            raise
-
-    # Add other HTTP methods as needed
+        return self.request('DELETE', url, **kwargs)
 
     def get_query_params(self):
         if self.current_url:
@@ -238,4 +323,4 @@ def is_rate_limited():
         return False
 
 def get_blocked_domains():
-    return []  # No domains are blocked anymore since we're not enforcing limits
\ No newline at end of file
+    return sorted(api.rate_limiter.blocked_domains)
\ No newline at end of file
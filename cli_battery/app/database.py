@@ -7,6 +7,7 @@ from sqlalchemy import or_, func, cast, String
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import IntegrityError, OperationalError
 from .logger_config import logger
+from .metadata_cache import metadata_cache
 from sqlalchemy import text, UniqueConstraint
 from sqlalchemy.types import JSON
 import os
@@ -257,6 +258,7 @@ class DatabaseManager:
             if item:
                 session.delete(item)
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 return True
             return False
 
@@ -289,6 +291,7 @@ class DatabaseManager:
                 session.query(Season).delete()
                 session.query(Poster).delete()
                 session.commit()
+                metadata_cache.invalidate()
                 return True
             except Exception as e:
                 logger.error(f"Error deleting all items: {str(e)}")
@@ -319,6 +322,7 @@ class DatabaseManager:
                 # Delete the item itself - this will cascade delete remaining related items
                 session.delete(item)
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 
                 logger.info(f"Successfully removed item and all metadata for IMDB ID {imdb_id}")
                 return True
@@ -1,7 +1,12 @@
 from .metadata_manager import MetadataManager
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Iterable, Iterator, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .logger_config import logger
 from .database import init_db, Session as DbSession
+from .metadata_cache import metadata_cache, MISS
+
+# Misses are refreshed from Trakt this many at a time; the api tracker caps Trakt connections too
+METADATA_FETCH_WORKERS = 4
 
 class DirectAPI:
     def __init__(self):
@@ -9,14 +14,93 @@ class DirectAPI:
         engine = init_db()
         DbSession.configure(bind=engine)
 
+    @staticmethod
+    def _cached(key, load, imdb_id: Optional[str] = None):
+        """Serve a (value, source) lookup from the metadata cache, loading and storing it on a miss"""
+        cached = metadata_cache.get(key)
+        if cached is not MISS:
+            return cached
+        value, source = load()
+        if value and source is not None:
+            # tmdb_to_imdb is keyed by TMDB ID but invalidated by the IMDb ID it resolves to
+            metadata_cache.put(key, (value, source), [imdb_id or value])
+        return value, source
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        return metadata_cache.get_stats()
+
     @staticmethod
     def get_movie_metadata(imdb_id: str) -> Tuple[Dict[str, Any], str]:
-        metadata, source = MetadataManager.get_movie_metadata(imdb_id)
+        metadata, source = DirectAPI._cached(('movie', imdb_id), lambda: MetadataManager.get_movie_metadata(imdb_id), imdb_id)
         return metadata, source
 
+    @staticmethod
+    def get_metadata_many(imdb_ids: Union[Iterable[str], Dict[str, str]], media_type: str = 'movie',
+                          max_workers: int = METADATA_FETCH_WORKERS) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Resolve metadata for many items, yielding (imdb_id, metadata, source) as each one resolves.
+
+        imdb_ids is either a list of ids of the same media_type or a {imdb_id: media_type} dict.
+        Items in the metadata cache, then those stored and fresh (one bulk query), are yielded
+        first; the rest are fetched from Trakt with up to max_workers requests in flight.
+        """
+        if isinstance(imdb_ids, dict):
+            wanted = {imdb_id: ('show' if kind in ('tv', 'show') else 'movie') for imdb_id, kind in imdb_ids.items()}
+        else:
+            kind = 'show' if media_type in ('tv', 'show') else 'movie'
+            wanted = {imdb_id: kind for imdb_id in imdb_ids}
+        if not wanted:
+            return
+
+        uncached = {}
+        for imdb_id, kind in wanted.items():
+            cached = metadata_cache.get((kind, imdb_id))
+            if cached is MISS:
+                uncached[imdb_id] = kind
+            else:
+                yield imdb_id, cached[0], cached[1]
+
+        hits = MetadataManager.get_cached_metadata_many(uncached.keys()) if uncached else {}
+        misses = []
+        for imdb_id, kind in uncached.items():
+            hit = hits.get(imdb_id)
+            if hit and hit[0] == kind:
+                metadata_cache.put((kind, imdb_id), (hit[1], "battery"), [imdb_id])
+                yield imdb_id, hit[1], "battery"
+            else:
+                misses.append(imdb_id)
+        logger.info(f"get_metadata_many: {len(wanted) - len(misses)} of {len(wanted)} items served from the cache or database")
+        if not misses:
+            return
+
+        def fetch(imdb_id):
+            try:
+                if wanted[imdb_id] == 'show':
+                    return MetadataManager.get_show_metadata(imdb_id)
+                return MetadataManager.get_movie_metadata(imdb_id)
+            except Exception as e:
+                logger.error(f"Error fetching metadata for {imdb_id}: {str(e)}")
+                return None, None
+            finally:
+                DbSession.remove()
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(misses))))
+        try:
+            futures = {executor.submit(fetch, imdb_id): imdb_id for imdb_id in misses}
+            for future in as_completed(futures):
+                imdb_id = futures[future]
+                metadata, source = future.result()
+                if metadata and source is not None:
+                    metadata_cache.put((wanted[imdb_id], imdb_id), (metadata, source), [imdb_id])
+                yield imdb_id, metadata, source
+        finally:
+            # Stop fetching if the caller stopped consuming
+            executor.shutdown(wait=False, cancel_futures=True)
+
     @staticmethod
     def get_movie_release_dates(imdb_id: str):
-        release_dates, source = MetadataManager.get_release_dates(imdb_id)
+        release_dates, source = DirectAPI._cached(('release_dates', imdb_id), lambda: MetadataManager.get_release_dates(imdb_id), imdb_id)
         return release_dates, source
 
     @staticmethod
@@ -28,13 +112,26 @@ class DirectAPI:
     def get_show_metadata(imdb_id):
         import logging
         logging.info(f"DirectAPI.get_show_metadata called for {imdb_id}")
-        metadata, source = MetadataManager.get_show_metadata(imdb_id)
+        metadata, source = DirectAPI._cached(('show', imdb_id), lambda: MetadataManager.get_show_metadata(imdb_id), imdb_id)
         if metadata and 'seasons' in metadata:
             logging.info(f"DirectAPI got {len(metadata['seasons'])} seasons")
             #for season_num in metadata['seasons'].keys():
                 #logging.info(f"Season {season_num} has {len(metadata['seasons'][season_num].get('episodes', {}))} episodes")
         return metadata, source
 
+    @staticmethod
+    def get_episode(imdb_id: str, season_number: int, episode_number: int) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Get a single episode (title, overview, runtime, first_aired, imdb_id) of a show"""
+        episode, source = DirectAPI._cached(('episode', imdb_id, int(season_number), int(episode_number)),
+                                            lambda: MetadataManager.get_episode(imdb_id, season_number, episode_number), imdb_id)
+        return episode, source
+
+    @staticmethod
+    def get_season_counts(imdb_id: str) -> Tuple[Dict[int, int], Optional[str]]:
+        """Get {season_number: episode_count} for a show, without specials"""
+        counts, source = DirectAPI._cached(('season_counts', imdb_id), lambda: MetadataManager.get_season_counts(imdb_id), imdb_id)
+        return counts, source
+
     @staticmethod
     def get_show_seasons(imdb_id: str) -> Tuple[Dict[str, Any], str]:
         seasons, source = MetadataManager.get_seasons(imdb_id)
@@ -48,17 +145,18 @@ class DirectAPI:
             tmdb_id: The TMDB ID to convert
             media_type: Either 'movie' or 'show' to specify what type of content to look for
         """
-        imdb_id, source = MetadataManager.tmdb_to_imdb(tmdb_id, media_type=media_type)
+        imdb_id, source = DirectAPI._cached(('tmdb_to_imdb', str(tmdb_id), media_type),
+                                            lambda: MetadataManager.tmdb_to_imdb(tmdb_id, media_type=media_type))
         return imdb_id, source
 
     @staticmethod
     def get_show_aliases(imdb_id: str):
         """Get all aliases for a show by IMDb ID"""
-        aliases, source = MetadataManager.get_show_aliases(imdb_id)
+        aliases, source = DirectAPI._cached(('show_aliases', imdb_id), lambda: MetadataManager.get_show_aliases(imdb_id), imdb_id)
         return aliases, source
 
     @staticmethod
     def get_movie_aliases(imdb_id: str):
         """Get all aliases for a movie by IMDb ID"""
-        aliases, source = MetadataManager.get_movie_aliases(imdb_id)
+        aliases, source = DirectAPI._cached(('movie_aliases', imdb_id), lambda: MetadataManager.get_movie_aliases(imdb_id), imdb_id)
         return aliases, source
\ No newline at end of file
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from settings import _copy_value, get_setting
+from .logger_config import logger
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL_SECONDS = 300
+# How often the shared invalidation stamp is checked for writes made by other processes
+STAMP_CHECK_INTERVAL = 1.0
+
+MISS = object()
+
+class MetadataCache:
+    """
+    Bounded, process-local LRU of DirectAPI results with a TTL.
+
+    Entries are tagged with the IMDb IDs they describe, so a metadata write only
+    drops what it touched. Writes also bump a stamp file next to cli_battery.db;
+    other processes notice the change and clear their whole cache.
+
+    Values are copied in and out so callers can't mutate cached entries.
+    """
+
+    def __init__(self, stamp_path: Optional[str] = None):
+        self._stamp_path = stamp_path
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_imdb_id = defaultdict(set)
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0, 'remote_invalidations': 0}
+        self._stamp = None
+        self._stamp_seen = False
+        self._next_stamp_check = 0.0
+
+    def _get_stamp_path(self) -> str:
+        if self._stamp_path:
+            return self._stamp_path
+        db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+        return os.path.join(db_content_dir, 'metadata_cache.stamp')
+
+    def _read_stamp(self) -> Optional[int]:
+        try:
+            return os.stat(self._get_stamp_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def get_max_entries() -> int:
+        try:
+            return int(get_setting('Metadata Battery', 'cache_max_entries', DEFAULT_MAX_ENTRIES))
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_ENTRIES
+
+    @staticmethod
+    def get_ttl_seconds() -> float:
+        try:
+            return float(get_setting('Metadata Battery', 'cache_ttl_seconds', DEFAULT_TTL_SECONDS))
+        except (TypeError, ValueError):
+            return DEFAULT_TTL_SECONDS
+
+    def _check_stamp(self, now: float):
+        # Called with the lock held
+        if now < self._next_stamp_check:
+            return
+        self._next_stamp_check = now + STAMP_CHECK_INTERVAL
+        stamp = self._read_stamp()
+        if not self._stamp_seen:
+            self._stamp_seen = True
+        elif stamp != self._stamp and self._entries:
+            logger.debug("Metadata changed in another process, clearing the metadata cache")
+            self._stats['remote_invalidations'] += 1
+            self._clear()
+        self._stamp = stamp
+
+    def _clear(self):
+        self._entries.clear()
+        self._keys_by_imdb_id.clear()
+
+    def _remove(self, key: Hashable):
+        _, imdb_ids, _ = self._entries.pop(key)
+        for imdb_id in imdb_ids:
+            keys = self._keys_by_imdb_id.get(imdb_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_imdb_id[imdb_id]
+
+    def get(self, key: Hashable) -> Any:
+        """Return a copy of the cached value for key, or MISS"""
+        now = time.time()
+        with self._lock:
+            self._check_stamp(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return MISS
+            expires_at, _, value = entry
+            if expires_at <= now:
+                self._remove(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        return _copy_value(value)
+
+    def put(self, key: Hashable, value: Any, imdb_ids: Iterable[str] = ()):
+        max_entries = self.get_max_entries()
+        ttl = self.get_ttl_seconds()
+        if max_entries <= 0 or ttl <= 0:
+            return
+        imdb_ids = tuple(imdb_id for imdb_id in imdb_ids if imdb_id)
+        value = _copy_value(value)
+        now = time.time()
+        with self._lock:
+            self._check_stamp(now)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (now + ttl, imdb_ids, value)
+            for imdb_id in imdb_ids:
+                self._keys_by_imdb_id[imdb_id].add(key)
+            while len(self._entries) > max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def invalidate(self, imdb_id: Optional[str] = None, broadcast: bool = True) -> int:
+        """Drop entries for imdb_id, or everything if it's None, and tell other processes"""
+        with self._lock:
+            if imdb_id is None:
+                removed = len(self._entries)
+                self._clear()
+            else:
+                keys = list(self._keys_by_imdb_id.get(imdb_id, ()))
+                for key in keys:
+                    self._remove(key)
+                removed = len(keys)
+            self._stats['invalidations'] += 1
+            if broadcast:
+                self._touch_stamp()
+        return removed
+
+    def _touch_stamp(self):
+        # Called with the lock held; our own write shouldn't clear our own cache
+        try:
+            with open(self._get_stamp_path(), 'a'):
+                os.utime(self._get_stamp_path(), None)
+            self._stamp = self._read_stamp()
+            self._stamp_seen = True
+        except OSError as e:
+            logger.debug(f"Could not update metadata cache stamp: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_entries'] = self.get_max_entries()
+        stats['ttl_seconds'] = self.get_ttl_seconds()
+        return stats
+
+metadata_cache = MetadataCache()
@@ -3,9 +3,10 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy import func, cast, String, or_
 from sqlalchemy.orm import joinedload
 from .trakt_metadata import TraktMetadata
+from .metadata_cache import metadata_cache
 from PIL import Image
 from .logger_config import logger
-import requests
+from api_tracker import api
 from io import BytesIO
 from .settings import Settings
 import json
@@ -20,6 +21,9 @@ import random
 from typing import Optional
 import logging
 
+# Stay well under SQLite's bound parameter limit
+BULK_QUERY_CHUNK_SIZE = 500
+
 class MetadataManager:
 
     def __init__(self):
@@ -57,6 +61,11 @@ class MetadataManager:
             current_time = datetime.now(_get_local_timezone())
             
             for key, value in metadata_dict.items():
+                if key == 'seasons' and isinstance(value, dict):
+                    # Seasons live in the Season/Episode tables rather than a JSON blob
+                    MetadataManager._replace_seasons(item, value, session)
+                    success = True
+                    continue
                 # Convert complex objects to JSON strings
                 if isinstance(value, (dict, list)):
                     value = json.dumps(value)
@@ -87,6 +96,7 @@ class MetadataManager:
             
             if not success:
                 logger.warning(f"No metadata entries were updated for {item.title} ({item.imdb_id})")
+            metadata_cache.invalidate(item.imdb_id)
             return success
         except Exception as e:
             logger.error(f"Error in _update_metadata_with_session for item {item.imdb_id}: {str(e)}")
@@ -166,7 +176,7 @@ class MetadataManager:
         trakt = TraktMetadata()
         poster_url = trakt.get_poster(imdb_id)
         if poster_url:
-            response = requests.get(poster_url)
+            response = api.get(poster_url, raise_for_status=False)
             if response.status_code == 200:
                 image = Image.open(BytesIO(response.content))
                 image_data = BytesIO()
@@ -203,8 +213,7 @@ class MetadataManager:
                 seasons = session.query(Season).filter_by(item_id=item.id).options(selectinload(Season.episodes)).all()
                 if seasons:
                     # Check if any metadata is stale
-                    metadata = session.query(Metadata).filter_by(item_id=item.id, key='seasons').first()
-                    if metadata and MetadataManager.is_metadata_stale(metadata.last_updated):
+                    if MetadataManager.is_metadata_stale(item.updated_at):
                         logger.debug(f"Seasons metadata is stale for {imdb_id}, refreshing from Trakt")
                         # Fetch fresh data from Trakt
                         trakt = TraktMetadata()
@@ -231,23 +240,159 @@ class MetadataManager:
         return None, None
 
     @staticmethod
-    def format_seasons_data(seasons):
+    def format_seasons_data(seasons, string_keys=False):
+        """
+        Build the {season: {'episode_count', 'episodes': {episode: {...}}}} structure Trakt
+        returns from Season rows. string_keys matches the JSON round-tripped form the show
+        metadata has always been served in.
+        """
+        key = str if string_keys else int
         seasons_data = {}
         for season in seasons:
-            seasons_data[season.season_number] = {
+            seasons_data[key(season.season_number)] = {
                 'episode_count': season.episode_count,
                 'episodes': {
-                    episode.episode_number: {
-                        'title': episode.title,
-                        'overview': episode.overview,
-                        'runtime': episode.runtime,
-                        'first_aired': episode.first_aired.isoformat() if episode.first_aired else None,
-                        'imdb_id': episode.imdb_id
-                    } for episode in season.episodes
+                    key(episode.episode_number): MetadataManager._format_episode(episode)
+                    for episode in sorted(season.episodes, key=lambda e: e.episode_number)
                 }
             }
         return seasons_data
 
+    @staticmethod
+    def _format_episode(episode):
+        return {
+            'title': episode.title,
+            'overview': episode.overview,
+            'runtime': episode.runtime,
+            'first_aired': MetadataManager._format_first_aired(episode.first_aired),
+            'imdb_id': episode.imdb_id
+        }
+
+    @staticmethod
+    def _format_first_aired(first_aired):
+        # Same shape as Trakt's timestamps, which is what episode processing parses
+        if not first_aired:
+            return None
+        if first_aired.tzinfo is not None:
+            first_aired = first_aired.astimezone(timezone.utc)
+        return first_aired.strftime('%Y-%m-%dT%H:%M:%S.') + f"{first_aired.microsecond // 1000:03d}Z"
+
+    @staticmethod
+    def _parse_first_aired(first_aired):
+        if not first_aired:
+            return None
+        try:
+            # Stored as naive UTC, SQLite drops the offset anyway
+            return iso8601.parse_date(first_aired).astimezone(timezone.utc).replace(tzinfo=None)
+        except (iso8601.ParseError, TypeError, ValueError):
+            logger.warning(f"Could not parse first_aired value: {first_aired}")
+            return None
+
+    @staticmethod
+    def _replace_seasons(item, seasons_data, session):
+        """Replace an item's Season/Episode rows with seasons_data, in the structure Trakt returns"""
+        season_ids = [season_id for season_id, in session.query(Season.id).filter_by(item_id=item.id)]
+        if season_ids:
+            session.query(Episode).filter(Episode.season_id.in_(season_ids)).delete(synchronize_session=False)
+            session.query(Season).filter_by(item_id=item.id).delete(synchronize_session=False)
+        session.query(Metadata).filter_by(item_id=item.id, key='seasons').delete(synchronize_session=False)
+        session.expire(item, ['seasons'])
+
+        for season_number, season_info in seasons_data.items():
+            episodes = season_info.get('episodes') or {}
+            season = Season(
+                item_id=item.id,
+                season_number=int(season_number),
+                episode_count=season_info.get('episode_count', len(episodes))
+            )
+            session.add(season)
+            session.flush()  # Get the season.id
+            session.bulk_save_objects([
+                Episode(
+                    season_id=season.id,
+                    episode_number=int(episode_number),
+                    title=episode_info.get('title'),
+                    overview=episode_info.get('overview'),
+                    runtime=episode_info.get('runtime'),
+                    first_aired=MetadataManager._parse_first_aired(episode_info.get('first_aired')),
+                    imdb_id=episode_info.get('imdb_id')
+                ) for episode_number, episode_info in episodes.items()
+            ])
+        session.flush()
+
+    @staticmethod
+    def _load_show_seasons(session, item_ids):
+        """Return {item_id: seasons} for the given show items from the Season/Episode tables"""
+        seasons_by_item = defaultdict(list)
+        if item_ids:
+            seasons = session.query(Season).filter(Season.item_id.in_(item_ids)).options(
+                selectinload(Season.episodes)).order_by(Season.season_number).all()
+            for season in seasons:
+                seasons_by_item[season.item_id].append(season)
+        return {item_id: MetadataManager.format_seasons_data(seasons, string_keys=True)
+                for item_id, seasons in seasons_by_item.items()}
+
+    @staticmethod
+    def _migrate_seasons_blob(item, session):
+        """Move a show's legacy 'seasons' JSON blob into the Season/Episode tables, returning the seasons"""
+        blob = session.query(Metadata).filter_by(item_id=item.id, key='seasons').first()
+        if not blob:
+            return None
+        try:
+            seasons_data = json.loads(blob.value) if isinstance(blob.value, str) else blob.value
+        except json.JSONDecodeError:
+            seasons_data = None
+        if not isinstance(seasons_data, dict) or not seasons_data:
+            return None
+        try:
+            MetadataManager._replace_seasons(item, seasons_data, session)
+            session.commit()
+            logger.info(f"Moved seasons for {item.imdb_id} from the metadata blob to the seasons table")
+        except Exception as e:
+            logger.error(f"Error migrating seasons for {item.imdb_id}: {str(e)}")
+            session.rollback()
+        return {str(season): data for season, data in seasons_data.items()}
+
+    @staticmethod
+    def get_episode(imdb_id, season_number, episode_number):
+        """Look up a single episode of a show without loading the rest of its seasons"""
+        def query():
+            with DbSession() as session:
+                episode = session.query(Episode).join(Season).join(Item).filter(
+                    Item.imdb_id == imdb_id,
+                    Season.season_number == int(season_number),
+                    Episode.episode_number == int(episode_number)
+                ).first()
+                if episode:
+                    return MetadataManager._format_episode(episode)
+                return None
+
+        episode = query()
+        if episode:
+            return episode, "battery"
+        # Populates the tables when the show isn't stored yet
+        metadata, source = MetadataManager.get_show_metadata(imdb_id)
+        if not metadata:
+            return None, None
+        return query(), source
+
+    @staticmethod
+    def get_season_counts(imdb_id):
+        """Return {season_number: episode_count} for a show, season 0 (specials) excluded"""
+        def query():
+            with DbSession() as session:
+                rows = session.query(Season.season_number, Season.episode_count).join(Item).filter(
+                    Item.imdb_id == imdb_id, Season.season_number != 0).all()
+                return {season_number: episode_count or 0 for season_number, episode_count in rows}
+
+        counts = query()
+        if counts:
+            return counts, "battery"
+        metadata, source = MetadataManager.get_show_metadata(imdb_id)
+        if not metadata:
+            return {}, None
+        return query(), source
+
     @staticmethod
     def add_or_update_seasons_and_episodes(imdb_id, seasons_data):
         from metadata.metadata import _get_local_timezone
@@ -261,44 +406,10 @@ class MetadataManager:
                 # Update item's timestamp
                 item.updated_at = datetime.now(_get_local_timezone())
 
-                # Update metadata timestamp
-                metadata = session.query(Metadata).filter_by(item_id=item.id, key='seasons').first()
-                if not metadata:
-                    metadata = Metadata(item_id=item.id, key='seasons')
-                    session.add(metadata)
-                metadata.value = json.dumps(seasons_data)
-                metadata.provider = 'trakt'
-                metadata.last_updated = datetime.now(_get_local_timezone())
-
-                for season_number, season_info in seasons_data.items():
-                    season = session.query(Season).filter_by(item_id=item.id, season_number=season_number).first()
-                    if not season:
-                        season = Season(item_id=item.id, season_number=season_number, episode_count=season_info['episode_count'])
-                        session.add(season)
-                    else:
-                        season.episode_count = season_info['episode_count']
-
-                    for episode_number, episode_info in season_info['episodes'].items():
-                        episode = session.query(Episode).filter_by(season_id=season.id, episode_number=episode_number).first()
-                        if not episode:
-                            episode = Episode(
-                                season_id=season.id,
-                                episode_number=episode_number,
-                                title=episode_info['title'],
-                                overview=episode_info['overview'],
-                                runtime=episode_info['runtime'],
-                                first_aired=iso8601.parse_date(episode_info['first_aired']) if episode_info['first_aired'] else None,
-                                imdb_id=episode_info['imdb_id']
-                            )
-                            session.add(episode)
-                        else:
-                            episode.title = episode_info['title']
-                            episode.overview = episode_info['overview']
-                            episode.runtime = episode_info['runtime']
-                            episode.first_aired = iso8601.parse_date(episode_info['first_aired']) if episode_info['first_aired'] else None
-                            episode.imdb_id = episode_info['imdb_id']
+                MetadataManager._replace_seasons(item, seasons_data, session)
 
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 return True
             except Exception as e:
                 session.rollback()
@@ -391,6 +502,7 @@ class MetadataManager:
                 session.execute(stmt)
 
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 return True
             except IntegrityError as e:
                 session.rollback()
@@ -617,6 +729,7 @@ class MetadataManager:
                 session.execute(stmt)
 
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 return True
 
             except Exception as e:
@@ -665,6 +778,7 @@ class MetadataManager:
             metadata.last_updated = func.now()
 
             session.commit()
+            metadata_cache.invalidate(imdb_id)
             return trakt_release_dates, "trakt"
         logger.warning(f"No release dates found for IMDB ID: {imdb_id}")
         return None, None
@@ -757,28 +871,73 @@ class MetadataManager:
                 )
                 session.add(episode)
                 session.commit()
+                metadata_cache.invalidate(show_imdb_id)
 
             return {'show': show_metadata, 'episode': episode_data}, "trakt"
 
         return None, None
 
+    @staticmethod
+    def _parse_item_metadata(item):
+        return MetadataManager._parse_metadata_rows(item.item_metadata)
+
+    @staticmethod
+    def _parse_metadata_rows(rows):
+        metadata = {}
+        for m in rows:
+            try:
+                # Always try to parse as JSON first, fall back to string if it fails
+                try:
+                    metadata[m.key] = json.loads(m.value)
+                except json.JSONDecodeError:
+                    metadata[m.key] = m.value
+            except Exception as e:
+                logger.error(f"Error processing metadata for key {m.key}: {str(e)}")
+                metadata[m.key] = m.value
+        return metadata
+
+    @staticmethod
+    def get_cached_metadata_many(imdb_ids):
+        """
+        Load stored metadata for many items with bulk IN queries. Returns
+        {imdb_id: (item_type, metadata)} for items that can be served as-is; stale
+        items, shows without seasons and unknown ids are left out so the caller
+        can refresh them through get_movie_metadata/get_show_metadata.
+        """
+        imdb_ids = list(dict.fromkeys(imdb_ids))
+        hits = {}
+        try:
+            with DbSession() as session:
+                for start in range(0, len(imdb_ids), BULK_QUERY_CHUNK_SIZE):
+                    chunk = imdb_ids[start:start + BULK_QUERY_CHUNK_SIZE]
+                    items = session.query(Item).filter(Item.imdb_id.in_(chunk)).all()
+                    fresh = {item.id: item for item in items if not MetadataManager.is_metadata_stale(item.updated_at)}
+                    if not fresh:
+                        continue
+                    rows = defaultdict(list)
+                    for m in session.query(Metadata).filter(Metadata.item_id.in_(list(fresh)), Metadata.key != 'seasons'):
+                        rows[m.item_id].append(m)
+                    seasons = MetadataManager._load_show_seasons(
+                        session, [item_id for item_id, item in fresh.items() if item.type == 'show'])
+                    for item_id, item in fresh.items():
+                        metadata = MetadataManager._parse_metadata_rows(rows[item_id])
+                        if item.type == 'show':
+                            # Shows still on the legacy seasons blob are migrated by get_show_metadata
+                            if item_id not in seasons:
+                                continue
+                            metadata['seasons'] = seasons[item_id]
+                        hits[item.imdb_id] = (item.type, metadata)
+        except Exception as e:
+            logger.error(f"Error in get_cached_metadata_many: {str(e)}")
+        return hits
+
     @staticmethod
     def get_movie_metadata(imdb_id):
         try:
             with DbSession() as session:
                 item = session.query(Item).options(joinedload(Item.item_metadata)).filter_by(imdb_id=imdb_id, type='movie').first()
                 if item:
-                    metadata = {}
-                    for m in item.item_metadata:
-                        try:
-                            # Always try to parse as JSON first, fall back to string if it fails
-                            try:
-                                metadata[m.key] = json.loads(m.value)
-                            except json.JSONDecodeError:
-                                metadata[m.key] = m.value
-                        except Exception as e:
-                            logger.error(f"Error processing metadata for key {m.key}: {str(e)}")
-                            metadata[m.key] = m.value
+                    metadata = MetadataManager._parse_item_metadata(item)
 
                     if MetadataManager.is_metadata_stale(item.updated_at):
                         logger.info(f"Movie metadata for {imdb_id} is stale, refreshing from Trakt")
@@ -824,6 +983,7 @@ class MetadataManager:
                 from metadata.metadata import _get_local_timezone
                 item.updated_at = datetime.now(_get_local_timezone())
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 return new_metadata, "trakt"
         except Exception as e:
             logger.error(f"Error refreshing movie metadata for {imdb_id}: {str(e)}")
@@ -842,6 +1002,7 @@ class MetadataManager:
             metadata = Metadata(item_id=item.id, key=key, value=str(value), provider='trakt')
             session.add(metadata)
         session.commit()
+        metadata_cache.invalidate(item.imdb_id)
 
     @staticmethod
     def get_show_metadata(imdb_id):
@@ -853,17 +1014,13 @@ class MetadataManager:
                 if item.updated_at.tzinfo is None:
                     item.updated_at = item.updated_at.replace(tzinfo=timezone.utc)
                 
-                metadata = {}
-                for m in item.item_metadata:
-                    try:
-                        # Always try to parse JSON first, fall back to string if it fails
-                        try:
-                            metadata[m.key] = json.loads(m.value)
-                        except json.JSONDecodeError:
-                            metadata[m.key] = m.value
-                    except Exception as e:
-                        logger.error(f"Error processing metadata for key {m.key}: {str(e)}")
-                        metadata[m.key] = m.value
+                metadata = MetadataManager._parse_metadata_rows(
+                    session.query(Metadata).filter(Metadata.item_id == item.id, Metadata.key != 'seasons'))
+                seasons = MetadataManager._load_show_seasons(session, [item.id]).get(item.id)
+                if not seasons:
+                    seasons = MetadataManager._migrate_seasons_blob(item, session)
+                if seasons:
+                    metadata['seasons'] = seasons
 
                 # Force refresh if seasons data is missing or if metadata is stale
                 if 'seasons' not in metadata or MetadataManager.is_metadata_stale(item.updated_at):
@@ -932,6 +1089,10 @@ class MetadataManager:
                 logger.warning(f"No seasons data found in show_data for {item.imdb_id}")
 
             for key, value in show_data.items():
+                if key == 'seasons':
+                    if isinstance(value, dict) and value:
+                        MetadataManager._replace_seasons(item, value, session)
+                    continue
                 if isinstance(value, (list, dict)):
                     value = json.dumps(value)
                 metadata = Metadata(
@@ -950,6 +1111,7 @@ class MetadataManager:
             
             # Commit the transaction
             session.commit()
+            metadata_cache.invalidate(item.imdb_id)
             logger.info(f"Committed transaction with {len(metadata_entries)} metadata entries for {item.imdb_id}")
             
             # Verify the metadata was saved
@@ -960,17 +1122,11 @@ class MetadataManager:
             logger.info(f"Verified {len(saved_metadata)} metadata entries were saved for {item.imdb_id}")
             
             # Verify seasons data was saved
-            seasons_metadata = session.query(Metadata).filter_by(item_id=item.id, key='seasons').first()
-            if seasons_metadata:
-                try:
-                    saved_seasons = json.loads(seasons_metadata.value)
-                    logger.info(f"Verified seasons data for {item.imdb_id}: {list(saved_seasons.keys()) if saved_seasons else 'Empty'}")
-                    for season_num, season_data in saved_seasons.items():
-                        logger.info(f"Saved season {season_num} has {len(season_data.get('episodes', {}))} episodes")
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to decode saved seasons data for {item.imdb_id}")
+            saved_seasons = session.query(Season.season_number, Season.episode_count).filter_by(item_id=item.id).all()
+            if saved_seasons:
+                logger.info(f"Verified seasons data for {item.imdb_id}: {[season_number for season_number, _ in saved_seasons]}")
             else:
-                logger.warning(f"No seasons metadata found after save for {item.imdb_id}")
+                logger.warning(f"No seasons found after save for {item.imdb_id}")
             
             return True
         except Exception as e:
@@ -1015,6 +1171,7 @@ class MetadataManager:
                 from metadata.metadata import _get_local_timezone
                 metadata.last_updated = datetime.now(_get_local_timezone())
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 
                 return show_data['aliases'], "trakt"
             
@@ -1057,6 +1214,7 @@ class MetadataManager:
                 from metadata.metadata import _get_local_timezone
                 metadata.last_updated = datetime.now(_get_local_timezone())
                 session.commit()
+                metadata_cache.invalidate(imdb_id)
                 
                 return movie_data['aliases'], "trakt"
             
@@ -1088,6 +1246,7 @@ class MetadataManager:
                     from metadata.metadata import _get_local_timezone
                     item.updated_at = datetime.now(_get_local_timezone())
                     session.commit()
+                    metadata_cache.invalidate(imdb_id)
                     return show_data, "trakt"
                 
                 logger.warning(f"No show metadata found for IMDB ID: {imdb_id}")
@@ -2,7 +2,6 @@ from .logger_config import logger
 from datetime import datetime, timedelta
 import iso8601
 from datetime import timezone
-import requests
 from urllib.parse import urlencode
 import json
 from .settings import Settings
@@ -12,6 +11,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from settings import get_setting  # Add this import
+from api_tracker import api
 
 TRAKT_API_URL = "https://api.trakt.tv"
 REQUEST_TIMEOUT = 10  # seconds
@@ -98,7 +98,7 @@ class TraktAuth:
             'client_secret': self.client_secret,
             'grant_type': 'refresh_token'
         }
-        response = requests.post(f"{self.base_url}/oauth/token", json=data)
+        response = api.post(f"{self.base_url}/oauth/token", json=data, raise_for_status=False)
         if response.status_code == 200:
             token_data = response.json()
             self.save_token_data(token_data)
@@ -112,7 +112,7 @@ class TraktAuth:
         data = {
             "client_id": self.client_id
         }
-        response = requests.post(url, json=data, timeout=REQUEST_TIMEOUT)
+        response = api.post(url, json=data, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
 
@@ -123,7 +123,7 @@ class TraktAuth:
             "client_id": self.client_id,
             "client_secret": self.client_secret
         }
-        return requests.post(url, json=data, timeout=REQUEST_TIMEOUT)
+        return api.post(url, json=data, timeout=REQUEST_TIMEOUT, raise_for_status=False)
 
     def get_authorization_url(self):
         params = {
@@ -143,7 +143,7 @@ class TraktAuth:
             'redirect_uri': self.redirect_uri,
             'grant_type': 'authorization_code'
         }
-        response = requests.post(f"{self.base_url}/oauth/token", json=data)
+        response = api.post(f"{self.base_url}/oauth/token", json=data, raise_for_status=False)
         if response.status_code == 200:
             token_data = response.json()
             self.save_token_data(token_data)
@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Tuple
 from urllib.parse import urlparse, urlencode
 import requests
 from requests.exceptions import RequestException
+from api_tracker import api
 import time
 from .settings import Settings
 import trakt.core
@@ -71,13 +72,13 @@ class TraktMetadata:
             'Authorization': f'Bearer {self.trakt_auth.access_token}'
         }
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = api.get(url, headers=headers, timeout=10, raise_for_status=False)
             if response.status_code == 401:
                 logger.warning("Received 401 Unauthorized. Attempting to refresh token.")
                 if self.trakt_auth.refresh_access_token():
                     # Update the header with the new token and retry the request
                     headers['Authorization'] = f'Bearer {self.trakt_auth.access_token}'
-                    response = requests.get(url, headers=headers, timeout=10)
+                    response = api.get(url, headers=headers, timeout=10, raise_for_status=False)
                 else:
                     logger.error("Failed to refresh Trakt access token after 401 error.")
                     return None
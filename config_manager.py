@@ -130,6 +130,8 @@ def save_config(config):
     # Save the new config
     with open(CONFIG_FILE, 'w') as file:
         json.dump(config, file, indent=4, default=json_serializer)
+    from settings import invalidate_settings_cache
+    invalidate_settings_cache()
     try:
         from routes.base_routes import clear_cache
         clear_cache()  # Clear the update check cache when settings are saved
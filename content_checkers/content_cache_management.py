@@ -1,44 +1,266 @@
+import json
 import logging
 import os
 import pickle
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime, timedelta
 
+from settings import get_setting
+from utilities.sqlite_store import SQLiteStore
+
 # Get db_content directory from environment variable with fallback
 DB_CONTENT_DIR = os.environ.get('USER_DB_CONTENT', '/user/db_content')
 CACHE_EXPIRY_DAYS = 7
 
+def _to_epoch(timestamp) -> float:
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+class ContentSourceCache(SQLiteStore):
+    """
+    SQLite store of the items each content source has already added, keyed by
+    (source_id, cache_key), plus each source's delta sync state.
+
+    Lookups are point queries on the primary key and a run's updates are upserted
+    in one transaction, so a crash can't leave a half-written cache behind.
+    Entries older than CACHE_EXPIRY_DAYS are deleted when a source saves.
+    """
+
+    DB_FILENAME = 'content_source_cache.db'
+    STATS = ('hits', 'misses', 'stores', 'expired_removed')
+
+    def _create_schema(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS content_source_cache (
+                source_id TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                processed_at REAL NOT NULL,
+                PRIMARY KEY (source_id, cache_key)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_content_source_cache_processed_at ON content_source_cache(processed_at)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS content_source_sync (
+                source_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+
+    def lookup(self, conn, source_id: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            'SELECT data, processed_at FROM content_source_cache WHERE source_id = ? AND cache_key = ?',
+            (source_id, cache_key)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return {'timestamp': datetime.fromtimestamp(row['processed_at']), 'data': json.loads(row['data'])}
+
+    def count(self, conn, source_id: str) -> int:
+        return conn.execute('SELECT COUNT(*) FROM content_source_cache WHERE source_id = ?', (source_id,)).fetchone()[0]
+
+    def upsert(self, conn, source_id: str, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Write entries and drop the source's expired ones in a single transaction"""
+        rows = [(source_id, cache_key, json.dumps(entry.get('data', {}), default=str), _to_epoch(entry['timestamp']))
+                for cache_key, entry in entries]
+        cutoff = time.time() - CACHE_EXPIRY_DAYS * 86400
+        with conn:
+            conn.executemany('''
+                INSERT INTO content_source_cache (source_id, cache_key, data, processed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(source_id, cache_key) DO UPDATE SET data = excluded.data, processed_at = excluded.processed_at
+            ''', rows)
+            expired = conn.execute('DELETE FROM content_source_cache WHERE source_id = ? AND processed_at < ?',
+                                   (source_id, cutoff)).rowcount
+        self._count('stores', len(rows))
+        if expired:
+            self._count('expired_removed', expired)
+        return len(rows)
+
+    def migrate_pickle(self, source_id: str):
+        """Import a content_source_<id>_cache.pkl left by older versions, then remove it"""
+        cache_file = get_cache_file_path(source_id)
+        if not os.path.exists(cache_file):
+            return
+        try:
+            with open(cache_file, 'rb') as f:
+                legacy_cache = pickle.load(f)
+            conn = self._connect()
+            try:
+                imported = self.upsert(conn, source_id, legacy_cache.items())
+            finally:
+                conn.close()
+            logging.info(f"Migrated {imported} cache entries for source {source_id} to the content source cache database")
+        except (EOFError, pickle.UnpicklingError) as e:
+            logging.warning(f"Discarding unreadable cache file for source {source_id}: {e}")
+        except Exception as e:
+            logging.error(f"Error migrating cache for source {source_id}: {e}")
+            return
+        os.remove(cache_file)
+
+    def load_sync_state(self, source_id: str) -> Dict[str, Any]:
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT state FROM content_source_sync WHERE source_id = ?', (source_id,)).fetchone()
+            if row is None:
+                return self._migrate_sync_file(source_id)
+            state = json.loads(row['state'])
+            return state if isinstance(state, dict) else {}
+        except Exception as e:
+            logging.warning(f"Error loading sync state for source {source_id}: {e}. Starting a full sync.")
+            return {}
+        finally:
+            if conn:
+                conn.close()
+
+    def _migrate_sync_file(self, source_id: str) -> Dict[str, Any]:
+        # Sync state used to live in a JSON file next to the pickle cache
+        safe_source_id = source_id.replace('/', '_').replace('\\', '_')
+        state_file = os.path.join(DB_CONTENT_DIR, f'content_source_{safe_source_id}_sync.json')
+        if not os.path.exists(state_file):
+            return {}
+        try:
+            with open(state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        os.remove(state_file)
+        return state if isinstance(state, dict) else {}
+
+    def save_sync_state(self, source_id: str, state: Dict[str, Any]):
+        conn = None
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute('''
+                    INSERT INTO content_source_sync (source_id, state, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(source_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at
+                ''', (source_id, json.dumps(state, default=str), time.time()))
+        except Exception as e:
+            logging.error(f"Error saving sync state for source {source_id}: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def clear(self, source_id: Optional[str] = None) -> int:
+        """Remove the cached items and sync state for source_id, or for every source"""
+        conn = None
+        try:
+            conn = self._connect()
+            with conn:
+                if source_id:
+                    removed = conn.execute('DELETE FROM content_source_cache WHERE source_id = ?', (source_id,)).rowcount
+                    conn.execute('DELETE FROM content_source_sync WHERE source_id = ?', (source_id,))
+                else:
+                    removed = conn.execute('DELETE FROM content_source_cache').rowcount
+                    conn.execute('DELETE FROM content_source_sync')
+            return removed
+        except Exception as e:
+            logging.error(f"Error clearing content source cache: {e}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any]):
+        stats['entries'] = {row['source_id']: row['entries'] for row in conn.execute(
+            'SELECT source_id, COUNT(*) AS entries FROM content_source_cache GROUP BY source_id')}
+
+content_source_cache = ContentSourceCache()
+
+class SourceCache:
+    """
+    One source's view of the content source cache for a single run. Behaves like
+    the dict the pickled caches used to be: get() is a point lookup and assignments
+    are buffered until save_source_cache writes them in one transaction.
+    """
+
+    def __init__(self, source_id: str, store: Optional[ContentSourceCache] = None):
+        self.source_id = source_id
+        self._store = store or content_source_cache
+        self._conn = None
+        self._pending = {}
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = self._store._connect()
+        return self._conn
+
+    def get(self, cache_key: str, default=None) -> Optional[Dict[str, Any]]:
+        if cache_key in self._pending:
+            return self._pending[cache_key]
+        try:
+            entry = self._store.lookup(self._connection(), self.source_id, cache_key)
+        except Exception as e:
+            logging.error(f"Error reading content source cache for {self.source_id}: {e}")
+            return default
+        return default if entry is None else entry
+
+    def __setitem__(self, cache_key: str, entry: Dict[str, Any]):
+        self._pending[cache_key] = entry
+
+    def __len__(self) -> int:
+        try:
+            return self._store.count(self._connection(), self.source_id) + len(self._pending)
+        except Exception as e:
+            logging.error(f"Error counting content source cache entries for {self.source_id}: {e}")
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write the buffered entries and close the connection, returning how many were written"""
+        try:
+            written = 0
+            if self._pending:
+                written = self._store.upsert(self._connection(), self.source_id, self._pending.items())
+                self._pending.clear()
+            return written
+        finally:
+            self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
 def get_cache_file_path(source_id: str) -> str:
-    """Get the cache file path for a specific content source."""
+    """Get the legacy pickle cache file path for a specific content source."""
     safe_source_id = source_id.replace('/', '_').replace('\\', '_')
     return os.path.join(DB_CONTENT_DIR, f'content_source_{safe_source_id}_cache.pkl')
 
-def load_source_cache(source_id: str) -> Dict[str, Any]:
-    """Load cache for a specific content source."""
-    cache_file = get_cache_file_path(source_id)
+def load_source_cache(source_id: str) -> SourceCache:
+    """Open the cache for a specific content source, importing an old pickle cache first."""
+    content_source_cache.migrate_pickle(source_id)
+    return SourceCache(source_id)
+
+def save_source_cache(source_id: str, cache) -> None:
+    """Write the entries updated during this run for a specific content source."""
     try:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                cache = pickle.load(f)
-                logging.debug(f"Loaded cache for source {source_id} with {len(cache)} entries")
-                return cache
+        if isinstance(cache, SourceCache):
+            written = cache.flush()
         else:
-            logging.debug(f"No existing cache file found for source {source_id}")
-    except (EOFError, pickle.UnpicklingError, FileNotFoundError) as e:
-        logging.warning(f"Error loading cache for source {source_id}: {e}. Creating a new cache.")
-    return {}
-
-def save_source_cache(source_id: str, cache: Dict[str, Any]) -> None:
-    """Save cache for a specific content source."""
-    cache_file = get_cache_file_path(source_id)
-    try:
-        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-        with open(cache_file, 'wb') as f:
-            pickle.dump(cache, f)
-            logging.debug(f"Saved cache for source {source_id} with {len(cache)} entries")
+            conn = content_source_cache._connect()
+            try:
+                written = content_source_cache.upsert(conn, source_id, cache.items())
+            finally:
+                conn.close()
+        logging.debug(f"Saved {written} cache entries for source {source_id}")
     except Exception as e:
         logging.error(f"Error saving cache for source {source_id}: {e}")
 
+def load_sync_state(source_id: str) -> Dict[str, Any]:
+    """Load the delta sync cursors (ETags, activity timestamps, stored payloads) for a content source."""
+    return content_source_cache.load_sync_state(source_id)
+
+def save_sync_state(source_id: str, state: Dict[str, Any]) -> None:
+    """Save the sync state for a content source."""
+    content_source_cache.save_sync_state(source_id, state)
+
 def create_cache_key(item: Dict[str, Any], source_id: str) -> str:
     """Create a cache key for an item from a specific source."""
     # Base key components
@@ -70,9 +292,6 @@ def should_process_item(item: Dict[str, Any], source_id: str, cache: Dict[str, A
     Determine if an item should be processed based on cache status.
     Returns True if item should be processed, False if it should be skipped.
     """
-    # Check if cache checking is disabled in debug settings
-    from settings import get_setting
-    
     # If cache checking is disabled, always process the item
     if get_setting('Debug', 'disable_content_source_caching', False):
         return True
@@ -0,0 +1,85 @@
+"""
+Delta sync helpers for content sources.
+
+A source's sync state (see content_cache_management.load_sync_state) holds one entry per
+upstream list. An entry remembers how the list was last seen - an ETag/Last-Modified pair,
+an activity token or a modified-since cursor - together with the raw payload, so a list that
+hasn't changed is answered with one cheap request and the stored payload. A full download is
+still forced every content_source_full_sync_hours in case a change was missed.
+"""
+
+import copy
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from api_tracker import api
+from settings import get_setting
+
+DEFAULT_FULL_SYNC_HOURS = 24
+
+def get_sync_entry(sync_state: Optional[Dict[str, Any]], key: str) -> Optional[Dict[str, Any]]:
+    """Return the mutable entry for key, or None when the caller isn't tracking sync state"""
+    if sync_state is None:
+        return None
+    entry = sync_state.get(key)
+    if not isinstance(entry, dict):
+        entry = sync_state[key] = {}
+    return entry
+
+def get_full_sync_seconds() -> float:
+    try:
+        return float(get_setting('Debug', 'content_source_full_sync_hours', DEFAULT_FULL_SYNC_HOURS)) * 3600
+    except (TypeError, ValueError):
+        return DEFAULT_FULL_SYNC_HOURS * 3600
+
+def full_sync_due(entry: Optional[Dict[str, Any]]) -> bool:
+    if not entry or 'payload' not in entry:
+        return True
+    return time.time() - entry.get('synced_at', 0) >= get_full_sync_seconds()
+
+def remember(entry: Optional[Dict[str, Any]], payload: Any, synced_at: Optional[float] = None, **validators) -> None:
+    """
+    Store a downloaded payload and the validators describing it. synced_at is when the
+    payload was last fully downloaded; pass the old value when only merging a delta.
+    """
+    if entry is None:
+        return
+    entry.clear()
+    entry.update({key: value for key, value in validators.items() if value is not None})
+    entry['payload'] = payload
+    entry['synced_at'] = synced_at or time.time()
+
+def reuse_if_unchanged(entry: Optional[Dict[str, Any]], token: Optional[str]) -> Optional[Any]:
+    """Return a copy of the stored payload if it was fetched when the upstream token was the same"""
+    if token is None or full_sync_due(entry) or entry.get('token') != token:
+        return None
+    logging.debug(f"Content source unchanged since last sync (token {token}), reusing stored list")
+    return copy.deepcopy(entry['payload'])
+
+def conditional_get_json(url: str, entry: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]] = None, timeout: float = 10) -> Any:
+    """
+    GET a JSON list with If-None-Match/If-Modified-Since from the last response and
+    return the stored payload on 304. Request errors propagate like api.get.
+    """
+    headers = dict(headers or {})
+    if not full_sync_due(entry):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = api.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and entry and 'payload' in entry:
+        logging.debug(f"Content source {url} not modified since last sync, reusing stored list")
+        return copy.deepcopy(entry['payload'])
+
+    payload = response.json()
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        remember(entry, payload, etag=etag, last_modified=last_modified)
+    elif entry is not None:
+        # Nothing to validate against next time, so there's no point keeping the payload
+        entry.clear()
+    return payload
@@ -1,11 +1,12 @@
 import logging
 from api_tracker import api
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from settings import get_all_settings, get_setting
 from database import get_media_item_presence
 import os
 import pickle
 from datetime import datetime, timedelta
+from content_checkers.content_sync import conditional_get_json, get_sync_entry
 
 REQUEST_TIMEOUT = 10  # seconds
 
@@ -41,7 +42,7 @@ def get_mdblist_sources() -> List[Dict[str, Any]]:
     
     return mdblist_sources
 
-def fetch_items_from_mdblist(url: str) -> List[Dict[str, Any]]:
+def fetch_items_from_mdblist(url: str, sync_entry: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     headers = {
         'Accept': 'application/json'
     }
@@ -53,9 +54,7 @@ def fetch_items_from_mdblist(url: str) -> List[Dict[str, Any]]:
     
     try:
         logging.info(f"Fetching items from MDBList URL: {url}")
-        response = api.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return response.json()
+        return conditional_get_json(url, sync_entry, headers=headers, timeout=REQUEST_TIMEOUT)
     except api.exceptions.RequestException as e:
         logging.error(f"Error fetching items from MDBList: {e}")
         return []
@@ -70,13 +69,13 @@ def assign_media_type(item: Dict[str, Any]) -> str:
         logging.warning(f"Unknown media type: {media_type}. Defaulting to 'movie'.")
         return 'movie'
 
-def get_wanted_from_mdblists(mdblist_url: str, versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_wanted_from_mdblists(mdblist_url: str, versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     all_wanted_items = []
     disable_caching = True  # Hardcoded to True
     cache = {} if disable_caching else load_mdblist_cache()
     current_time = datetime.now()
     
-    items = fetch_items_from_mdblist(mdblist_url)
+    items = fetch_items_from_mdblist(mdblist_url, get_sync_entry(sync_state, mdblist_url))
     processed_items = []
     
     skipped_count = 0
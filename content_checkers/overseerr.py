@@ -1,13 +1,16 @@
 import logging
 from api_tracker import api
 from settings import get_setting, get_all_settings
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from database import get_media_item_presence
 import os
 import pickle
 from datetime import datetime, timedelta
+from content_checkers.content_sync import full_sync_due, get_sync_entry, remember
 
 DEFAULT_TAKE = 100
+# Page size when only asking for requests modified since the last sync
+DELTA_TAKE = 20
 REQUEST_TIMEOUT = 15  # seconds
 
 # Get db_content directory from environment variable with fallback
@@ -94,7 +97,61 @@ def fetch_overseerr_wanted_content(overseerr_url: str, overseerr_api_key: str, t
     logging.info(f"Found {len(wanted_content)} wanted items from Overseerr")
     return wanted_content
 
-def get_wanted_from_overseerr(versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_overseerr_cursor(requests: List[Dict[str, Any]]) -> Optional[str]:
+    # updatedAt is an ISO 8601 UTC string, so the newest one sorts last
+    return max((request.get('updatedAt') or '' for request in requests), default=None) or None
+
+def fetch_overseerr_changes(overseerr_url: str, overseerr_api_key: str, sync_entry: Dict[str, Any], take: int = DELTA_TAKE) -> Optional[List[Dict[str, Any]]]:
+    """
+    Merge requests modified since the stored cursor into the stored request list.
+
+    Requests come newest-modified first, so paging stops at the first one we've already
+    seen. Returns None if a full fetch is needed: the delta failed, or the merged list
+    doesn't match Overseerr's total because requests were deleted or left the filter.
+    """
+    headers = get_overseerr_headers(overseerr_api_key)
+    cursor = sync_entry.get('cursor') or ''
+    changed = {}
+    total = None
+    skip = 0
+
+    try:
+        while True:
+            request_url = get_url(overseerr_url, f"/api/v1/request?take={take}&skip={skip}&filter=approved&sort=modified")
+            response = api.get(request_url, headers=headers, timeout=REQUEST_TIMEOUT)
+            data = response.json()
+            if total is None:
+                total = data.get('pageInfo', {}).get('results')
+            results = data.get('results', [])
+
+            reached_cursor = False
+            for request in results:
+                if (request.get('updatedAt') or '') <= cursor:
+                    reached_cursor = True
+                    break
+                changed[request.get('id')] = request
+
+            if reached_cursor or len(results) < take:
+                break
+            skip += take
+    except (api.exceptions.RequestException, ValueError) as e:
+        logging.warning(f"Error fetching Overseerr changes, falling back to a full fetch: {e}")
+        return None
+
+    if not changed and total == len(sync_entry['payload']):
+        logging.debug("No Overseerr requests modified since last sync, reusing stored list")
+        return sync_entry['payload']
+
+    merged = list(changed.values()) + [request for request in sync_entry['payload'] if request.get('id') not in changed]
+    if total != len(merged):
+        logging.debug(f"Overseerr request count changed ({len(merged)} known, {total} reported), doing a full fetch")
+        return None
+
+    logging.info(f"Merged {len(changed)} modified Overseerr requests into {len(merged)} stored requests")
+    remember(sync_entry, merged, cursor=get_overseerr_cursor(merged), synced_at=sync_entry['synced_at'])
+    return merged
+
+def get_wanted_from_overseerr(versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     content_sources = get_all_settings().get('Content Sources', {})
     overseerr_sources = [data for source, data in content_sources.items() if source.startswith('Overseerr') and data.get('enabled', False)]
     allow_partial = get_setting('Debug', 'allow_partial_overseerr_requests', 'False')
@@ -114,7 +171,13 @@ def get_wanted_from_overseerr(versions: Dict[str, bool]) -> List[Tuple[List[Dict
             continue
 
         try:
-            wanted_content_raw = fetch_overseerr_wanted_content(overseerr_url, overseerr_api_key)
+            sync_entry = get_sync_entry(sync_state, overseerr_url)
+            wanted_content_raw = None
+            if not full_sync_due(sync_entry):
+                wanted_content_raw = fetch_overseerr_changes(overseerr_url, overseerr_api_key, sync_entry)
+            if wanted_content_raw is None:
+                wanted_content_raw = fetch_overseerr_wanted_content(overseerr_url, overseerr_api_key)
+                remember(sync_entry, wanted_content_raw, cursor=get_overseerr_cursor(wanted_content_raw))
             wanted_items = []
             cache_skipped = 0
 
@@ -3,17 +3,21 @@ import os
 import pickle
 from datetime import datetime, timedelta
 import feedparser
-from typing import List, Dict, Any, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from settings import get_setting
 from database.database_reading import get_media_item_presence
 from cli_battery.app.metadata_manager import MetadataManager
 from cli_battery.app.trakt_metadata import TraktMetadata
 from cli_battery.app.database import DatabaseManager
+from content_checkers.content_sync import full_sync_due, get_sync_entry, remember
 
 # Get db_content directory from environment variable with fallback
 DB_CONTENT_DIR = os.environ.get('USER_DB_CONTENT', '/user/db_content')
 PLEX_RSS_CACHE_FILE = os.path.join(DB_CONTENT_DIR, 'plex_rss_cache.pkl')
 CACHE_EXPIRY_DAYS = 7
+# Entry fields kept in the sync state so an unmodified feed can be processed without downloading it,
+# feedparser serves entry.category from tags
+RSS_ENTRY_FIELDS = ('guid', 'title', 'tags')
 
 def load_rss_cache(cache_file):
     try:
@@ -68,7 +72,26 @@ def extract_imdb_id(guid: str, title: str = None) -> str:
             logging.error(f"Error converting TVDB ID {tvdb_id} to IMDB ID: {str(e)}")
     return None
 
-def get_wanted_from_plex_rss(rss_url: str, versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def parse_rss_feed(rss_url: str, sync_entry: Optional[Dict[str, Any]] = None):
+    """Parse the feed, sending the stored ETag/Last-Modified. Returns (feed, entries)."""
+    etag = modified = None
+    if not full_sync_due(sync_entry):
+        etag, modified = sync_entry.get('etag'), sync_entry.get('last_modified')
+    feed = feedparser.parse(rss_url, etag=etag, modified=modified)
+
+    if feed.get('status') == 304 and not full_sync_due(sync_entry):
+        logging.debug(f"RSS feed {rss_url} not modified since last sync, reusing stored entries")
+        return feed, [feedparser.FeedParserDict(entry) for entry in sync_entry['payload']]
+
+    if not feed.bozo and sync_entry is not None:
+        if feed.get('etag') or feed.get('modified'):
+            payload = [{field: entry[field] for field in RSS_ENTRY_FIELDS if field in entry} for entry in feed.entries]
+            remember(sync_entry, payload, etag=feed.get('etag'), last_modified=feed.get('modified'))
+        else:
+            sync_entry.clear()
+    return feed, feed.entries
+
+def get_wanted_from_plex_rss(rss_url: str, versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     all_wanted_items = []
     processed_items = []
     disable_caching = True  # Hardcoded to True
@@ -83,16 +106,16 @@ def get_wanted_from_plex_rss(rss_url: str, versions: Dict[str, bool]) -> List[Tu
     try:
         logging.info(f"Fetching RSS feed from URL: {rss_url}")
         # Parse the RSS feed
-        feed = feedparser.parse(rss_url)
+        feed, entries = parse_rss_feed(rss_url, get_sync_entry(sync_state, rss_url))
         if feed.bozo:  # Check if there was an error parsing the feed
             logging.error(f"Error parsing RSS feed: {feed.bozo_exception}")
             return [([], versions)]
 
-        logging.info(f"Successfully parsed RSS feed. Found {len(feed.entries)} entries")
+        logging.info(f"Successfully parsed RSS feed. Found {len(entries)} entries")
         skipped_count = 0
         cache_skipped = 0
 
-        for entry in feed.entries:
+        for entry in entries:
             try:
                 # Extract IMDB ID from the guid
                 if not hasattr(entry, 'guid'):
@@ -164,7 +187,7 @@ def get_wanted_from_plex_rss(rss_url: str, versions: Dict[str, bool]) -> List[Tu
             save_rss_cache(cache, PLEX_RSS_CACHE_FILE)
 
         logging.info(f"Plex RSS Watchlist Summary:")
-        logging.info(f"- Total entries: {len(feed.entries)}")
+        logging.info(f"- Total entries: {len(entries)}")
         logging.info(f"- Skipped (no IMDB ID): {skipped_count}")
         logging.info(f"- Items added to wanted: {sum(len(items) for items, _ in all_wanted_items)}")
 
@@ -174,7 +197,7 @@ def get_wanted_from_plex_rss(rss_url: str, versions: Dict[str, bool]) -> List[Tu
         logging.error(f"Error processing Plex RSS feed: {str(e)}")
         return [([], versions)]
 
-def get_wanted_from_friends_plex_rss(rss_urls: Union[str, List[str]], versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_wanted_from_friends_plex_rss(rss_urls: Union[str, List[str]], versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     """Get wanted items from one or more friends' Plex RSS feeds."""
     all_wanted_items = []
     
@@ -191,7 +214,7 @@ def get_wanted_from_friends_plex_rss(rss_urls: Union[str, List[str]], versions:
             continue
             
         try:
-            items = get_wanted_from_plex_rss(rss_url, versions)
+            items = get_wanted_from_plex_rss(rss_url, versions, sync_state)
             if items and items[0] and items[0][0]:  # Check if we got any valid items
                 all_wanted_items.extend(items)
                 logging.info(f"Successfully processed friend's RSS feed: {rss_url}")
@@ -2,7 +2,7 @@ import re
 import logging
 from api_tracker import api
 import json
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 from settings import get_all_settings
 import trakt.core
@@ -16,7 +16,7 @@ from settings import get_setting
 import random
 from time import sleep
 from content_checkers.plex_watchlist import get_show_status
-import requests
+from content_checkers.content_sync import get_sync_entry, remember, reuse_if_unchanged
 
 REQUEST_TIMEOUT = 10  # seconds
 TRAKT_API_URL = "https://api.trakt.tv"
@@ -132,7 +132,7 @@ def refresh_friend_token(auth_id: str) -> bool:
             return False
         
         # Refresh the token
-        response = requests.post(
+        response = api.post(
             f"{TRAKT_API_URL}/oauth/token",
             json={
                 'refresh_token': state['refresh_token'],
@@ -140,7 +140,8 @@ def refresh_friend_token(auth_id: str) -> bool:
                 'client_secret': client_secret,
                 'grant_type': 'refresh_token'
             },
-            timeout=REQUEST_TIMEOUT
+            timeout=REQUEST_TIMEOUT,
+            raise_for_status=False
         )
         
         if response.status_code == 200:
@@ -283,8 +284,7 @@ def fetch_items_from_trakt(endpoint: str, headers=None) -> List[Dict[str, Any]]:
     logging.debug(f"Fetching items from Trakt API: {url}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+        response = api.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
         return response.json()
     except Exception as e:
         logging.error(f"Error fetching items from Trakt API: {str(e)}")
@@ -383,6 +383,29 @@ def get_last_activity() -> Dict[str, Any]:
     endpoint = "/sync/last_activities"
     return fetch_items_from_trakt(endpoint)
 
+def get_activity_token(paths: List[str], headers=None) -> Optional[str]:
+    """
+    Join the /sync/last_activities timestamps at dotted paths like 'watchlist.updated_at'.
+    Returns None if any of them is unavailable, which makes the caller do a full fetch.
+    """
+    activity = fetch_items_from_trakt("/sync/last_activities", headers)
+    values = []
+    for path in paths:
+        value = activity
+        for key in path.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        if not value:
+            return None
+        values.append(value)
+    return '|'.join(values)
+
+def get_list_token(username: str, list_id: str) -> Optional[str]:
+    """The list's own updated_at, which also changes when items are added or removed"""
+    summary = fetch_items_from_trakt(f"/users/{username}/lists/{list_id}")
+    if isinstance(summary, dict):
+        return summary.get('updated_at')
+    return None
+
 def check_for_updates(list_url: str = None) -> bool:
     cached_activity = load_trakt_cache(LAST_ACTIVITY_CACHE_FILE)
     current_activity = get_last_activity()
@@ -418,7 +441,7 @@ def check_for_updates(list_url: str = None) -> bool:
 
     return False
 
-def get_wanted_from_trakt_watchlist(versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_wanted_from_trakt_watchlist(versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     logging.debug("Fetching Trakt watchlist")
     access_token = ensure_trakt_auth()
     if access_token is None:
@@ -441,7 +464,13 @@ def get_wanted_from_trakt_watchlist(versions: Dict[str, bool]) -> List[Tuple[Lis
     # Process Trakt Watchlist
     for watchlist_source in trakt_sources['watchlist']:
         if watchlist_source.get('enabled', False):
-            watchlist_items = fetch_items_from_trakt("/sync/watchlist")
+            sync_entry = get_sync_entry(sync_state, 'watchlist')
+            token = get_activity_token(['watchlist.updated_at']) if sync_entry is not None else None
+            watchlist_items = reuse_if_unchanged(sync_entry, token)
+            if watchlist_items is None:
+                watchlist_items = fetch_items_from_trakt("/sync/watchlist")
+                if isinstance(watchlist_items, list):
+                    remember(sync_entry, watchlist_items, token=token)
             
             processed_items = []
             movies_to_remove = []
@@ -577,7 +606,7 @@ def get_wanted_from_trakt_watchlist(versions: Dict[str, bool]) -> List[Tuple[Lis
         save_trakt_cache(cache, TRAKT_WATCHLIST_CACHE_FILE)
     return all_wanted_items
 
-def get_wanted_from_trakt_lists(trakt_list_url: str, versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_wanted_from_trakt_lists(trakt_list_url: str, versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     logging.debug("Fetching Trakt lists")
     access_token = ensure_trakt_auth()
     if access_token is None:
@@ -604,7 +633,13 @@ def get_wanted_from_trakt_lists(trakt_list_url: str, versions: Dict[str, bool])
     
     # Get list items
     endpoint = f"/users/{username}/lists/{list_id}/items"
-    list_items = fetch_items_from_trakt(endpoint)
+    sync_entry = get_sync_entry(sync_state, trakt_list_url)
+    token = get_list_token(username, list_id) if sync_entry is not None else None
+    list_items = reuse_if_unchanged(sync_entry, token)
+    if list_items is None:
+        list_items = fetch_items_from_trakt(endpoint)
+        if isinstance(list_items, list):
+            remember(sync_entry, list_items, token=token)
     
     processed_items = []
     skipped_count = 0
@@ -656,7 +691,7 @@ def get_wanted_from_trakt_lists(trakt_list_url: str, versions: Dict[str, bool])
         save_trakt_cache(cache, TRAKT_LISTS_CACHE_FILE)
     return all_wanted_items
 
-def get_wanted_from_trakt_collection(versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_wanted_from_trakt_collection(versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     logging.debug("Fetching Trakt collection")
     access_token = ensure_trakt_auth()
     if access_token is None:
@@ -669,14 +704,20 @@ def get_wanted_from_trakt_collection(versions: Dict[str, bool]) -> List[Tuple[Li
     current_time = datetime.now()
     cache_skipped = 0
 
-    # Get collection items
-    response = make_trakt_request('get', "/sync/collection/movies")
-    movie_items = response.json() if response else []
-    
-    response = make_trakt_request('get', "/sync/collection/shows")
-    show_items = response.json() if response else []
-    
-    collection_items = movie_items + show_items
+    # Get collection items, shows change when an episode is collected
+    sync_entry = get_sync_entry(sync_state, 'collection')
+    token = get_activity_token(['movies.collected_at', 'episodes.collected_at']) if sync_entry is not None else None
+    collection_items = reuse_if_unchanged(sync_entry, token)
+    if collection_items is None:
+        movie_response = make_trakt_request('get', "/sync/collection/movies")
+        movie_items = movie_response.json() if movie_response else []
+        
+        show_response = make_trakt_request('get', "/sync/collection/shows")
+        show_items = show_response.json() if show_response else []
+        
+        collection_items = movie_items + show_items
+        if movie_response and show_response:
+            remember(sync_entry, collection_items, token=token)
     processed_items = []
     skipped_count = 0
     
@@ -727,7 +768,7 @@ def get_wanted_from_trakt_collection(versions: Dict[str, bool]) -> List[Tuple[Li
         save_trakt_cache(cache, TRAKT_COLLECTION_CACHE_FILE)
     return all_wanted_items
 
-def get_wanted_from_friend_trakt_watchlist(source_config: Dict[str, Any], versions: Dict[str, bool]) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
+def get_wanted_from_friend_trakt_watchlist(source_config: Dict[str, Any], versions: Dict[str, bool], sync_state: Optional[Dict[str, Any]] = None) -> List[Tuple[List[Dict[str, Any]], Dict[str, bool]]]:
     """Get wanted items from a friend's Trakt watchlist"""
     auth_id = source_config.get('auth_id')
     if not auth_id:
@@ -781,7 +822,13 @@ def get_wanted_from_friend_trakt_watchlist(source_config: Dict[str, Any], versio
         try:
             # Get the watchlist from Trakt
             endpoint = f"/users/{username}/watchlist"
-            items = fetch_items_from_trakt(endpoint, headers)
+            sync_entry = get_sync_entry(sync_state, f'friend_watchlist_{username}')
+            token = get_activity_token(['watchlist.updated_at'], headers) if sync_entry is not None else None
+            items = reuse_if_unchanged(sync_entry, token)
+            if items is None:
+                items = fetch_items_from_trakt(endpoint, headers)
+                if isinstance(items, list):
+                    remember(sync_entry, items, token=token)
             
             # Process the items
             processed_items = process_trakt_items(items)
@@ -41,6 +41,66 @@ def get_all_media_items(state=None, media_type=None, tmdb_id=None):
     conn.close()
     return items
 
+def get_latest_media_item_change():
+    """Return the newest sequence number in media_item_changes, or None if change tracking is unavailable."""
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('SELECT MAX(seq) AS seq FROM media_item_changes')
+        result = cursor.fetchone()
+        return result['seq'] or 0
+    except Exception as e:
+        # Callers fall back to full reloads when change tracking is missing
+        logging.debug(f"Error retrieving latest media item change: {str(e)}")
+        return None
+    finally:
+        conn.close()
+
+def get_changed_media_items(since_seq, states=None):
+    """
+    Get the media items that changed after the given change sequence number.
+
+    Args:
+        since_seq: Last change sequence number the caller has already applied
+        states: Optional list of states; only rows currently in one of these states are returned
+
+    Returns:
+        tuple: (latest_seq, changed_ids, rows) where changed_ids contains every item id touched
+        since since_seq (including deleted items) and rows holds the current rows for those ids
+        that match states. Returns (None, None, None) on error.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('''
+            SELECT item_id, MAX(seq) AS seq FROM media_item_changes
+            WHERE seq > ?
+            GROUP BY item_id
+        ''', (since_seq,))
+        changes = cursor.fetchall()
+        if not changes:
+            return since_seq, set(), []
+
+        latest_seq = max(row['seq'] for row in changes)
+        changed_ids = [row['item_id'] for row in changes]
+
+        rows = []
+        # Stay well below SQLite's bound parameter limit
+        chunk_size = 500
+        for start in range(0, len(changed_ids), chunk_size):
+            chunk = changed_ids[start:start + chunk_size]
+            query = f"SELECT * FROM media_items WHERE id IN ({','.join('?' for _ in chunk)})"
+            params = list(chunk)
+            if states:
+                query += f" AND state IN ({','.join('?' for _ in states)})"
+                params.extend(states)
+            rows.extend(conn.execute(query, params).fetchall())
+
+        return latest_seq, set(changed_ids), rows
+    except Exception as e:
+        logging.error(f"Error retrieving changed media items since {since_seq}: {str(e)}")
+        return None, None, None
+    finally:
+        conn.close()
+
 def get_media_item_presence(imdb_id=None, tmdb_id=None):
     conn = get_db_connection()
     try:
@@ -160,6 +160,26 @@ def remove_from_media_items(item_id):
     finally:
         conn.close()
 
+def prune_media_item_changes(up_to_seq: int, min_age_minutes: int = 15):
+    """Delete change log entries that have already been applied.
+
+    Entries younger than min_age_minutes are kept so that other readers of the
+    log that lag slightly behind do not miss changes.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('''
+            DELETE FROM media_item_changes
+            WHERE seq <= ? AND changed_at < datetime('now', ?)
+        ''', (up_to_seq, f'-{int(min_age_minutes)} minutes'))
+        conn.commit()
+        return cursor.rowcount
+    except Exception as e:
+        logging.error(f"Error pruning media item changes up to {up_to_seq}: {str(e)}")
+        return 0
+    finally:
+        conn.close()
+
 def add_to_collected_notifications(media_item):
     # Get db_content directory from environment variable with fallback
     db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
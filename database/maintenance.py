@@ -197,10 +197,10 @@ def update_show_ids():
                                             from settings import get_setting
                                             tmdb_api_key = get_setting('TMDB','api_key')
                                             if tmdb_api_key:
-                                                import requests
+                                                from api_tracker import api as tracked_api
                                                 tmdb_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}/external_ids?api_key={tmdb_api_key}"
                                                 try:
-                                                    tmdb_response = requests.get(tmdb_url)
+                                                    tmdb_response = tracked_api.get(tmdb_url, raise_for_status=False)
                                                     if tmdb_response.status_code == 200:
                                                         tmdb_data = tmdb_response.json()
                                                         logging.debug(f"Full TMDB response: {tmdb_data}")
@@ -479,10 +479,10 @@ def update_movie_ids():
                                             from settings import get_setting
                                             tmdb_api_key = get_setting('TMDB','api_key')
                                             if tmdb_api_key:
-                                                import requests
+                                                from api_tracker import api as tracked_api
                                                 tmdb_url = f"https://api.themoviedb.org/3/movie/{tmdb_id}/external_ids?api_key={tmdb_api_key}"
                                                 try:
-                                                    tmdb_response = requests.get(tmdb_url)
+                                                    tmdb_response = tracked_api.get(tmdb_url, raise_for_status=False)
                                                     if tmdb_response.status_code == 200:
                                                         tmdb_data = tmdb_response.json()
                                                         logging.debug(f"Full TMDB response: {tmdb_data}")
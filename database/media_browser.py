@@ -0,0 +1,224 @@
+"""
+Paging, counting and exporting media_items for the database browser.
+
+Pages are read with keyset (seek) queries on (sort column, id): a page starts
+right after the last row of the previous one, so page 1000 costs the same as
+page 1 instead of making SQLite step over every row before an OFFSET. Cursors
+are opaque strings holding the (sort value, id) of the row to continue from.
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .core import get_db_connection
+from .database_reading import get_latest_media_item_change
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+# Counts are trusted this long when the media_items change log is unavailable
+COUNT_FALLBACK_TTL_SECONDS = 60
+
+DIGIT_TITLE_PREFIXES = [str(digit) for digit in range(10)] + ['[', '(', '{']
+
+def build_media_filter(all_columns: Sequence[str], filter_column: str = '', filter_value: str = '',
+                       content_type: str = 'all', letter: str = '') -> Tuple[List[str], List[Any]]:
+    """
+    WHERE clauses and parameters for the browser's filters: a LIKE on any real
+    column, or else the content type and the title's first letter ('#' for titles
+    starting with a digit or bracket).
+    """
+    where_clauses = []
+    params = []
+    if filter_column and filter_value:
+        if filter_column in all_columns:
+            where_clauses.append(f"{filter_column} LIKE ?")
+            params.append(f"%{filter_value}%")
+        return where_clauses, params
+
+    if content_type and content_type != 'all':
+        where_clauses.append("type = ?")
+        params.append(content_type)
+    if letter == '#':
+        where_clauses.append("(" + " OR ".join("title LIKE ?" for _ in DIGIT_TITLE_PREFIXES) + ")")
+        params.extend(f"{prefix}%" for prefix in DIGIT_TITLE_PREFIXES)
+    elif letter and letter.isalpha():
+        where_clauses.append("title LIKE ?")
+        params.append(f"{letter}%")
+    return where_clauses, params
+
+def encode_cursor(row: Dict[str, Any], sort_column: str) -> str:
+    payload = json.dumps([row.get(sort_column), row['id']], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """The (sort value, id) in cursor, or None when it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return value, int(item_id)
+    except (ValueError, TypeError):
+        logging.warning(f"Ignoring malformed database browser cursor: {cursor}")
+        return None
+
+def _seek_clause(sort_column: str, descending: bool, position: Tuple[Any, int]) -> Tuple[str, List[Any]]:
+    # Rows that come after position when ordered by (sort_column, id), both ascending or both descending.
+    # SQLite sorts NULLs first, so they open an ascending order and close a descending one.
+    value, item_id = position
+    if sort_column == 'id':
+        return ("id < ?" if descending else "id > ?"), [item_id]
+    if descending:
+        if value is None:
+            return f"({sort_column} IS NULL AND id < ?)", [item_id]
+        return (f"({sort_column} < ? OR ({sort_column} = ? AND id < ?) OR {sort_column} IS NULL)",
+                [value, value, item_id])
+    if value is None:
+        return f"(({sort_column} IS NULL AND id > ?) OR {sort_column} IS NOT NULL)", [item_id]
+    return f"({sort_column} > ? OR ({sort_column} = ? AND id > ?))", [value, value, item_id]
+
+def _order_clause(sort_column: str, descending: bool) -> str:
+    direction = 'DESC' if descending else 'ASC'
+    if sort_column == 'id':
+        return f"ORDER BY id {direction}"
+    return f"ORDER BY {sort_column} {direction}, id {direction}"
+
+def _select(columns: Sequence[str], sort_column: str) -> List[str]:
+    # id and the sort column are needed to build cursors even when they aren't displayed
+    return list(dict.fromkeys(list(columns) + ['id', sort_column]))
+
+def fetch_page(conn, columns: Sequence[str], where_clauses: Sequence[str], params: Sequence[Any],
+               sort_column: str = 'id', sort_order: str = 'asc', page_size: int = DEFAULT_PAGE_SIZE,
+               after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of media_items in (sort_column, id) order, starting after the after
+    cursor, or ending before the before cursor when paging back.
+
+    Returns the items plus next_cursor/prev_cursor, None at either end.
+    """
+    page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+    descending = sort_order.lower() == 'desc'
+    after_position = decode_cursor(after)
+    before_position = None if after_position else decode_cursor(before)
+    # Paging back reads the rows before the cursor in reverse order and flips them afterwards
+    backwards = before_position is not None
+    query_columns = _select(columns, sort_column)
+
+    clauses = list(where_clauses)
+    query_params = list(params)
+    position = after_position or before_position
+    if position:
+        seek, seek_params = _seek_clause(sort_column, descending != backwards, position)
+        clauses.append(seek)
+        query_params.extend(seek_params)
+
+    query = f"SELECT {', '.join(query_columns)} FROM media_items"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" {_order_clause(sort_column, descending != backwards)} LIMIT ?"
+    # One extra row tells whether there is another page in this direction
+    rows = conn.execute(query, query_params + [page_size + 1]).fetchall()
+    has_more = len(rows) > page_size
+    items = [dict(zip(query_columns, row)) for row in rows[:page_size]]
+    if backwards:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, after_position is not None
+    return {
+        'items': items,
+        'next_cursor': encode_cursor(items[-1], sort_column) if items and has_next else None,
+        'prev_cursor': encode_cursor(items[0], sort_column) if items and has_prev else None,
+        'page_size': page_size,
+    }
+
+def iter_media_items(columns: Sequence[str], where_clauses: Sequence[str], params: Sequence[Any],
+                     sort_column: str = 'id', sort_order: str = 'asc',
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Every matching item in order, read in keyset batches so an export of the whole
+    library holds neither the whole result nor a long read transaction.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = None
+        while True:
+            page = fetch_page(conn, columns, where_clauses, params, sort_column, sort_order,
+                              min(batch_size, MAX_PAGE_SIZE), after=cursor)
+            yield from page['items']
+            cursor = page['next_cursor']
+            if not cursor:
+                return
+    finally:
+        conn.close()
+
+class MediaCountCache:
+    """
+    COUNT(*) of media_items per filter signature (the WHERE clauses and their
+    parameters). A count stays valid until the media_items change log moves on,
+    so browsing the pages of one filter counts the rows once.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._entries = {}  # signature -> (change_seq, counted_at, count)
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    @staticmethod
+    def get_signature(where_clauses: Sequence[str], params: Sequence[Any]) -> str:
+        return json.dumps([list(where_clauses), list(params)], default=str)
+
+    def get(self, conn, where_clauses: Sequence[str], params: Sequence[Any]) -> int:
+        signature = self.get_signature(where_clauses, params)
+        change_seq = get_latest_media_item_change()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(signature)
+        if entry is not None:
+            cached_seq, counted_at, count = entry
+            if change_seq is not None and cached_seq == change_seq:
+                self._count('hits')
+                return count
+            if change_seq is None and now - counted_at < COUNT_FALLBACK_TTL_SECONDS:
+                self._count('hits')
+                return count
+
+        query = "SELECT COUNT(*) FROM media_items"
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+        count = conn.execute(query, list(params)).fetchone()[0]
+        self._count('misses')
+        with self._lock:
+            if signature not in self._entries and len(self._entries) >= self._max_entries:
+                # Drop the oldest count
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[signature] = (change_seq, now, count)
+        return count
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        with self._lock:
+            stats['entries'] = len(self._entries)
+        return stats
+
+media_count_cache = MediaCountCache()
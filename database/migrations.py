@@ -48,6 +48,35 @@ def add_statistics_indexes():
     finally:
         conn.close()
 
+# (name, columns, partial index condition) for the hot media_items lookups
+MEDIA_ITEM_INDEXES = [
+    # Queue loads and get_all_media_items filter by state, usually with a type
+    ('idx_media_items_state_type', 'state, type', None),
+    # Existing-item checks (add_wanted_items, WantedQueue reconciliation, get_media_item_presence)
+    # match on an ID plus the episode key and version; state makes the presence check covering
+    ('idx_media_items_imdb_key', 'imdb_id, type, season_number, episode_number, version, state', None),
+    ('idx_media_items_tmdb_key', 'tmdb_id, type, season_number, episode_number, version, state', None),
+    # File and torrent lookups only ever look for filled-in values
+    ('idx_media_items_filled_by_file', 'filled_by_file', 'filled_by_file IS NOT NULL'),
+    ('idx_media_items_upgrading_from', 'upgrading_from', 'upgrading_from IS NOT NULL'),
+    ('idx_media_items_filled_by_torrent_id', 'filled_by_torrent_id', 'filled_by_torrent_id IS NOT NULL'),
+]
+
+def add_media_item_indexes():
+    """Add the indexes behind the common media_items lookups so none of them scans the table"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        for name, columns, condition in MEDIA_ITEM_INDEXES:
+            where = f" WHERE {condition}" if condition else ''
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON media_items ({columns}){where}")
+        conn.commit()
+    except Exception as e:
+        logging.error(f"Error adding media item indexes: {str(e)}")
+        conn.rollback()
+    finally:
+        conn.close()
+
 def remove_statistics_indexes():
     """Remove statistics indexes if needed"""
     conn = get_db_connection()
@@ -70,4 +99,55 @@ def remove_statistics_indexes():
         logging.error(f"Error removing statistics indexes: {str(e)}")
         conn.rollback()
     finally:
-        conn.close() 
\ No newline at end of file
+        conn.close() 
+def add_change_tracking():
+    """Add the media_item_changes log and the triggers that feed it.
+
+    Every insert, update and delete on media_items appends the affected item id
+    with a monotonically increasing sequence number, regardless of which code
+    path made the write. Consumers such as QueueManager remember the last
+    sequence they applied and only re-read the rows that changed since.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS media_item_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS media_items_track_insert
+            AFTER INSERT ON media_items
+            BEGIN
+                INSERT INTO media_item_changes (item_id) VALUES (NEW.id);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS media_items_track_update
+            AFTER UPDATE ON media_items
+            BEGIN
+                INSERT INTO media_item_changes (item_id) VALUES (NEW.id);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS media_items_track_delete
+            AFTER DELETE ON media_items
+            BEGIN
+                INSERT INTO media_item_changes (item_id) VALUES (OLD.id);
+            END
+        """)
+
+        conn.commit()
+
+    except Exception as e:
+        logging.error(f"Error adding media item change tracking: {str(e)}")
+        conn.rollback()
+    finally:
+        conn.close()
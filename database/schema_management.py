@@ -171,8 +171,10 @@ def verify_database():
     create_torrent_tracking_table()
     
     # Add statistics indexes
-    from .migrations import add_statistics_indexes
+    from .migrations import add_statistics_indexes, add_media_item_indexes, add_change_tracking
     add_statistics_indexes()
+    add_media_item_indexes()
+    add_change_tracking()
     
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -1,19 +1,65 @@
 import logging
 from .core import get_db_connection, normalize_string, get_existing_airtime
-from manual_blacklist import is_blacklisted
-from typing import List, Dict, Any
+from manual_blacklist import is_blacklisted, get_manual_blacklist
+from typing import List, Dict, Any, Iterable, Set, Tuple
 import json
+import time
 from datetime import datetime, timezone
 from metadata.metadata import get_tmdb_id_and_media_type
 import random
 import os
 from config_manager import load_config
 
+# Keeps IN (...) lists under SQLite's default limit of 999 variables
+ID_QUERY_BATCH_SIZE = 450
+
+def _load_watch_history_keys(watch_history_conn, movie_ids: Iterable[str], episode_ids: Iterable[str]) -> Tuple[Set[tuple], Set[tuple]]:
+    """
+    Load the watch history rows matching this batch's IDs in a few IN queries.
+    Movies are keyed by ('imdb'|'tmdb', id), episodes by (kind, id, season, episode, show_title).
+    """
+    watched_movies = set()
+    watched_episodes = set()
+    batch_size = ID_QUERY_BATCH_SIZE // 2
+    for item_type, ids in (('movie', movie_ids), ('episode', episode_ids)):
+        id_list = list(ids)
+        for i in range(0, len(id_list), batch_size):
+            batch = id_list[i:i + batch_size]
+            placeholders = ', '.join(['?'] * len(batch))
+            rows = watch_history_conn.execute(f'''
+                SELECT imdb_id, tmdb_id, season, episode, show_title FROM watch_history
+                WHERE type = ? AND (imdb_id IN ({placeholders}) OR tmdb_id IN ({placeholders}))
+            ''', (item_type, *batch, *batch)).fetchall()
+            for row in rows:
+                for kind in ('imdb', 'tmdb'):
+                    media_id = row[f'{kind}_id']
+                    if not media_id:
+                        continue
+                    if item_type == 'movie':
+                        watched_movies.add((kind, str(media_id)))
+                    else:
+                        watched_episodes.add((kind, str(media_id), _watch_key_number(row['season']),
+                                              _watch_key_number(row['episode']), row['show_title']))
+    return watched_movies, watched_episodes
+
+def _watch_key_number(value):
+    # Season/episode numbers arrive as ints or numeric strings depending on the source
+    return str(value) if value is not None else None
+
 def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
     from metadata.metadata import get_show_airtime_by_imdb_id
     from settings import get_setting
 
     conn = get_db_connection()
+    timings = {}
+    phase_started = time.perf_counter()
+
+    def end_phase(phase):
+        nonlocal phase_started
+        now = time.perf_counter()
+        timings[phase] = timings.get(phase, 0.0) + (now - phase_started) * 1000
+        phase_started = now
+
     try:
         items_added = 0
         items_updated = 0
@@ -141,10 +187,11 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
             filtered_media_items_batch.append(item)
 
         media_items_batch = filtered_media_items_batch
+        end_phase('prepare')
 
         # Get existing movies and episodes
         existing_movies = {}  # Changed from set to dict to store versions
-        batch_size = 450
+        batch_size = ID_QUERY_BATCH_SIZE
         
         def strip_version(version):
             """Strip asterisk from version for comparison"""
@@ -222,6 +269,14 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
                     if key not in existing_episodes:
                         existing_episodes[key] = set()
                     existing_episodes[key].add(strip_version(row['version']))
+        end_phase('load_existing')
+
+        watched_movies = watched_episodes = set()
+        if do_not_add_watched and watch_history_conn:
+            watched_movies, watched_episodes = _load_watch_history_keys(
+                watch_history_conn, movie_imdb_ids | movie_tmdb_ids, episode_imdb_ids | episode_tmdb_ids
+            )
+            end_phase('watch_history')
 
         filtered_media_items_batch = []
         for item in media_items_batch:
@@ -232,56 +287,20 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
 
             # Check watch history if enabled
             if do_not_add_watched and watch_history_conn:
+                # Keys are strings on both sides; Trakt and others hand out tmdb ids as ints
+                media_ids = [(kind, str(media_id)) for kind, media_id in (('imdb', imdb_id), ('tmdb', tmdb_id)) if media_id]
                 if item_type == 'movie':
-                    # Check if movie exists in watch history
-                    if imdb_id or tmdb_id:
-                        query = "SELECT 1 FROM watch_history WHERE type = 'movie' AND "
-                        params = []
-                        conditions = []
-                        if imdb_id:
-                            conditions.append("imdb_id = ?")
-                            params.append(imdb_id)
-                        if tmdb_id:
-                            conditions.append("tmdb_id = ?")
-                            params.append(tmdb_id)
-                        query += " OR ".join(conditions)
-                        if watch_history_conn.execute(query, params).fetchone():
-                            skip_stats['already_watched'] += 1
-                            items_skipped += 1
-                            continue
+                    watched = any(key in watched_movies for key in media_ids)
                 else:
-                    # Check if episode exists in watch history
-                    season = item.get('season_number')
-                    episode = item.get('episode_number')
-                    show_title = normalized_title
-                    if (imdb_id or tmdb_id) and season is not None and episode is not None:
-                        query = """
-                            SELECT 1 FROM watch_history 
-                            WHERE type = 'episode' 
-                            AND season = ? 
-                            AND episode = ? 
-                            AND show_title = ?
-                            AND (
-                        """
-                        params = [season, episode, show_title]
-                        conditions = []
-                        if imdb_id:
-                            conditions.append("imdb_id = ?")
-                            params.append(imdb_id)
-                        if tmdb_id:
-                            conditions.append("tmdb_id = ?")
-                            params.append(tmdb_id)
-                        query += " OR ".join(conditions) + ")"
-                        
-                        # Log the query and parameters for debugging
-                        # logging.debug(f"Watch history check query: {query}")
-                        # logging.debug(f"Parameters: season={season}, episode={episode}, show_title={show_title}, " + 
-                                   # f"show_imdb_id={imdb_id}, show_tmdb_id={tmdb_id}")
-                        
-                        if watch_history_conn.execute(query, params).fetchone():
-                            skip_stats['already_watched'] += 1
-                            items_skipped += 1
-                            continue
+                    season = _watch_key_number(item.get('season_number'))
+                    episode = _watch_key_number(item.get('episode_number'))
+                    watched = season is not None and episode is not None and any(
+                        (kind, media_id, season, episode, normalized_title) in watched_episodes for kind, media_id in media_ids
+                    )
+                if watched:
+                    skip_stats['already_watched'] += 1
+                    items_skipped += 1
+                    continue
 
             # Continue with existing checks
             if item_type == 'movie':
@@ -398,6 +417,14 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
             filtered_media_items_batch.append(item)
 
         media_items_batch = filtered_media_items_batch
+        end_phase('filter')
+
+        blacklist = get_manual_blacklist()
+        allow_partial_requests = get_setting('Debug', 'allow_partial_overseerr_requests')
+        # Rows are keyed like the existing-items lookup, so an item listed twice in a batch is only inserted once
+        movie_rows = {}
+        episode_rows = {}
+        show_titles = {}
 
         for item in media_items_batch:
             if not item.get('imdb_id') and not item.get('tmdb_id'):
@@ -408,8 +435,8 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
             # Check for blacklisting, considering season number for TV shows
             season_number = item.get('season_number')
             is_item_blacklisted = (
-                is_blacklisted(item.get('imdb_id', ''), season_number) or 
-                is_blacklisted(item.get('tmdb_id', ''), season_number)
+                is_blacklisted(item.get('imdb_id', ''), season_number, blacklist) or 
+                is_blacklisted(item.get('tmdb_id', ''), season_number, blacklist)
             )
             if is_item_blacklisted:
                 skip_stats['blacklisted'] += 1
@@ -430,50 +457,60 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
 
             # Use the item-specific versions if they exist, otherwise use the original versions
             versions_to_use = item.get('versions_to_add', versions)
+            media_id = item.get('imdb_id') or item.get('tmdb_id')
             for version, enabled in versions_to_use.items():
                 if not enabled:
                     continue
 
                 if item_type == 'movie':
-                    conn.execute('''
-                        INSERT INTO media_items
-                        (imdb_id, tmdb_id, title, year, release_date, state, type, last_updated, version, genres, runtime, country, content_source, content_source_detail, physical_release_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+                    movie_rows.setdefault((media_id, version), (
                         item.get('imdb_id'), item.get('tmdb_id'), normalized_title, item.get('year'),
                         item.get('release_date'), 'Wanted', 'movie', datetime.now(), version, genres, item.get('runtime'), item.get('country', '').lower(), item.get('content_source'), item.get('content_source_detail'), item.get('physical_release_date')
                     ))
-                    items_added += 1
                 else:
-                    # Check if we need to update the show title for all related records
-                    update_show_title(conn, item.get('imdb_id'), item.get('tmdb_id'), item.get('title'))
+                    # The show title only needs checking once per show, not once per episode and version
+                    show_titles[(item.get('imdb_id'), item.get('tmdb_id'))] = item.get('title')
                     
                     airtime = item.get('airtime') or '19:00'
-                    
-                    from settings import get_setting
 
-                    if get_setting('Debug', 'allow_partial_overseerr_requests'):
+                    if allow_partial_requests:
                         initial_state = 'Wanted' if item.get('is_requested_season', True) else 'Blacklisted'
                     else:
                         initial_state = 'Wanted'
                     blacklisted_date = datetime.now(timezone.utc) if initial_state == 'Blacklisted' else None
 
-                    conn.execute('''
-                        INSERT INTO media_items
-                        (imdb_id, tmdb_id, title, year, release_date, state, type, season_number, episode_number, 
-                         episode_title, last_updated, version, runtime, airtime, genres, country, blacklisted_date,
-                         requested_season, content_source, content_source_detail)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+                    episode_rows.setdefault((media_id, item['season_number'], item['episode_number'], version), (
                         item.get('imdb_id'), item.get('tmdb_id'), normalized_title, item.get('year'),
                         item.get('release_date'), initial_state, 'episode',
                         item['season_number'], item['episode_number'], item.get('episode_title', ''),
                         datetime.now(), version, item.get('runtime'), airtime, genres, item.get('country', '').lower(),
                         blacklisted_date, item.get('requested_season', False), item.get('content_source'), item.get('content_source_detail')
                     ))
-                    items_added += 1
+        end_phase('build_rows')
+
+        for (show_imdb_id, show_tmdb_id), title in show_titles.items():
+            # Check if we need to update the show title for all related records
+            if update_show_title(conn, show_imdb_id, show_tmdb_id, title):
+                items_updated += 1
+
+        if movie_rows:
+            conn.executemany('''
+                INSERT INTO media_items
+                (imdb_id, tmdb_id, title, year, release_date, state, type, last_updated, version, genres, runtime, country, content_source, content_source_detail, physical_release_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', list(movie_rows.values()))
+        if episode_rows:
+            conn.executemany('''
+                INSERT INTO media_items
+                (imdb_id, tmdb_id, title, year, release_date, state, type, season_number, episode_number, 
+                 episode_title, last_updated, version, runtime, airtime, genres, country, blacklisted_date,
+                 requested_season, content_source, content_source_detail)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', list(episode_rows.values()))
+        items_added += len(movie_rows) + len(episode_rows)
 
         conn.commit()
+        end_phase('write')
         
         # Generate skip summary report
         skip_report = []
@@ -528,6 +565,7 @@ def add_wanted_items(media_items_batch: List[Dict[str, Any]], versions_input):
         if skip_report:
             logging.info("Wanted items processing complete. Skip summary:\n" + "\n".join(skip_report))
         logging.info(f"Final stats - Added: {items_added}, Updated: {items_updated}, Total Skipped: {items_skipped}")
+        logging.info("Wanted items timings - " + ", ".join(f"{phase}: {ms:.0f}ms" for phase, ms in timings.items()))
     except Exception as e:
         logging.error(f"Error adding wanted items: {str(e)}", exc_info=True)
         conn.rollback()
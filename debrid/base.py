@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Union, Tuple
+from typing import Iterable, List, Dict, Optional, Union, Tuple
 from .common import RateLimiter, timed_lru_cache
 from .status import TorrentStatus
 import hashlib
@@ -106,18 +106,19 @@ class DebridProvider(ABC):
     supports_uncached = _p3
     
     @abstractmethod
-    def add_torrent(self, magnet_link: str, temp_file_path: Optional[str] = None) -> str:
-        """Add a torrent/magnet link to the debrid service"""
+    def add_torrent(self, magnet_link: str, temp_file_path: Optional[str] = None, torrent_data: Optional[bytes] = None) -> str:
+        """Add a torrent/magnet link to the debrid service, or a torrent file by path or contents"""
         pass
     
     @abstractmethod
-    def is_cached(self, magnet_or_url: Union[str, List[str]], temp_file_path: Optional[str] = None) -> Union[bool, Dict[str, Optional[bool]]]:
+    def is_cached(self, magnet_or_url: Union[str, List[str]], temp_file_path: Optional[str] = None, torrent_data: Optional[bytes] = None) -> Union[bool, Dict[str, Optional[bool]]]:
         """
         Check if a magnet link or torrent file is cached on the service.
         
         Args:
             magnet_or_url: Magnet link, hash, or URL to check
             temp_file_path: Optional path to torrent file
+            torrent_data: Optional contents of a torrent file, used instead of temp_file_path
             
         Returns:
             - For single input: bool or None (error)
@@ -139,7 +140,14 @@ class DebridProvider(ABC):
     def get_torrent_info(self, torrent_id: str) -> Optional[Dict]:
         """Get information about a specific torrent"""
         pass
-        
+
+    def get_torrents_status(self, torrent_ids: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Get information about several torrents, None for ones that no longer exist.
+        Providers with a listing endpoint override this to answer from one listing.
+        """
+        return {torrent_id: self.get_torrent_info(torrent_id) for torrent_id in dict.fromkeys(torrent_ids) if torrent_id}
+
     @abstractmethod
     def remove_torrent(self, torrent_id: str) -> None:
         """Remove a torrent from the service"""
@@ -2,7 +2,9 @@ from .torrent import (
     torrent_to_magnet,
     download_and_extract_hash,
     download_and_convert_to_magnet,
-    extract_hash_from_file
+    extract_hash_from_file,
+    extract_hash_from_data,
+    fetch_torrent_file
 )
 from .utils import (
     extract_hash_from_magnet,
@@ -18,6 +20,8 @@ __all__ = [
     'download_and_convert_to_magnet',
     'extract_hash_from_magnet',
     'extract_hash_from_file',
+    'extract_hash_from_data',
+    'fetch_torrent_file',
     'RateLimiter',
     'timed_lru_cache',
     'is_video_file',
@@ -0,0 +1,138 @@
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from settings import get_setting
+from utilities.sqlite_store import SQLiteStore
+
+CACHED = 'cached'
+UNCACHED = 'uncached'
+INVALID = 'invalid'
+
+DEFAULT_POSITIVE_TTL_HOURS = 24
+DEFAULT_NEGATIVE_TTL_HOURS = 6
+# Expired rows are purged once every this many writes
+PURGE_INTERVAL = 100
+
+class CacheStatusStore(SQLiteStore):
+    """
+    Persistent info hash -> cache status store shared by cache checks, so a release
+    that shows up again (another version, the hourly scrape, a restart) is answered
+    without adding it to the debrid account.
+
+    Cached results stay valid for the positive TTL; uncached and invalid results
+    for the shorter negative TTL, since uncached torrents become cached over time.
+    """
+
+    DB_FILENAME = 'cache_status.db'
+    STATS = ('hits', 'misses', 'stores')
+
+    def __init__(self, db_path: Optional[str] = None):
+        super().__init__(db_path)
+        self._writes_since_purge = 0
+
+    def _create_schema(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_status (
+                provider TEXT NOT NULL,
+                info_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                filename TEXT,
+                files TEXT,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (provider, info_hash)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_status_checked_at ON cache_status(checked_at)')
+
+    @staticmethod
+    def _get_hours(key: str, default: float) -> float:
+        try:
+            return float(get_setting('Debrid Provider', key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_ttl_seconds(self, status: str) -> float:
+        if status == CACHED:
+            return self._get_hours('cache_status_positive_ttl_hours', DEFAULT_POSITIVE_TTL_HOURS) * 3600
+        return self._get_hours('cache_status_negative_ttl_hours', DEFAULT_NEGATIVE_TTL_HOURS) * 3600
+
+    def get(self, provider: str, info_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the fresh entry for info_hash (status, filename, files, checked_at), or None"""
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT status, filename, files, checked_at FROM cache_status WHERE provider = ? AND info_hash = ?',
+                (provider, info_hash.lower())
+            ).fetchone()
+            if row is None or time.time() - row['checked_at'] >= self.get_ttl_seconds(row['status']):
+                self._count('misses')
+                return None
+            self._count('hits')
+            return {
+                'status': row['status'],
+                'filename': row['filename'],
+                'files': json.loads(row['files']) if row['files'] else [],
+                'checked_at': row['checked_at'],
+            }
+        except Exception as e:
+            logging.error(f"Error reading cache status for {info_hash}: {str(e)}")
+            self._count('misses')
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def put(self, provider: str, info_hash: str, status: str, filename: Optional[str] = None, files: Optional[List[Dict[str, Any]]] = None):
+        conn = None
+        try:
+            conn = self._connect()
+            conn.execute('''
+                INSERT OR REPLACE INTO cache_status (provider, info_hash, status, filename, files, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (provider, info_hash.lower(), status, filename, json.dumps(files or []), time.time()))
+            self._writes_since_purge += 1
+            if self._writes_since_purge >= PURGE_INTERVAL:
+                self._writes_since_purge = 0
+                self._purge_expired(conn)
+            conn.commit()
+            self._count('stores')
+        except Exception as e:
+            logging.error(f"Error writing cache status for {info_hash}: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _purge_expired(self, conn):
+        now = time.time()
+        conn.execute('DELETE FROM cache_status WHERE status = ? AND checked_at <= ?', (CACHED, now - self.get_ttl_seconds(CACHED)))
+        conn.execute('DELETE FROM cache_status WHERE status != ? AND checked_at <= ?', (CACHED, now - self.get_ttl_seconds(UNCACHED)))
+
+    def invalidate(self, provider: Optional[str] = None, info_hash: Optional[str] = None) -> int:
+        """Forget a hash (for one provider or all of them), everything for a provider, or everything"""
+        conn = None
+        try:
+            conn = self._connect()
+            if info_hash and provider:
+                removed = conn.execute('DELETE FROM cache_status WHERE provider = ? AND info_hash = ?', (provider, info_hash.lower())).rowcount
+            elif info_hash:
+                removed = conn.execute('DELETE FROM cache_status WHERE info_hash = ?', (info_hash.lower(),)).rowcount
+            elif provider:
+                removed = conn.execute('DELETE FROM cache_status WHERE provider = ?', (provider,)).rowcount
+            else:
+                removed = conn.execute('DELETE FROM cache_status').rowcount
+            conn.commit()
+            return removed
+        except Exception as e:
+            logging.error(f"Error clearing cache status store: {str(e)}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any]):
+        stats['entries'] = {row['status']: row['count'] for row in conn.execute('SELECT status, COUNT(*) AS count FROM cache_status GROUP BY status')}
+
+cache_status_store = CacheStatusStore()
@@ -1,8 +1,7 @@
 import hashlib
-import tempfile
-import os
 import logging
-import requests
+from api_tracker import api
+from .torrent_cache import torrent_file_cache
 import bencodepy
 from typing import Optional, Tuple
 from urllib.parse import urlencode
@@ -13,9 +12,19 @@ def torrent_to_magnet(file_path: str) -> Optional[str]:
     Returns None if conversion fails.
     """
     try:
-        # Read and decode the torrent file
         with open(file_path, 'rb') as f:
-            torrent_data = bencodepy.decode(f.read())
+            return torrent_data_to_magnet(f.read())
+    except Exception as e:
+        logging.error(f"Error converting torrent to magnet: {str(e)}")
+        return None
+
+def torrent_data_to_magnet(data: bytes) -> Optional[str]:
+    """
+    Convert the contents of a torrent file to a magnet link.
+    Returns None if conversion fails.
+    """
+    try:
+        torrent_data = bencodepy.decode(data)
         info = torrent_data[b'info']
         
         # Calculate the info hash
@@ -65,59 +74,49 @@ def torrent_to_magnet(file_path: str) -> Optional[str]:
         logging.error(f"Error converting torrent to magnet: {str(e)}")
         return None
 
+def extract_hash_from_data(data: bytes) -> Optional[str]:
+    """Info hash of a torrent file's contents, or None if they can't be decoded"""
+    try:
+        info = bencodepy.decode(data)[b'info']
+        return hashlib.sha1(bencodepy.encode(info)).hexdigest()
+    except Exception as e:
+        logging.error(f"Error extracting hash from torrent data: {str(e)}")
+        return None
+
+def fetch_torrent_file(url: str) -> Optional[Tuple[str, bytes]]:
+    """
+    Get a .torrent file by URL, from the torrent file cache if it was downloaded before.
+
+    Returns:
+        (info_hash, torrent bytes), or None if the download failed or isn't a valid torrent
+    """
+    cached = torrent_file_cache.get_by_url(url)
+    if cached:
+        return cached
+    try:
+        response = api.get(url, timeout=30)
+    except Exception as e:
+        logging.error(f"Failed to download torrent file: {str(e)}")
+        return None
+    data = response.content
+    info_hash = extract_hash_from_data(data)
+    if not info_hash:
+        return None
+    torrent_file_cache.put(url, info_hash, data)
+    return info_hash, data
+
 def download_and_extract_hash(url: str) -> Optional[str]:
     """Download a torrent file and extract its hash"""
-    with tempfile.NamedTemporaryFile(suffix='.torrent', delete=False) as temp_file:
-        try:
-            # Download the torrent file
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            temp_file.write(response.content)
-            temp_file.flush()
-            
-            # Extract hash from the torrent file
-            with open(temp_file.name, 'rb') as f:
-                torrent_data = bencodepy.decode(f.read())
-            info = torrent_data[b'info']
-            return hashlib.sha1(bencodepy.encode(info)).hexdigest()
-        except Exception as e:
-            logging.error(f"Error extracting hash from torrent: {str(e)}")
-            return None
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_file.name)
-            except Exception as e:
-                logging.error(f"Error cleaning up temporary file: {str(e)}")
+    fetched = fetch_torrent_file(url)
+    return fetched[0] if fetched else None
 
 def download_and_convert_to_magnet(url: str) -> Optional[str]:
     """
     Download a torrent file from a URL and convert it to a magnet link.
     Returns None if the download or conversion fails.
     """
-    with tempfile.NamedTemporaryFile(suffix='.torrent', delete=False) as temp_file:
-        try:
-            # Download the torrent file
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            temp_file.write(response.content)
-            temp_file.flush()
-        
-            # Convert to magnet
-            return torrent_to_magnet(temp_file.name)
-            
-        except Exception as e:
-            logging.error(f"Error converting torrent to magnet: {str(e)}")
-            return None
-            
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_file.name)
-            except Exception as e:
-                logging.error(f"Error cleaning up temporary file: {str(e)}")
+    fetched = fetch_torrent_file(url)
+    return torrent_data_to_magnet(fetched[1]) if fetched else None
 
 def extract_hash_from_file(file_path: str) -> Optional[str]:
     """
@@ -131,9 +130,7 @@ def extract_hash_from_file(file_path: str) -> Optional[str]:
     """
     try:
         with open(file_path, 'rb') as f:
-            torrent_data = bencodepy.decode(f.read())
-        info = torrent_data[b'info']
-        return hashlib.sha1(bencodepy.encode(info)).hexdigest()
+            return extract_hash_from_data(f.read())
     except Exception as e:
         logging.error(f"Error extracting hash from torrent file: {str(e)}")
         return None
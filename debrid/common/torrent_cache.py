@@ -0,0 +1,149 @@
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from settings import get_setting
+from utilities.sqlite_store import SQLiteStore
+
+DEFAULT_MAX_SIZE_MB = 200
+
+class TorrentFileCache(SQLiteStore):
+    """
+    Content-addressed on-disk store of downloaded .torrent files. Download URLs map
+    to an info hash and each info hash is stored once, so the same release linked
+    from several indexers or scrapes is downloaded and hashed a single time.
+
+    The store is bounded by size; least recently used files are evicted first.
+    """
+
+    DB_FILENAME = 'torrent_cache.db'
+    STATS = ('hits', 'misses', 'stores', 'evictions')
+
+    def _create_schema(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS torrent_files (
+                info_hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                added_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS torrent_urls (
+                url TEXT PRIMARY KEY,
+                info_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_torrent_files_last_access ON torrent_files(last_access)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_torrent_urls_info_hash ON torrent_urls(info_hash)')
+
+    @staticmethod
+    def get_max_size_bytes() -> int:
+        try:
+            return int(float(get_setting('Debrid Provider', 'torrent_file_cache_max_size_mb', DEFAULT_MAX_SIZE_MB)) * 1024 * 1024)
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_SIZE_MB * 1024 * 1024
+
+    def get_by_url(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """Return (info_hash, torrent bytes) previously downloaded from url, or None"""
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute('''
+                SELECT f.info_hash, f.data FROM torrent_urls u
+                JOIN torrent_files f ON f.info_hash = u.info_hash
+                WHERE u.url = ?
+            ''', (url,)).fetchone()
+            if row is None:
+                self._count('misses')
+                return None
+            conn.execute('UPDATE torrent_files SET last_access = ? WHERE info_hash = ?', (time.time(), row['info_hash']))
+            conn.commit()
+            self._count('hits')
+            return row['info_hash'], bytes(row['data'])
+        except Exception as e:
+            logging.error(f"Error reading torrent file cache: {str(e)}")
+            self._count('misses')
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def get_by_hash(self, info_hash: str) -> Optional[bytes]:
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT data FROM torrent_files WHERE info_hash = ?', (info_hash.lower(),)).fetchone()
+            return bytes(row['data']) if row else None
+        except Exception as e:
+            logging.error(f"Error reading torrent file cache: {str(e)}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def put(self, url: str, info_hash: str, data: bytes):
+        info_hash = info_hash.lower()
+        conn = None
+        try:
+            now = time.time()
+            conn = self._connect()
+            conn.execute('''
+                INSERT INTO torrent_files (info_hash, data, size_bytes, added_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(info_hash) DO UPDATE SET last_access = excluded.last_access
+            ''', (info_hash, data, len(data), now, now))
+            conn.execute('INSERT OR REPLACE INTO torrent_urls (url, info_hash, fetched_at) VALUES (?, ?, ?)', (url, info_hash, now))
+            conn.commit()
+            self._count('stores')
+            self._evict(conn)
+        except Exception as e:
+            logging.error(f"Error writing torrent file cache: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _evict(self, conn):
+        """Drop least recently used files, and the URLs pointing at them, until the store fits its budget"""
+        max_size = self.get_max_size_bytes()
+        total = conn.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM torrent_files').fetchone()[0]
+        if total <= max_size:
+            return
+        # Trim to 90% so we don't evict on every store once full
+        target = max_size * 0.9
+        stale = []
+        for row in conn.execute('SELECT info_hash, size_bytes FROM torrent_files ORDER BY last_access'):
+            if total <= target:
+                break
+            stale.append((row['info_hash'],))
+            total -= row['size_bytes']
+        conn.executemany('DELETE FROM torrent_files WHERE info_hash = ?', stale)
+        conn.executemany('DELETE FROM torrent_urls WHERE info_hash = ?', stale)
+        conn.commit()
+        self._count('evictions', len(stale))
+
+    def clear(self) -> int:
+        conn = None
+        try:
+            conn = self._connect()
+            removed = conn.execute('DELETE FROM torrent_files').rowcount
+            conn.execute('DELETE FROM torrent_urls')
+            conn.commit()
+            return removed
+        except Exception as e:
+            logging.error(f"Error clearing torrent file cache: {str(e)}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any]):
+        stats['max_size_bytes'] = self.get_max_size_bytes()
+        row = conn.execute('SELECT COUNT(*) AS files, COALESCE(SUM(size_bytes), 0) AS size_bytes FROM torrent_files').fetchone()
+        stats['files'] = row['files']
+        stats['size_bytes'] = row['size_bytes']
+        stats['urls'] = conn.execute('SELECT COUNT(*) FROM torrent_urls').fetchone()[0]
+
+torrent_file_cache = TorrentFileCache()
@@ -1,23 +1,24 @@
 import logging
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Dict, Iterable, List, Optional, Union, Tuple
 from datetime import datetime, timedelta
 import tempfile
 import os
 import time
+import threading
 from urllib.parse import unquote
-import hashlib
-import bencodepy
 import inspect
 
 from ..base import DebridProvider, TooManyDownloadsError, ProviderUnavailableError, TorrentAdditionError
 from ..common import (
     extract_hash_from_magnet,
+    extract_hash_from_data,
     download_and_extract_hash,
     timed_lru_cache,
     torrent_to_magnet,
     is_video_file,
     is_unwanted_file
 )
+from ..common.cache_status import cache_status_store, CACHED, UNCACHED, INVALID
 from ..status import TorrentStatus
 from .api import make_request
 from not_wanted_magnets import add_to_not_wanted, add_to_not_wanted_urls
@@ -27,12 +28,19 @@ class RealDebridProvider(DebridProvider):
     
     API_BASE_URL = "https://api.real-debrid.com/rest/1.0"
     MAX_DOWNLOADS = 25
+    CACHE_STATUS_PROVIDER = "real_debrid"
+    # Page size for the /torrents listing (the API allows up to 5000)
+    TORRENT_LIST_PAGE_SIZE = 1000
+    # How long one listing of the account is shared between callers
+    TORRENT_SNAPSHOT_SECONDS = 30
     
     def __init__(self):
         super().__init__()
         self._cached_torrent_ids = {}  # Store torrent IDs for cached content
         self._cached_torrent_titles = {}  # Store torrent titles for cached content
         self._all_torrent_ids = {}  # Store all torrent IDs for tracking
+        self._torrent_snapshot = None  # (taken_at, {torrent_id: listing entry})
+        self._torrent_snapshot_lock = threading.Lock()
         
     def _load_api_key(self) -> str:
         """Load API key from settings"""
@@ -42,7 +50,7 @@ class RealDebridProvider(DebridProvider):
         except Exception as e:
             raise ProviderUnavailableError(f"Failed to load API key: {str(e)}")
 
-    def is_cached(self, magnet_links: Union[str, List[str]], temp_file_path: Optional[str] = None, result_title: Optional[str] = None, result_index: Optional[str] = None, remove_uncached: bool = True) -> Union[bool, Dict[str, bool], None]:
+    def is_cached(self, magnet_links: Union[str, List[str]], temp_file_path: Optional[str] = None, result_title: Optional[str] = None, result_index: Optional[str] = None, remove_uncached: bool = True, torrent_data: Optional[bytes] = None) -> Union[bool, Dict[str, bool], None]:
         """
         Check if one or more magnet links or torrent files are cached on Real-Debrid.
         If a single input is provided, returns a boolean or None (for error).
@@ -54,6 +62,7 @@ class RealDebridProvider(DebridProvider):
             result_title: Optional title of the result being checked (for logging)
             result_index: Optional index of the result in the list (for logging)
             remove_uncached: Whether to remove uncached torrents after checking (default: True)
+            torrent_data: Optional contents of a torrent file, used instead of temp_file_path
             
         Returns:
             - True: Torrent is cached
@@ -72,6 +81,13 @@ class RealDebridProvider(DebridProvider):
         logging.debug(f"{log_prefix} Starting cache check for {len([magnet_links] if isinstance(magnet_links, str) else magnet_links)} magnet(s)")
         logging.debug(f"{log_prefix} Temp file path: {temp_file_path}")
         
+        if temp_file_path and torrent_data is None:
+            try:
+                with open(temp_file_path, 'rb') as f:
+                    torrent_data = f.read()
+            except Exception as e:
+                logging.error(f"{log_prefix} Could not read torrent file: {str(e)}")
+
         # If single magnet link, convert to list
         if isinstance(magnet_links, str):
             magnet_links = [magnet_links]
@@ -89,16 +105,13 @@ class RealDebridProvider(DebridProvider):
             # Extract hash at the beginning to ensure it's always available
             hash_value = None
             
-            # Prioritize temp files over magnet links
-            if temp_file_path:
-                try:
-                    with open(temp_file_path, 'rb') as f:
-                        torrent_data = bencodepy.decode(f.read())
-                        info = torrent_data[b'info']
-                        hash_value = hashlib.sha1(bencodepy.encode(info)).hexdigest()
-                        magnet_link = None  # Clear magnet link if we have a valid temp file
-                except Exception as e:
-                    logging.error(f"{log_prefix} Could not extract hash from torrent file: {str(e)}")
+            # Prioritize torrent files over magnet links
+            if torrent_data:
+                hash_value = extract_hash_from_data(torrent_data)
+                if hash_value:
+                    magnet_link = None  # Clear magnet link if we have a valid torrent file
+                else:
+                    logging.error(f"{log_prefix} Could not extract hash from torrent file")
             elif magnet_link and magnet_link.startswith('magnet:'):
                 hash_value = extract_hash_from_magnet(magnet_link)
             elif magnet_link and len(magnet_link) == 40 and all(c in '0123456789abcdefABCDEF' for c in magnet_link):
@@ -115,12 +128,19 @@ class RealDebridProvider(DebridProvider):
                 continue
                 
             logging.debug(f"{log_prefix} Extracted hash: {hash_value}")
+
+            # A recent answer for this hash saves adding, polling and removing the torrent
+            stored = cache_status_store.get(self.CACHE_STATUS_PROVIDER, hash_value)
+            if stored:
+                logging.info(f"{log_prefix} Cache status from store: {stored['status']} (checked {int(time.time() - stored['checked_at'])}s ago)")
+                results[hash_value] = None if stored['status'] == INVALID else stored['status'] == CACHED
+                continue
             
             torrent_id = None
             try:
                 # Add the magnet/torrent to RD
                 logging.info(f"{log_prefix} PHASE: Addition - Adding to Real-Debrid for cache check")
-                torrent_id = self.add_torrent(magnet_link if magnet_link and magnet_link.startswith('magnet:') else None, temp_file_path)
+                torrent_id = self.add_torrent(magnet_link if magnet_link and magnet_link.startswith('magnet:') else None, torrent_data=torrent_data)
                 
                 if not torrent_id:
                     # If add_torrent returns None, the torrent might already be added
@@ -128,8 +148,8 @@ class RealDebridProvider(DebridProvider):
                     if hash_value:
                         logging.info(f"{log_prefix} PHASE: Lookup - Checking for existing torrent")
                         # Search for existing torrent with this hash
-                        torrents = make_request('GET', '/torrents', self.api_key) or []
-                        for torrent in torrents:
+                        self.invalidate_torrent_snapshot()
+                        for torrent in self.list_active_torrents():
                             if torrent.get('hash', '').lower() == hash_value.lower():
                                 torrent_id = torrent['id']
                                 logging.info(f"{log_prefix} Found existing torrent with ID {torrent_id}")
@@ -160,6 +180,7 @@ class RealDebridProvider(DebridProvider):
                 # Handle error statuses
                 if status in ['magnet_error', 'error', 'virus', 'dead']:
                     logging.error(f"{log_prefix} Torrent has error status: {status}")
+                    cache_status_store.put(self.CACHE_STATUS_PROVIDER, hash_value, INVALID, info.get('filename'))
                     try:
                         add_to_not_wanted(hash_value)
                         self.remove_torrent(torrent_id, f"Torrent has error status: {status}")
@@ -174,6 +195,7 @@ class RealDebridProvider(DebridProvider):
                 if not video_files:
                     logging.error(f"{log_prefix} No video files found in torrent")
                     self.update_status(torrent_id, TorrentStatus.ERROR)
+                    cache_status_store.put(self.CACHE_STATUS_PROVIDER, hash_value, INVALID, info.get('filename'))
                     try:
                         add_to_not_wanted(hash_value)
                         self.remove_torrent(torrent_id, "No video files found in torrent")
@@ -185,6 +207,10 @@ class RealDebridProvider(DebridProvider):
                 
                 is_cached = status == 'downloaded'
                 logging.info(f"{log_prefix} Cache status: {'Cached' if is_cached else 'Not cached'}")
+                cache_status_store.put(
+                    self.CACHE_STATUS_PROVIDER, hash_value, CACHED if is_cached else UNCACHED, info.get('filename'),
+                    [{'path': f.get('path', ''), 'bytes': f.get('bytes', 0)} for f in info.get('files', [])]
+                )
                 
                 # Update status tracking
                 self.update_status(
@@ -244,25 +270,82 @@ class RealDebridProvider(DebridProvider):
 
     def list_active_torrents(self) -> List[Dict]:
         """List all active torrents"""
-        from .torrent import list_active_torrents
-        return list_active_torrents(self.api_key)
+        return list(self.get_torrents_snapshot().values())
+
+    def _list_all_torrents(self) -> List[Dict]:
+        """Page through /torrents until a short page"""
+        torrents = []
+        page = 1
+        while True:
+            batch = make_request('GET', '/torrents', self.api_key,
+                                 params={'page': page, 'limit': self.TORRENT_LIST_PAGE_SIZE})
+            if not isinstance(batch, list):
+                break
+            torrents.extend(batch)
+            if len(batch) < self.TORRENT_LIST_PAGE_SIZE:
+                break
+            page += 1
+        return torrents
 
-    def add_torrent(self, magnet_link: Optional[str], temp_file_path: Optional[str] = None) -> Optional[str]:
-        """Add a torrent to Real-Debrid"""
+    def get_torrents_snapshot(self) -> Dict[str, Dict]:
+        """
+        Every torrent on the account keyed by ID, from a listing shared for
+        TORRENT_SNAPSHOT_SECONDS. Concurrent callers wait for a single listing.
+        """
+        with self._torrent_snapshot_lock:
+            if self._torrent_snapshot and time.time() - self._torrent_snapshot[0] < self.TORRENT_SNAPSHOT_SECONDS:
+                return self._torrent_snapshot[1]
+            torrents = {torrent['id']: torrent for torrent in self._list_all_torrents() if torrent.get('id')}
+            self._torrent_snapshot = (time.time(), torrents)
+            logging.debug(f"Listed {len(torrents)} torrents on Real-Debrid")
+            return torrents
+
+    def invalidate_torrent_snapshot(self) -> None:
+        with self._torrent_snapshot_lock:
+            self._torrent_snapshot = None
+
+    def get_torrents_status(self, torrent_ids: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Get the listing entry (id, hash, filename, status, progress, ...) for each torrent from
+        the shared snapshot. Torrents missing from it are looked up with get_torrent_info, so a
+        torrent added since the snapshot isn't reported as gone; None means it no longer exists.
+        """
+        torrent_ids = [torrent_id for torrent_id in dict.fromkeys(torrent_ids) if torrent_id]
+        if not torrent_ids:
+            return {}
+        try:
+            snapshot = self.get_torrents_snapshot()
+        except Exception as e:
+            logging.error(f"Error listing torrents, falling back to individual lookups: {str(e)}")
+            snapshot = {}
+
+        statuses = {}
+        for torrent_id in torrent_ids:
+            torrent = snapshot.get(torrent_id)
+            if torrent is None:
+                statuses[torrent_id] = self.get_torrent_info(torrent_id)
+            else:
+                self._track_status(torrent_id, torrent)
+                statuses[torrent_id] = torrent
+        return statuses
+
+    def add_torrent(self, magnet_link: Optional[str], temp_file_path: Optional[str] = None, torrent_data: Optional[bytes] = None) -> Optional[str]:
+        """Add a torrent to Real-Debrid, from a magnet link or a torrent file's path or contents"""
         try:
+            if temp_file_path and torrent_data is None:
+                if not os.path.exists(temp_file_path):
+                    logging.error(f"Temp file does not exist: {temp_file_path}")
+                    raise ValueError(f"Temp file does not exist: {temp_file_path}")
+                with open(temp_file_path, 'rb') as f:
+                    torrent_data = f.read()
+
             # Extract hash value at the beginning
             hash_value = None
             
-            # Prioritize temp files over magnet links for hash extraction
-            if temp_file_path:
-                try:
-                    with open(temp_file_path, 'rb') as f:
-                        torrent_data = bencodepy.decode(f.read())
-                        info = torrent_data[b'info']
-                        hash_value = hashlib.sha1(bencodepy.encode(info)).hexdigest()
-                        magnet_link = None  # Clear magnet link if we have a valid temp file
-                except Exception as e:
-                    logging.error(f"Could not extract hash from torrent file: {str(e)}")
+            # Prioritize torrent files over magnet links for hash extraction
+            if torrent_data:
+                hash_value = extract_hash_from_data(torrent_data)
+                magnet_link = None  # Upload the torrent file rather than the magnet link
             elif magnet_link:
                 hash_value = extract_hash_from_magnet(magnet_link)
             
@@ -270,15 +353,9 @@ class RealDebridProvider(DebridProvider):
                 logging.error("Could not extract hash from magnet link or torrent file")
             
             # Handle torrent file upload
-            if temp_file_path:
-                if not os.path.exists(temp_file_path):
-                    logging.error(f"Temp file does not exist: {temp_file_path}")
-                    raise ValueError(f"Temp file does not exist: {temp_file_path}")
-                    
-                # Add the torrent file directly
-                with open(temp_file_path, 'rb') as f:
-                    file_content = f.read()
-                    result = make_request('PUT', '/torrents/addTorrent', self.api_key, data=file_content)
+            if torrent_data:
+                # Add the torrent file directly from memory
+                result = make_request('PUT', '/torrents/addTorrent', self.api_key, data=torrent_data)
             # Handle magnet link only if no temp file was used
             elif magnet_link:
                 # URL decode the magnet link if needed
@@ -287,8 +364,7 @@ class RealDebridProvider(DebridProvider):
 
                 # Check if torrent already exists
                 if hash_value:
-                    torrents = make_request('GET', '/torrents', self.api_key) or []
-                    for torrent in torrents:
+                    for torrent in self.get_torrents_snapshot().values():
                         if torrent.get('hash', '').lower() == hash_value.lower():
                             logging.info(f"Torrent already exists with ID {torrent['id']}")
                             # Cache the filename for existing torrent
@@ -299,14 +375,15 @@ class RealDebridProvider(DebridProvider):
                 data = {'magnet': magnet_link}
                 result = make_request('POST', '/torrents/addMagnet', self.api_key, data=data)
             else:
-                logging.error("Neither magnet_link nor temp_file_path provided")
-                raise ValueError("Either magnet_link or temp_file_path must be provided")
+                logging.error("Neither magnet_link nor a torrent file provided")
+                raise ValueError("Either magnet_link, temp_file_path or torrent_data must be provided")
 
             if not result or 'id' not in result:
                 logging.error(f"Failed to add torrent - response: {result}")
                 raise TorrentAdditionError(f"Failed to add torrent - response: {result}")
                 
             torrent_id = result['id']
+            self.invalidate_torrent_snapshot()
             
             # Wait for files to be available
             max_attempts = 30  # Increase timeout to 30 seconds
@@ -537,26 +614,7 @@ class RealDebridProvider(DebridProvider):
             
             # Update status based on response
             if info:
-                status = info.get('status', '')
-                hash_value = info.get('hash', '').lower()
-                
-                # Update torrent tracking status
-                from database.torrent_tracking import mark_torrent_removed
-                
-                if status == 'downloaded':
-                    self.update_status(torrent_id, TorrentStatus.CACHED)
-                elif status == 'downloading':
-                    self.update_status(torrent_id, TorrentStatus.DOWNLOADING)
-                elif status == 'waiting_files_selection':
-                    self.update_status(torrent_id, TorrentStatus.SELECTING)
-                elif status == 'magnet_error':
-                    self.update_status(torrent_id, TorrentStatus.ERROR)
-                    if hash_value:
-                        mark_torrent_removed(hash_value, f"Magnet error: {info.get('filename', '')}")
-                elif status == 'error':
-                    self.update_status(torrent_id, TorrentStatus.ERROR)
-                    if hash_value:
-                        mark_torrent_removed(hash_value, f"Torrent error: {info.get('filename', '')}")
+                self._track_status(torrent_id, info)
                     
             return info
             
@@ -575,6 +633,29 @@ class RealDebridProvider(DebridProvider):
                 self.update_status(torrent_id, TorrentStatus.ERROR)
             return None
 
+    def _track_status(self, torrent_id: str, info: Dict) -> None:
+        """Update status tracking from a torrent's info or listing entry"""
+        status = info.get('status', '')
+        hash_value = info.get('hash', '').lower()
+        
+        # Update torrent tracking status
+        from database.torrent_tracking import mark_torrent_removed
+        
+        if status == 'downloaded':
+            self.update_status(torrent_id, TorrentStatus.CACHED)
+        elif status == 'downloading':
+            self.update_status(torrent_id, TorrentStatus.DOWNLOADING)
+        elif status == 'waiting_files_selection':
+            self.update_status(torrent_id, TorrentStatus.SELECTING)
+        elif status == 'magnet_error':
+            self.update_status(torrent_id, TorrentStatus.ERROR)
+            if hash_value:
+                mark_torrent_removed(hash_value, f"Magnet error: {info.get('filename', '')}")
+        elif status == 'error':
+            self.update_status(torrent_id, TorrentStatus.ERROR)
+            if hash_value:
+                mark_torrent_removed(hash_value, f"Torrent error: {info.get('filename', '')}")
+
     def verify_torrent_presence(self, hash_value: str = None) -> bool:
         """
         Verify if a torrent is still present in Real-Debrid.
@@ -588,7 +669,8 @@ class RealDebridProvider(DebridProvider):
         """
         try:
             # Get all active torrents from Real-Debrid
-            active_torrents = make_request('GET', '/torrents', self.api_key) or []
+            self.invalidate_torrent_snapshot()
+            active_torrents = self.list_active_torrents()
             active_hashes = {t['hash'].lower(): t['id'] for t in active_torrents}
             
             from database.torrent_tracking import mark_torrent_removed
@@ -624,7 +706,7 @@ class RealDebridProvider(DebridProvider):
             # Get torrent info before removal to get the hash
             hash_value = None
             try:
-                info = self.get_torrent_info(torrent_id)
+                info = self.get_torrents_status([torrent_id]).get(torrent_id)
                 if info:
                     hash_value = info.get('hash', '').lower()
             except Exception as e:
@@ -632,6 +714,7 @@ class RealDebridProvider(DebridProvider):
 
             logging.info(f"Attempting to remove torrent {torrent_id} from Real-Debrid")
             make_request('DELETE', f'/torrents/delete/{torrent_id}', self.api_key)
+            self.invalidate_torrent_snapshot()
             logging.info(f"Successfully removed torrent {torrent_id} from Real-Debrid")
             
             # Update status and tracking
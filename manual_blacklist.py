@@ -69,8 +69,10 @@ def remove_from_manual_blacklist(imdb_id):
     else:
         logging.warning(f"{imdb_id} not found in manual blacklist.")
 
-def is_blacklisted(imdb_id, season: int = None):
-    blacklist = get_manual_blacklist()
+def is_blacklisted(imdb_id, season: int = None, blacklist: Dict[str, Dict[str, str]] = None):
+    # Callers checking many items pass the blacklist in rather than re-reading the file each time
+    if blacklist is None:
+        blacklist = get_manual_blacklist()
     if imdb_id not in blacklist:
         return False
         
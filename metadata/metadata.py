@@ -1,5 +1,5 @@
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from datetime import datetime, timedelta, timezone
 import sys, os
 import json
@@ -20,13 +20,17 @@ from cli_battery.app.database import DatabaseManager
 # Initialize DirectAPI at module level
 direct_api = DirectAPI()
 
+# Source items per batch handed back by process_metadata_batches
+METADATA_BATCH_SIZE = 50
+
 def parse_json_string(s):
     try:
         return json.loads(s)
     except json.JSONDecodeError:
         return s
 
-def get_metadata(imdb_id: Optional[str] = None, tmdb_id: Optional[int] = None, item_media_type: Optional[str] = None, original_item: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def get_metadata(imdb_id: Optional[str] = None, tmdb_id: Optional[int] = None, item_media_type: Optional[str] = None, original_item: Optional[Dict[str, Any]] = None, prefetched: Optional[Tuple[Any, Any]] = None) -> Dict[str, Any]:
+    """prefetched is a (metadata, source) result already resolved for imdb_id, e.g. by DirectAPI.get_metadata_many"""
 
     if not imdb_id and not tmdb_id:
         raise ValueError("Either imdb_id or tmdb_id must be provided")
@@ -51,7 +55,9 @@ def get_metadata(imdb_id: Optional[str] = None, tmdb_id: Optional[int] = None, i
     media_type = item_media_type.lower() if item_media_type else 'movie'
     
     try:
-        if media_type == 'movie':
+        if prefetched is not None:
+            metadata, _ = prefetched
+        elif media_type == 'movie':
             logging.info(f"Fetching movie metadata for IMDb ID: {imdb_id}")
             result = DirectAPI.get_movie_metadata(imdb_id)
             if result is None:
@@ -382,16 +388,46 @@ def get_physical_release_date(imdb_id: Optional[str] = None) -> Optional[str]:
 
     return min(physical_releases).strftime("%Y-%m-%d") if physical_releases else None
 
-def process_metadata(media_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def _iter_prefetched_items(media_items: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any], Optional[Tuple[Any, Any]]]]:
+    """
+    Yield (index, item, prefetched) with the metadata of every item that has an IMDb ID
+    resolved in one batch, in the order it resolves. Items that only have a TMDB ID
+    follow with prefetched=None and are resolved one at a time by get_metadata.
+    """
+    by_imdb_id = {}
+    remaining = []
+    for index, item in enumerate(media_items, 1):
+        media_type = (item.get('media_type') or '').lower()
+        if item.get('imdb_id') and media_type in ('movie', 'tv', 'show'):
+            by_imdb_id.setdefault(item['imdb_id'], []).append((index, item))
+        else:
+            remaining.append((index, item))
+
+    wanted = {imdb_id: items[0][1]['media_type'].lower() for imdb_id, items in by_imdb_id.items()}
+    try:
+        for imdb_id, metadata, source in DirectAPI.get_metadata_many(wanted):
+            for index, item in by_imdb_id.pop(imdb_id, []):
+                yield index, item, (metadata, source)
+    except Exception as e:
+        logging.error(f"Error resolving metadata in batch: {str(e)}", exc_info=True)
+
+    # Anything the batch didn't answer is retried the old way
+    for items in by_imdb_id.values():
+        remaining.extend(items)
+    for index, item in sorted(remaining, key=lambda entry: entry[0]):
+        yield index, item, None
+
+def iter_process_metadata(media_items: List[Dict[str, Any]]) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+    """Yield {'movies': [...], 'episodes': [...]} for each item as soon as its metadata resolves"""
     from database.database_writing import update_blacklisted_date, update_media_item
     from database.core import get_db_connection
     from database.wanted_items import add_wanted_items
     from run_program import program_runner
 
-    processed_items = {'movies': [], 'episodes': []}
     trakt_metadata = TraktMetadata()
 
-    for index, item in enumerate(media_items, 1):
+    for index, item, prefetched in _iter_prefetched_items(media_items):
+        processed_items = {'movies': [], 'episodes': []}
         try:
             logging.debug(f"Processing item {index}: content_source_detail={item.get('content_source_detail')}")
             if not trakt_metadata._check_rate_limit():
@@ -402,7 +438,8 @@ def process_metadata(media_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
                 imdb_id=item.get('imdb_id'), 
                 tmdb_id=item.get('tmdb_id'), 
                 item_media_type=item.get('media_type'),
-                original_item=item  # Pass the original item to preserve content source info
+                original_item=item,  # Pass the original item to preserve content source info
+                prefetched=prefetched
             )
             if not metadata:
                 logging.warning(f"Could not fetch metadata for item: {item}")
@@ -518,6 +555,8 @@ def process_metadata(media_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
                         episode = append_content_source_detail(episode, source_type='Overseerr')
                     add_wanted_items(all_episodes, versions)
 
+            yield processed_items
+
         except Exception as e:
             # Use the most specific identifier available
             show_id = (
@@ -527,6 +566,27 @@ def process_metadata(media_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
             )
             logging.error(f"Error processing item for show {show_id}: {str(e)}", exc_info=True)
 
+def process_metadata_batches(media_items: List[Dict[str, Any]], batch_size: int = METADATA_BATCH_SIZE) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+    """Like process_metadata, but yields the processed items in batches so callers can store them early"""
+    batch = {'movies': [], 'episodes': []}
+    pending = 0
+    for processed_items in iter_process_metadata(media_items):
+        batch['movies'].extend(processed_items['movies'])
+        batch['episodes'].extend(processed_items['episodes'])
+        pending += 1
+        if pending >= batch_size:
+            yield batch
+            batch = {'movies': [], 'episodes': []}
+            pending = 0
+    if pending:
+        yield batch
+
+def process_metadata(media_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    processed_items = {'movies': [], 'episodes': []}
+    for batch in iter_process_metadata(media_items):
+        processed_items['movies'].extend(batch['movies'])
+        processed_items['episodes'].extend(batch['episodes'])
+
     logging.info(f"Processed {len(processed_items['movies'])} movies and {len(processed_items['episodes'])} episodes")
     return processed_items
 
@@ -771,14 +831,12 @@ def refresh_release_dates():
     logging.info("Finished refresh_release_dates function")
 
 def get_episode_count_for_seasons(imdb_id: str, seasons: List[int]) -> int:
-    show_metadata, _ = DirectAPI.get_show_metadata(imdb_id)
-    all_seasons = show_metadata.get('seasons', {})
-    return sum(all_seasons.get(str(season), {}).get('episode_count', 0) for season in seasons)
+    season_counts, _ = DirectAPI.get_season_counts(imdb_id)
+    return sum(season_counts.get(int(season), 0) for season in seasons)
 
 def get_all_season_episode_counts(imdb_id: str) -> Dict[int, int]:
-    show_metadata, _ = DirectAPI.get_show_metadata(imdb_id)
-    all_seasons = show_metadata.get('seasons', {})
-    return {int(season): data['episode_count'] for season, data in all_seasons.items() if season != '0'}
+    season_counts, _ = DirectAPI.get_season_counts(imdb_id)
+    return dict(season_counts)
 
 def get_show_airtime_by_imdb_id(imdb_id: str) -> str:
     DEFAULT_AIRTIME = "19:00"
@@ -1,7 +1,11 @@
 import pickle
 import os
 import logging
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
 from settings import get_setting
+from utilities.sqlite_store import SQLiteStore
 
 # Get db_content directory from environment variable with fallback
 DB_CONTENT_DIR = os.environ.get('USER_DB_CONTENT', '/user/db_content')
@@ -10,68 +14,230 @@ DB_CONTENT_DIR = os.environ.get('USER_DB_CONTENT', '/user/db_content')
 NOT_WANTED_MAGNETS_FILE = os.path.join(DB_CONTENT_DIR, 'not_wanted_magnets.pkl')
 NOT_WANTED_URLS_FILE = os.path.join(DB_CONTENT_DIR, 'not_wanted_urls.pkl')
 
-def load_not_wanted_magnets():
-    try:
-        with open(NOT_WANTED_MAGNETS_FILE, 'rb') as f:
-            return pickle.load(f)
-    except (EOFError, pickle.UnpicklingError):
-        # If the file is empty or not a valid pickle object, return an empty set
-        return set()
-    except FileNotFoundError:
-        # If the file does not exist, create it and return an empty set
-        os.makedirs(os.path.dirname(NOT_WANTED_MAGNETS_FILE), exist_ok=True)
-        with open(NOT_WANTED_MAGNETS_FILE, 'wb') as f:
-            pickle.dump(set(), f)
-        return set()
+MAGNETS = 'magnet'
+URLS = 'url'
+# Keep IN (...) lists well below SQLite's bound parameter limit
+LOOKUP_BATCH_SIZE = 450
 
-def save_not_wanted_magnets(not_wanted_set):
-    os.makedirs(os.path.dirname(NOT_WANTED_MAGNETS_FILE), exist_ok=True)
-    with open(NOT_WANTED_MAGNETS_FILE, 'wb') as f:
-        pickle.dump(not_wanted_set, f)
-
-def add_to_not_wanted(hash_value, item_identifier=None, item=None):
-    not_wanted = load_not_wanted_magnets()
-    not_wanted.add(hash_value)
-    save_not_wanted_magnets(not_wanted)
+BTIH_PATTERN = re.compile(r'btih:([a-fA-F0-9]{40})')
+HASH_PATTERN = re.compile(r'^[a-fA-F0-9]{40}$')
 
 def get_base_filename(url):
     """Extract the base filename from a URL or magnet link."""
     if url is None:
         logging.warning("Received None value for URL/magnet in get_base_filename")
         return None
-        
+
     if url.startswith('magnet:'):
         # For magnet links, extract the hash
-        import re
-        btih_match = re.search(r'btih:([a-fA-F0-9]{40})', url)
+        btih_match = BTIH_PATTERN.search(url)
         if btih_match:
             return btih_match.group(1).lower()
-    
+
     # For URLs with file parameter
     if 'file=' in url:
         return url.split('file=')[-1].split('&')[0]
-    
+
     # For direct URLs
     return url.split('/')[-1]
 
+def get_lookup_key(value: Optional[str]) -> Optional[str]:
+    """The key an entry is stored and matched under: its base filename, with bare hashes lowercased"""
+    base = get_base_filename(value) if value is not None else None
+    if base and HASH_PATTERN.match(base):
+        return base.lower()
+    return base
+
+class NotWantedStore(SQLiteStore):
+    """
+    SQLite store of not wanted magnets and URLs, keyed by (kind, lookup key).
+
+    Checks are primary key lookups, so they no longer depend on the size of the
+    list, and additions insert a single row. The pickled sets used by older
+    versions are imported and removed the first time the store is opened.
+    """
+
+    DB_FILENAME = 'not_wanted.db'
+    STATS = ('checks', 'matches', 'additions')
+
+    def _create_schema(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS not_wanted (
+                kind TEXT NOT NULL,
+                lookup_key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                added_at REAL NOT NULL,
+                PRIMARY KEY (kind, lookup_key)
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+        self._migrate_pickle(conn, MAGNETS, NOT_WANTED_MAGNETS_FILE)
+        self._migrate_pickle(conn, URLS, NOT_WANTED_URLS_FILE)
+
+    def _migrate_pickle(self, conn, kind: str, pickle_file: str):
+        if not os.path.exists(pickle_file):
+            return
+        try:
+            with open(pickle_file, 'rb') as f:
+                legacy_set = pickle.load(f)
+            imported = self._insert(conn, kind, legacy_set)
+            logging.info(f"Migrated {imported} not wanted {kind} entries from {os.path.basename(pickle_file)}")
+        except (EOFError, pickle.UnpicklingError) as e:
+            logging.warning(f"Discarding unreadable not wanted file {pickle_file}: {e}")
+        except Exception as e:
+            logging.error(f"Error migrating not wanted file {pickle_file}: {e}")
+            return
+        os.remove(pickle_file)
+
+    def _insert(self, conn, kind: str, values: Iterable[Optional[str]]) -> int:
+        now = time.time()
+        rows = {}
+        for value in values:
+            key = get_lookup_key(value)
+            if key:
+                rows.setdefault(key, (kind, key, value, now))
+        with conn:
+            added = conn.executemany(
+                'INSERT OR IGNORE INTO not_wanted (kind, lookup_key, value, added_at) VALUES (?, ?, ?, ?)',
+                list(rows.values())
+            ).rowcount
+        return max(added, 0)
+
+    def add(self, kind: str, values: Iterable[Optional[str]]) -> int:
+        conn = None
+        try:
+            conn = self._connect()
+            added = self._insert(conn, kind, values)
+            self._count('additions', added)
+            return added
+        except Exception as e:
+            logging.error(f"Error adding to not wanted {kind} list: {e}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def find(self, kind: str, values: Iterable[Optional[str]]) -> Set[str]:
+        """Return the subset of values whose lookup key is in the kind's list"""
+        values_by_key = {}
+        for value in values:
+            key = get_lookup_key(value)
+            if key:
+                values_by_key.setdefault(key, []).append(value)
+        if not values_by_key:
+            return set()
+
+        matched = set()
+        conn = None
+        try:
+            conn = self._connect()
+            keys = list(values_by_key)
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                for row in conn.execute(
+                        f'SELECT lookup_key FROM not_wanted WHERE kind = ? AND lookup_key IN ({placeholders})',
+                        [kind] + batch):
+                    matched.update(values_by_key[row['lookup_key']])
+        except Exception as e:
+            logging.error(f"Error checking not wanted {kind} list: {e}")
+        finally:
+            if conn:
+                conn.close()
+        self._count('checks', len(values_by_key))
+        self._count('matches', len(matched))
+        return matched
+
+    def values(self, kind: str) -> Set[str]:
+        conn = None
+        try:
+            conn = self._connect()
+            return {row['value'] for row in conn.execute('SELECT value FROM not_wanted WHERE kind = ?', (kind,))}
+        except Exception as e:
+            logging.error(f"Error loading not wanted {kind} list: {e}")
+            return set()
+        finally:
+            if conn:
+                conn.close()
+
+    def remove(self, kind: str, value: str) -> bool:
+        conn = None
+        try:
+            conn = self._connect()
+            with conn:
+                return conn.execute('DELETE FROM not_wanted WHERE kind = ? AND value = ?', (kind, value)).rowcount > 0
+        except Exception as e:
+            logging.error(f"Error removing {value} from not wanted {kind} list: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+
+    def replace(self, kind: str, values: Iterable[Optional[str]]):
+        """Make values the kind's whole list"""
+        conn = None
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute('DELETE FROM not_wanted WHERE kind = ?', (kind,))
+            self._insert(conn, kind, values)
+        except Exception as e:
+            logging.error(f"Error saving not wanted {kind} list: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def clear(self, kind: Optional[str] = None) -> int:
+        conn = None
+        try:
+            conn = self._connect()
+            with conn:
+                if kind:
+                    return conn.execute('DELETE FROM not_wanted WHERE kind = ?', (kind,)).rowcount
+                return conn.execute('DELETE FROM not_wanted').rowcount
+        except Exception as e:
+            logging.error(f"Error clearing not wanted list: {e}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['match_rate'] = stats['matches'] / stats['checks'] if stats['checks'] else 0.0
+        return stats
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any]):
+        stats['entries'] = {row['kind']: row['entries'] for row in conn.execute(
+            'SELECT kind, COUNT(*) AS entries FROM not_wanted GROUP BY kind')}
+
+not_wanted_store = NotWantedStore()
+
+def not_wanted_check_disabled():
+    return get_setting('Debug', 'disable_not_wanted_check', False)
+
+def load_not_wanted_magnets():
+    return not_wanted_store.values(MAGNETS)
+
+def save_not_wanted_magnets(not_wanted_set):
+    not_wanted_store.replace(MAGNETS, not_wanted_set)
+
+def add_to_not_wanted(hash_value, item_identifier=None, item=None):
+    not_wanted_store.add(MAGNETS, [hash_value])
+
+def remove_from_not_wanted(hash_value):
+    return not_wanted_store.remove(MAGNETS, hash_value)
+
 def is_magnet_not_wanted(magnet):
-    if get_setting('Debug','disable_not_wanted_check', False):
+    if not_wanted_check_disabled():
         logging.debug(f"Not wanted check is disabled, allowing magnet: {magnet[:60] if magnet else 'None'}...")
         return False
-        
+
     if magnet is None:
         logging.warning("Received None value for magnet in is_magnet_not_wanted")
         return False
-        
-    not_wanted = load_not_wanted_magnets()
-    
-    # Extract hash from magnet link
-    magnet_hash = get_base_filename(magnet)
-    if magnet_hash is None:
-        return False
-        
-    # Check if the hash exists in not_wanted
-    is_not_wanted = magnet_hash in [get_base_filename(nw) for nw in not_wanted if nw is not None]
+
+    is_not_wanted = bool(not_wanted_store.find(MAGNETS, [magnet]))
     if is_not_wanted:
         logging.info(f"Filtering out magnet {magnet[:60]}... as it is in not_wanted_magnets list")
     return is_not_wanted
@@ -83,69 +249,66 @@ def get_not_wanted_urls():
     return load_not_wanted_urls()
 
 def add_to_not_wanted_urls(url, item_identifier=None, item=None):
-    not_wanted = load_not_wanted_urls()
-    not_wanted.add(url)
-    save_not_wanted_urls(not_wanted)
+    not_wanted_store.add(URLS, [url])
+
+def remove_from_not_wanted_urls(url):
+    return not_wanted_store.remove(URLS, url)
 
 def is_url_not_wanted(url):
-    if get_setting('Debug','disable_not_wanted_check', False):
+    if not_wanted_check_disabled():
         logging.debug(f"Not wanted check is disabled, allowing URL: {url}")
         return False
-    not_wanted = load_not_wanted_urls()
-    
-    # Get base filename of the URL
-    url_filename = get_base_filename(url)
-    
-    # Check if the filename exists in not_wanted
-    is_not_wanted = url_filename in [get_base_filename(nw) for nw in not_wanted]
+
+    is_not_wanted = bool(not_wanted_store.find(URLS, [url]))
     if is_not_wanted:
         logging.info(f"Filtering out URL {url} as it is in not_wanted_urls list")
     return is_not_wanted
 
-def load_not_wanted_urls():
-    try:
-        with open(NOT_WANTED_URLS_FILE, 'rb') as f:
-            return pickle.load(f)
-    except (EOFError, pickle.UnpicklingError):
-        return set()
-    except FileNotFoundError:
-        os.makedirs(os.path.dirname(NOT_WANTED_URLS_FILE), exist_ok=True)
-        with open(NOT_WANTED_URLS_FILE, 'wb') as f:
-            pickle.dump(set(), f)
+def find_not_wanted(magnets: Iterable[Optional[str]]) -> Set[str]:
+    """
+    Batch version of is_magnet_not_wanted/is_url_not_wanted: return the magnets or
+    URLs that are on either not wanted list, using one query per list.
+    """
+    if not_wanted_check_disabled():
         return set()
-    
+    magnets = [magnet for magnet in magnets if magnet is not None]
+    return not_wanted_store.find(MAGNETS, magnets) | not_wanted_store.find(URLS, magnets)
+
+def filter_not_wanted_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop scrape results whose magnet or URL is on a not wanted list"""
+    not_wanted = find_not_wanted(result.get('magnet') for result in results)
+    if not not_wanted:
+        return list(results)
+    filtered_results = []
+    for result in results:
+        if result.get('magnet') in not_wanted:
+            logging.info(f"Filtering out result '{result.get('title')}' as it is in the not wanted list")
+            continue
+        filtered_results.append(result)
+    return filtered_results
+
+def load_not_wanted_urls():
+    return not_wanted_store.values(URLS)
+
 def save_not_wanted_urls(not_wanted_set):
-    os.makedirs(os.path.dirname(NOT_WANTED_URLS_FILE), exist_ok=True)
-    with open(NOT_WANTED_URLS_FILE, 'wb') as f:
-        pickle.dump(not_wanted_set, f)
+    not_wanted_store.replace(URLS, not_wanted_set)
 
 def purge_not_wanted_magnets_file():
-    # Purge the contents of the file by overwriting it with an empty set
-    with open(NOT_WANTED_MAGNETS_FILE, 'wb') as f:
-        pickle.dump(set(), f)
-    print("The 'not_wanted_magnets.pkl' file has been purged.")
+    # Purge the not wanted magnets, leaving the URLs in place
+    removed = not_wanted_store.clear(MAGNETS)
+    logging.info(f"Purged {removed} not wanted magnets.")
 
 def validate_not_wanted_entries():
-    """Validate the not wanted magnets and URLs files on boot."""
+    """Open the not wanted store on boot, importing any old pickle files."""
     logging.info("Validating not wanted entries...")
-    
-    # Validate magnets
+
     magnets = load_not_wanted_magnets()
     if magnets:
         logging.info(f"Found {len(magnets)} not wanted magnets")
         logging.info("First 5 magnet entries:")
         for i, magnet in enumerate(list(magnets)[:5]):
-            if magnet is None:
-                logging.error(f"Entry {i} is None - removing invalid entry")
-                magnets.remove(None)
-                continue
             logging.info(f"  {i+1}. {magnet[:60]}...")
-    
-    # Save cleaned magnets if any None values were removed
-    if None in magnets:
-        magnets.remove(None)
-        save_not_wanted_magnets(magnets)
-        logging.info("Cleaned up not wanted magnets list by removing None values")
+    logging.info(f"Found {len(load_not_wanted_urls())} not wanted URLs")
 
 if __name__ == '__main__':
-    validate_not_wanted_entries()
\ No newline at end of file
+    validate_not_wanted_entries()
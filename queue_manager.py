@@ -1,9 +1,13 @@
 import logging
+import time
 from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, List
 
 from database import update_media_item_state, get_media_item_by_id, update_media_item
+from database import get_latest_media_item_change, get_changed_media_items, prune_media_item_changes
+from settings import add_settings_listener
+from task_scheduler import task_scheduler
 from queues.wanted_queue import WantedQueue
 from queues.scraping_queue import ScrapingQueue
 from queues.adding_queue import AddingQueue
@@ -18,10 +22,21 @@ from wake_count_manager import wake_count_manager
 class QueueManager:
     _instance = None
 
+    # Fall back to a complete reload from the database this often, as a safety
+    # net for anything the change log cannot see (e.g. manual blacklist edits)
+    FULL_REFRESH_INTERVAL = 300
+    # How often already-applied entries are pruned from media_item_changes
+    CHANGE_LOG_PRUNE_INTERVAL = 300
+    # Queues that are woken up as soon as an item is moved into them. Wanted is
+    # left out on purpose: items fall back to it on failures, and waking it
+    # straight away could spin a failing item through the pipeline.
+    SIGNALLED_QUEUES = {'Scraping', 'Adding', 'Checking'}
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(QueueManager, cls).__new__(cls)
             cls._instance.initialize()
+            add_settings_listener(cls._instance._on_settings_changed)
         return cls._instance
 
     def initialize(self):
@@ -37,17 +52,114 @@ class QueueManager:
             "Upgrading": UpgradingQueue()
         }
         self.paused = False
+        # Incremental refresh state: last applied media_item_changes sequence
+        # number and an index of item id -> queue name for every queued item
+        self.change_cursor = None
+        self.item_states = {}
+        self.last_full_refresh = 0
+        self.last_change_prune = time.time()
 
     def reinitialize_queues(self):
         """Force reinitialization of all queues to pick up new settings"""
         self.initialize()
 
+    def request_full_refresh(self):
+        """Make the next update_all_queues call reload every queue from the database"""
+        self.change_cursor = None
+
+    def _on_settings_changed(self, changed_sections):
+        # Queue sort order and airtime offsets are applied while loading items
+        if 'Queue' in changed_sections:
+            self.request_full_refresh()
+
+    def signal_new_work(self, queue_name: str):
+        """Wake the program loop so queue_name is processed without waiting for its interval"""
+        if queue_name in self.SIGNALLED_QUEUES:
+            task_scheduler.signal(queue_name)
+
     def update_all_queues(self):
+        """
+        Bring the in-memory queues in line with the database.
+
+        Only items that changed since the previous call (according to the
+        media_item_changes log) are re-read and patched into the queues. A full
+        reload happens on the first call, every FULL_REFRESH_INTERVAL seconds,
+        after request_full_refresh(), or if change tracking is unavailable.
+        """
+        latest_change = get_latest_media_item_change()
+        needs_full_refresh = (
+            self.change_cursor is None
+            or latest_change is None
+            or latest_change < self.change_cursor
+            or time.time() - self.last_full_refresh >= self.FULL_REFRESH_INTERVAL
+        )
+
+        if needs_full_refresh:
+            self._full_refresh(latest_change)
+        elif latest_change > self.change_cursor:
+            latest_seq, changed_ids, rows = get_changed_media_items(self.change_cursor, list(self.queues.keys()))
+            if latest_seq is None:
+                self._full_refresh(latest_change)
+            else:
+                self._apply_item_changes(changed_ids, rows)
+                self.change_cursor = latest_seq
+
+        self._prune_change_log()
+
+    def _full_refresh(self, latest_change):
+        # The cursor is read before the queues are loaded, so anything written
+        # while loading is applied again on the next incremental update
         for queue_name, queue in self.queues.items():
-            before_count = len(queue.get_contents())
             queue.update()
-            after_count = len(queue.get_contents())
-            # logging.debug(f"Queue {queue_name} update: {before_count} -> {after_count} items")
+        self.item_states = {
+            item['id']: queue_name
+            for queue_name, queue in self.queues.items()
+            for item in queue.items
+        }
+        self.change_cursor = latest_change
+        self.last_full_refresh = time.time()
+
+    def _apply_item_changes(self, changed_ids, rows):
+        """Patch the queues' item lists in place with the given changed rows"""
+        new_states = {row['id']: row['state'] for row in rows}
+        fresh_items = {row['id']: dict(row) for row in rows}
+
+        affected_queues = set(new_states.values())
+        affected_queues.update(self.item_states[item_id] for item_id in changed_ids if item_id in self.item_states)
+
+        for queue_name in affected_queues:
+            queue = self.queues[queue_name]
+            patched_items = []
+            updated_items = []
+            seen_ids = set()
+            for item in queue.items:
+                item_id = item['id']
+                if item_id not in changed_ids:
+                    patched_items.append(item)
+                elif new_states.get(item_id) == queue_name and item_id not in seen_ids:
+                    patched_items.append(fresh_items[item_id])
+                    updated_items.append(fresh_items[item_id])
+                    seen_ids.add(item_id)
+            for item_id, state in new_states.items():
+                if state == queue_name and item_id not in seen_ids:
+                    patched_items.append(fresh_items[item_id])
+                    updated_items.append(fresh_items[item_id])
+
+            queue.items[:] = patched_items
+            if updated_items and hasattr(queue, 'prepare_items'):
+                queue.prepare_items(updated_items)
+
+        for item_id in changed_ids:
+            if item_id in new_states:
+                self.item_states[item_id] = new_states[item_id]
+            else:
+                self.item_states.pop(item_id, None)
+
+    def _prune_change_log(self):
+        if self.change_cursor is None or time.time() - self.last_change_prune < self.CHANGE_LOG_PRUNE_INTERVAL:
+            return
+        prune_media_item_changes(self.change_cursor)
+        self.last_change_prune = time.time()
 
     def get_queue_contents(self):
         contents = OrderedDict()
@@ -190,6 +302,7 @@ class QueueManager:
         updated_item = get_media_item_by_id(item['id'])
         if updated_item:
             self.queues["Scraping"].add_item(updated_item)
+            self.signal_new_work("Scraping")
             self.queues[from_queue].remove_item(item)
             logging.info(f"Moved item {item_identifier} to Scraping queue")
         else:
@@ -202,6 +315,7 @@ class QueueManager:
         updated_item = get_media_item_by_id(item['id'])
         if updated_item:
             self.queues["Adding"].add_item(updated_item)
+            self.signal_new_work("Adding")
             # Remove the item from the Scraping queue, but not from the Wanted queue
             if from_queue == "Scraping":
                 self.queues[from_queue].remove_item(item)
@@ -262,6 +376,7 @@ class QueueManager:
             if 'downloading' in item:
                 updated_item['downloading'] = item['downloading']
             self.queues["Checking"].add_item(updated_item)
+            self.signal_new_work("Checking")
             # Remove the item from the Adding queue and the Wanted queue
             if from_queue in ["Adding", "Wanted"]:
                 self.queues[from_queue].remove_item(item)
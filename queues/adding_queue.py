@@ -14,6 +14,12 @@ from settings import get_setting
 from .torrent_processor import TorrentProcessor
 from .media_matcher import MediaMatcher
 from database.torrent_tracking import update_adding_error
+from api_tracker import api
+
+# Real-Debrid calls kept in reserve before an item is started; adding one item can take
+# several calls (add, select files, info, cache checks), so stop early instead of hitting 429s
+DEBRID_API_DOMAIN = 'api.real-debrid.com'
+MIN_DEBRID_BUDGET_PER_ITEM = 20
 
 class AddingQueue:
     """Manages the queue of items being added to the debrid service"""
@@ -92,7 +98,7 @@ class AddingQueue:
         try:
             # Get torrent info before removal to record hash
             try:
-                info = self.debrid_provider.get_torrent_info(torrent_id)
+                info = self.debrid_provider.get_torrents_status([torrent_id]).get(torrent_id)
                 if info:
                     hash_value = info.get('hash', '').lower()
                     if hash_value:
@@ -142,6 +148,11 @@ class AddingQueue:
             logging.debug(f"Adding Queue - Processing item with resolution: {item.get('resolution', 'Not found')} for {item_identifier}")
             
         for item in self.items[:]:  # Copy list as we'll modify it
+            remaining_budget = api.rate_limiter.get_remaining(DEBRID_API_DOMAIN)
+            if remaining_budget < MIN_DEBRID_BUDGET_PER_ITEM:
+                logging.info(f"Adding Queue - Only {remaining_budget} debrid API calls left in the current window, deferring remaining items")
+                break
+
             item_identifier = f"{item.get('title')} ({item.get('type')})"
             item_id = item.get('id')
             logging.info(f"Processing item {item_id}: {item_identifier}")
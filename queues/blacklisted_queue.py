@@ -12,8 +12,12 @@ class BlacklistedQueue:
 
     def update(self):
         self.items = [dict(row) for row in get_all_media_items(state="Blacklisted")]
+        self.prepare_items(self.items)
+
+    def prepare_items(self, items: List[Dict[str, Any]]):
+        """Prepare items freshly loaded from the database for this queue"""
         # Initialize blacklist times for new items
-        for item in self.items:
+        for item in items:
             if item['id'] not in self.blacklist_times:
                 self.blacklist_times[item['id']] = datetime.now()
 
@@ -10,7 +10,6 @@ from not_wanted_magnets import add_to_not_wanted, add_to_not_wanted_urls
 from queues.adding_queue import AddingQueue
 from debrid import get_debrid_provider
 from settings import get_setting
-from debrid.common import timed_lru_cache
 from pathlib import Path
 import os
 
@@ -55,8 +54,12 @@ class CheckingQueue:
         if removed_torrents:
             logging.debug(f"Torrent IDs no longer present: {removed_torrents}")
         
+        self.prepare_items(self.items)
+
+    def prepare_items(self, items):
+        """Prepare items freshly loaded from the database for this queue"""
         # Initialize checking times for new items
-        for item in self.items:
+        for item in items:
             if item['id'] not in self.checking_queue_times:
                 self.checking_queue_times[item['id']] = time.time()
                 logging.debug(f"Initialized checking time for item {item['id']} with torrent ID {item.get('filled_by_torrent_id')}")
@@ -76,8 +79,9 @@ class CheckingQueue:
                 torrent_groups[torrent_id].append(item)
         
         # Process items in batches by torrent ID
+        progress_by_torrent = self.get_torrents_progress(torrent_groups)
         for torrent_id, items in torrent_groups.items():
-            progress = self.get_torrent_progress(torrent_id)
+            progress = progress_by_torrent.get(torrent_id)
             state = self.get_torrent_state(torrent_id)
             
             # If state is 'missing', these items will be moved to Wanted by get_torrent_state
@@ -182,19 +186,31 @@ class CheckingQueue:
             except Exception as e:
                 logging.error(f"Failed to move item to Wanted state: {str(e)}")
 
-    @timed_lru_cache(seconds=60)
-    def get_torrent_progress(self, torrent_id: str) -> Optional[int]:
-        """Get the current progress percentage for a torrent"""
+    def get_torrents_progress(self, torrent_ids) -> Dict[str, Optional[int]]:
+        """
+        Get the current progress percentage for several torrents from the provider's
+        shared torrent listing. None means the torrent could not be found.
+        """
+        torrent_ids = list(torrent_ids)
         try:
-            torrent_info = self.debrid_provider.get_torrent_info(torrent_id)
+            statuses = self.debrid_provider.get_torrents_status(torrent_ids)
+        except Exception as e:
+            logging.error(f"Failed to get progress for torrents {torrent_ids}: {str(e)}")
+            return {torrent_id: None for torrent_id in torrent_ids}
+
+        progress_by_torrent = {}
+        for torrent_id in torrent_ids:
+            torrent_info = statuses.get(torrent_id)
             if torrent_info:
-                return torrent_info.get('progress', 0)
+                progress_by_torrent[torrent_id] = torrent_info.get('progress', 0)
             else:
                 logging.info(f"Torrent {torrent_id} not found on Real-Debrid (404)")
-                return None
-        except Exception as e:
-            logging.error(f"Failed to get progress for torrent {torrent_id}: {str(e)}")
-            return None
+                progress_by_torrent[torrent_id] = None
+        return progress_by_torrent
+
+    def get_torrent_progress(self, torrent_id: str) -> Optional[int]:
+        """Get the current progress percentage for a torrent"""
+        return self.get_torrents_progress([torrent_id]).get(torrent_id)
 
     def get_torrent_state(self, torrent_id: str) -> str:
         """Get the current state of a torrent (downloaded or downloading)"""
@@ -358,13 +374,15 @@ class CheckingQueue:
                 logging.warning(f"Item {item['id']} missing from checking_queue_times. Initializing with current time.")
                 self.checking_queue_times[item['id']] = current_time
 
+        # One listing covers every torrent in the queue, missing torrents come back as None
+        progress_by_torrent = self.get_torrents_progress(items_by_torrent)
+
         # Process items by torrent ID
         for torrent_id, items in items_by_torrent.items():
             try:
                 logging.debug(f"Processing torrent {torrent_id} with {len(items)} associated items")
                 
-                # Use the cached get_torrent_progress which includes error handling for 404s
-                current_progress = self.get_torrent_progress(torrent_id)
+                current_progress = progress_by_torrent.get(torrent_id)
                 
                 # If current_progress is None, the torrent was not found (404)
                 if current_progress is None:
@@ -552,7 +570,7 @@ class CheckingQueue:
         # After processing all torrents, check if we need to run Plex scan
         if not get_setting('File Management', 'file_collection_management') == 'Symlinked/Local':
             # Only run Plex scan if we have any completed torrents
-            if any(self.get_torrent_progress(torrent_id) == 100 for torrent_id in items_by_torrent.keys()):
+            if any(progress == 100 for progress in progress_by_torrent.values()):
                 get_and_add_recent_collected_from_plex()
 
         #logging.debug(f"Finished processing checking queue. Remaining items: {len(self.items)}")
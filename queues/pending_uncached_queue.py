@@ -20,10 +20,14 @@ class PendingUncachedQueue:
 
     def update(self):
         self.items = [dict(row) for row in get_all_media_items(state="Pending Uncached")]
-        self._deserialize_scrape_results()
+        self.prepare_items(self.items)
 
-    def _deserialize_scrape_results(self):
-        for item in self.items:
+    def prepare_items(self, items):
+        """Prepare items freshly loaded from the database for this queue"""
+        self._deserialize_scrape_results(items)
+
+    def _deserialize_scrape_results(self, items=None):
+        for item in (self.items if items is None else items):
             if 'scrape_results' in item:
                 try:
                     if isinstance(item['scrape_results'], str):
@@ -63,8 +67,8 @@ class PendingUncachedQueue:
                 continue
 
             # Process the magnet link first
-            processed_magnet, temp_file = self.torrent_processor.process_torrent(link)
-            if not processed_magnet and not temp_file:
+            processed_magnet, torrent_data = self.torrent_processor.process_torrent(link)
+            if not processed_magnet and not torrent_data:
                 logging.error(f"Failed to process magnet link for {item_identifier}")
                 self._handle_failed_add(item, queue_manager)
                 continue
@@ -72,7 +76,7 @@ class PendingUncachedQueue:
             # Try to add the processed magnet first
             add_result = self.debrid_provider.add_torrent(
                 magnet_link=processed_magnet if processed_magnet else None,
-                temp_file_path=temp_file if temp_file else None
+                torrent_data=torrent_data
             )
 
             # Add to not wanted after successful addition
@@ -90,13 +94,6 @@ class PendingUncachedQueue:
             except Exception as e:
                 logging.error(f"Failed to add to not wanted lists: {str(e)}")
 
-            # Clean up temp file if it exists
-            if temp_file:
-                try:
-                    os.unlink(temp_file)
-                except Exception as e:
-                    logging.error(f"Failed to clean up temp file: {str(e)}")
-
             if add_result:
                 self._handle_successful_add(item, queue_manager, add_result)
                 
@@ -6,7 +6,7 @@ import json
 from database import get_all_media_items, get_media_item_by_id
 from settings import get_setting
 from scraper.scraper import scrape
-from not_wanted_magnets import is_magnet_not_wanted, is_url_not_wanted
+from not_wanted_magnets import filter_not_wanted_results
 from wake_count_manager import wake_count_manager
 from cli_battery.app.direct_api import DirectAPI
 
@@ -16,7 +16,10 @@ class ScrapingQueue:
 
     def update(self):
         self.items = [dict(row) for row in get_all_media_items(state="Scraping")]
-        
+        self.prepare_items(self.items)
+
+    def prepare_items(self, items: List[Dict[str, Any]]):
+        """Prepare items freshly loaded from the database for this queue"""
         # Get the queue sort order setting
         sort_order = get_setting("Queue", "queue_sort_order", "None")
         
@@ -194,42 +197,21 @@ class ScrapingQueue:
                     return True
 
                 # Filter and process results
-                filtered_results = []
-                for result in results:
-                    if not item.get('disable_not_wanted_check'):
-                        if is_magnet_not_wanted(result['magnet']):
-                            continue
-                        if is_url_not_wanted(result['magnet']):
-                            continue
-                    filtered_results.append(result)
+                filtered_results = results if item.get('disable_not_wanted_check') else filter_not_wanted_results(results)
                 
                 if not filtered_results:
                     logging.warning(f"All results filtered out for {item_identifier}. Retrying individual scraping.")
                     individual_results, individual_filtered_out = self.scrape_with_fallback(item, False, queue_manager)
                     logging.info(f"Individual scraping returned {len(individual_results)} results")
                     
-                    filtered_individual_results = []
-                    for result in individual_results:
-                        if not item.get('disable_not_wanted_check'):
-                            if is_magnet_not_wanted(result['magnet']):
-                                continue
-                            if is_url_not_wanted(result['magnet']):
-                                continue
-                        filtered_individual_results.append(result)
+                    filtered_individual_results = individual_results if item.get('disable_not_wanted_check') else filter_not_wanted_results(individual_results)
                     
                     if not filtered_individual_results and item['type'] == 'episode':
                         # Final fallback - try multi-pack even if not all episodes have aired
                         logging.info(f"No individual episode results, trying final multi-pack fallback for {item_identifier}")
                         fallback_results, fallback_filtered_out = self.scrape_with_fallback(item, True, queue_manager)
                         
-                        filtered_fallback_results = []
-                        for result in fallback_results:
-                            if not item.get('disable_not_wanted_check'):
-                                if is_magnet_not_wanted(result['magnet']):
-                                    continue
-                                if is_url_not_wanted(result['magnet']):
-                                    continue
-                            filtered_fallback_results.append(result)
+                        filtered_fallback_results = fallback_results if item.get('disable_not_wanted_check') else filter_not_wanted_results(fallback_results)
                         
                         if filtered_fallback_results:
                             logging.info(f"Found {len(filtered_fallback_results)} results in multi-pack fallback")
@@ -280,6 +262,9 @@ class ScrapingQueue:
         if get_media_item_by_id(item['id']).get('fall_back_to_single_scraper'):
             is_multi_pack = False
 
+        # An item woken from Sleeping is retrying because the last scrape found nothing usable
+        bypass_scrape_cache = wake_count_manager.get_wake_count(item['id']) > 0
+
         results, filtered_out = scrape(
             item['imdb_id'],
             item['tmdb_id'],
@@ -290,7 +275,8 @@ class ScrapingQueue:
             item.get('season_number'),
             item.get('episode_number'),
             is_multi_pack,  # This will now be False if fall_back_to_single_scraper is True
-            item.get('genres')
+            item.get('genres'),
+            bypass_scrape_cache=bypass_scrape_cache
         )
 
         # Ensure results and filtered_out are lists
@@ -299,7 +285,7 @@ class ScrapingQueue:
 
         if not skip_filter and not item.get('disable_not_wanted_check'):
             # Filter out unwanted magnets and URLs
-            results = [r for r in results if not (is_magnet_not_wanted(r['magnet']) or is_url_not_wanted(r['magnet']))]
+            results = filter_not_wanted_results(results)
 
         is_anime = True if item.get('genres') and 'anime' in item['genres'] else False
         
@@ -331,7 +317,8 @@ class ScrapingQueue:
             item.get('season_number'),
             item.get('episode_number'),
             False,
-            item.get('genres')
+            item.get('genres'),
+            bypass_scrape_cache=bypass_scrape_cache
         )
 
         # Ensure individual results and filtered_out are lists
@@ -340,7 +327,7 @@ class ScrapingQueue:
 
         # Filter out unwanted magnets and URLs for individual results
         if not skip_filter and not item.get('disable_not_wanted_check'):
-            individual_results = [r for r in individual_results if not (is_magnet_not_wanted(r['magnet']) or is_url_not_wanted(r['magnet']))]
+            individual_results = filter_not_wanted_results(individual_results)
 
         # For episodes, ensure we have the correct season and episode
         if item['type'] == 'episode':
@@ -14,8 +14,12 @@ class SleepingQueue:
 
     def update(self):
         self.items = [dict(row) for row in get_all_media_items(state="Sleeping")]
+        self.prepare_items(self.items)
+
+    def prepare_items(self, items):
+        """Prepare items freshly loaded from the database for this queue"""
         # Initialize sleeping times for new items
-        for item in self.items:
+        for item in items:
             if item['id'] not in self.sleeping_queue_times:
                 self.sleeping_queue_times[item['id']] = datetime.now()
             item['wake_count'] = wake_count_manager.get_wake_count(item['id'])
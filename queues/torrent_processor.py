@@ -5,25 +5,28 @@ and addition to debrid service accounts.
 
 import logging
 import time
-from typing import Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
 from urllib.parse import urlparse
-import tempfile
-import requests
-import os
-import bencodepy
-import hashlib
 import inspect
 
+from api_tracker import api
 from debrid.base import DebridProvider, TooManyDownloadsError
 from debrid.common import (
     extract_hash_from_magnet,
-    extract_hash_from_file,
+    extract_hash_from_data,
+    fetch_torrent_file,
     is_video_file,
     is_unwanted_file,
     download_and_extract_hash
 )
 from debrid.status import TorrentStatus
 from not_wanted_magnets import add_to_not_wanted, add_to_not_wanted_urls
+from settings import get_setting
+
+# Debrid API calls a single cache probe can make (add, select files, info, remove)
+PROBE_CALL_COST = 4
 
 class TorrentProcessingError(Exception):
     """Base exception for torrent processing errors"""
@@ -49,7 +52,7 @@ class TorrentProcessor:
         """
         self.debrid_provider = debrid_provider
         
-    def process_torrent(self, magnet_or_url: str) -> Tuple[Optional[str], Optional[str]]:
+    def process_torrent(self, magnet_or_url: str) -> Tuple[Optional[str], Optional[bytes]]:
         """
         Process a magnet link or torrent URL
         
@@ -57,9 +60,9 @@ class TorrentProcessor:
             magnet_or_url: Either a magnet link or URL to a torrent file
             
         Returns:
-            Tuple of (magnet_link, temp_file_path) where:
+            Tuple of (magnet_link, torrent_data) where:
                 - For magnet links: (magnet_link, None)
-                - For torrent files: (None, temp_file_path)
+                - For torrent files: (None, torrent file contents)
                 - Returns (None, None) on error
         """
         try:
@@ -71,20 +74,11 @@ class TorrentProcessor:
                 logging.error(f"Invalid URL or magnet link: {magnet_or_url}")
                 return None, None
                 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.torrent') as tmp:
-                try:
-                    response = requests.get(magnet_or_url, timeout=30)
-                    response.raise_for_status()
-                    tmp.write(response.content)
-                    tmp.flush()
-                    return None, tmp.name
-                except Exception as e:
-                    logging.error(f"Failed to download torrent file: {str(e)}")
-                    try:
-                        os.unlink(tmp.name)
-                    except:
-                        pass
-                    return None, None
+            # Downloaded once per URL and kept in the torrent file cache
+            fetched = fetch_torrent_file(magnet_or_url)
+            if not fetched:
+                return None, None
+            return None, fetched[1]
             
         except Exception as e:
             logging.error(f"Error processing magnet/URL: {str(e)}", exc_info=True)
@@ -106,98 +100,28 @@ class TorrentProcessor:
         torrent_id_to_remove = None
         
         try:
-            import tempfile
-            import requests
-            import os
-            import bencodepy
-            import hashlib
-            from debrid.common.torrent import torrent_to_magnet
-            
-            # Create a temporary file to store the torrent
-            with tempfile.NamedTemporaryFile(suffix='.torrent', delete=False) as tmp:
-                temp_file_path = tmp.name
-                
-                try:
-                    # Download the torrent file
-                    logging.info(f"Downloading torrent file from {url} to {temp_file_path}")
-                    response = requests.get(url, timeout=30)
-                    
-                    if response.status_code != 200:
-                        logging.error(f"Failed to download torrent file. Status code: {response.status_code}")
-                        return None
-                    
-                    # Write the content to the temp file
-                    tmp.write(response.content)
-                    tmp.flush()
-                    
-                    # Try to parse the torrent and extract hash
-                    try:
-                        # Parse the torrent file
-                        with open(temp_file_path, 'rb') as f:
-                            torrent_data = bencodepy.decode(f.read())
-                        
-                        # Extract hash from torrent data
-                        if b'info' in torrent_data:
-                            info_data = bencodepy.encode(torrent_data[b'info'])
-                            info_hash = hashlib.sha1(info_data).hexdigest()
-                            logging.info(f"Extracted hash from torrent file: {info_hash}")
-                            
-                            # Check cache using the extracted hash
-                            magnet_link = f"magnet:?xt=urn:btih:{info_hash}"
-                            logging.info(f"Checking cache with extracted magnet link: {magnet_link}")
-                            is_cached = self.debrid_provider.is_cached(magnet_link)
-                            logging.info(f"Cache check result for extracted hash: {is_cached}")
-                            
-                            # Track torrent ID for removal if this is Real-Debrid
-                            from debrid.real_debrid.client import RealDebridProvider
-                            if isinstance(self.debrid_provider, RealDebridProvider) and hasattr(self.debrid_provider, '_all_torrent_ids'):
-                                torrent_id = self.debrid_provider._all_torrent_ids.get(info_hash)
-                                if torrent_id:
-                                    torrent_id_to_remove = torrent_id
-                                    logging.info(f"Tracked torrent ID {torrent_id} for removal")
+            fetched = fetch_torrent_file(url)
+            if not fetched:
+                logging.error(f"Failed to get torrent file from {url}")
+                return None
+            info_hash = fetched[0]
+            logging.info(f"Extracted hash from torrent file: {info_hash}")
                             
-                            return is_cached
-                    except Exception as parse_error:
-                        logging.error(f"Error parsing torrent file: {str(parse_error)}", exc_info=True)
-                        
-                        # Try using the torrent file directly as fallback
-                        logging.info("Falling back to direct torrent file cache check")
-                        is_cached = self.debrid_provider.is_cached(temp_file_path)
-                        logging.info(f"Direct cache check result: {is_cached}")
-                        
-                        # For direct file checks, we don't get the hash so we'll need to look up all recent torrents
-                        # in the Real-Debrid client if applicable
-                        from debrid.real_debrid.client import RealDebridProvider
-                        if isinstance(self.debrid_provider, RealDebridProvider) and hasattr(self.debrid_provider, 'get_all_torrents'):
-                            try:
-                                # Check for recently added torrents (within the last minute)
-                                logging.info("Checking for recently added torrents to remove")
-                                all_torrents = self.debrid_provider.get_all_torrents()
-                                # Find the most recently added torrent within the last minute
-                                import time
-                                current_time = time.time()
-                                for torrent in all_torrents:
-                                    if 'id' in torrent and 'added' in torrent:
-                                        added_time = torrent.get('added', 0)
-                                        # If added within the last minute
-                                        if current_time - added_time < 60:
-                                            torrent_id_to_remove = torrent['id']
-                                            logging.info(f"Found recent torrent ID {torrent_id_to_remove} for removal")
-                                            break
-                            except Exception as e:
-                                logging.error(f"Error finding recent torrents for removal: {str(e)}")
-                        
-                        return is_cached
-                
-                finally:
-                    # Clean up temporary file
-                    try:
-                        os.unlink(temp_file_path)
-                        logging.info(f"Removed temporary file: {temp_file_path}")
-                    except Exception as e:
-                        logging.warning(f"Failed to delete temporary file: {str(e)}")
+            # Check cache using the extracted hash
+            magnet_link = f"magnet:?xt=urn:btih:{info_hash}"
+            logging.info(f"Checking cache with extracted magnet link: {magnet_link}")
+            is_cached = self.debrid_provider.is_cached(magnet_link)
+            logging.info(f"Cache check result for extracted hash: {is_cached}")
             
-            return None
+            # Track torrent ID for removal if this is Real-Debrid
+            from debrid.real_debrid.client import RealDebridProvider
+            if isinstance(self.debrid_provider, RealDebridProvider) and hasattr(self.debrid_provider, '_all_torrent_ids'):
+                torrent_id = self.debrid_provider._all_torrent_ids.get(info_hash)
+                if torrent_id:
+                    torrent_id_to_remove = torrent_id
+                    logging.info(f"Tracked torrent ID {torrent_id} for removal")
+            
+            return is_cached
             
         except Exception as e:
             logging.error(f"Error checking cache for URL: {str(e)}", exc_info=True)
@@ -213,13 +137,13 @@ class TorrentProcessor:
                 except Exception as e:
                     logging.error(f"Error removing torrent {torrent_id_to_remove}: {str(e)}")
             
-    def check_cache(self, magnet_or_url: str, temp_file: Optional[str] = None) -> Optional[bool]:
+    def check_cache(self, magnet_or_url: str, torrent_data: Optional[bytes] = None) -> Optional[bool]:
         """
         Check if a magnet link or torrent file is cached
         
         Args:
             magnet_or_url: Magnet link or URL
-            temp_file: Optional path to torrent file
+            torrent_data: Optional contents of a torrent file
             
         Returns:
             - True: Torrent is cached
@@ -256,8 +180,8 @@ class TorrentProcessor:
                 except Exception as e:
                     logging.error(f"Error extracting hash from magnet link: {e}")
             
-            # If it's a magnet link or we already have a temp file, use the standard method
-            is_cached = self.debrid_provider.is_cached(magnet_or_url, temp_file)
+            # If it's a magnet link or we already have the torrent file, use the standard method
+            is_cached = self.debrid_provider.is_cached(magnet_or_url, torrent_data=torrent_data)
             logging.info(f"Cache check result: {is_cached}")
             
             # Track torrent ID for removal if this is Real-Debrid
@@ -301,7 +225,6 @@ class TorrentProcessor:
         info = None
         max_retries = 3
         retry_delay = 2  # seconds
-        temp_file = None
 
         # Get caller information
         caller_frame = inspect.currentframe().f_back
@@ -309,8 +232,8 @@ class TorrentProcessor:
         logging.info(f"TorrentProcessor.add_to_account called from {caller_info}")
         
         try:
-            magnet, temp_file = self.process_torrent(magnet_or_url)
-            add_response = self.debrid_provider.add_torrent(magnet if magnet else None, temp_file)
+            magnet, torrent_data = self.process_torrent(magnet_or_url)
+            add_response = self.debrid_provider.add_torrent(magnet if magnet else None, torrent_data=torrent_data)
             
             torrent_id = add_response
             if not torrent_id:
@@ -339,12 +262,6 @@ class TorrentProcessor:
             return None
             
         finally:
-            if temp_file:
-                try:
-                    os.unlink(temp_file)
-                except Exception as e:
-                    logging.error(f"Error cleaning up temp file: {str(e)}")
-            
             if torrent_id and (not info or len(info.get('files', [])) == 0):
                 try:
                     logging.info(f"Attempting to remove empty/failed torrent {torrent_id}")
@@ -376,30 +293,144 @@ class TorrentProcessor:
         item_identifier = item.get('title', 'Unknown') if item else 'Unknown'
         logging.info(f"[{item_identifier}] Starting to process {len(results)} results (accept_uncached={accept_uncached})")
         
-        for idx, result in enumerate(results, 1):
-            try:
-                original_link = result.get('magnet') or result.get('link')
-                if not original_link:
+        probes = self._iter_cache_probes(results, accept_uncached, item_identifier)
+        try:
+            return self._select_result(probes, results, accept_uncached, item, item_identifier)
+        finally:
+            # Stops outstanding probes once a winner is picked and cleans up after them
+            probes.close()
+
+    def _get_probe_concurrency(self) -> int:
+        try:
+            return max(1, int(get_setting('Debrid Provider', 'cache_probe_concurrency', 1)))
+        except (TypeError, ValueError):
+            return 1
+
+    def _probe_budget_allows(self, probes_in_flight: int) -> bool:
+        """Whether the provider's API budget covers this many concurrent probes"""
+        domain = urlparse(getattr(self.debrid_provider, 'API_BASE_URL', '')).netloc
+        if not domain:
+            return True
+        return api.rate_limiter.get_remaining(domain) >= probes_in_flight * PROBE_CALL_COST
+
+    def _probe_cache(self, idx: int, result: Dict, total: int, accept_uncached: bool, item_identifier: str) -> Optional[Tuple]:
+        """
+        Prepare a result and check its cache status.
+
+        Returns:
+            (original_link, magnet, torrent_data, is_cached, hash_value, was_tracked), or None if the
+            result can't be checked. was_tracked is whether the provider already tracked a torrent
+            for the hash before this probe.
+        """
+        original_link = result.get('magnet') or result.get('link')
+        if not original_link:
+            return None
+            
+        result_title = result.get('title', 'Unknown title')
+        logging.info(f"[{item_identifier}] [Result {idx}/{total}] Processing: {result_title}")
+        logging.debug(f"[{item_identifier}] [Result {idx}/{total}] Raw result data: {result}")
+        
+        magnet, torrent_data = self.process_torrent(original_link)
+        if not magnet and not torrent_data:
+            logging.warning(f"[{item_identifier}] [Result {idx}/{total}] Failed to process magnet/torrent")
+            return None
+
+        hash_value = extract_hash_from_magnet(magnet) if magnet else extract_hash_from_data(torrent_data)
+        was_tracked = hash_value in getattr(self.debrid_provider, '_all_torrent_ids', {})
+            
+        logging.info(f"[{item_identifier}] [Result {idx}/{total}] PHASE: Cache Check - Starting cache status check")
+        is_cached = self.debrid_provider.is_cached(
+            magnet if not torrent_data else "",
+            torrent_data=torrent_data,
+            result_title=result_title,
+            result_index=f"{idx}/{total}",
+            remove_uncached=not accept_uncached  # Don't remove if we might use it later
+        )
+        return original_link, magnet, torrent_data, is_cached, hash_value, was_tracked
+
+    def _iter_cache_probes(self, results: list[Dict], accept_uncached: bool, item_identifier: str) -> Iterator[Tuple]:
+        """
+        Yield (idx, result, original_link, magnet, torrent_data, is_cached) in rank order.
+
+        With cache_probe_concurrency above 1, up to that many results ahead of the one being
+        decided on are probed concurrently, as far as the provider's API budget allows. Probes
+        still outstanding when the generator is closed are cancelled, or discarded (their
+        speculative torrents removed) once they finish.
+        """
+        total = len(results)
+        concurrency = self._get_probe_concurrency()
+
+        if concurrency <= 1:
+            for idx, result in enumerate(results, 1):
+                try:
+                    outcome = self._probe_cache(idx, result, total, accept_uncached, item_identifier)
+                except Exception as e:
+                    logging.error(f"[{item_identifier}] [Result {idx}/{total}] Error processing result: {str(e)}", exc_info=True)
                     continue
-                    
-                result_title = result.get('title', 'Unknown title')
-                logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] Processing: {result_title}")
-                logging.debug(f"[{item_identifier}] [Result {idx}/{len(results)}] Raw result data: {result}")
-                
-                magnet, temp_file = self.process_torrent(original_link)
-                if not magnet and not temp_file:
-                    logging.warning(f"[{item_identifier}] [Result {idx}/{len(results)}] Failed to process magnet/torrent")
+                if outcome:
+                    yield (idx, result) + outcome[:4]
+            return
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='cache_probe')
+        pending = deque()
+        next_index = 0
+        try:
+            while pending or next_index < total:
+                # Keep the window full; the head of the queue is always submitted so we make progress
+                while next_index < total and len(pending) < concurrency and (not pending or self._probe_budget_allows(len(pending) + 1)):
+                    result = results[next_index]
+                    next_index += 1
+                    pending.append((next_index, result, executor.submit(
+                        self._probe_cache, next_index, result, total, accept_uncached, item_identifier
+                    )))
+
+                idx, result, future = pending.popleft()
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logging.error(f"[{item_identifier}] [Result {idx}/{total}] Error processing result: {str(e)}", exc_info=True)
                     continue
-                    
-                logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] PHASE: Cache Check - Starting cache status check")
-                is_cached = self.debrid_provider.is_cached(
-                    magnet if not temp_file else "",
-                    temp_file,
-                    result_title=result_title,
-                    result_index=f"{idx}/{len(results)}",
-                    remove_uncached=not accept_uncached  # Don't remove if we might use it later
-                )
-                    
+                if outcome:
+                    yield (idx, result) + outcome[:4]
+        finally:
+            if pending:
+                logging.info(f"[{item_identifier}] Stopping {len(pending)} outstanding cache probe(s)")
+            for idx, result, future in pending:
+                if not future.cancel():
+                    future.add_done_callback(lambda f, accept=accept_uncached: self._discard_probe(f, accept))
+            executor.shutdown(wait=False)
+
+    def _discard_probe(self, future, accept_uncached: bool):
+        """Clean up after a probe whose result lost to a higher ranked one"""
+        try:
+            outcome = future.result()
+        except Exception:
+            return
+        if not outcome:
+            return
+        original_link, magnet, torrent_data, is_cached, hash_value, was_tracked = outcome
+        # Cached torrents, and uncached ones when accepting uncached, are left on the account by is_cached
+        kept = is_cached or (is_cached is False and accept_uncached)
+        if not kept or was_tracked or not hash_value:
+            return
+        torrent_id = getattr(self.debrid_provider, '_all_torrent_ids', {}).get(hash_value)
+        if torrent_id:
+            try:
+                self.debrid_provider.remove_torrent(torrent_id, removal_reason="Cache probe lost to a higher ranked result")
+            except Exception as e:
+                logging.error(f"Error removing torrent {torrent_id} from discarded cache probe: {str(e)}")
+
+    def _select_result(
+        self,
+        probes: Iterator[Tuple],
+        results: list[Dict],
+        accept_uncached: bool,
+        item: Optional[Dict],
+        item_identifier: str
+    ) -> Tuple[Optional[Dict], Optional[str]]:
+        """Pick the first acceptable result from the probes, in rank order, and add it"""
+        for idx, result, original_link, magnet, torrent_data, is_cached in probes:
+            try:
                 if is_cached is None:
                     logging.warning(f"[{item_identifier}] [Result {idx}/{len(results)}] Cache check returned None, skipping result")
                     continue
@@ -443,8 +474,8 @@ class TorrentProcessor:
                     hash_value = None
                     if magnet:
                         hash_value = extract_hash_from_magnet(magnet)
-                    elif temp_file:
-                        hash_value = extract_hash_from_file(temp_file)
+                    elif torrent_data:
+                        hash_value = extract_hash_from_data(torrent_data)
                         
                     if hash_value:
                         torrent_id = self.debrid_provider.get_cached_torrent_id(hash_value)
@@ -454,96 +485,89 @@ class TorrentProcessor:
                             torrent_title = self.debrid_provider.get_cached_torrent_title(hash_value)
                 
                 if not info:
-                    magnet, temp_file = self.process_torrent(original_link)
-                    try:
-                        # Extract hash to check if it already exists
+                    magnet, torrent_data = self.process_torrent(original_link)
+                    # Extract hash to check if it already exists
+                    hash_value = None
+                    if magnet:
+                        hash_value = extract_hash_from_magnet(magnet)
+                    elif torrent_data:
+                        hash_value = extract_hash_from_data(torrent_data)
+                        
+                    # Check if this torrent was already added during cache check
+                    existing_torrent_id = None
+                    if hash_value:
+                        existing_torrent_id = self.debrid_provider._all_torrent_ids.get(hash_value)
+                        
+                    if existing_torrent_id:
+                        logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] Reusing existing torrent ID: {existing_torrent_id}")
+                        info = self.debrid_provider.get_torrent_info(existing_torrent_id)
+                    else:
+                        logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] PHASE: Addition - Adding to debrid service")
+                        info = self.add_to_account(original_link)
+                    
+                    if info:
+                        # Extract hash after successful addition
                         hash_value = None
                         if magnet:
                             hash_value = extract_hash_from_magnet(magnet)
-                        elif temp_file:
-                            hash_value = extract_hash_from_file(temp_file)
+                        elif torrent_data:
+                            hash_value = extract_hash_from_data(torrent_data)
+
+                        if hash_value and item:
+                            from database.torrent_tracking import record_torrent_addition, update_torrent_tracking, get_torrent_history
+                            # Prepare item data
+                            item_data = {
+                                'title': item.get('title'),
+                                'type': item.get('type'),
+                                'version': item.get('version'),
+                                'tmdb_id': item.get('tmdb_id'),
+                                'state': item.get('state')
+                            }
                             
-                        # Check if this torrent was already added during cache check
-                        existing_torrent_id = None
-                        if hash_value:
-                            existing_torrent_id = self.debrid_provider._all_torrent_ids.get(hash_value)
+                            # Check recent history for this hash
+                            history = get_torrent_history(hash_value)
                             
-                        if existing_torrent_id:
-                            logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] Reusing existing torrent ID: {existing_torrent_id}")
-                            info = self.debrid_provider.get_torrent_info(existing_torrent_id)
-                        else:
-                            logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] PHASE: Addition - Adding to debrid service")
-                            info = self.add_to_account(original_link)
-                        
-                        if info:
-                            # Extract hash after successful addition
-                            hash_value = None
-                            if magnet:
-                                hash_value = extract_hash_from_magnet(magnet)
-                            elif temp_file:
-                                hash_value = extract_hash_from_file(temp_file)
-
-                            if hash_value and item:
-                                from database.torrent_tracking import record_torrent_addition, update_torrent_tracking, get_torrent_history
-                                # Prepare item data
-                                item_data = {
-                                    'title': item.get('title'),
-                                    'type': item.get('type'),
-                                    'version': item.get('version'),
-                                    'tmdb_id': item.get('tmdb_id'),
-                                    'state': item.get('state')
-                                }
-                                
-                                # Check recent history for this hash
-                                history = get_torrent_history(hash_value)
-                                
-                                # If there's a recent entry, update it instead of creating new one
-                                if history:
-                                    update_torrent_tracking(
-                                        torrent_hash=hash_value,
-                                        item_data=item_data,
-                                        trigger_details={
-                                            'source': 'adding_queue',
-                                            'queue_initiated': True,
-                                            'accept_uncached': accept_uncached,
-                                            'torrent_info': {
-                                                'id': info.get('id'),
-                                                'filename': info.get('filename'),
-                                                'is_cached': is_cached
-                                            }
-                                        },
-                                        trigger_source='queue_add',
-                                        rationale='Added via adding queue processing'
-                                    )
-                                    logging.info(f"[{item_identifier}] Updated existing torrent tracking entry for hash {hash_value}")
-                                else:
-                                    # Record new addition if no history exists
-                                    record_torrent_addition(
-                                        torrent_hash=hash_value,
-                                        trigger_source='queue_add',
-                                        rationale='Added via adding queue processing',
-                                        item_data=item_data,
-                                        trigger_details={
-                                            'source': 'adding_queue',
-                                            'queue_initiated': True,
-                                            'accept_uncached': accept_uncached,
-                                            'torrent_info': {
-                                                'id': info.get('id'),
-                                                'filename': info.get('filename'),
-                                                'is_cached': is_cached
-                                            }
+                            # If there's a recent entry, update it instead of creating new one
+                            if history:
+                                update_torrent_tracking(
+                                    torrent_hash=hash_value,
+                                    item_data=item_data,
+                                    trigger_details={
+                                        'source': 'adding_queue',
+                                        'queue_initiated': True,
+                                        'accept_uncached': accept_uncached,
+                                        'torrent_info': {
+                                            'id': info.get('id'),
+                                            'filename': info.get('filename'),
+                                            'is_cached': is_cached
                                         }
-                                    )
-                                    logging.info(f"[{item_identifier}] Recorded new torrent addition for hash {hash_value}")
-                                    
-                            torrent_title = info.get('filename', '')
-                            logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] Successfully added torrent with ID: {info.get('id')}")
-                    finally:
-                        if temp_file and os.path.exists(temp_file):
-                            try:
-                                os.unlink(temp_file)
-                            except Exception as e:
-                                logging.error(f"[{item_identifier}] [Result {idx}/{len(results)}] Error cleaning up temp file: {str(e)}")
+                                    },
+                                    trigger_source='queue_add',
+                                    rationale='Added via adding queue processing'
+                                )
+                                logging.info(f"[{item_identifier}] Updated existing torrent tracking entry for hash {hash_value}")
+                            else:
+                                # Record new addition if no history exists
+                                record_torrent_addition(
+                                    torrent_hash=hash_value,
+                                    trigger_source='queue_add',
+                                    rationale='Added via adding queue processing',
+                                    item_data=item_data,
+                                    trigger_details={
+                                        'source': 'adding_queue',
+                                        'queue_initiated': True,
+                                        'accept_uncached': accept_uncached,
+                                        'torrent_info': {
+                                            'id': info.get('id'),
+                                            'filename': info.get('filename'),
+                                            'is_cached': is_cached
+                                        }
+                                    }
+                                )
+                                logging.info(f"[{item_identifier}] Recorded new torrent addition for hash {hash_value}")
+                                
+                        torrent_title = info.get('filename', '')
+                        logging.info(f"[{item_identifier}] [Result {idx}/{len(results)}] Successfully added torrent with ID: {info.get('id')}")
             
                 if info:
                     info['title'] = torrent_title or result.get('title', '')
@@ -7,7 +7,7 @@ from queues.scraping_queue import ScrapingQueue
 from queues.adding_queue import AddingQueue
 from settings import get_setting
 from utilities.plex_functions import remove_file_from_plex
-from not_wanted_magnets import is_magnet_not_wanted, is_url_not_wanted
+from not_wanted_magnets import find_not_wanted
 import os
 import pickle
 from pathlib import Path
@@ -238,7 +238,11 @@ class UpgradingQueue:
 
     def update(self):
         self.items = [dict(row) for row in get_all_media_items(state="Upgrading")]
-        for item in self.items:
+        self.prepare_items(self.items)
+
+    def prepare_items(self, items):
+        """Prepare items freshly loaded from the database for this queue"""
+        for item in items:
             if item['id'] not in self.upgrade_times:
                 collected_at = item.get('original_collected_at', datetime.now())
                 self.upgrade_times[item['id']] = {
@@ -452,20 +456,18 @@ class UpgradingQueue:
                 upgrading_percentage_threshold = 0.1
 
             # Apply filtering to all results except our current item
+            not_wanted = set() if item.get('disable_not_wanted_check') else find_not_wanted(
+                result['magnet'] for result in results if result.get('title') != current_title)
             filtered_results = []
             for result in results:
                 # Skip filtering for our current item
                 if result.get('title') == current_title:
                     filtered_results.append(result)
                     continue
-                    
-                if not item.get('disable_not_wanted_check'):
-                    if is_magnet_not_wanted(result['magnet']):
-                        logging.info(f"Result '{result['title']}' filtered out by not_wanted_magnets check")
-                        continue
-                    if is_url_not_wanted(result['magnet']):
-                        logging.info(f"Result '{result['title']}' filtered out by not_wanted_urls check")
-                        continue
+
+                if result['magnet'] in not_wanted:
+                    logging.info(f"Result '{result['title']}' filtered out by not wanted check")
+                    continue
                 filtered_results.append(result)
 
             # Filter out any previously failed upgrades (except our current item)
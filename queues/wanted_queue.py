@@ -12,12 +12,16 @@ class WantedQueue:
 
     def update(self):
         self.items = [dict(row) for row in get_all_media_items(state="Wanted")]
+        self.prepare_items(self.items)
+
+    def prepare_items(self, items: List[Dict[str, Any]]):
+        """Prepare items freshly loaded from the database for this queue"""
         # Move any blacklisted items to blacklisted state before calculating scrape times
-        self.move_blacklisted_items()
-        self._calculate_scrape_times()
+        self.move_blacklisted_items(items)
+        self._calculate_scrape_times(items)
 
-    def _calculate_scrape_times(self):
-        for item in self.items:
+    def _calculate_scrape_times(self, items: List[Dict[str, Any]] = None):
+        for item in (self.items if items is None else items):
             # For early release items without release date, set scrape time to now
             if item.get('early_release', False) and (not item.get('release_date') or str(item.get('release_date')).lower() in ["unknown", "none"]):
                 item['scrape_time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -263,15 +267,18 @@ class WantedQueue:
 
         return True
 
-    def move_blacklisted_items(self):
+    def move_blacklisted_items(self, items: List[Dict[str, Any]] = None):
         """
-        Check all items in the Wanted queue against the blacklist and move any that are blacklisted
+        Check items in the Wanted queue against the blacklist and move any that are blacklisted
         to the Blacklisted state.
+
+        Args:
+            items: Items to check, defaults to the whole queue
         """
         items_to_remove = []
         blacklisted_count = 0
 
-        for item in self.items:
+        for item in (self.items if items is None else items):
             season_number = item.get('season_number') if item.get('type') == 'episode' else None
             is_item_blacklisted = (
                 is_blacklisted(item.get('imdb_id', ''), season_number) or 
@@ -5,6 +5,7 @@ from cli_battery.app.direct_api import DirectAPI
 from config_manager import load_config
 from metadata.metadata import process_metadata
 from database.wanted_items import add_wanted_items
+from task_scheduler import task_scheduler
 import logging
 import re
 
@@ -109,6 +110,7 @@ def request_content():
             
         # Pass versions dictionary to add_wanted_items
         add_wanted_items(all_items, versions)
+        task_scheduler.signal('Wanted')
         
         logging.info(f"Content request processed: TMDB ID {tmdb_id} -> IMDB ID {imdb_id} ({media_type}) with versions {versions}")
         return jsonify({'success': True, 'item': wanted_item})
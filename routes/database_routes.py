@@ -1,6 +1,8 @@
 # File: godver3/cli_debrid/cli_debrid-c51ff53e5123ef56c2eb4bcb3e5f00dbae792c0d/routes/database_routes.py
 
-from flask import jsonify, request, render_template, session, flash, Blueprint, current_app
+from flask import jsonify, request, render_template, session, flash, Blueprint, current_app, Response, stream_with_context
+import csv
+import io
 import sqlite3
 import string
 from database import get_db_connection, get_all_media_items, update_media_item_state
@@ -14,6 +16,8 @@ from reverse_parser import get_version_settings, get_default_version, get_versio
 from .models import admin_required
 from utilities.plex_functions import remove_file_from_plex # This might still be used elsewhere
 from database.database_reading import get_media_item_by_id # This might still be used elsewhere
+from database.media_browser import (DEFAULT_PAGE_SIZE, build_media_filter, fetch_page, iter_media_items,
+                                     media_count_cache)
 import os
 from datetime import datetime
 from time import sleep
@@ -60,6 +64,40 @@ def delete_media_item_api(item_id):
         return jsonify({'error': f'An error occurred during deletion: {str(e)}'}), 500
 
 
+def get_browser_filter(all_columns):
+    """The database browser's filter and sort parameters from the request, validated against all_columns"""
+    filter_column = request.args.get('filter_column', '')
+    filter_value = request.args.get('filter_value', '')
+    sort_column = request.args.get('sort_column', 'id')  # Default sort by id
+    sort_order = request.args.get('sort_order', 'asc')
+    content_type = request.args.get('content_type', 'movie')  # Default to 'movie'
+    current_letter = request.args.get('letter', 'A')
+
+    # Validate sort_column
+    if sort_column not in all_columns:
+        sort_column = 'id'  # Fallback to 'id' if invalid column is provided
+
+    # Validate sort_order
+    if sort_order.lower() not in ['asc', 'desc']:
+        sort_order = 'asc'  # Fallback to 'asc' if invalid order is provided
+
+    if filter_column and filter_value:
+        # Reset content_type and current_letter when custom filter is applied
+        content_type = 'all'
+        current_letter = ''
+
+    where_clauses, params = build_media_filter(all_columns, filter_column, filter_value, content_type, current_letter)
+    return {
+        'filter_column': filter_column,
+        'filter_value': filter_value,
+        'sort_column': sort_column,
+        'sort_order': sort_order,
+        'content_type': content_type,
+        'current_letter': current_letter,
+        'where_clauses': where_clauses,
+        'params': params
+    }
+
 @database_bp.route('/', methods=['GET', 'POST'])
 @admin_required
 def index():
@@ -94,76 +132,33 @@ def index():
         if not selected_columns:
             selected_columns = ['id']
 
-        # Get filter and sort parameters
-        filter_column = request.args.get('filter_column', '')
-        filter_value = request.args.get('filter_value', '')
-        sort_column = request.args.get('sort_column', 'id')  # Default sort by id
-        sort_order = request.args.get('sort_order', 'asc')
-        content_type = request.args.get('content_type', 'movie')  # Default to 'movie'
-        current_letter = request.args.get('letter', 'A')
-
-        # Validate sort_column
-        if sort_column not in all_columns:
-            sort_column = 'id'  # Fallback to 'id' if invalid column is provided
-
-        # Validate sort_order
-        if sort_order.lower() not in ['asc', 'desc']:
-            sort_order = 'asc'  # Fallback to 'asc' if invalid order is provided
+        browser_filter = get_browser_filter(all_columns)
+        selected_columns = [col for col in selected_columns if col in all_columns] or ['id']
 
         # Define alphabet here
         alphabet = list(string.ascii_uppercase)
 
-        # Construct the SQL query
-        query = f"SELECT {', '.join(selected_columns)} FROM media_items"
-        where_clauses = []
-        params = []
-
-        # Apply custom filter if present, otherwise apply content type and letter filters
-        if filter_column and filter_value:
-            where_clauses.append(f"{filter_column} LIKE ?")
-            params.append(f"%{filter_value}%")
-            # Reset content_type and current_letter when custom filter is applied
-            content_type = 'all'
-            current_letter = ''
-        else:
-            if content_type != 'all':
-                where_clauses.append("type = ?")
-                params.append(content_type)
-            
-            if current_letter:
-                if current_letter == '#':
-                    where_clauses.append("title LIKE '0%' OR title LIKE '1%' OR title LIKE '2%' OR title LIKE '3%' OR title LIKE '4%' OR title LIKE '5%' OR title LIKE '6%' OR title LIKE '7%' OR title LIKE '8%' OR title LIKE '9%' OR title LIKE '[%' OR title LIKE '(%' OR title LIKE '{%'")
-                elif current_letter.isalpha():
-                    where_clauses.append("title LIKE ?")
-                    params.append(f"{current_letter}%")
-
-        # Construct the ORDER BY clause safely
-        order_clause = f"ORDER BY {sort_column} {sort_order}"
-
-        # Ensure 'id' is always included in the query, even if not displayed
-        query_columns = list(set(selected_columns + ['id']))
-        
-        # Construct the final query
-        query = f"SELECT {', '.join(query_columns)} FROM media_items"
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-        query += f" {order_clause}"
-
-        # Log the query and parameters for debugging
-        logging.debug(f"Executing query: {query}")
-        logging.debug(f"Query parameters: {params}")
-
-        # Execute the query
-        cursor.execute(query, params)
-        items = cursor.fetchall()
+        # Keyset pagination: each page continues from the cursor of the previous one
+        page = fetch_page(
+            conn, selected_columns, browser_filter['where_clauses'], browser_filter['params'],
+            browser_filter['sort_column'], browser_filter['sort_order'],
+            page_size=request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int),
+            after=request.args.get('after'), before=request.args.get('before')
+        )
+        total_count = media_count_cache.get(conn, browser_filter['where_clauses'], browser_filter['params'])
 
         # Log the number of items fetched
-        logging.debug(f"Fetched {len(items)} items from the database")
+        logging.debug(f"Fetched {len(page['items'])} of {total_count} items from the database")
 
         conn.close()
 
-        # Convert items to a list of dictionaries, always including 'id'
-        items = [dict(zip(query_columns, item)) for item in items]
+        filter_column = browser_filter['filter_column']
+        filter_value = browser_filter['filter_value']
+        sort_column = browser_filter['sort_column']
+        sort_order = browser_filter['sort_order']
+        content_type = browser_filter['content_type']
+        current_letter = browser_filter['current_letter']
+        items = page['items']
 
         # Prepare the data dictionary
         data = {
@@ -176,7 +171,11 @@ def index():
             'sort_order': sort_order,
             'alphabet': alphabet,
             'current_letter': current_letter,
-            'content_type': content_type
+            'content_type': content_type,
+            'total_count': total_count,
+            'page_size': page['page_size'],
+            'next_cursor': page['next_cursor'],
+            'prev_cursor': page['prev_cursor']
         }
 
         if request.args.get('ajax') == '1':
@@ -198,6 +197,65 @@ def index():
         # Remove 'items' from the arguments here
         return render_template('database.html', **{**data, 'items': []})
 
+@database_bp.route('/export')
+@admin_required
+def export_media_items():
+    """
+    Stream every item matching the browser's filters as JSON or CSV (?format=csv),
+    read in keyset batches so the size of the export doesn't matter.
+    """
+    export_format = request.args.get('format', 'json').lower()
+    if export_format not in ('json', 'csv'):
+        return jsonify({'error': f"Unsupported export format: {export_format}"}), 400
+    try:
+        conn = get_db_connection()
+        try:
+            all_columns = [column[1] for column in conn.execute("PRAGMA table_info(media_items)").fetchall()]
+        finally:
+            conn.close()
+        requested_columns = request.args.getlist('columns') or all_columns
+        columns = [col for col in requested_columns if col in all_columns] or ['id']
+        browser_filter = get_browser_filter(all_columns)
+    except sqlite3.Error as e:
+        logging.error(f"SQLite error preparing media items export: {str(e)}")
+        return jsonify({'error': f"Database error: {str(e)}"}), 500
+
+    items = iter_media_items(columns, browser_filter['where_clauses'], browser_filter['params'],
+                             browser_filter['sort_column'], browser_filter['sort_order'])
+
+    def generate_json():
+        yield '['
+        for index, item in enumerate(items):
+            yield (',\n' if index else '\n') + json.dumps({col: item.get(col) for col in columns}, default=str)
+        yield '\n]\n'
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for index, item in enumerate(items, 1):
+            writer.writerow([item.get(col) for col in columns])
+            # Flush in chunks rather than once per row
+            if index % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def log_errors(chunks):
+        try:
+            yield from chunks
+        except Exception as e:
+            logging.error(f"Error streaming media items export: {str(e)}")
+            raise
+
+    filename = f"media_items_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    generate = generate_csv if export_format == 'csv' else generate_json
+    response = Response(stream_with_context(log_errors(generate())),
+                        mimetype='text/csv' if export_format == 'csv' else 'application/json')
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @database_bp.route('/bulk_queue_action', methods=['POST'])
 @login_required
 @admin_required
@@ -345,24 +403,17 @@ def reverse_parser():
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        page = int(request.args.get('page', 1))
         items_per_page = 100
         filter_default = request.args.get('filter_default', 'false').lower() == 'true'
 
-        logging.debug(f"page: {page}, items_per_page: {items_per_page}, filter_default: {filter_default}")
+        logging.debug(f"after: {request.args.get('after')}, items_per_page: {items_per_page}, filter_default: {filter_default}")
 
         # Fetch the latest settings every time
         version_terms = get_version_settings()
         default_version = get_default_version()
         version_order = get_version_order()
 
-        # Construct the base query
-        query = f"""
-            SELECT id, {', '.join(data['selected_columns'])}
-            FROM media_items
-            WHERE state = 'Collected'
-        """
-        
+        where_clauses = ["state = 'Collected'"]
         params = []
 
         # Add filtering logic
@@ -375,23 +426,18 @@ def reverse_parser():
                     params.extend([f"%{term}%" for term in terms])
             
             if version_conditions:
-                query += f" AND NOT ({' OR '.join(version_conditions)})"
-
-        # Add sorting and pagination
-        query += f" ORDER BY {data['sort_column']} {data['sort_order']}"
-        query += f" LIMIT {items_per_page} OFFSET {(page - 1) * items_per_page}"
+                where_clauses.append(f"NOT ({' OR '.join(version_conditions)})")
 
-        logging.debug(f"Executing query: {query}")
-        logging.debug(f"Query parameters: {params}")
-
-        cursor.execute(query, params)
-        items = cursor.fetchall()
+        # Pages are addressed by cursor only: the next page is requested with after=<next_cursor>
+        result = fetch_page(conn, data['selected_columns'], where_clauses, params,
+                            data['sort_column'], data['sort_order'], items_per_page,
+                            after=request.args.get('after'))
 
-        logging.debug(f"Fetched {len(items)} items from the database")
+        logging.debug(f"Fetched {len(result['items'])} items from the database")
 
         conn.close()
 
-        items = [dict(zip(['id'] + data['selected_columns'], item)) for item in items]
+        items = result['items']
 
         # Parse versions using parse_filename_for_version function
         for item in items:
@@ -401,7 +447,7 @@ def reverse_parser():
 
         data.update({
             'items': items,
-            'page': page,
+            'next_cursor': result['next_cursor'],
             'filter_default': filter_default,
             'default_version': default_version,
             'version_terms': version_terms,
@@ -22,7 +22,7 @@ from content_checkers.mdb_list import get_wanted_from_mdblists
 from content_checkers.content_source_detail import append_content_source_detail
 from metadata.metadata import process_metadata, get_metadata
 from cli_battery.app.direct_api import DirectAPI
-from database import add_wanted_items, get_db_connection, bulk_delete_by_id, create_tables, verify_database
+from database import add_wanted_items, get_db_connection, bulk_delete_by_id, create_tables, verify_database, get_media_item_by_id
 from database.torrent_tracking import get_recent_additions, get_torrent_history
 import os
 import glob
@@ -36,12 +36,14 @@ from datetime import datetime, timedelta
 from queue_manager import QueueManager
 from not_wanted_magnets import (
     get_not_wanted_magnets, get_not_wanted_urls,
-    purge_not_wanted_magnets_file, save_not_wanted_magnets,
-    load_not_wanted_urls, save_not_wanted_urls
+    purge_not_wanted_magnets_file, remove_from_not_wanted,
+    remove_from_not_wanted_urls, not_wanted_store
 )
 import json
 from debrid import get_debrid_provider
 import threading
+import importlib
+from collections import namedtuple
 import queue
 import asyncio
 from utilities.plex_functions import get_collected_from_plex
@@ -194,6 +196,10 @@ def delete_database():
             except Exception as e:
                 logging.warning(f"Failed to delete cache file {cache_file}: {str(e)}")
         
+        from content_checkers.content_cache_management import content_source_cache
+        content_source_cache.clear()
+        not_wanted_store.clear()
+
         # Delete not wanted files
         for not_wanted_file in not_wanted_files:
             file_path = os.path.join(db_content_dir, not_wanted_file)
@@ -774,26 +780,65 @@ def get_wanted_content():
 
 @debug_bp.route('/api/rate_limit_info')
 def get_rate_limit_info():
+    window_names = {60: 'minute', 300: 'five_minute', 3600: 'hourly'}
     rate_limit_info = {}
-    current_time = time.time()
     
     for domain in api.monitored_domains:
-        hourly_calls = [t for t in api.rate_limiter.hourly_calls[domain] if t > current_time - 3600]
-        five_minute_calls = [t for t in api.rate_limiter.five_minute_calls[domain] if t > current_time - 300]
-        
         rate_limit_info[domain] = {
-            'five_minute': {
-                'count': len(five_minute_calls),
-                'limit': api.rate_limiter.five_minute_limit
-            },
-            'hourly': {
-                'count': len(hourly_calls),
-                'limit': api.rate_limiter.hourly_limit
-            }
+            window_names.get(seconds, f'{seconds}s'): usage
+            for seconds, usage in api.rate_limiter.get_budget(domain).items()
         }
     
     return jsonify(rate_limit_info)
 
+# Caches and stores with stats on the debug page: name -> where the instance lives, the method that
+# clears it and the request fields passed to that method (no method if it can't be cleared from here)
+DebugStore = namedtuple('DebugStore', ['module', 'attribute', 'clear_method', 'clear_fields', 'stats_flags'],
+                        defaults=[None, (), ()])
+DEBUG_STORES = {
+    'scrape_cache': DebugStore('scraper.scrape_cache', 'scrape_cache', 'invalidate', ('imdb_id',)),
+    'cache_status': DebugStore('debrid.common.cache_status', 'cache_status_store', 'invalidate', ('provider', 'info_hash')),
+    'torrent_file_cache': DebugStore('debrid.common.torrent_cache', 'torrent_file_cache', 'clear'),
+    'metadata_cache': DebugStore('cli_battery.app.metadata_cache', 'metadata_cache', 'invalidate'),
+    'content_source_cache': DebugStore('content_checkers.content_cache_management', 'content_source_cache', 'clear', ('source_id',)),
+    'library_index': DebugStore('utilities.library_index', 'library_index', stats_flags=('check',)),
+    'not_wanted': DebugStore('not_wanted_magnets', 'not_wanted_store'),
+    'media_count_cache': DebugStore('database.media_browser', 'media_count_cache', 'clear'),
+    'queue_stream': DebugStore('routes.queues_routes', 'queue_stream_broadcaster'),
+}
+
+def get_debug_store(name):
+    # Imported on request, several of these modules are heavy or import this one
+    store = DEBUG_STORES[name]
+    return getattr(importlib.import_module(store.module), store.attribute)
+
+@debug_bp.route('/api/<store_name>_stats')
+def get_store_stats(store_name):
+    if store_name not in DEBUG_STORES:
+        return jsonify({'error': f'Unknown store: {store_name}'}), 404
+    flags = {flag: request.args.get(flag) == 'true' for flag in DEBUG_STORES[store_name].stats_flags}
+    return jsonify(get_debug_store(store_name).get_stats(**flags))
+
+@debug_bp.route('/api/<store_name>/clear', methods=['POST'])
+@admin_required
+def clear_store(store_name):
+    store = DEBUG_STORES.get(store_name)
+    if store is None or store.clear_method is None:
+        return jsonify({'success': False, 'error': f'Unknown store: {store_name}'}), 404
+    data = (request.json or {}) if request.is_json else {}
+    filters = {field: data[field] for field in store.clear_fields if data.get(field)}
+    removed = getattr(get_debug_store(store_name), store.clear_method)(**filters)
+    return jsonify({'success': True, 'removed': removed})
+
+@debug_bp.route('/api/library_index/rebuild', methods=['POST'])
+@admin_required
+def rebuild_library_index():
+    from utilities.library_index import get_library_roots, rebuild_library_index as rebuild
+    roots = get_library_roots()
+    # Listing a large mount can take minutes, so rebuild in the background
+    threading.Thread(target=rebuild, args=(roots,), daemon=True).start()
+    return jsonify({'success': True, 'roots': roots})
+
 @debug_bp.route('/rescrape_item', methods=['POST'])
 def rescrape_item():
     item_id = request.json.get('item_id')
@@ -802,6 +847,11 @@ def rescrape_item():
 
     try:
         move_item_to_wanted(item_id)
+        # The rescrape has to ask the scrapers again rather than reuse cached results
+        from scraper.scrape_cache import scrape_cache
+        item = get_media_item_by_id(item_id)
+        if item and item.get('imdb_id'):
+            scrape_cache.invalidate(item['imdb_id'])
         return jsonify({'success': True, 'message': 'Item moved to Wanted queue for rescraping'}), 200
     except Exception as e:
         logging.error(f"Error moving item to Wanted queue: {str(e)}")
@@ -1071,10 +1121,7 @@ def remove_not_wanted_magnet():
     """Remove a magnet from the not wanted list."""
     magnet = request.form.get('magnet')
     if magnet:
-        magnets = get_not_wanted_magnets()
-        if magnet in magnets:
-            magnets.remove(magnet)
-            save_not_wanted_magnets(magnets)
+        if remove_from_not_wanted(magnet):
             flash('Magnet removed from not wanted list.', 'success')
         else:
             flash('Magnet not found in not wanted list.', 'error')
@@ -1085,10 +1132,7 @@ def remove_not_wanted_url():
     """Remove a URL from the not wanted list."""
     url = request.form.get('url')
     if url:
-        urls = get_not_wanted_urls()
-        if url in urls:
-            urls.remove(url)
-            save_not_wanted_urls(urls)
+        if remove_from_not_wanted_urls(url):
             flash('URL removed from not wanted list.', 'success')
         else:
             flash('URL not found in not wanted list.', 'error')
@@ -1098,9 +1142,7 @@ def remove_not_wanted_url():
 def purge_not_wanted():
     """Purge all not wanted magnets and URLs."""
     try:
-        # Create empty sets for both magnets and URLs
-        save_not_wanted_magnets(set())
-        save_not_wanted_urls(set())
+        not_wanted_store.clear()
         flash('All not wanted items have been purged.', 'success')
     except Exception as e:
         flash(f'Error purging not wanted items: {str(e)}', 'error')
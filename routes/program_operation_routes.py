@@ -564,6 +564,7 @@ def get_task_timings():
 
     current_time = time.time()
     task_timings = {}
+    wall_times = program_runner.task_executor.get_task_stats()
     
     # Get all task intervals and their last run times
     for task, interval in program_runner.task_intervals.items():
@@ -583,7 +584,9 @@ def get_task_timings():
             },
             "interval": interval,
             "last_run": last_run,
-            "enabled": task in program_runner.enabled_tasks
+            "enabled": task in program_runner.enabled_tasks,
+            "running": task in program_runner.currently_running_tasks,
+            "wall_time": wall_times.get(task)
         }
 
     # Group tasks by type
@@ -8,7 +8,9 @@ from initialization import get_initialization_status
 from cli_battery.app.limiter import limiter
 from settings import get_setting
 import json
+import threading
 import time
+from collections import deque
 
 queues_bp = Blueprint('queues', __name__)
 queue_manager = QueueManager()
@@ -228,19 +230,23 @@ def api_queue_contents():
         "initialization_status": initialization_status
     })
 
-def process_item_for_response(item, queue_name):
+def get_response_scraping_versions():
+    scraping_versions = get_setting('Scraping', 'versions', {})
+    # Handle Infinity values in scraping_versions
+    for version in scraping_versions.values():
+        if isinstance(version, dict):
+            for key, value in version.items():
+                if value == float('inf'):
+                    version[key] = "Infinity"
+                elif value == float('-inf'):
+                    version[key] = "-Infinity"
+    return scraping_versions
+
+def process_item_for_response(item, queue_name, scraping_versions=None):
     try:
         # Add scraping version settings to each item
-        scraping_versions = get_setting('Scraping', 'versions', {})
-        # Handle Infinity values in scraping_versions
-        for version in scraping_versions.values():
-            if isinstance(version, dict):
-                for key, value in version.items():
-                    if value == float('inf'):
-                        version[key] = "Infinity"
-                    elif value == float('-inf'):
-                        version[key] = "-Infinity"
-        
+        if scraping_versions is None:
+            scraping_versions = get_response_scraping_versions()
         item['scraping_versions'] = scraping_versions
         
         if queue_name == 'Upgrading':
@@ -307,80 +313,269 @@ def process_item_for_response(item, queue_name):
             'error': str(e)
         }
 
+STREAM_ITEMS_LIMIT = 500  # Fixed limit of 500 items per queue
+
+def get_stream_item_key(item):
+    """Identity of an item across stream updates; consolidated items have no id"""
+    if item.get('id') is not None:
+        return str(item['id'])
+    return f"{item.get('title')}_{item.get('year', 'Unknown')}"
+
+def build_queue_snapshot(items_limit=STREAM_ITEMS_LIMIT):
+    """
+    The queue view shown on the queues page: the first items_limit items of every
+    queue keyed by get_stream_item_key, the queue sizes and the program state.
+    """
+    queue_contents = queue_manager.get_queue_contents()
+    program_running = program_is_running()
+    program_initializing = program_is_initializing()
+
+    # Get initialization status
+    initialization_status = None
+    if program_initializing:
+        status = get_initialization_status()
+        if status:
+            initialization_status = {
+                'current_step': status.get('current_step', ''),
+                'total_steps': status.get('total_steps', 4),
+                'current_step_number': status.get('current_step_number', 0),
+                'progress_value': status.get('progress_value', 0),
+                'substep_details': status.get('substep_details', ''),
+                'error_details': status.get('error_details', None),
+                'is_substep': status.get('is_substep', False),
+                'current_phase': status.get('current_phase', None)
+            }
+
+    # Shared by every item instead of being read from the settings per item
+    scraping_versions = get_response_scraping_versions()
+    contents = {}
+    queue_counts = {}
+    hidden_counts = {}
+    for queue_name, items in queue_contents.items():
+        total_count = len(items)
+        queue_counts[queue_name] = total_count
+        hidden_count = max(0, total_count - items_limit)
+        if hidden_count > 0:
+            hidden_counts[queue_name] = hidden_count
+
+        # Copies, so the queues' own items aren't rewritten and the next build can be compared to this one
+        processed_items = [process_item_for_response(dict(item), queue_name, scraping_versions)
+                           for item in items[:items_limit]]
+        # Pre-consolidate data for specific queues
+        if queue_name in ('Blacklisted', 'Unreleased'):
+            processed_items, _ = consolidate_items(processed_items)
+        contents[queue_name] = {get_stream_item_key(item): item for item in processed_items}
+
+    return {
+        "contents": contents,
+        "queue_counts": queue_counts,
+        "hidden_counts": hidden_counts,
+        "program_running": program_running,
+        "program_initializing": program_initializing,
+        "initialization_status": initialization_status
+    }
+
+def diff_queue_snapshots(old, new):
+    """
+    The changes that turn snapshot old into new, or None when they are the same.
+    Per queue: items added and changed by key, keys removed, and the full key order
+    when items were added or moved. Other fields are included only when they changed.
+    """
+    delta = {}
+    queues = {}
+    old_contents = old['contents']
+    new_contents = new['contents']
+    for queue_name in list(old_contents) + [name for name in new_contents if name not in old_contents]:
+        old_items = old_contents.get(queue_name, {})
+        new_items = new_contents.get(queue_name, {})
+        added = {key: item for key, item in new_items.items() if key not in old_items}
+        changed = {key: item for key, item in new_items.items() if key in old_items and old_items[key] != item}
+        removed = [key for key in old_items if key not in new_items]
+        moved = [key for key in new_items if key in old_items] != [key for key in old_items if key in new_items]
+        if not (added or changed or removed or moved):
+            continue
+        queue_delta = {'added': added, 'changed': changed, 'removed': removed}
+        if added or moved:
+            queue_delta['order'] = list(new_items)
+        queues[queue_name] = queue_delta
+    if queues:
+        delta['queues'] = queues
+    for field, value in new.items():
+        if field != 'contents' and old.get(field) != value:
+            delta[field] = value
+    return delta or None
+
+class QueueStreamBroadcaster:
+    """
+    Builds the queue view once per interval for every connected queue stream and
+    publishes only what changed since the previous build. Each change bumps version;
+    subscribers get a snapshot first and deltas after it. A subscriber that falls
+    further behind than the kept history, or reconnects with a version that is no
+    longer kept, is sent a fresh snapshot instead. The producer thread runs only
+    while someone is subscribed.
+    """
+
+    INTERVAL_SECONDS = 1
+    HISTORY_SIZE = 30
+    KEEPALIVE_SECONDS = 15
+
+    def __init__(self, build_snapshot=build_queue_snapshot):
+        self._build_snapshot = build_snapshot
+        self._condition = threading.Condition()
+        self._thread = None
+        self._subscribers = 0
+        self._state = None
+        # Versions start from the clock so a client reconnecting after a restart can't resume from the wrong base
+        self._version = int(time.time())
+        self._sequence = 0
+        # (sequence, version, payload); a None payload means subscribers need a snapshot
+        self._messages = deque(maxlen=self.HISTORY_SIZE)
+        self._snapshot_payload = None
+        self._stats = {'builds': 0, 'unchanged_builds': 0, 'versions': 0, 'snapshots_sent': 0, 'deltas_sent': 0}
+
+    def _ensure_producer(self):
+        # Called with the condition held
+        if self._thread is None:
+            # Whatever was built before the producer went idle is stale
+            self._state = None
+            self._snapshot_payload = None
+            self._thread = threading.Thread(target=self._run, name='queue-stream-producer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self.publish_once()
+            time.sleep(self.INTERVAL_SECONDS)
+
+    def _append(self, payload):
+        # Called with the condition held
+        self._sequence += 1
+        self._messages.append((self._sequence, self._version, payload))
+        self._condition.notify_all()
+
+    def publish_once(self):
+        """Build the queue view and publish it if it differs from the last one"""
+        try:
+            state = self._build_snapshot()
+        except Exception as e:
+            logging.error(f"Error in queue stream: {str(e)}")
+            with self._condition:
+                self._append(json.dumps({'type': 'error', 'success': False, 'error': str(e)}))
+            return
+
+        with self._condition:
+            self._stats['builds'] += 1
+            previous = self._state
+            delta = diff_queue_snapshots(previous, state) if previous is not None else None
+            if previous is not None and delta is None:
+                self._stats['unchanged_builds'] += 1
+                return
+            self._version += 1
+            self._stats['versions'] += 1
+            self._state = state
+            self._snapshot_payload = None
+            if delta is None:
+                self._append(None)
+            else:
+                self._append(json.dumps(dict(delta, type='delta', version=self._version,
+                                             base_version=self._version - 1), default=str))
+
+    def _get_snapshot_payload(self):
+        # Called with the condition held; serialised once per version however many clients join
+        if self._snapshot_payload is None:
+            state = self._state
+            snapshot = {field: value for field, value in state.items() if field != 'contents'}
+            snapshot.update({
+                'type': 'snapshot',
+                'version': self._version,
+                'contents': {queue_name: list(items.values()) for queue_name, items in state['contents'].items()},
+                'keys': {queue_name: list(items) for queue_name, items in state['contents'].items()},
+            })
+            self._snapshot_payload = json.dumps(snapshot, default=str)
+        return self._snapshot_payload
+
+    def _resume_cursor(self, since_version):
+        # Called with the condition held: the sequence after which since_version's successors start
+        if since_version == self._version:
+            return self._sequence
+        for sequence, version, payload in self._messages:
+            if version > since_version:
+                return sequence - 1 if version == since_version + 1 else None
+        return None
+
+    def _pending(self, cursor):
+        # Called with the condition held: the (version, payload) pairs published after cursor
+        pending = [(version, payload) for sequence, version, payload in self._messages if sequence > cursor]
+        lagged = not self._messages or self._messages[0][0] > cursor + 1
+        if lagged or any(payload is None for _, payload in pending):
+            self._stats['snapshots_sent'] += 1
+            return [(self._version, self._get_snapshot_payload())]
+        self._stats['deltas_sent'] += len(pending)
+        return pending
+
+    def stream(self, since_version=None):
+        """
+        Server-sent events for one subscriber. since_version is the last version the
+        client applied, when it is reconnecting, so it can resume from the deltas.
+        """
+        with self._condition:
+            self._subscribers += 1
+            self._ensure_producer()
+        try:
+            cursor = None
+            while True:
+                with self._condition:
+                    if cursor is None:
+                        if self._condition.wait_for(lambda: self._state is not None, timeout=self.KEEPALIVE_SECONDS):
+                            cursor = self._resume_cursor(since_version) if since_version is not None else None
+                            if cursor is None:
+                                self._stats['snapshots_sent'] += 1
+                                messages = [(self._version, self._get_snapshot_payload())]
+                            else:
+                                messages = self._pending(cursor)
+                            cursor = self._sequence
+                        else:
+                            messages = []
+                    else:
+                        self._condition.wait_for(lambda: self._sequence > cursor, timeout=self.KEEPALIVE_SECONDS)
+                        messages = self._pending(cursor) if self._sequence > cursor else []
+                        cursor = self._sequence
+                if not messages:
+                    # Lets the server notice disconnected clients
+                    yield ": keepalive\n\n"
+                for version, payload in messages:
+                    yield f"id: {version}\ndata: {payload}\n\n"
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({'subscribers': self._subscribers, 'version': self._version,
+                          'producer_running': self._thread is not None})
+        stats['change_rate'] = stats['versions'] / stats['builds'] if stats['builds'] else 0.0
+        return stats
+
+queue_stream_broadcaster = QueueStreamBroadcaster()
+
 @queues_bp.route('/api/queue-stream')
 @user_required
 def queue_stream():
-    """Stream queue updates with a fixed limit of 500 items per queue."""
-    ITEMS_LIMIT = 500  # Fixed limit of 500 items per queue
+    """Stream the queues: a snapshot on connect, then deltas from the shared producer."""
+    since_version = request.headers.get('Last-Event-ID') or request.args.get('version')
+    try:
+        since_version = int(since_version) if since_version else None
+    except ValueError:
+        since_version = None
 
     def generate():
-        while True:
-            try:
-                queue_contents = queue_manager.get_queue_contents()
-                program_running = program_is_running()
-                program_initializing = program_is_initializing()
-                
-                # Get initialization status
-                initialization_status = None
-                if program_initializing:
-                    status = get_initialization_status()
-                    if status:
-                        initialization_status = {
-                            'current_step': status.get('current_step', ''),
-                            'total_steps': status.get('total_steps', 4),
-                            'current_step_number': status.get('current_step_number', 0),
-                            'progress_value': status.get('progress_value', 0),
-                            'substep_details': status.get('substep_details', ''),
-                            'error_details': status.get('error_details', None),
-                            'is_substep': status.get('is_substep', False),
-                            'current_phase': status.get('current_phase', None)
-                        }
-                
-                # Process all queues with their specific logic
-                queue_counts = {}
-                hidden_counts = {}
-                for queue_name, items in queue_contents.items():
-                    # Store total count
-                    total_count = len(items)
-                    queue_counts[queue_name] = total_count
-                    
-                    # Calculate hidden items
-                    hidden_count = max(0, total_count - ITEMS_LIMIT)
-                    if hidden_count > 0:
-                        hidden_counts[queue_name] = hidden_count
-                    
-                    # Apply fixed limit to items
-                    limited_items = items[:ITEMS_LIMIT]
-                    
-                    # Process each item in the queue
-                    processed_items = [process_item_for_response(item, queue_name) for item in limited_items]
-                    queue_contents[queue_name] = processed_items
-                    
-                    # Pre-consolidate data for specific queues
-                    if queue_name == 'Blacklisted':
-                        items, _ = consolidate_items(processed_items)
-                        queue_contents[queue_name] = items
-                    elif queue_name == 'Unreleased':
-                        items, _ = consolidate_items(processed_items)
-                        queue_contents[queue_name] = items
-
-                data = {
-                    "contents": queue_contents,
-                    "queue_counts": queue_counts,
-                    "hidden_counts": hidden_counts,
-                    "program_running": program_running,
-                    "program_initializing": program_initializing,
-                    "initialization_status": initialization_status
-                }
-                
-                yield f"data: {json.dumps(data, default=str)}\n\n"
-                    
-            except Exception as e:
-                logging.error(f"Error in queue stream: {str(e)}")
-                yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
-            
-            time.sleep(1)  # Check for updates every second
-    
+        yield from queue_stream_broadcaster.stream(since_version)
+
     response = Response(generate(), mimetype='text/event-stream')
     response.headers.update({
         'Cache-Control': 'no-cache',
@@ -20,7 +20,7 @@ import requests
 import tempfile
 import os
 import bencodepy
-from debrid.common.torrent import torrent_to_magnet
+from debrid.common.torrent import torrent_to_magnet, fetch_torrent_file
 import hashlib
 from datetime import datetime, timezone, timedelta
 from database.torrent_tracking import record_torrent_addition, get_torrent_history, update_torrent_tracking
@@ -166,104 +166,83 @@ def add_torrent_to_debrid():
         obfuscated_link = obfuscate_magnet_link(magnet_link)
         logging.info(f"Link: {obfuscated_link}")
 
-        temp_file = None
+        torrent_data = None
+        file_hash = None
         # If it's a URL rather than a magnet link
         if magnet_link.startswith('http'):
-            try:
-                # For Jackett URLs or any other torrent URLs, download to temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.torrent') as tmp:
-                    response = requests.get(magnet_link, timeout=30)
-                    response.raise_for_status()
-                    tmp.write(response.content)
-                    tmp.flush()
-                    temp_file = tmp.name
-                    logging.info("Downloaded torrent file")
-            except Exception as e:
-                error_message = str(e)
+            # For Jackett URLs or any other torrent URLs, get the torrent file (cached by URL)
+            fetched = fetch_torrent_file(magnet_link)
+            if not fetched:
+                error_message = "Failed to download torrent file"
                 logging.error(f"Failed to process torrent URL: {error_message}")
-                if temp_file and os.path.exists(temp_file):
-                    try:
-                        os.unlink(temp_file)
-                    except Exception as e:
-                        logging.warning(f"Failed to delete temp file {temp_file}: {e}")
                 return jsonify({'error': error_message}), 400
+            file_hash, torrent_data = fetched
+            logging.info("Downloaded torrent file")
 
         # Add magnet/torrent to debrid provider
         debrid_provider = get_debrid_provider()
-        try:
-            torrent_id = debrid_provider.add_torrent(magnet_link, temp_file)
-            logging.info(f"Torrent result: {torrent_id}")
-            
-            if not torrent_id:
-                error_message = "Failed to add torrent to debrid provider"
-                logging.error(error_message)
-                return jsonify({'error': error_message}), 500
-
-            # Extract torrent hash from magnet link or torrent file
-            torrent_hash = None
-            if magnet_link.startswith('magnet:'):
-                # Extract hash from magnet link
-                hash_match = re.search(r'btih:([a-fA-F0-9]{40})', magnet_link)
-                if hash_match:
-                    torrent_hash = hash_match.group(1).lower()
-            elif temp_file:
-                # Extract hash from torrent file
-                with open(temp_file, 'rb') as f:
-                    torrent_data = bencodepy.decode(f.read())
-                    info = torrent_data[b'info']
-                    torrent_hash = hashlib.sha1(bencodepy.encode(info)).hexdigest()
-
-            # Record the torrent addition only if it hasn't been recorded in the last minute
-            if torrent_hash:
-                # Check recent history for this hash
-                history = get_torrent_history(torrent_hash)
-                
-                # Prepare item data
-                item_data = {
-                    'title': title,
-                    'year': year,
-                    'media_type': media_type,
-                    'season': season_number,
-                    'episode': episode_number,
-                    'version': version,
-                    'tmdb_id': tmdb_id,
-                    'genres': genres
-                }
-
-                # If there's a recent entry, update it instead of creating new one
-                if history:
-                    update_torrent_tracking(
-                        torrent_hash=torrent_hash,
-                        item_data=item_data,
-                        trigger_details={
-                            'source': 'web_interface',
-                            'user_initiated': True
-                        },
-                        trigger_source='manual_add',
-                        rationale='User manually added via web interface'
-                    )
-                    logging.info(f"Updated existing torrent tracking entry for {title} (hash: {torrent_hash})")
-                else:
-                    # Record new addition if no history exists
-                    record_torrent_addition(
-                        torrent_hash=torrent_hash,
-                        trigger_source='manual_add',
-                        rationale='User manually added via web interface',
-                        item_data=item_data,
-                        trigger_details={
-                            'source': 'web_interface',
-                            'user_initiated': True
-                        }
-                    )
-                    logging.info(f"Recorded new torrent addition for {title} with hash {torrent_hash}")
+        torrent_id = debrid_provider.add_torrent(magnet_link, torrent_data=torrent_data)
+        logging.info(f"Torrent result: {torrent_id}")
+        
+        if not torrent_id:
+            error_message = "Failed to add torrent to debrid provider"
+            logging.error(error_message)
+            return jsonify({'error': error_message}), 500
 
-        finally:
-            # Clean up temp file if it exists
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except Exception as e:
-                    logging.warning(f"Failed to delete temp file {temp_file}: {e}")
+        # Extract torrent hash from magnet link or torrent file
+        torrent_hash = None
+        if magnet_link.startswith('magnet:'):
+            # Extract hash from magnet link
+            hash_match = re.search(r'btih:([a-fA-F0-9]{40})', magnet_link)
+            if hash_match:
+                torrent_hash = hash_match.group(1).lower()
+        elif file_hash:
+            # Hash of the downloaded torrent file
+            torrent_hash = file_hash
+
+        # Record the torrent addition only if it hasn't been recorded in the last minute
+        if torrent_hash:
+            # Check recent history for this hash
+            history = get_torrent_history(torrent_hash)
+            
+            # Prepare item data
+            item_data = {
+                'title': title,
+                'year': year,
+                'media_type': media_type,
+                'season': season_number,
+                'episode': episode_number,
+                'version': version,
+                'tmdb_id': tmdb_id,
+                'genres': genres
+            }
+
+            # If there's a recent entry, update it instead of creating new one
+            if history:
+                update_torrent_tracking(
+                    torrent_hash=torrent_hash,
+                    item_data=item_data,
+                    trigger_details={
+                        'source': 'web_interface',
+                        'user_initiated': True
+                    },
+                    trigger_source='manual_add',
+                    rationale='User manually added via web interface'
+                )
+                logging.info(f"Updated existing torrent tracking entry for {title} (hash: {torrent_hash})")
+            else:
+                # Record new addition if no history exists
+                record_torrent_addition(
+                    torrent_hash=torrent_hash,
+                    trigger_source='manual_add',
+                    rationale='User manually added via web interface',
+                    item_data=item_data,
+                    trigger_details={
+                        'source': 'web_interface',
+                        'user_initiated': True
+                    }
+                )
+                logging.info(f"Recorded new torrent addition for {title} with hash {torrent_hash}")
 
         # Get torrent info for processing
         if isinstance(debrid_provider, RealDebridProvider):
@@ -808,6 +787,7 @@ def run_scrape():
         modified_settings = data.get('modifiedSettings', {})
         genres = data.get('genres', [])
         skip_cache_check = data.get('skip_cache_check', False)  # Default to NOT skipping cache check
+        bypass_scrape_cache = data.get('bypass_scrape_cache', True)  # Fresh scraper results unless the caller opts in to the cache
         
         if media_type == 'episode':
             season = int(data.get('season', 1))  # Convert to int, default to 1
@@ -826,7 +806,8 @@ def run_scrape():
         
         # Run first scrape with current settings
         original_results, _ = scrape(
-            imdb_id, tmdb_id, title, year, media_type, version, season, episode, multi, genres, skip_cache_check
+            imdb_id, tmdb_id, title, year, media_type, version, season, episode, multi, genres, skip_cache_check,
+            bypass_scrape_cache=bypass_scrape_cache
         )
 
         # Update version settings with modified settings
@@ -848,7 +829,8 @@ def run_scrape():
         config['Scraping']['versions'][version] = updated_version_settings
         save_config(config)
 
-        # Run second scrape with modified settings
+        # Run second scrape with modified settings; the raw results come from the
+        # scrape cache filled by the first run, so this only re-filters and re-ranks
         try:
             adjusted_results, _ = scrape(
                 imdb_id, tmdb_id, title, year, media_type, version, season, episode, multi, genres, skip_cache_check
@@ -10,7 +10,7 @@ from content_checkers.collected import get_wanted_from_collected
 from content_checkers.plex_rss_watchlist import get_wanted_from_plex_rss, get_wanted_from_friends_plex_rss
 from content_checkers.plex_watchlist import get_wanted_from_plex_watchlist, get_wanted_from_other_plex_watchlist, validate_plex_tokens
 from content_checkers.trakt import get_wanted_from_trakt_lists, get_wanted_from_trakt_watchlist, get_wanted_from_trakt_collection, get_wanted_from_friend_trakt_watchlist
-from metadata.metadata import process_metadata, refresh_release_dates, get_runtime, get_episode_airtime
+from metadata.metadata import process_metadata, process_metadata_batches, refresh_release_dates, get_runtime, get_episode_airtime
 from content_checkers.mdb_list import get_wanted_from_mdblists
 from content_checkers.content_source_detail import append_content_source_detail
 from database import add_collected_items, add_wanted_items
@@ -30,21 +30,32 @@ from content_checkers.trakt import check_trakt_early_releases
 from debrid.base import TooManyDownloadsError, RateLimitError
 import tempfile
 from api_tracker import api  # Add this import for the api module
+from task_scheduler import task_scheduler
+from task_executor import TaskExecutor, RunningTasks, get_task_concurrency_class, INLINE
 from plexapi.server import PlexServer
 from database.core import get_db_connection
 import json
 from utilities.post_processing import handle_state_change
 from content_checkers.content_cache_management import (
     load_source_cache, save_source_cache, 
-    should_process_item, update_cache_for_item
+    should_process_item, update_cache_for_item,
+    load_sync_state, save_sync_state
 )
 
 queue_logger = logging.getLogger('queue_logger')
 program_runner = None
 
+QUEUE_TASKS = ['Wanted', 'Scraping', 'Adding', 'Checking', 'Sleeping', 'Unreleased', 'Blacklisted', 'Pending Uncached', 'Upgrading']
+
 class ProgramRunner:
     _instance = None
 
+    # Longest the main loop sleeps when nothing is due, so housekeeping such as
+    # the heartbeat and connectivity checks keeps running while idle
+    MAX_IDLE_WAIT = 30
+    # Delay before retrying a task that was due but could not start
+    TASK_RETRY_DELAY = 1
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ProgramRunner, cls).__new__(cls)
@@ -57,7 +68,8 @@ class ProgramRunner:
         self._initialized = True
         self.running = False
         self.initializing = False
-        self.currently_running_tasks = set()  # Track which tasks are currently running
+        self.currently_running_tasks = RunningTasks()  # Per-task locks for tasks that are currently running
+        self.task_executor = TaskExecutor()
         self.pause_reason = None  # Track why the queue is paused
         self.connectivity_failure_time = None  # Track when connectivity failed
         self.connectivity_retry_count = 0  # Track number of retries
@@ -194,6 +206,9 @@ class ProgramRunner:
         self.content_sources = None
         self.file_location_cache = {}  # Cache to store known file locations
 
+        self.scheduler = task_scheduler
+        self.sync_schedule()
+
     def task_heartbeat(self):
         random_number = random.randint(1, 100)
         if self.running:
@@ -260,16 +275,73 @@ class ProgramRunner:
 
         return self.content_sources
         
-    def should_run_task(self, task_name):
-        if task_name not in self.enabled_tasks or task_name in self.currently_running_tasks:
+    def should_run_task(self, task_name, force=False):
+        if task_name not in self.enabled_tasks:
             return False
         current_time = time.time()
         time_since_last_run = current_time - self.last_run_times[task_name]
-        should_run = time_since_last_run >= self.task_intervals[task_name]
-        if should_run:
-            self.last_run_times[task_name] = current_time
-            self.currently_running_tasks.add(task_name)  # Mark task as running
-        return should_run
+        if not (force or time_since_last_run >= self.task_intervals[task_name]):
+            return False
+        # Acquiring the task's lock marks it as running; fails if a previous run is still going
+        if not self.currently_running_tasks.try_acquire(task_name):
+            return False
+        self.last_run_times[task_name] = current_time
+        self.scheduler.schedule(task_name, current_time + self.task_intervals[task_name])
+        return True
+
+    def parallel_tasks_enabled(self):
+        return get_setting('Debug', 'parallel_task_execution', False)
+
+    def start_task(self, task_name, func, force=False):
+        """Start a due task, inline on the main loop or on the task executor's worker pool.
+
+        The task's running lock (taken in should_run_task) is released once it finishes.
+        Returns False if the task did not start, either because should_run_task declined
+        or because its concurrency class has no free worker; sync_schedule retries it.
+        """
+        concurrency_class = get_task_concurrency_class(task_name)
+        if concurrency_class == INLINE or not self.parallel_tasks_enabled():
+            if not self.should_run_task(task_name, force=force):
+                return False
+            try:
+                self.task_executor.run(task_name, func)
+            finally:
+                self.currently_running_tasks.release(task_name)
+            return True
+
+        if not self.task_executor.try_reserve(concurrency_class):
+            return False
+        if not self.should_run_task(task_name, force=force):
+            self.task_executor.release_reservation(concurrency_class)
+            return False
+
+        def on_done():
+            self.currently_running_tasks.release(task_name)
+            # Let the main loop reschedule against the updated state promptly
+            self.scheduler.wake()
+
+        try:
+            self.task_executor.submit(task_name, concurrency_class, func, on_done=on_done)
+        except RuntimeError:
+            self.currently_running_tasks.release(task_name)
+            return False
+        return True
+
+    def sync_schedule(self):
+        """Make sure every enabled task has an entry in the scheduler.
+
+        Tasks that were popped as due but could not start (already running,
+        interval not elapsed after last_run_times was adjusted) are put back at
+        their next due time, retried shortly if that time has already passed.
+        """
+        current_time = time.time()
+        for task_name in list(self.enabled_tasks):
+            if task_name not in self.task_intervals:
+                continue
+            due_time = self.last_run_times.get(task_name, current_time) + self.task_intervals[task_name]
+            if due_time <= current_time:
+                due_time = current_time + self.TASK_RETRY_DELAY
+            self.scheduler.ensure_scheduled(task_name, due_time)
 
     def task_check_service_connectivity(self):
         """Check connectivity to required services"""
@@ -365,56 +437,39 @@ class ProgramRunner:
             self.update_heartbeat()
             self.check_heartbeat()
             self.check_task_health()
-            current_time = time.time()
+            # Only tasks that are due (or were signalled) are considered this cycle
+            due_tasks, signalled_tasks = self.scheduler.pop_due_tasks()
             
             # Update all queues from database
             self.queue_manager.update_all_queues()
             
             # Process queue tasks
-            for queue_name in ['Wanted', 'Scraping', 'Adding', 'Checking', 'Sleeping', 'Unreleased', 'Blacklisted', 'Pending Uncached', 'Upgrading']:
-                should_run = self.should_run_task(queue_name)
-                time_since_last = current_time - self.last_run_times[queue_name]
-                # Remove per-queue debug logging unless it's going to run
-                if should_run:
-                    # logging.debug(f"Queue {queue_name}: Time since last run: {time_since_last:.2f}s")
-                    # logging.info(f"Processing {queue_name} queue")
-                    self.safe_process_queue(queue_name)
+            for queue_name in QUEUE_TASKS:
+                if queue_name not in due_tasks:
+                    continue
+                self.start_task(queue_name, lambda queue_name=queue_name: self.safe_process_queue(queue_name),
+                                force=queue_name in signalled_tasks)
 
             # Process content source tasks
             for source, data in self.get_content_sources().items():
                 task_name = f'task_{source}_wanted'
-                should_run = self.should_run_task(task_name)
-                time_since_last = current_time - self.last_run_times[task_name]
-                # Remove content source debug logging unless it's going to run
-                if should_run:
-                    # logging.debug(f"Content source {source}: Time since last run: {time_since_last:.2f}s")
-                    try:
-                        self.process_content_source(source, data)
-                    except Exception as e:
-                        logging.error(f"Error processing content source {source}: {str(e)}")
-                        logging.error(traceback.format_exc())
-                    finally:
-                        self.currently_running_tasks.discard(task_name)
+                if task_name not in due_tasks:
+                    continue
+                self.start_task(task_name, lambda source=source, data=data: self.process_content_source(source, data),
+                                force=task_name in signalled_tasks)
             
             # Process other enabled tasks
-            for task_name in self.enabled_tasks:
-                if (task_name not in ['Wanted', 'Scraping', 'Adding', 'Checking', 'Sleeping', 'Unreleased', 'Blacklisted', 'Pending Uncached', 'Upgrading'] 
+            for task_name in due_tasks:
+                if (task_name not in QUEUE_TASKS
                     and not task_name.endswith('_wanted')):
-                    if self.should_run_task(task_name):
-                        # Only log when task will actually run
-                        # logging.debug(f"Running task: {task_name}")
-                        try:
-                            task_method = getattr(self, task_name)
-                            task_method()
-                        except Exception as e:
-                            logging.error(f"Error running task {task_name}: {str(e)}")
-                            logging.error(traceback.format_exc())
-                        finally:
-                            self.currently_running_tasks.discard(task_name)
+                    self.start_task(task_name, lambda task_name=task_name: getattr(self, task_name)(),
+                                    force=task_name in signalled_tasks)
 
         except Exception as e:
             logging.error(f"Error in process_queues: {str(e)}")
             logging.error(traceback.format_exc())
+        finally:
+            self.sync_schedule()
 
     def safe_process_queue(self, queue_name: str):
         try:
@@ -476,10 +531,13 @@ class ProgramRunner:
 
         logging.debug(f"Processing content source: {source} (type: {source_type}, media_type: {source_media_type})")
 
+        source_cache = None
         try:
             # Load cache for this source
             source_cache = load_source_cache(source)
             logging.debug(f"Initial cache state for {source}: {len(source_cache)} entries")
+            # ETags, activity timestamps and cursors so unchanged lists aren't downloaded again
+            sync_state = load_sync_state(source)
             cache_skipped = 0
             items_processed = 0
             total_items = 0
@@ -487,15 +545,15 @@ class ProgramRunner:
 
             wanted_content = []
             if source_type == 'Overseerr':
-                wanted_content = get_wanted_from_overseerr(versions)
+                wanted_content = get_wanted_from_overseerr(versions, sync_state)
             elif source_type == 'MDBList':
                 mdblist_urls = data.get('urls', '').split(',')
                 for mdblist_url in mdblist_urls:
                     mdblist_url = mdblist_url.strip()
-                    wanted_content.extend(get_wanted_from_mdblists(mdblist_url, versions))
+                    wanted_content.extend(get_wanted_from_mdblists(mdblist_url, versions, sync_state))
             elif source_type == 'Trakt Watchlist':
                 try:
-                    wanted_content = get_wanted_from_trakt_watchlist(versions)
+                    wanted_content = get_wanted_from_trakt_watchlist(versions, sync_state)
                 except (ValueError, api.exceptions.RequestException) as e:
                     logging.error(f"Failed to fetch Trakt watchlist: {str(e)}")
                     return
@@ -504,24 +562,24 @@ class ProgramRunner:
                 for trakt_list in trakt_lists:
                     trakt_list = trakt_list.strip()
                     try:
-                        wanted_content.extend(get_wanted_from_trakt_lists(trakt_list, versions))
+                        wanted_content.extend(get_wanted_from_trakt_lists(trakt_list, versions, sync_state))
                     except (ValueError, api.exceptions.RequestException) as e:
                         logging.error(f"Failed to fetch Trakt list {trakt_list}: {str(e)}")
                         continue
             elif source_type == 'Trakt Collection':
-                wanted_content = get_wanted_from_trakt_collection(versions)
+                wanted_content = get_wanted_from_trakt_collection(versions, sync_state)
             elif source_type == 'Friends Trakt Watchlist':
-                wanted_content = get_wanted_from_friend_trakt_watchlist(data, versions)
+                wanted_content = get_wanted_from_friend_trakt_watchlist(data, versions, sync_state)
             elif source_type == 'Collected':
                 wanted_content = get_wanted_from_collected()
             elif source_type == 'My Plex Watchlist':
                 wanted_content = get_wanted_from_plex_watchlist(versions)
             elif source_type == 'My Plex RSS Watchlist':
                 plex_rss_url = data.get('url', '')
-                wanted_content = get_wanted_from_plex_rss(plex_rss_url, versions)
+                wanted_content = get_wanted_from_plex_rss(plex_rss_url, versions, sync_state)
             elif source_type == 'My Friends Plex RSS Watchlist':
                 plex_rss_url = data.get('url', '')
-                wanted_content = get_wanted_from_friends_plex_rss(plex_rss_url, versions)
+                wanted_content = get_wanted_from_friends_plex_rss(plex_rss_url, versions, sync_state)
             elif source_type == 'Other Plex Watchlist':
                 other_watchlists = []
                 for source_id, source_data in self.get_content_sources().items():
@@ -548,6 +606,9 @@ class ProgramRunner:
                 logging.warning(f"Unknown source type: {source_type}")
                 return
 
+            if sync_state:
+                save_sync_state(source, sync_state)
+
             if wanted_content:
                 if isinstance(wanted_content, list) and len(wanted_content) > 0 and isinstance(wanted_content[0], tuple):
                     # Handle list of tuples (e.g., from Plex sources)
@@ -572,8 +633,8 @@ class ProgramRunner:
                         cache_skipped += items_skipped
                         
                         if items_to_process:
-                            processed_items = process_metadata(items_to_process)
-                            if processed_items:
+                            # Store each batch as soon as its metadata resolves rather than after the whole list
+                            for processed_items in process_metadata_batches(items_to_process):
                                 all_items = processed_items.get('movies', []) + processed_items.get('episodes', []) + processed_items.get('anime', [])
                                 
                                 # Set content source and detail for each item
@@ -581,13 +642,13 @@ class ProgramRunner:
                                     item['content_source'] = source
                                     item = append_content_source_detail(item, source_type=source_type)
                                 
-                                # Update cache for the original items (pre-metadata processing)
-                                for item in items_to_process:
-                                    update_cache_for_item(item, source, source_cache)
-                                
                                 add_wanted_items(all_items, item_versions or versions)
                                 total_items += len(all_items)
-                                items_processed += len(items_to_process)
+                            
+                            # Update cache for the original items (pre-metadata processing)
+                            for item in items_to_process:
+                                update_cache_for_item(item, source, source_cache)
+                            items_processed += len(items_to_process)
                 else:
                     # Handle single list of items
                     logging.debug(f"Processing batch of {len(wanted_content)} items from {source}")
@@ -610,8 +671,8 @@ class ProgramRunner:
                     cache_skipped += items_skipped
                     
                     if items_to_process:
-                        processed_items = process_metadata(items_to_process)
-                        if processed_items:
+                        # Store each batch as soon as its metadata resolves rather than after the whole list
+                        for processed_items in process_metadata_batches(items_to_process):
                             all_items = processed_items.get('movies', []) + processed_items.get('episodes', []) + processed_items.get('anime', [])
                             
                             # Set content source and detail for each item
@@ -619,13 +680,13 @@ class ProgramRunner:
                                 item['content_source'] = source
                                 item = append_content_source_detail(item, source_type=source_type)
                             
-                            # Update cache for the original items (pre-metadata processing)
-                            for item in items_to_process:
-                                update_cache_for_item(item, source, source_cache)
-                            
                             add_wanted_items(all_items, versions)
                             total_items += len(all_items)
-                            items_processed += len(items_to_process)
+                        
+                        # Update cache for the original items (pre-metadata processing)
+                        for item in items_to_process:
+                            update_cache_for_item(item, source, source_cache)
+                        items_processed += len(items_to_process)
                 
                 # Save the updated cache
                 save_source_cache(source, source_cache)
@@ -645,6 +706,9 @@ class ProgramRunner:
             logging.error(f"Error processing content source {source}: {str(e)}")
             logging.error(traceback.format_exc())
             # Don't re-raise - allow other content sources to continue processing
+        finally:
+            if source_cache is not None:
+                source_cache.close()
 
     def task_refresh_release_dates(self):
         refresh_release_dates()
@@ -689,6 +753,8 @@ class ProgramRunner:
         logging.warning("Program stop requested")
         self.running = False
         self.initializing = False
+        self.task_executor.shutdown(wait=False)
+        self.scheduler.wake()
 
     def is_running(self):
         return self.running
@@ -735,7 +801,8 @@ class ProgramRunner:
                     logging.error(f"Unexpected error in main loop: {str(e)}")
                     logging.error(traceback.format_exc())
                 finally:
-                    time.sleep(1)  # Main loop runs every second
+                    # Sleep until the next task is due or new work is signalled
+                    self.scheduler.wait(self.MAX_IDLE_WAIT)
 
             logging.warning("Program has stopped running")
         except Exception as e:
@@ -997,8 +1064,11 @@ class ProgramRunner:
     def task_refresh_download_stats(self):
         """Task to refresh the download stats cache"""
         from database.statistics import get_cached_download_stats
+        from debrid import get_debrid_provider
         try:
             get_cached_download_stats()  # This will refresh the cache if needed
+            # Keep the shared torrent listing warm for the status page and the queues
+            get_debrid_provider().list_active_torrents()
             logging.debug("Download stats cache refreshed")
         except Exception as e:
             logging.error(f"Error refreshing download stats cache: {str(e)}")
@@ -1056,8 +1126,11 @@ class ProgramRunner:
                     logging.debug(f"Skipping previously verified file: {filled_by_title}")
                     continue
 
-                if not os.path.exists(file_path) and not os.path.exists(file_path_no_ext):
-                    # Try to find the file anywhere under plex_file_location
+                if os.path.exists(file_path) or os.path.exists(file_path_no_ext):
+                    # Use the path that exists (prefer original if both exist)
+                    actual_file_path = file_path if os.path.exists(file_path) else file_path_no_ext
+                else:
+                    # Try to find the file anywhere under plex_file_location via the library index
                     from utilities.local_library_scan import find_file
                     found_path = find_file(filled_by_file, plex_file_location)
                     if found_path:
@@ -1069,8 +1142,6 @@ class ProgramRunner:
                         logging.debug(f"File not found on disk in any location:\n  {file_path}\n  {file_path_no_ext}")
                         continue
 
-                # Use the path that exists (prefer original if both exist)
-                actual_file_path = file_path if os.path.exists(file_path) else file_path_no_ext
                 logging.info(f"Found file on disk: {actual_file_path}")
                 self.file_location_cache[cache_key] = 'exists'
                 
@@ -1169,8 +1240,11 @@ class ProgramRunner:
                     logging.debug(f"Skipping previously verified file: {filled_by_title}")
                     continue
 
-                if not os.path.exists(file_path) and not os.path.exists(file_path_no_ext):
-                    # Try to find the file anywhere under plex_file_location
+                if os.path.exists(file_path) or os.path.exists(file_path_no_ext):
+                    # Use the path that exists (prefer original if both exist)
+                    actual_file_path = file_path if os.path.exists(file_path) else file_path_no_ext
+                else:
+                    # Try to find the file anywhere under plex_file_location via the library index
                     from utilities.local_library_scan import find_file
                     found_path = find_file(filled_by_file, plex_file_location)
                     if found_path:
@@ -1182,8 +1256,6 @@ class ProgramRunner:
                         logging.debug(f"File not found on disk in any location:\n  {file_path}\n  {file_path_no_ext}")
                         continue
 
-                # Use the path that exists (prefer original if both exist)
-                actual_file_path = file_path if os.path.exists(file_path) else file_path_no_ext
                 logging.info(f"Found file on disk: {actual_file_path}")
                 self.file_location_cache[cache_key] = 'exists'
                 
@@ -1348,6 +1420,8 @@ class ProgramRunner:
             
         # Add to enabled tasks
         self.enabled_tasks.add(normalized_name)
+        self.sync_schedule()
+        self.scheduler.wake()
         logging.info(f"Enabled task: {normalized_name}")
         return True
         
@@ -1362,6 +1436,7 @@ class ProgramRunner:
             
         # Remove from enabled tasks
         self.enabled_tasks.remove(normalized_name)
+        self.scheduler.unschedule(normalized_name)
         logging.info(f"Disabled task: {normalized_name}")
         return True
         
@@ -1516,6 +1591,8 @@ def process_overseerr_webhook(data):
             from content_checkers.content_source_detail import append_content_source_detail
             item = append_content_source_detail(item, source_type='Overseerr')
         add_wanted_items(all_items, versions)
+        # Pick the new items up right away instead of on the next Wanted interval
+        task_scheduler.signal('Wanted')
         logging.info(f"Processed and added wanted item from webhook: {wanted_item}")
 
 def generate_airtime_report():
@@ -1,5 +1,7 @@
 """Common utility functions shared across the scraper module."""
 import re
+import base64
+import binascii
 import logging
 from typing import Dict, Any, Union, List, Optional
 from guessit import guessit
@@ -10,6 +12,37 @@ def trim_magnet(magnet: str):
         magnet = magnet.split('&amp;')[0]
     return magnet.split('&tr=')[0]
 
+INFO_HASH_PATTERN = re.compile(r'urn:btih:([a-zA-Z0-9]+)')
+
+def extract_info_hash(magnet: str) -> Optional[str]:
+    """Return the lowercase hex info hash of a magnet link, or None if it has none."""
+    match = INFO_HASH_PATTERN.search(magnet or '')
+    if not match:
+        return None
+    info_hash = match.group(1)
+    if len(info_hash) == 40:
+        return info_hash.lower()
+    if len(info_hash) == 32:
+        # Base32 encoded v1 hash
+        try:
+            return base64.b32decode(info_hash.upper()).hex()
+        except (binascii.Error, ValueError):
+            return None
+    return None
+
+def result_identity_key(result: Dict[str, Any]) -> str:
+    """
+    Stable key identifying the torrent behind a scrape result: its info hash if the
+    magnet carries one, otherwise the trimmed link, otherwise title and size.
+    """
+    magnet = result.get('magnet', '')
+    if magnet:
+        info_hash = extract_info_hash(magnet)
+        if info_hash:
+            return info_hash
+        return trim_magnet(magnet)
+    return f"{result.get('title', '').lower()}_{round_size(result.get('size', ''))}"
+
 def round_size(size: str):
     """Round file size to 2 decimal places."""
     try:
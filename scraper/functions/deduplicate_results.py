@@ -1,22 +1,17 @@
 from typing import List, Dict, Any
-from scraper.functions.common import round_size, trim_magnet
+from scraper.functions.common import round_size, result_identity_key
 
 def deduplicate_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     unique_results = {}
     title_size_map = {}
 
     for index, result in enumerate(results):
-        magnet = result.get('magnet', '')
         title = result.get('title', '').lower()  # Convert to lowercase for case-insensitive comparison
         size = result.get('size', '')
         rounded_size = round_size(size)
 
-        # First check: Use magnet link
-        if magnet:
-            trimmed_magnet = trim_magnet(magnet)
-            unique_id = trimmed_magnet
-        else:
-            unique_id = f"{title}_{rounded_size}"
+        # First check: the torrent's identity (info hash or magnet link)
+        unique_id = result.get('identity_key') or result_identity_key(result)
 
         is_duplicate = False
 
@@ -1,453 +1,431 @@
 import logging
 import re
-from typing import List, Dict, Any
-from fuzzywuzzy import fuzz
+from typing import List, Dict, Any, Tuple
+from rapidfuzz import fuzz, process
 from PTT import parse_title
 from settings import get_setting
 from scraper.functions.similarity_checks import improved_title_similarity, normalize_title
 from scraper.functions.file_processing import compare_resolutions, parse_size, calculate_bitrate
-from scraper.functions.other_functions import smart_search
+from scraper.functions.other_functions import compile_smart_search, compile_smart_search_any
 from scraper.functions.adult_terms import adult_terms
 from scraper.functions.common import *
 
-def filter_results(results: List[Dict[str, Any]], tmdb_id: str, title: str, year: int, content_type: str, season: int, episode: int, multi: bool, version_settings: Dict[str, Any], runtime: int, episode_count: int, season_episode_counts: Dict[int, int], genres: List[str], matching_aliases: List[str] = None) -> List[Dict[str, Any]]:
+class ResultFilter:
+    """
+    Filter settings for one query and version, normalised and compiled once.
 
-    filtered_results = []
-    pre_size_filtered_results = []  # Track results before size filtering
-    resolution_wanted = version_settings.get('resolution_wanted', '<=')
-    max_resolution = version_settings.get('max_resolution', '2160p')
-    min_size_gb = float(version_settings.get('min_size_gb', 0.01))
-    max_size_gb = float(version_settings.get('max_size_gb', float('inf')) or float('inf'))
-    filter_in = version_settings.get('filter_in', [])
-    filter_out = version_settings.get('filter_out', [])
-    enable_hdr = version_settings.get('enable_hdr', False)
-    disable_adult = get_setting('Scraping', 'disable_adult', False)
-    
-    logging.debug(f"Starting filter_results with {len(results)} results")
-    #logging.debug(f"Version settings: resolution={max_resolution}({resolution_wanted}), size={min_size_gb}-{max_size_gb}GB, HDR={enable_hdr}")
-    #logging.debug(f"Filter patterns - in: {filter_in}, out: {filter_out}")
-    
-    # Pre-compile patterns
-    filter_in_patterns = filter_in if filter_in else []
-    filter_out_patterns = filter_out if filter_out else []
-    adult_pattern = re.compile('|'.join(adult_terms), re.IGNORECASE) if disable_adult else None
-    
-    # Determine content type specific settings
-    is_movie = content_type.lower() == 'movie'
-    is_episode = content_type.lower() == 'episode'
-    is_anime = genres and 'anime' in [genre.lower() for genre in genres]
-    is_ufc = False
-    
-    # Pre-normalize query title and aliases
-    normalized_query_title = normalize_title(title).lower()
-    normalized_aliases = [normalize_title(alias).lower() for alias in (matching_aliases or [])]
-    similarity_threshold = float(version_settings.get('similarity_threshold_anime', 0.35)) if is_anime else float(version_settings.get('similarity_threshold', 0.8))
-    
-    #logging.debug(f"Content type: {'movie' if is_movie else 'episode'}, Anime: {is_anime}, Title similarity threshold: {similarity_threshold}")
-    
-    # Cache season episode counts for multi-episode content
-    total_episodes = sum(season_episode_counts.values()) if is_episode else 0
-    
-    for result in results:
-        try:
-            result['filter_reason'] = "Passed all filters"  # Default reason
-            original_title = result.get('original_title', result.get('title', ''))
-            logging.debug(f"Processing result: {original_title}")
-            
-            # Quick UFC check
-            if "UFC" in original_title.upper():
-                is_ufc = True
-                similarity_threshold = 0.35
-                #logging.debug("UFC content detected, lowering similarity threshold")
-            
-            # Get parsed info from result (should be already parsed by PTT)
-            parsed_info = result.get('parsed_info', {})
-            if not parsed_info:
-                result['filter_reason'] = "Missing parsed info"
-                logging.debug("❌ Failed: Missing parsed info")
+    apply() runs the cheap per-result checks (resolution, HDR, year) first,
+    scores title similarity for the remaining results in one batch and only
+    then runs the season/episode, size, pattern and adult checks. Every result
+    gets a 'filter_reason' saying why it was rejected (or that it passed).
+    """
+
+    def __init__(self, tmdb_id: str, title: str, year: int, content_type: str, season: int, episode: int, multi: bool, version_settings: Dict[str, Any], runtime: int, episode_count: int, season_episode_counts: Dict[int, int], genres: List[str], matching_aliases: List[str] = None):
+        self.tmdb_id = tmdb_id
+        self.year = year
+        self.season = season
+        self.episode = episode
+        self.multi = multi
+        self.runtime = runtime
+        self.season_episode_counts = season_episode_counts
+
+        self.resolution_wanted = version_settings.get('resolution_wanted', '<=')
+        self.max_resolution = version_settings.get('max_resolution', '2160p')
+        self.min_size_gb = float(version_settings.get('min_size_gb', 0.01))
+        self.max_size_gb = float(version_settings.get('max_size_gb', float('inf')) or float('inf'))
+        self.min_bitrate_mbps = float(version_settings.get('min_bitrate_mbps', 0.0))
+        self.max_bitrate_mbps = float(version_settings.get('max_bitrate_mbps', float('inf')) or float('inf'))
+        self.enable_hdr = version_settings.get('enable_hdr', False)
+
+        # Compile patterns once; the merged alternation answers "does anything match"
+        # and the individual patterns are only consulted to name the matches
+        filter_in = version_settings.get('filter_in', []) or []
+        filter_out = version_settings.get('filter_out', []) or []
+        self.filter_in_patterns = [compile_smart_search(pattern) for pattern in filter_in]
+        self.filter_in_any = compile_smart_search_any(filter_in)
+        self.filter_out_patterns = [(pattern, compile_smart_search(pattern)) for pattern in filter_out]
+        self.filter_out_any = compile_smart_search_any(filter_out)
+        disable_adult = get_setting('Scraping', 'disable_adult', False)
+        self.adult_pattern = re.compile('|'.join(adult_terms), re.IGNORECASE) if disable_adult else None
+
+        # Determine content type specific settings
+        self.is_movie = content_type.lower() == 'movie'
+        self.is_episode = content_type.lower() == 'episode'
+        self.is_anime = genres and 'anime' in [genre.lower() for genre in genres]
+
+        # Pre-normalize query title and aliases
+        self.normalized_query_title = normalize_title(title).lower()
+        self.normalized_aliases = [normalize_title(alias).lower() for alias in (matching_aliases or [])]
+        self.similarity_threshold = float(version_settings.get('similarity_threshold_anime', 0.35)) if self.is_anime else float(version_settings.get('similarity_threshold', 0.8))
+
+        # Cache season episode counts for multi-episode content
+        self.total_episodes = sum(season_episode_counts.values()) if self.is_episode else 0
+
+    def apply(self, results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Filter results, returning (filtered_results, pre_size_filtered_results)"""
+        logging.debug(f"Starting filter_results with {len(results)} results")
+
+        candidates = []
+        for result in results:
+            self._run_check(result, self._check_cheap, candidates)
+
+        candidates = self._check_title_similarity(candidates)
+
+        filtered_results = []
+        pre_size_filtered_results = []  # Track results before size filtering
+        for result in candidates:
+            if not self._run_check(result, self._check_episode):
+                continue
+            # Size/bitrate are only final once the episode checks settled the season pack
+            if not self._run_check(result, self._calculate_size_and_bitrate):
                 continue
-            
-            # Store original title in parsed_info
-            parsed_info['original_title'] = original_title
-            
-            # If season_episode_info is not in parsed_info, detect it
-            if 'season_episode_info' not in parsed_info:
-                from scraper.functions.common import detect_season_episode_info
-                parsed_info['season_episode_info'] = detect_season_episode_info(original_title)
-                logging.debug(f"Detected season_episode_info: {parsed_info['season_episode_info']}")
-                
-                # Special handling for documentary tags that might be misinterpreted as episode titles
-                if 'episode_title' in parsed_info and parsed_info.get('episode_title', '').upper() == 'DOC':
-                    # This is likely a documentary tag, not an episode title
-                    parsed_info['documentary'] = True
-                    del parsed_info['episode_title']
-                    # Re-detect season/episode info after fixing the parsed_info
-                    parsed_info['season_episode_info'] = detect_season_episode_info(parsed_info)
-                    logging.debug(f"Corrected season_episode_info after DOC handling: {parsed_info['season_episode_info']}")
-            
-            result['parsed_info'] = parsed_info
-            
-            # Title similarity check
-            normalized_result_title = normalize_title(parsed_info.get('title', original_title)).lower()
-            normalized_query = normalized_query_title
-            
+            pre_size_filtered_results.append(result)
+            if self._run_check(result, self._check_size_patterns_and_adult):
+                filtered_results.append(result)
+                logging.debug("✓ Result accepted!")
+
+        logging.debug(f"\nFiltering complete: {len(filtered_results)}/{len(results)} results passed")
+        return filtered_results, pre_size_filtered_results
+
+    def _run_check(self, result, check, passed=None):
+        """Run check(result), recording the returned failure reason. Returns True if the result passed."""
+        try:
+            reason = check(result)
+        except Exception as e:
+            logging.error(f"Error filtering result '{result.get('original_title', result.get('title', ''))}': {str(e)}", exc_info=True)
+            result['filter_reason'] = f"Error during filtering: {str(e)}"
+            return False
+        if reason:
+            result['filter_reason'] = reason
+            return False
+        if passed is not None:
+            passed.append(result)
+        return True
+
+    @staticmethod
+    def _is_ufc(result):
+        return "UFC" in result['parsed_info']['original_title'].upper()
+
+    def _check_cheap(self, result):
+        result['filter_reason'] = "Passed all filters"  # Default reason
+        original_title = result.get('original_title', result.get('title', ''))
+        logging.debug(f"Processing result: {original_title}")
+
+        # Get parsed info from result (should be already parsed by PTT)
+        parsed_info = result.get('parsed_info', {})
+        if not parsed_info:
+            logging.debug("❌ Failed: Missing parsed info")
+            return "Missing parsed info"
+
+        # Store original title in parsed_info
+        parsed_info['original_title'] = original_title
+
+        # If season_episode_info is not in parsed_info, detect it
+        if 'season_episode_info' not in parsed_info:
+            parsed_info['season_episode_info'] = detect_season_episode_info(original_title)
+            logging.debug(f"Detected season_episode_info: {parsed_info['season_episode_info']}")
+
+            # Special handling for documentary tags that might be misinterpreted as episode titles
+            if 'episode_title' in parsed_info and parsed_info.get('episode_title', '').upper() == 'DOC':
+                # This is likely a documentary tag, not an episode title
+                parsed_info['documentary'] = True
+                del parsed_info['episode_title']
+                # Re-detect season/episode info after fixing the parsed_info
+                parsed_info['season_episode_info'] = detect_season_episode_info(parsed_info)
+                logging.debug(f"Corrected season_episode_info after DOC handling: {parsed_info['season_episode_info']}")
+
+        result['parsed_info'] = parsed_info
+
+        # Resolution check
+        detected_resolution = parsed_info.get('resolution', 'Unknown')
+        if not resolution_filter(detected_resolution, self.max_resolution, self.resolution_wanted):
+            logging.debug(f"❌ Failed: Resolution {detected_resolution} doesn't match criteria {self.resolution_wanted} {self.max_resolution}")
+            return f"Resolution mismatch (max: {self.max_resolution}, wanted: {self.resolution_wanted})"
+
+        # HDR check
+        if not self.enable_hdr and parsed_info.get('is_hdr', False):
+            logging.debug("❌ Failed: HDR content not allowed")
+            return "HDR content when HDR is disabled"
+
+        # Year check, skipped for UFC movies whose titles rarely carry the event year
+        if self.is_episode or (self.is_movie and not self._is_ufc(result)):
+            parsed_year = parsed_info.get('year')
+            if parsed_year:
+                if isinstance(parsed_year, list):
+                    if not any(abs(int(py) - self.year) <= 1 for py in parsed_year):
+                        logging.debug(f"❌ Failed: Year list {parsed_year} doesn't match {self.year}")
+                        return f"Year mismatch: {parsed_year} (expected: {self.year})"
+                elif abs(int(parsed_year) - self.year) > 1:
+                    logging.debug(f"❌ Failed: Year {parsed_year} doesn't match {self.year}")
+                    return f"Year mismatch: {parsed_year} (expected: {self.year})"
+        return None
+
+    @staticmethod
+    def _batch_ratio(query, titles):
+        """fuzz.ratio(title, query) / 100 for every title, with the query preprocessed once"""
+        scores = [0.0] * len(titles)
+        for _, score, index in process.extract(query, titles, scorer=fuzz.ratio, limit=None):
+            # Rounded to whole percent to keep the thresholds' historical behaviour
+            scores[index] = round(score) / 100.0
+        return scores
+
+    def _check_title_similarity(self, results):
+        """Batch title similarity against the query, falling back to the aliases. Returns the results that pass."""
+        if not results:
+            return []
+
+        titles = []
+        for result in results:
+            parsed_info = result['parsed_info']
+            normalized_result_title = normalize_title(parsed_info.get('title', parsed_info['original_title'])).lower()
             # If this is a documentary, add it back to the result title for comparison
             if parsed_info.get('documentary', False):
                 normalized_result_title = f"{normalized_result_title} documentary"
-            
-            title_sim = fuzz.ratio(normalized_result_title, normalized_query) / 100.0
-            
-            # Check against main title and aliases
-            if title_sim < similarity_threshold:
-                # Try matching against aliases if available
-                alias_similarities = [fuzz.ratio(normalized_result_title, alias) / 100.0 for alias in normalized_aliases]
-                best_alias_sim = max(alias_similarities) if alias_similarities else 0
-                
-                if best_alias_sim >= similarity_threshold:
-                    title_sim = best_alias_sim  # Use the best alias similarity
-                    logging.debug(f"✓ Passed title similarity check via alias with score {title_sim:.2f}")
-                else:
-                    result['filter_reason'] = f"Title similarity too low (main={title_sim:.2f}, best_alias={best_alias_sim:.2f})"
-                    logging.debug(f"❌ Failed: Title similarity {title_sim:.2f} below threshold {similarity_threshold}")
-                    logging.debug(f"  - Main title comparison: '{normalized_result_title}' vs '{normalized_query_title}'")
-                    if normalized_aliases:
-                        logging.debug(f"  - Best alias comparison: '{normalized_result_title}' vs '{normalized_aliases[alias_similarities.index(best_alias_sim)]}'")
-                    continue
-            #logging.debug("✓ Passed title similarity check")
-            
-            # Resolution check
-            detected_resolution = parsed_info.get('resolution', 'Unknown')
-            if not resolution_filter(detected_resolution, max_resolution, resolution_wanted):
-                result['filter_reason'] = f"Resolution mismatch (max: {max_resolution}, wanted: {resolution_wanted})"
-                logging.debug(f"❌ Failed: Resolution {detected_resolution} doesn't match criteria {resolution_wanted} {max_resolution}")
+            titles.append(normalized_result_title)
+
+        thresholds = [0.35 if self._is_ufc(result) else self.similarity_threshold for result in results]
+        main_scores = self._batch_ratio(self.normalized_query_title, titles)
+        below = [i for i, score in enumerate(main_scores) if score < thresholds[i]]
+
+        # Only results that miss on the main title are compared with the aliases
+        best_alias = {i: (0, None) for i in below}
+        if below and self.normalized_aliases:
+            below_titles = [titles[i] for i in below]
+            for alias in self.normalized_aliases:
+                for i, score in zip(below, self._batch_ratio(alias, below_titles)):
+                    if score > best_alias[i][0] or best_alias[i][1] is None:
+                        best_alias[i] = (score, alias)
+
+        passed = []
+        for i, result in enumerate(results):
+            if i not in best_alias:
+                passed.append(result)
                 continue
-            #logging.debug("✓ Passed resolution check")
-            
-            # HDR check
-            if not enable_hdr and parsed_info.get('is_hdr', False):
-                result['filter_reason'] = "HDR content when HDR is disabled"
-                logging.debug("❌ Failed: HDR content not allowed")
+            best_alias_sim, alias = best_alias[i]
+            if best_alias_sim >= thresholds[i]:
+                logging.debug(f"✓ Passed title similarity check via alias with score {best_alias_sim:.2f}")
+                passed.append(result)
                 continue
-            #logging.debug("✓ Passed HDR check")
-            
-            # Content type specific checks
-            if is_movie and not is_ufc:
-                parsed_year = parsed_info.get('year')
-                if parsed_year:
-                    if isinstance(parsed_year, list):
-                        if not any(abs(int(py) - year) <= 1 for py in parsed_year):
-                            result['filter_reason'] = f"Year mismatch: {parsed_year} (expected: {year})"
-                            logging.debug(f"❌ Failed: Year list {parsed_year} doesn't match {year}")
-                            continue
-                    elif abs(int(parsed_year) - year) > 1:
-                        result['filter_reason'] = f"Year mismatch: {parsed_year} (expected: {year})"
-                        logging.debug(f"❌ Failed: Year {parsed_year} doesn't match {year}")
-                        continue
-                #logging.debug("✓ Passed year check")
-            
-            elif is_episode:
-                # Add year check for TV shows
-                parsed_year = parsed_info.get('year')
-                if parsed_year:
-                    if isinstance(parsed_year, list):
-                        if not any(abs(int(py) - year) <= 1 for py in parsed_year):
-                            result['filter_reason'] = f"Year mismatch: {parsed_year} (expected: {year})"
-                            logging.debug(f"❌ Failed: Year list {parsed_year} doesn't match {year}")
-                            continue
-                    elif abs(int(parsed_year) - year) > 1:
-                        result['filter_reason'] = f"Year mismatch: {parsed_year} (expected: {year})"
-                        logging.debug(f"❌ Failed: Year {parsed_year} doesn't match {year}")
-                        continue
-
-                season_episode_info = parsed_info.get('season_episode_info', {})
-                #logging.debug(f"Season episode info: {season_episode_info}")
-                
-                # Check if title contains "complete" - consider it as having all episodes
-                if 'complete' in original_title.lower():
-                    #logging.debug("Complete series pack detected")
-                    season_episode_info['season_pack'] = 'Complete'
-                    season_episode_info['seasons'] = list(season_episode_counts.keys())
-                    season_episode_info['episodes'] = list(range(1, max(season_episode_counts.values()) + 1))
-                    result['parsed_info']['season_episode_info'] = season_episode_info
-                
-                if multi:
-                    #logging.debug(f"Multi-episode mode: season={season}, season_pack={season_episode_info.get('season_pack')}, seasons={season_episode_info.get('seasons')}")
-                    
-                    episodes = season_episode_info.get('episodes', [])
-                    if len(episodes) == 1:
-                        result['filter_reason'] = "Single episode result when searching for multi"
-                        logging.debug("❌ Failed: Single episode in multi mode")
-                        continue
-
-                    if episodes and episode not in episodes:
-                        result['filter_reason'] = f"Multi-episode pack does not contain requested episode {episode}"
-                        logging.debug(f"❌ Failed: Multi-pack missing episode {episode}")
-                        continue
-
-                    season_pack = season_episode_info.get('season_pack', 'Unknown')
-                    if season_pack == 'N/A':
-                        result['filter_reason'] = "Single episode result when searching for multi"
-                        logging.debug("❌ Failed: Single episode in multi mode")
-                        continue
-                    elif season_pack == 'Complete':
-                        #logging.debug("Complete series pack accepted")
-                        pass
-                    elif season_pack == 'Unknown':
-                        if len(episodes) < 2:
-                            result['filter_reason'] = "Non-multi result when searching for multi"
-                            logging.debug("❌ Failed: Not enough episodes for multi")
-                            continue
-                    else:
-                        if season not in season_episode_info.get('seasons', []):
-                            result['filter_reason'] = f"Season pack not containing the requested season: {season}"
-                            logging.debug(f"❌ Failed: Season pack missing season {season}")
-                            continue
-                    #logging.debug("✓ Passed multi-episode checks")
-                else:
-                    #logging.debug(f"Single episode mode: S{season}E{episode}")
-                    
-                    result_seasons = season_episode_info.get('seasons', [])
-                    result_episodes = season_episode_info.get('episodes', [])
-                    
-                    if not is_anime:
-                        if result_seasons and season not in result_seasons:
-                            result['filter_reason'] = f"Season mismatch: expected S{season}, got {result_seasons}"
-                            logging.debug(f"❌ Failed: Season mismatch - found {result_seasons} but needed {season}")
-                            continue
-                        elif not result_seasons:
-                            logging.debug(f"⚠️ No season information found, will de-rank later")
-                            
-                        # Debug the season pack detection
-                        season_pack = season_episode_info.get('season_pack', 'Unknown')
-                        logging.debug(f"Season pack detection for '{result.get('title', '')}': {season_pack}")
-                        logging.debug(f"Season info: {season_episode_info.get('seasons', [])} | Episode info: {season_episode_info.get('episodes', [])}")
-                        
-                        # Check for multi-season packs
-                        if not multi and (season_pack == 'Complete' or (season_pack != 'N/A' and season_pack != 'Unknown' and ',' in season_pack)):
-                            result['filter_reason'] = "Multi-season pack when searching for single episode"
-                            logging.debug("❌ Failed: Multi-season pack in single episode mode")
-                            continue
-                        
-                        # Check for single season packs (single season but no specific episode)
-                        # This is the key check for season packs like "Below Deck 2013 S01 DOC FRENCH 1080p WEB H264-TFA"
-                        if not multi and season_pack not in ['N/A', 'Unknown'] and not result_episodes:
-                            # Check if the title contains the specific episode we're looking for
-                            episode_pattern = f"S{season:02d}E{episode:02d}"
-                            if not re.search(episode_pattern, result.get('title', ''), re.IGNORECASE):
-                                result['filter_reason'] = "Season pack when searching for single episode"
-                                logging.debug(f"❌ Failed: Season pack '{season_pack}' in single episode mode")
-                                continue
-                        
-                        # Extra check: if we have season info but no episode info, and we're looking for a specific episode
-                        if not multi and season_episode_info.get('seasons') and not season_episode_info.get('episodes'):
-                            # This is likely a season pack
-                            episode_pattern = f"S{season:02d}E{episode:02d}"
-                            if not re.search(episode_pattern, result.get('title', ''), re.IGNORECASE):
-                                result['filter_reason'] = "Season pack (has season but no episodes) when searching for single episode"
-                                logging.debug(f"❌ Failed: Season pack with season {season_episode_info.get('seasons')} but no episodes in single episode mode")
-                                continue
-                            
-                        # Also check if multiple episodes are detected
-                        if not multi and len(result_episodes) > 1:
-                            result['filter_reason'] = f"Multiple episodes detected: {result_episodes} when searching for single episode {episode}"
-                            logging.debug(f"❌ Failed: Multiple episodes {result_episodes} in single episode mode")
-                            continue
-                    else:
-                        # For anime, we need to handle season packs differently
-                        # Mark this result as anime for ranking
-                        result['is_anime'] = True
-                        
-                        season_pack = season_episode_info.get('season_pack', 'Unknown')
-                        logging.debug(f"Anime season pack detection for '{result.get('title', '')}': {season_pack}")
-                        logging.debug(f"Anime season info: {season_episode_info.get('seasons', [])} | Episode info: {season_episode_info.get('episodes', [])}")
-                        
-                        # Check for multi-season packs
-                        if not multi and (season_pack == 'Complete' or (season_pack != 'N/A' and season_pack != 'Unknown' and ',' in season_pack)):
-                            result['filter_reason'] = "Multi-season pack when searching for single episode"
-                            logging.debug("❌ Failed: Multi-season pack in single episode mode")
-                            continue
-                        
-                        # Check for single season packs (single season but no specific episode)
-                        if not multi and season_pack not in ['N/A', 'Unknown'] and not result_episodes:
-                            # Check if the title contains the specific episode we're looking for
-                            episode_pattern = f"S{season:02d}E{episode:02d}"
-                            if not re.search(episode_pattern, result.get('title', ''), re.IGNORECASE):
-                                result['filter_reason'] = "Season pack when searching for single episode"
-                                logging.debug(f"❌ Failed: Season pack '{season_pack}' in single episode mode")
-                                continue
-                        
-                        # Extra check: if we have season info but no episode info, and we're looking for a specific episode
-                        if not multi and season_episode_info.get('seasons') and not season_episode_info.get('episodes'):
-                            # This is likely a season pack
-                            episode_pattern = f"S{season:02d}E{episode:02d}"
-                            if not re.search(episode_pattern, result.get('title', ''), re.IGNORECASE):
-                                result['filter_reason'] = "Season pack (has season but no episodes) when searching for single episode"
-                                logging.debug(f"❌ Failed: Season pack with season {season_episode_info.get('seasons')} but no episodes in single episode mode")
-                                continue
-                            
-                        # Also check if multiple episodes are detected
-                        if not multi and len(result_episodes) > 1:
-                            result['filter_reason'] = f"Multiple episodes detected: {result_episodes} when searching for single episode {episode}"
-                            logging.debug(f"❌ Failed: Multiple episodes {result_episodes} in single episode mode")
-                            continue
-
-                        # Special handling for anime based on the anime_format
-                        anime_format = result.get('anime_format')
-                        if anime_format and not result_seasons and not result_episodes:
-                            # For anime with no detected season/episode, validate based on the format used
-                            valid = False
-                            
-                            if anime_format == 'regular':
-                                # Regular format should have correct season/episode
-                                pattern = f"S{season:02d}E{episode:02d}"
-                                valid = pattern.lower() in result.get('title', '').lower()
-                                
-                            elif anime_format == 'absolute' or anime_format == 'absolute_with_e':
-                                # Calculate expected absolute episode number based on season episode counts if available
-                                from web_scraper import get_all_season_episode_counts
-                                try:
-                                    season_episode_counts = get_all_season_episode_counts(tmdb_id)
-                                    total_episodes_in_prev_seasons = sum(season_episode_counts.get(s, 13) for s in range(1, season))
-                                    expected_abs_ep = total_episodes_in_prev_seasons + episode
-                                except Exception as e:
-                                    # Fallback to default 13 episodes per season if API call fails
-                                    logging.warning(f"Failed to get episode counts, using default: {str(e)}")
-                                    expected_abs_ep = ((season - 1) * 13) + episode
-                                
-                                # Check if the absolute episode number appears in the title
-                                abs_pattern = f"{expected_abs_ep:03d}"
-                                e_abs_pattern = f"E{expected_abs_ep:03d}"
-                                valid = (abs_pattern in result.get('title', '') or 
-                                         e_abs_pattern.lower() in result.get('title', '').lower())
-                                
-                            elif anime_format == 'no_zeros':
-                                # Simple episode number format
-                                valid = f" {episode} " in f" {result.get('title', '')} "
-                                
-                            elif anime_format == 'combined':
-                                # Combined format (S01E018)
-                                from web_scraper import get_all_season_episode_counts
-                                try:
-                                    season_episode_counts = get_all_season_episode_counts(tmdb_id)
-                                    total_episodes_in_prev_seasons = sum(season_episode_counts.get(s, 13) for s in range(1, season))
-                                    expected_abs_ep = total_episodes_in_prev_seasons + episode
-                                except Exception as e:
-                                    # Fallback to default 13 episodes per season if API call fails
-                                    logging.warning(f"Failed to get episode counts, using default: {str(e)}")
-                                    expected_abs_ep = ((season - 1) * 13) + episode
-                                
-                                pattern = f"S{season:02d}E{expected_abs_ep:03d}"
-                                valid = pattern.lower() in result.get('title', '').lower()
-                            
-                            if not valid:
-                                result['filter_reason'] = f"Anime format mismatch: {anime_format} format doesn't match S{season}E{episode}"
-                                logging.debug(f"❌ Failed: Anime format mismatch - {anime_format} doesn't match S{season}E{episode}")
-                                continue
-                            else:
-                                logging.debug(f"✓ Passed anime format validation with {anime_format}")
-                        elif result_seasons and season not in result_seasons:
-                            # Still do season validation for anime if season info is available
-                            result['filter_reason'] = f"Season mismatch: expected S{season}, got {result_seasons}"
-                            logging.debug(f"❌ Failed: Season mismatch - found {result_seasons} but needed {season}")
-                            continue
-
-                    if result_episodes and episode not in result_episodes:
-                        result['filter_reason'] = f"Episode mismatch: expected E{episode}, got {result_episodes}"
-                        logging.debug(f"❌ Failed: Episode mismatch {result_episodes}")
-                        continue
-                    #logging.debug("✓ Passed episode checks")
-            
-            # Size calculation
-            size_gb = parse_size(result.get('size', 0))
-            if is_episode:
-                scraper = result.get('scraper', '').lower()
-                if scraper.startswith(('jackett', 'zilean')):
-                    season_pack = season_episode_info.get('season_pack', 'Unknown')
-                    if season_pack == 'N/A':
-                        size_per_episode_gb = size_gb
-                    else:
-                        if season_pack == 'Complete':
-                            episode_count = total_episodes
-                        else:
-                            season_numbers = [int(s) for s in season_pack.split(',')]
-                            episode_count = sum(season_episode_counts.get(s, 0) for s in season_numbers)
-                        size_per_episode_gb = size_gb / episode_count if episode_count > 0 else size_gb
-                    result['size'] = size_per_episode_gb
-                    bitrate = calculate_bitrate(size_per_episode_gb, runtime)
+            result['filter_reason'] = f"Title similarity too low (main={main_scores[i]:.2f}, best_alias={best_alias_sim:.2f})"
+            logging.debug(f"❌ Failed: Title similarity {main_scores[i]:.2f} below threshold {thresholds[i]}")
+            logging.debug(f"  - Main title comparison: '{titles[i]}' vs '{self.normalized_query_title}'")
+            if alias is not None:
+                logging.debug(f"  - Best alias comparison: '{titles[i]}' vs '{alias}'")
+        return passed
+
+    def _season_pack_reason(self, result, season_episode_info, result_episodes):
+        """Reason to reject a pack when a single episode was requested, or None"""
+        season, episode = self.season, self.episode
+        season_pack = season_episode_info.get('season_pack', 'Unknown')
+
+        # Check for multi-season packs
+        if season_pack == 'Complete' or (season_pack != 'N/A' and season_pack != 'Unknown' and ',' in season_pack):
+            logging.debug("❌ Failed: Multi-season pack in single episode mode")
+            return "Multi-season pack when searching for single episode"
+
+        # Check for single season packs (single season but no specific episode)
+        # This is the key check for season packs like "Below Deck 2013 S01 DOC FRENCH 1080p WEB H264-TFA"
+        episode_pattern = f"S{season:02d}E{episode:02d}"
+        if season_pack not in ['N/A', 'Unknown'] and not result_episodes:
+            # Check if the title contains the specific episode we're looking for
+            if not re.search(episode_pattern, result.get('title', ''), re.IGNORECASE):
+                logging.debug(f"❌ Failed: Season pack '{season_pack}' in single episode mode")
+                return "Season pack when searching for single episode"
+
+        # Extra check: if we have season info but no episode info, and we're looking for a specific episode
+        if season_episode_info.get('seasons') and not season_episode_info.get('episodes'):
+            # This is likely a season pack
+            if not re.search(episode_pattern, result.get('title', ''), re.IGNORECASE):
+                logging.debug(f"❌ Failed: Season pack with season {season_episode_info.get('seasons')} but no episodes in single episode mode")
+                return "Season pack (has season but no episodes) when searching for single episode"
+
+        # Also check if multiple episodes are detected
+        if len(result_episodes) > 1:
+            logging.debug(f"❌ Failed: Multiple episodes {result_episodes} in single episode mode")
+            return f"Multiple episodes detected: {result_episodes} when searching for single episode {episode}"
+        return None
+
+    def _expected_absolute_episode(self):
+        from web_scraper import get_all_season_episode_counts
+        try:
+            season_episode_counts = get_all_season_episode_counts(self.tmdb_id)
+            total_episodes_in_prev_seasons = sum(season_episode_counts.get(s, 13) for s in range(1, self.season))
+            return total_episodes_in_prev_seasons + self.episode
+        except Exception as e:
+            # Fallback to default 13 episodes per season if API call fails
+            logging.warning(f"Failed to get episode counts, using default: {str(e)}")
+            return ((self.season - 1) * 13) + self.episode
+
+    def _check_episode(self, result):
+        if not self.is_episode:
+            return None
+
+        season, episode = self.season, self.episode
+        original_title = result['parsed_info']['original_title']
+        season_episode_info = result['parsed_info'].get('season_episode_info', {})
+
+        # Check if title contains "complete" - consider it as having all episodes
+        if 'complete' in original_title.lower():
+            season_episode_info['season_pack'] = 'Complete'
+            season_episode_info['seasons'] = list(self.season_episode_counts.keys())
+            season_episode_info['episodes'] = list(range(1, max(self.season_episode_counts.values()) + 1))
+            result['parsed_info']['season_episode_info'] = season_episode_info
+
+        if self.multi:
+            episodes = season_episode_info.get('episodes', [])
+            if len(episodes) == 1:
+                logging.debug("❌ Failed: Single episode in multi mode")
+                return "Single episode result when searching for multi"
+
+            if episodes and episode not in episodes:
+                logging.debug(f"❌ Failed: Multi-pack missing episode {episode}")
+                return f"Multi-episode pack does not contain requested episode {episode}"
+
+            season_pack = season_episode_info.get('season_pack', 'Unknown')
+            if season_pack == 'N/A':
+                logging.debug("❌ Failed: Single episode in multi mode")
+                return "Single episode result when searching for multi"
+            elif season_pack == 'Complete':
+                pass
+            elif season_pack == 'Unknown':
+                if len(episodes) < 2:
+                    logging.debug("❌ Failed: Not enough episodes for multi")
+                    return "Non-multi result when searching for multi"
+            elif season not in season_episode_info.get('seasons', []):
+                logging.debug(f"❌ Failed: Season pack missing season {season}")
+                return f"Season pack not containing the requested season: {season}"
+            return None
+
+        result_seasons = season_episode_info.get('seasons', [])
+        result_episodes = season_episode_info.get('episodes', [])
+
+        if not self.is_anime:
+            if result_seasons and season not in result_seasons:
+                logging.debug(f"❌ Failed: Season mismatch - found {result_seasons} but needed {season}")
+                return f"Season mismatch: expected S{season}, got {result_seasons}"
+            elif not result_seasons:
+                logging.debug(f"⚠️ No season information found, will de-rank later")
+
+            # Debug the season pack detection
+            logging.debug(f"Season pack detection for '{result.get('title', '')}': {season_episode_info.get('season_pack', 'Unknown')}")
+            logging.debug(f"Season info: {season_episode_info.get('seasons', [])} | Episode info: {season_episode_info.get('episodes', [])}")
+
+            reason = self._season_pack_reason(result, season_episode_info, result_episodes)
+            if reason:
+                return reason
+        else:
+            # For anime, we need to handle season packs differently
+            # Mark this result as anime for ranking
+            result['is_anime'] = True
+
+            logging.debug(f"Anime season pack detection for '{result.get('title', '')}': {season_episode_info.get('season_pack', 'Unknown')}")
+            logging.debug(f"Anime season info: {season_episode_info.get('seasons', [])} | Episode info: {season_episode_info.get('episodes', [])}")
+
+            reason = self._season_pack_reason(result, season_episode_info, result_episodes)
+            if reason:
+                return reason
+
+            # Special handling for anime based on the anime_format
+            anime_format = result.get('anime_format')
+            if anime_format and not result_seasons and not result_episodes:
+                # For anime with no detected season/episode, validate based on the format used
+                valid = False
+                title = result.get('title', '')
+
+                if anime_format == 'regular':
+                    # Regular format should have correct season/episode
+                    valid = f"S{season:02d}E{episode:02d}".lower() in title.lower()
+                elif anime_format == 'absolute' or anime_format == 'absolute_with_e':
+                    # Check if the absolute episode number appears in the title
+                    expected_abs_ep = self._expected_absolute_episode()
+                    valid = (f"{expected_abs_ep:03d}" in title or
+                             f"E{expected_abs_ep:03d}".lower() in title.lower())
+                elif anime_format == 'no_zeros':
+                    # Simple episode number format
+                    valid = f" {episode} " in f" {title} "
+                elif anime_format == 'combined':
+                    # Combined format (S01E018)
+                    expected_abs_ep = self._expected_absolute_episode()
+                    valid = f"S{season:02d}E{expected_abs_ep:03d}".lower() in title.lower()
+
+                if not valid:
+                    logging.debug(f"❌ Failed: Anime format mismatch - {anime_format} doesn't match S{season}E{episode}")
+                    return f"Anime format mismatch: {anime_format} format doesn't match S{season}E{episode}"
+                logging.debug(f"✓ Passed anime format validation with {anime_format}")
+            elif result_seasons and season not in result_seasons:
+                # Still do season validation for anime if season info is available
+                logging.debug(f"❌ Failed: Season mismatch - found {result_seasons} but needed {season}")
+                return f"Season mismatch: expected S{season}, got {result_seasons}"
+
+        if result_episodes and episode not in result_episodes:
+            logging.debug(f"❌ Failed: Episode mismatch {result_episodes}")
+            return f"Episode mismatch: expected E{episode}, got {result_episodes}"
+        return None
+
+    def _calculate_size_and_bitrate(self, result):
+        size_gb = parse_size(result.get('size', 0))
+        size_per_episode_gb = size_gb
+        if self.is_episode and result.get('scraper', '').lower().startswith(('jackett', 'zilean')):
+            season_pack = result['parsed_info'].get('season_episode_info', {}).get('season_pack', 'Unknown')
+            if season_pack != 'N/A':
+                if season_pack == 'Complete':
+                    episode_count = self.total_episodes
                 else:
-                    result['size'] = size_gb
-                    bitrate = calculate_bitrate(size_gb, runtime)
-            else:
-                result['size'] = size_gb
-                bitrate = calculate_bitrate(size_gb, runtime)
-            
-            result['bitrate'] = bitrate
-            #logging.debug(f"Size: {result['size']:.2f}GB, Bitrate: {bitrate:.2f}Mbps")
-            
-            # Add to pre-size filtered results
-            pre_size_filtered_results.append(result)
-            
-            # Size filters
-            if result['size'] > 0:
-                if result['size'] < min_size_gb:
-                    result['filter_reason'] = f"Size too small: {result['size']:.2f} GB (min: {min_size_gb} GB)"
-                    logging.debug(f"❌ Failed: Size {result['size']:.2f}GB below minimum {min_size_gb}GB")
-                    continue
-                if result['size'] > max_size_gb:
-                    result['filter_reason'] = f"Size too large: {result['size']:.2f} GB (max: {max_size_gb} GB)"
-                    logging.debug(f"❌ Failed: Size {result['size']:.2f}GB above maximum {max_size_gb}GB")
-                    continue
-            #logging.debug("✓ Passed size checks")
-            
-            # Bitrate filters
-            min_bitrate_mbps = float(version_settings.get('min_bitrate_mbps', 0.0))
-            max_bitrate_mbps = float(version_settings.get('max_bitrate_mbps', float('inf')) or float('inf'))
-            
-            if result.get('bitrate', 0) > 0:
-                if result['bitrate'] < min_bitrate_mbps:
-                    result['filter_reason'] = f"Bitrate too low: {result['bitrate']:.2f} Mbps (min: {min_bitrate_mbps} Mbps)"
-                    logging.debug(f"❌ Failed: Bitrate {result['bitrate']:.2f}Mbps below minimum {min_bitrate_mbps}Mbps")
-                    continue
-                if result['bitrate'] > max_bitrate_mbps:
-                    result['filter_reason'] = f"Bitrate too high: {result['bitrate']:.2f} Mbps (max: {max_bitrate_mbps} Mbps)"
-                    logging.debug(f"❌ Failed: Bitrate {result['bitrate']:.2f}Mbps above maximum {max_bitrate_mbps}Mbps")
-                    continue
-            #logging.debug("✓ Passed bitrate checks")
-            
-            # Pattern matching
+                    season_numbers = [int(s) for s in season_pack.split(',')]
+                    episode_count = sum(self.season_episode_counts.get(s, 0) for s in season_numbers)
+                size_per_episode_gb = size_gb / episode_count if episode_count > 0 else size_gb
+        result['size'] = size_per_episode_gb
+        result['bitrate'] = calculate_bitrate(size_per_episode_gb, self.runtime)
+        return None
+
+    def _check_size_patterns_and_adult(self, result):
+        # Size filters
+        if result['size'] > 0:
+            if result['size'] < self.min_size_gb:
+                logging.debug(f"❌ Failed: Size {result['size']:.2f}GB below minimum {self.min_size_gb}GB")
+                return f"Size too small: {result['size']:.2f} GB (min: {self.min_size_gb} GB)"
+            if result['size'] > self.max_size_gb:
+                logging.debug(f"❌ Failed: Size {result['size']:.2f}GB above maximum {self.max_size_gb}GB")
+                return f"Size too large: {result['size']:.2f} GB (max: {self.max_size_gb} GB)"
+
+        # Bitrate filters
+        if result.get('bitrate', 0) > 0:
+            if result['bitrate'] < self.min_bitrate_mbps:
+                logging.debug(f"❌ Failed: Bitrate {result['bitrate']:.2f}Mbps below minimum {self.min_bitrate_mbps}Mbps")
+                return f"Bitrate too low: {result['bitrate']:.2f} Mbps (min: {self.min_bitrate_mbps} Mbps)"
+            if result['bitrate'] > self.max_bitrate_mbps:
+                logging.debug(f"❌ Failed: Bitrate {result['bitrate']:.2f}Mbps above maximum {self.max_bitrate_mbps}Mbps")
+                return f"Bitrate too high: {result['bitrate']:.2f} Mbps (max: {self.max_bitrate_mbps} Mbps)"
+
+        # Pattern matching
+        original_title = result['parsed_info']['original_title']
+        if self.filter_out_patterns or self.filter_in_patterns:
             normalized_filter_title = normalize_title(original_title)
-            
-            if filter_out_patterns:
-                matched_patterns = [pattern for pattern in filter_out_patterns if smart_search(pattern, normalized_filter_title)]
+
+            if self.filter_out_patterns and (self.filter_out_any is None or self.filter_out_any.search(normalized_filter_title)):
+                matched_patterns = [pattern for pattern, compiled in self.filter_out_patterns if compiled.search(normalized_filter_title)]
                 if matched_patterns:
-                    result['filter_reason'] = f"Matching filter_out pattern(s): {', '.join(matched_patterns)}"
                     logging.debug(f"❌ Failed: Matched filter_out patterns: {matched_patterns}")
-                    continue
-            
-            if filter_in_patterns and not any(smart_search(pattern, normalized_filter_title) for pattern in filter_in_patterns):
-                result['filter_reason'] = "Not matching any filter_in patterns"
-                logging.debug("❌ Failed: No matching filter_in patterns")
-                continue
-            #logging.debug("✓ Passed pattern checks")
-            
-            # Adult content check
-            if adult_pattern and adult_pattern.search(original_title):
-                result['filter_reason'] = "Adult content filtered"
-                logging.debug("❌ Failed: Adult content detected")
-                continue
-            #logging.debug("✓ Passed adult content check")
-            
-            # If we made it here, add to filtered results
-            filtered_results.append(result)
-            logging.debug("✓ Result accepted!")
-            
-        except Exception as e:
-            logging.error(f"Error filtering result '{original_title}': {str(e)}", exc_info=True)
-            result['filter_reason'] = f"Error during filtering: {str(e)}"
-            continue
-    
-    logging.debug(f"\nFiltering complete: {len(filtered_results)}/{len(results)} results passed")
-    return filtered_results, pre_size_filtered_results
+                    return f"Matching filter_out pattern(s): {', '.join(matched_patterns)}"
+
+            if self.filter_in_patterns:
+                if self.filter_in_any is not None:
+                    matched_in = self.filter_in_any.search(normalized_filter_title) is not None
+                else:
+                    matched_in = any(compiled.search(normalized_filter_title) for compiled in self.filter_in_patterns)
+                if not matched_in:
+                    logging.debug("❌ Failed: No matching filter_in patterns")
+                    return "Not matching any filter_in patterns"
+
+        # Adult content check
+        if self.adult_pattern and self.adult_pattern.search(original_title):
+            logging.debug("❌ Failed: Adult content detected")
+            return "Adult content filtered"
+        return None
+
+def filter_results(results: List[Dict[str, Any]], tmdb_id: str, title: str, year: int, content_type: str, season: int, episode: int, multi: bool, version_settings: Dict[str, Any], runtime: int, episode_count: int, season_episode_counts: Dict[int, int], genres: List[str], matching_aliases: List[str] = None) -> List[Dict[str, Any]]:
+    result_filter = ResultFilter(tmdb_id, title, year, content_type, season, episode, multi, version_settings, runtime, episode_count, season_episode_counts, genres, matching_aliases)
+    return result_filter.apply(results)
 
 def resolution_filter(result_resolution, max_resolution, resolution_wanted):
     comparison = compare_resolutions(result_resolution, max_resolution)
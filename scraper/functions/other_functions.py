@@ -51,6 +51,42 @@ def smart_search(pattern, text):
     else:
         return pattern.lower() in text.lower()
 
+def smart_search_regex(pattern):
+    """Regex source that matches (case-insensitively) wherever smart_search(pattern, text) would."""
+    if pattern.startswith('"') and pattern.endswith('"'):
+        return re.escape(pattern[1:-1])
+    if is_regex(pattern):
+        is_valid, error = validate_regex(pattern)
+        if is_valid:
+            return pattern
+        logging.error(f"Invalid regex pattern '{pattern}': {error}")
+    # Plain patterns, and invalid regexes as a fallback, are substring matches
+    return re.escape(pattern)
+
+def compile_smart_search(pattern):
+    """Compile a smart_search pattern once for repeated use."""
+    return re.compile(smart_search_regex(pattern), re.IGNORECASE)
+
+# A backslash escape of a group number (\1) or a conditional on one ((?(1)...)). Joining patterns into
+# one alternation renumbers their groups, so these would silently refer to the wrong group.
+GROUP_REFERENCE_PATTERN = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(\d')
+
+def compile_smart_search_any(patterns):
+    """
+    Compile a list of smart_search patterns into a single alternation that matches
+    if any of them would. Returns None if there are no patterns or they can't be
+    combined (a pattern uses global inline flags or refers to a group by number).
+    """
+    if not patterns:
+        return None
+    sources = [smart_search_regex(pattern) for pattern in patterns]
+    if any(GROUP_REFERENCE_PATTERN.search(source) for source in sources):
+        return None
+    try:
+        return re.compile('|'.join(f'(?:{source})' for source in sources), re.IGNORECASE)
+    except re.error:
+        return None
+
 def test_regex_patterns():
     """Test function to demonstrate valid and invalid regex patterns."""
     # Valid pattern examples
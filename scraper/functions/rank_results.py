@@ -1,10 +1,61 @@
 import logging
 import re
-from typing import List, Dict, Any, Tuple
+from bisect import bisect_right
+from typing import List, Dict, Any, Tuple, Callable
 from scraper.functions.similarity_checks import similarity
-from scraper.functions.other_functions import smart_search
+from scraper.functions.other_functions import compile_smart_search
+
+TV_INDICATORS_PATTERN = re.compile(r'(s\d{2}|e\d{2}|season|episode)', re.IGNORECASE)
+YEAR_RANGE_PATTERN = re.compile(r'\[(\d{4}).*?(\d{4})\]')
+ANIME_EPISODE_PATTERN = re.compile(r'[-\s_](\d{1,3})(\s|$|\.|_|\[)')
+ANIME_BATCH_PATTERN = re.compile(r'batch|season|complete|\(s\d+\)|\[s\d+\]', re.IGNORECASE)
+
+class PercentileIndex:
+    """Sorted copy of a list of values for O(log n) percentile lookups."""
+
+    def __init__(self, values: List[float]):
+        self.values = sorted(values)
+
+    def rank(self, value: float) -> float:
+        """Fraction of values <= value, 0 if there are no values"""
+        if not self.values:
+            return 0
+        return bisect_right(self.values, value) / len(self.values)
+
+def compile_preferred_filters(filters: List[Tuple[str, int]]) -> List[Tuple[str, int, Callable[[str], bool]]]:
+    return [(pattern, weight, compile_smart_search(pattern).search) for pattern, weight in filters]
+
+def rank_results(results: List[Dict[str, Any]], query: str, query_year: int, query_season: int, query_episode: int, multi: bool, content_type: str, version_settings: Dict[str, Any]) -> List[Tuple]:
+    """
+    Compute the sort key of every result in one pass.
+
+    The size and bitrate percentile tables and the preferred filter patterns
+    are built once for the whole batch instead of once per result, so ranking
+    n results is O(n log n) rather than O(n^2).
+
+    Returns:
+        List of sort keys in the same order as results (see rank_result_key).
+    """
+    sizes = PercentileIndex([float(r['size']) for r in results])
+    bitrates = PercentileIndex([float(r['bitrate']) for r in results])
+    preferred_filters_in = compile_preferred_filters(version_settings.get('preferred_filter_in', []))
+    preferred_filters_out = compile_preferred_filters(version_settings.get('preferred_filter_out', []))
+    return [
+        _rank_result_key(result, sizes, bitrates, query, query_year, query_season, query_episode, multi,
+                         content_type, version_settings, preferred_filters_in, preferred_filters_out)
+        for result in results
+    ]
 
 def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], query: str, query_year: int, query_season: int, query_episode: int, multi: bool, content_type: str, version_settings: Dict[str, Any]) -> Tuple:
+    """Sort key for a single result. Use rank_results when ranking a whole result list."""
+    sizes = PercentileIndex([float(r['size']) for r in all_results])
+    bitrates = PercentileIndex([float(r['bitrate']) for r in all_results])
+    return _rank_result_key(result, sizes, bitrates, query, query_year, query_season, query_episode, multi,
+                            content_type, version_settings,
+                            compile_preferred_filters(version_settings.get('preferred_filter_in', [])),
+                            compile_preferred_filters(version_settings.get('preferred_filter_out', [])))
+
+def _rank_result_key(result: Dict[str, Any], sizes: PercentileIndex, bitrates: PercentileIndex, query: str, query_year: int, query_season: int, query_episode: int, multi: bool, content_type: str, version_settings: Dict[str, Any], preferred_filters_in: List[Tuple[str, int, Callable[[str], bool]]], preferred_filters_out: List[Tuple[str, int, Callable[[str], bool]]]) -> Tuple:
     torrent_title = result.get('title', '')
     parsed_info = result.get('parsed_info', {})
     extracted_title = parsed_info.get('title', torrent_title)
@@ -99,14 +150,8 @@ def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], q
     bitrate = float(result['bitrate'])  # Extract the numeric value from the bitrate string
     
     # Calculate percentile ranks for size and bitrate
-    all_sizes = [float(r['size']) for r in all_results]
-    all_bitrates = [float(r['bitrate']) for r in all_results]
-
-    def percentile_rank(value, all_values):
-        return sum(1 for v in all_values if v <= value) / len(all_values) if all_values else 0
-
-    size_percentile = percentile_rank(size, all_sizes)
-    bitrate_percentile = percentile_rank(bitrate, all_bitrates)
+    size_percentile = sizes.rank(size)
+    bitrate_percentile = bitrates.rank(bitrate)
 
     # Normalize scores to a 0-10 range
     normalized_similarity = title_similarity * 10
@@ -177,15 +222,15 @@ def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], q
 
     # Apply preferred_filter_in bonus
     preferred_filter_in_breakdown = {}
-    for pattern, weight in version_settings.get('preferred_filter_in', []):
-        if smart_search(pattern, torrent_title):
+    for pattern, weight, matches in preferred_filters_in:
+        if matches(torrent_title):
             preferred_filter_score += weight
             preferred_filter_in_breakdown[pattern] = weight
 
     # Apply preferred_filter_out penalty
     preferred_filter_out_breakdown = {}
-    for pattern, weight in version_settings.get('preferred_filter_out', []):
-        if smart_search(pattern, torrent_title):
+    for pattern, weight, matches in preferred_filters_out:
+        if matches(torrent_title):
             preferred_filter_score -= weight
             preferred_filter_out_breakdown[pattern] = -weight
 
@@ -208,7 +253,7 @@ def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], q
     # Content type matching score
     content_type_score = 0
     if content_type.lower() == 'movie' and not result.get('is_anime', False):
-        if re.search(r'(s\d{2}|e\d{2}|season|episode)', torrent_title, re.IGNORECASE):
+        if TV_INDICATORS_PATTERN.search(torrent_title):
             content_type_score = -500
             logging.debug(f"Applied penalty for movie with season/episode in title")
     elif content_type.lower() == 'episode':
@@ -217,8 +262,8 @@ def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], q
         
         if not is_anime:
             # Regular TV show pattern matching
-            tv_indicators = re.search(r'(s\d{2}|e\d{2}|season|episode)', torrent_title, re.IGNORECASE)
-            year_range = re.search(r'\[(\d{4}).*?(\d{4})\]', torrent_title)
+            tv_indicators = TV_INDICATORS_PATTERN.search(torrent_title)
+            year_range = YEAR_RANGE_PATTERN.search(torrent_title)
             
             if not tv_indicators:
                 # If no clear TV indicators, check for year ranges typical of TV collections
@@ -237,7 +282,7 @@ def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], q
             anime_format = result.get('anime_format')
             
             # Check for common anime episode patterns
-            anime_episode_pattern = re.search(r'[-\s_](\d{1,3})(\s|$|\.|_|\[)', torrent_title)
+            anime_episode_pattern = ANIME_EPISODE_PATTERN.search(torrent_title)
             
             if anime_episode_pattern:
                 # Found a potential episode number
@@ -257,7 +302,7 @@ def rank_result_key(result: Dict[str, Any], all_results: List[Dict[str, Any]], q
                 logging.debug(f"No episode pattern found but has anime_format: {anime_format}")
             else:
                 # Try alternative pattern matching for anime batches
-                batch_pattern = re.search(r'batch|season|complete|\(s\d+\)|\[s\d+\]', torrent_title, re.IGNORECASE)
+                batch_pattern = ANIME_BATCH_PATTERN.search(torrent_title)
                 if batch_pattern:
                     # This is likely a batch/season pack
                     if multi:
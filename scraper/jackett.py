@@ -121,7 +121,7 @@ def scrape_jackett_instance(instance: str, settings: Dict[str, Any], imdb_id: st
         full_url = f"{search_endpoint}&{urlencode(query_params, doseq=True)}"
 
         try:
-            response = api.get(full_url, headers={'accept': 'application/json'})
+            response = api.get(full_url, headers={'accept': 'application/json'}, timeout=60)
             
             if response.status_code == 200:
                 data = response.json()
@@ -231,7 +231,7 @@ def construct_url(settings: Dict[str, Any], title: str, year: int, content_type:
     return full_url
 
 def fetch_data(url: str) -> Dict[str, Any]:
-    response = api.get(url, headers={'accept': 'application/json'})
+    response = api.get(url, headers={'accept': 'application/json'}, timeout=60)
     #logging.debug(f"Jackett instance '{instance}' API status code: {response.status_code}")
 
     if response.status_code == 200:
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from settings import get_setting
+from utilities.sqlite_store import SQLiteStore
+
+# How long raw results from each scraper type stay fresh. Indexer-backed scrapers
+# pick up new releases faster than the aggregators, so they expire sooner. All of
+# them stay well below the Sleeping queue's 30 minute wake interval, so a woken item
+# is never answered from the scrape that sent it to sleep.
+DEFAULT_TTL_MINUTES = {
+    'Torrentio': 15,
+    'Zilean': 15,
+    'MediaFusion': 15,
+    'Nyaa': 15,
+    'OldNyaa': 15,
+    'Jackett': 10,
+    'Prowlarr': 10,
+}
+FALLBACK_TTL_MINUTES = 10
+DEFAULT_MAX_SIZE_MB = 100
+
+class ScrapeCache(SQLiteStore):
+    """
+    On-disk cache of raw per-scraper-instance results, stored before filtering
+    so a re-scrape with different version settings only re-filters locally.
+
+    Entries are keyed by the query (imdb id, title, year, season, episode, multi)
+    and scraper instance, and are ignored once the instance's settings change.
+    """
+
+    DB_FILENAME = 'scrape_cache.db'
+    STATS = ('hits', 'misses', 'stores', 'evictions', 'bypassed')
+
+    def _create_schema(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                query_key TEXT NOT NULL,
+                instance TEXT NOT NULL,
+                imdb_id TEXT,
+                season INTEGER,
+                episode INTEGER,
+                settings_hash TEXT NOT NULL,
+                results TEXT NOT NULL,
+                result_count INTEGER NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                cached_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (query_key, instance)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_scrape_cache_last_access ON scrape_cache(last_access)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_scrape_cache_imdb_id ON scrape_cache(imdb_id)')
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return get_setting('Scraping', 'enable_scrape_cache', True)
+
+    @staticmethod
+    def make_query_key(imdb_id: str, title: str, year: Optional[int], content_type: str, season: Optional[int], episode: Optional[int], multi: bool) -> str:
+        return '|'.join(str(part) for part in (
+            imdb_id or '', (title or '').lower(), year or '', content_type.lower(),
+            season if season is not None else '', episode if episode is not None else '', int(bool(multi))
+        ))
+
+    @staticmethod
+    def _settings_hash(settings: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(settings or {}, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def get_ttl_seconds(instance: str, scraper_type: str) -> float:
+        """TTL for an instance: per-instance override, then per-type override, then the type's default"""
+        overrides = get_setting('Scraping', 'scrape_cache_ttl_minutes', {}) or {}
+        minutes = overrides.get(instance, overrides.get(scraper_type, DEFAULT_TTL_MINUTES.get(scraper_type, FALLBACK_TTL_MINUTES)))
+        try:
+            return float(minutes) * 60
+        except (TypeError, ValueError):
+            return FALLBACK_TTL_MINUTES * 60
+
+    @staticmethod
+    def get_max_size_bytes() -> int:
+        try:
+            return int(float(get_setting('Scraping', 'scrape_cache_max_size_mb', DEFAULT_MAX_SIZE_MB)) * 1024 * 1024)
+        except (TypeError, ValueError):
+            return DEFAULT_MAX_SIZE_MB * 1024 * 1024
+
+    def record_bypass(self):
+        self._count('bypassed')
+
+    def get(self, query_key: str, instance: str, settings: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached results for instance, or None on a miss (absent, expired or settings changed)"""
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT results, settings_hash, expires_at FROM scrape_cache WHERE query_key = ? AND instance = ?',
+                (query_key, instance)
+            ).fetchone()
+            now = time.time()
+            if row is None or row['expires_at'] <= now or row['settings_hash'] != self._settings_hash(settings):
+                self._count('misses')
+                return None
+            conn.execute('UPDATE scrape_cache SET last_access = ? WHERE query_key = ? AND instance = ?', (now, query_key, instance))
+            conn.commit()
+            self._count('hits')
+            return json.loads(row['results'])
+        except Exception as e:
+            logging.error(f"Error reading scrape cache for {instance}: {str(e)}")
+            self._count('misses')
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def put(self, query_key: str, instance: str, scraper_type: str, settings: Dict[str, Any], results: List[Dict[str, Any]],
+            imdb_id: str = None, season: int = None, episode: int = None):
+        if not results:
+            # An empty answer is what a retry is for, so it is always asked again
+            return
+        ttl = self.get_ttl_seconds(instance, scraper_type)
+        if ttl <= 0:
+            return
+        conn = None
+        try:
+            payload = json.dumps(results, default=str)
+            now = time.time()
+            conn = self._connect()
+            conn.execute('''
+                INSERT OR REPLACE INTO scrape_cache
+                (query_key, instance, imdb_id, season, episode, settings_hash, results, result_count, size_bytes, cached_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (query_key, instance, imdb_id, season, episode, self._settings_hash(settings), payload,
+                  len(results), len(payload), now, now + ttl, now))
+            conn.commit()
+            self._count('stores')
+            self._evict(conn)
+        except Exception as e:
+            logging.error(f"Error writing scrape cache for {instance}: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _evict(self, conn):
+        """Drop expired entries, then least recently used ones until the cache fits its size budget"""
+        evicted = conn.execute('DELETE FROM scrape_cache WHERE expires_at <= ?', (time.time(),)).rowcount
+        max_size = self.get_max_size_bytes()
+        total = conn.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM scrape_cache').fetchone()[0]
+        if total > max_size:
+            # Trim to 90% so we don't evict on every store once full
+            target = max_size * 0.9
+            stale = []
+            for row in conn.execute('SELECT query_key, instance, size_bytes FROM scrape_cache ORDER BY last_access'):
+                if total <= target:
+                    break
+                stale.append((row['query_key'], row['instance']))
+                total -= row['size_bytes']
+            conn.executemany('DELETE FROM scrape_cache WHERE query_key = ? AND instance = ?', stale)
+            evicted += len(stale)
+        conn.commit()
+        if evicted:
+            self._count('evictions', evicted)
+
+    def invalidate(self, imdb_id: Optional[str] = None) -> int:
+        """Remove the cached results for imdb_id, or everything if no id is given"""
+        conn = None
+        try:
+            conn = self._connect()
+            if imdb_id:
+                removed = conn.execute('DELETE FROM scrape_cache WHERE imdb_id = ?', (imdb_id,)).rowcount
+            else:
+                removed = conn.execute('DELETE FROM scrape_cache').rowcount
+            conn.commit()
+            return removed
+        except Exception as e:
+            logging.error(f"Error clearing scrape cache: {str(e)}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any]):
+        stats['max_size_bytes'] = self.get_max_size_bytes()
+        row = conn.execute('SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS size_bytes FROM scrape_cache').fetchone()
+        stats['entries'] = row['entries']
+        stats['size_bytes'] = row['size_bytes']
+
+scrape_cache = ScrapeCache()
@@ -60,8 +60,8 @@ def convert_anime_episode_format(season: int, episode: int, total_episodes: int)
         'combined': combined_format
     }
 
-def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str, version: str, season: int = None, episode: int = None, multi: bool = False, genres: List[str] = None, skip_cache_check: bool = False) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
-    logging.info(f"Scraping with parameters: imdb_id={imdb_id}, tmdb_id={tmdb_id}, title={title}, year={year}, content_type={content_type}, version={version}, season={season}, episode={episode}, multi={multi}, genres={genres}, skip_cache_check={skip_cache_check}")
+def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str, version: str, season: int = None, episode: int = None, multi: bool = False, genres: List[str] = None, skip_cache_check: bool = False, bypass_scrape_cache: bool = False) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+    logging.info(f"Scraping with parameters: imdb_id={imdb_id}, tmdb_id={tmdb_id}, title={title}, year={year}, content_type={content_type}, version={version}, season={season}, episode={episode}, multi={multi}, genres={genres}, skip_cache_check={skip_cache_check}, bypass_scrape_cache={bypass_scrape_cache}")
 
     try:
         start_time = time.time()
@@ -204,7 +204,8 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
                 multi=multi,
                 genres=genres,
                 episode_formats=episode_formats,
-                tmdb_id=tmdb_id
+                tmdb_id=tmdb_id,
+                use_cache=not bypass_scrape_cache
             )
             task_timings['scraping'] = time.time() - task_start
 
@@ -245,7 +246,8 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
             # Filter results
             task_start = time.time()
             filtered_results, pre_size_filtered_results = filter_results(normalized_results, tmdb_id, search_title, year, content_type, season, episode, multi, version_settings, runtime, episode_count, season_episode_counts, genres, matching_aliases)
-            filtered_out_results = [result for result in normalized_results if result not in filtered_results]
+            passed_keys = {result['identity_key'] for result in filtered_results}
+            filtered_out_results = [result for result in normalized_results if result['identity_key'] not in passed_keys]
             task_timings['filtering'] = time.time() - task_start
 
             return filtered_results, filtered_out_results, task_timings
@@ -316,11 +318,21 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
         seen = set()
         deduplicated_results = []
         for result in all_filtered_results:
-            result_key = result.get('original_title', '')
+            result_key = result['identity_key']
             if result_key not in seen:
                 seen.add(result_key)
                 deduplicated_results.append(result)
 
+        # A torrent filtered out for one title but accepted for another is not filtered out
+        filtered_out_seen = set(seen)
+        deduplicated_filtered_out = []
+        for result in all_filtered_out_results:
+            result_key = result['identity_key']
+            if result_key not in filtered_out_seen:
+                filtered_out_seen.add(result_key)
+                deduplicated_filtered_out.append(result)
+        all_filtered_out_results = deduplicated_filtered_out
+
         # Parse scraping settings for final sorting
         scraping_versions = get_setting('Scraping', 'versions', {})
         version_settings = scraping_versions.get(version, None)
@@ -345,21 +357,18 @@ def scrape(imdb_id: str, tmdb_id: str, title: str, year: int, content_type: str,
             }
 
         # Sort all results together
-        def stable_rank_key(x):
+        if is_anime:
             # Make sure is_anime flag is set in each result
-            if is_anime and 'is_anime' not in x:
-                x['is_anime'] = is_anime
-            return rank_result_key(x, deduplicated_results, title, year, season, episode, multi, content_type, version_settings)
+            for result in deduplicated_results:
+                result.setdefault('is_anime', is_anime)
+        rank_keys = rank_results(deduplicated_results, title, year, season, episode, multi, content_type, version_settings)
+        deduplicated_results = [result for _, result in sorted(zip(rank_keys, deduplicated_results), key=lambda pair: pair[0])]
 
         # Apply ultimate sort order if present
         if get_setting('Scraping', 'ultimate_sort_order')=='Size: large to small':
-            deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
             deduplicated_results = sorted(deduplicated_results, key=lambda x: x.get('size', 0), reverse=True)
         elif get_setting('Scraping', 'ultimate_sort_order')=='Size: small to large':
-            deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
             deduplicated_results = sorted(deduplicated_results, key=lambda x: x.get('size', 0))
-        else:
-            deduplicated_results = sorted(deduplicated_results, key=stable_rank_key)
 
         # Log final results
         logging.debug(f"Total scrape results after trying all titles: {len(deduplicated_results)}")
@@ -8,6 +8,8 @@ from .prowlarr import scrape_prowlarr_instance
 from .torrentio import scrape_torrentio_instance
 from .zilean import scrape_zilean_instance
 from .old_nyaa import scrape_nyaa_instance as scrape_old_nyaa_instance
+from scraper.functions.common import result_identity_key
+from .scrape_cache import scrape_cache
 from settings import get_setting
 
 class ScraperManager:
@@ -51,7 +53,8 @@ class ScraperManager:
         multi: bool = False,
         genres: List[str] = None,
         episode_formats: Optional[Dict[str, str]] = None,
-        tmdb_id: Optional[str] = None
+        tmdb_id: Optional[str] = None,
+        use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Scrape all configured sources for content.
@@ -67,13 +70,28 @@ class ScraperManager:
             genres: List of genres
             episode_formats: Dictionary of episode format patterns for anime
             tmdb_id: TMDB ID of the content
+            use_cache: Serve and store per-instance results through the scrape cache
+
+        Returns:
+            List of results, each carrying an 'identity_key' (info hash, or the magnet/link if it has none)
         """
         all_results = []
         is_anime = genres and 'anime' in [genre.lower() for genre in genres]
         is_episode = content_type.lower() == 'episode'
+
+        cache_query = None
+        if use_cache and scrape_cache.is_enabled():
+            cache_query = scrape_cache.make_query_key(imdb_id, title, year, content_type, season, episode, multi)
+        elif not use_cache:
+            scrape_cache.record_bypass()
         
         # Helper function to run a scraper and handle exceptions
         def run_scraper(instance, scraper_type, settings):
+            if cache_query is not None:
+                cached_results = scrape_cache.get(cache_query, instance, settings)
+                if cached_results is not None:
+                    logging.info(f"Using {len(cached_results)} cached results from {instance}")
+                    return instance, cached_results
             try:
                 if scraper_type in ['Nyaa', 'OldNyaa']:
                     # Nyaa has a different function signature
@@ -107,6 +125,14 @@ class ScraperManager:
                     else:
                         results = self.scrapers[scraper_type](instance, settings, imdb_id, title, year, content_type, season, episode, multi)
                 
+                # Tag every result with its torrent identity so later stages can use set operations
+                for result in results:
+                    result['identity_key'] = result_identity_key(result)
+
+                if cache_query is not None:
+                    scrape_cache.put(cache_query, instance, scraper_type, settings, results,
+                                     imdb_id=imdb_id, season=season, episode=episode)
+
                 logging.info(f"Found {len(results)} results from {instance}")
                 return instance, results
             except Exception as e:
@@ -125,7 +151,7 @@ class ScraperManager:
                 
                 # Use ThreadPoolExecutor to run anime scrapers in parallel
                 anime_scraper_tasks = []
-                with ThreadPoolExecutor() as executor:
+                with ThreadPoolExecutor(max_workers=2) as executor:
                     if old_nyaa_enabled:
                         anime_scraper_tasks.append(
                             executor.submit(run_scraper, 'OldNyaa', 'OldNyaa', old_nyaa_settings)
@@ -172,8 +198,8 @@ class ScraperManager:
                 
             scraper_tasks.append((instance, scraper_type, current_settings))
         
-        # Run all scrapers in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor() as executor:
+        # Run all scrapers in parallel, one worker each; per-host limits are applied by the shared api client
+        with ThreadPoolExecutor(max_workers=max(1, len(scraper_tasks))) as executor:
             futures = [
                 executor.submit(run_scraper, instance, scraper_type, settings)
                 for instance, scraper_type, settings in scraper_tasks
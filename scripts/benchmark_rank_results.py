@@ -0,0 +1,72 @@
+"""Benchmark ranking a large synthetic scrape result set.
+
+Compares the per-result rank_result_key (percentiles rebuilt for every
+result) with the batch rank_results API.
+
+Usage: python scripts/benchmark_rank_results.py [result_count]
+"""
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper.functions.rank_results import rank_result_key, rank_results
+
+VERSION_SETTINGS = {
+    'enable_hdr': True,
+    'max_resolution': '2160p',
+    'resolution_weight': '3',
+    'hdr_weight': '3',
+    'similarity_weight': '3',
+    'size_weight': '3',
+    'bitrate_weight': '3',
+    'preferred_filter_in': [['REMUX', 1000], ['"WEB-DL"', 200], [r'\bDV\b', 100]],
+    'preferred_filter_out': [['CAM', 1000], [r'x26[45]\.?HEVC', 50], ['3D', 500]],
+}
+
+def build_results(count, seed=0):
+    rng = random.Random(seed)
+    tags = ['1080p', '2160p', '720p', 'REMUX', 'WEB-DL', 'BluRay', 'DV', 'HDR', 'CAM', 'x265']
+    results = []
+    for i in range(count):
+        title = f"Some Show S01E0{rng.randint(1, 9)} {' '.join(rng.sample(tags, 3))}-GRP{i}"
+        results.append({
+            'title': title,
+            'size': round(rng.uniform(0.2, 60.0), 2),
+            'bitrate': round(rng.uniform(500, 80000), 2),
+            'scraper': 'jackett',
+            'season_pack': 'N/A',
+            'parsed_info': {
+                'title': 'Some Show',
+                'year': 2020,
+                'season': 1,
+                'episode': rng.randint(1, 9),
+                'resolution_rank': rng.randint(0, 4),
+                'is_hdr': 'HDR' in title,
+            },
+        })
+    return results
+
+def timed(label, call):
+    start = time.perf_counter()
+    keys = call()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:>8.2f} s")
+    return keys
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.disable(logging.CRITICAL)
+    results = build_results(count)
+    args = ('Some Show', 2020, 1, 1, False, 'episode', VERSION_SETTINGS)
+
+    print(f"Ranking {count} synthetic results")
+    batch_keys = timed('rank_results (batch)', lambda: rank_results(results, *args))
+    single_keys = timed('rank_result_key per result', lambda: [rank_result_key(r, results, *args) for r in results])
+    assert batch_keys == single_keys, "batch and per-result keys differ"
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark settings.get_setting with and without the in-memory snapshot.
+
+Usage: python scripts/benchmark_settings.py [iterations]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build_config():
+    return {
+        'Scraping': {
+            'versions': {
+                f'Version {i}': {
+                    'max_resolution': '2160p',
+                    'min_size_gb': 0.01,
+                    'preferred_filter_in': [['REMUX', 1000], ['HDR', 500]],
+                    'filter_out': ['CAM', 'TS'],
+                } for i in range(4)
+            },
+        },
+        'Queue': {'wake_limit': '24', 'sleep_duration': '30'},
+        'Debug': {'jackett_seeders_only': 'false'},
+        'Content Sources': {
+            f'Trakt Watchlist_{i}': json.dumps({'enabled': True, 'versions': ['Version 0'], 'type': 'Trakt Watchlist'})
+            for i in range(5)
+        },
+    }
+
+def run(iterations, label, call):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {iterations / elapsed:>12,.0f} calls/s  ({elapsed * 1e6 / iterations:.1f} us/call)")
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.environ['USER_CONFIG'] = config_dir
+        import settings
+        settings.CONFIG_DIR = config_dir
+        settings.CONFIG_FILE = os.path.join(config_dir, 'config.json')
+        settings.LOCK_FILE = os.path.join(config_dir, '.config.lock')
+        open(settings.LOCK_FILE, 'w').close()
+        with open(settings.CONFIG_FILE, 'w') as f:
+            json.dump(build_config(), f, indent=2)
+
+        def uncached():
+            # Equivalent of the previous get_setting: lock, open and parse on every call
+            settings._read_config_file().get('Queue', {}).get('wake_limit')
+
+        print(f"get_setting('Queue', 'wake_limit') x {iterations}")
+        run(iterations, 'lock + parse (before)', uncached)
+        run(iterations, 'snapshot (after)', lambda: settings.get_setting('Queue', 'wake_limit'))
+        run(iterations, 'snapshot, dict value', lambda: settings.get_setting('Scraping', 'versions'))
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ import logging
 from urllib.parse import urlparse
 import json
 import ast
+import threading
 from settings_schema import SETTINGS_SCHEMA
 from utilities.file_lock import FileLock
 import time
@@ -36,7 +37,7 @@ class Settings:
             self.lock.release()
             self.fd.close()
 
-def load_config():
+def _read_config_file():
     with Settings(LOCK_FILE):
         if os.path.exists(CONFIG_FILE):
             try:
@@ -66,6 +67,86 @@ def load_config():
                         logging.error(f"Failed to load backup: {str(e)}")
         return {}
 
+# Process-wide settings snapshot. The parsed config is kept in memory and only
+# re-read when config.json changes on disk (mtime/inode/size) or is written
+# through save_config. Callers never receive the snapshot itself, only copies.
+_snapshot_lock = threading.RLock()
+_snapshot = None
+_snapshot_signature = None
+_settings_listeners = []
+
+def _config_file_signature():
+    try:
+        stat = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return (CONFIG_FILE, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _notify_settings_listeners(previous, current):
+    if previous is None:
+        return
+    changed_sections = {
+        section for section in set(previous) | set(current)
+        if previous.get(section) != current.get(section)
+    }
+    if not changed_sections:
+        return
+    for callback in list(_settings_listeners):
+        try:
+            callback(changed_sections)
+        except Exception as e:
+            logging.error(f"Error in settings change listener {callback}: {str(e)}")
+
+def _get_snapshot():
+    global _snapshot, _snapshot_signature
+    signature = _config_file_signature()
+    snapshot = _snapshot
+    if snapshot is not None and signature == _snapshot_signature:
+        return snapshot
+
+    with _snapshot_lock:
+        # Another thread may have reloaded while we waited for the lock
+        if _snapshot is not None and signature == _snapshot_signature:
+            return _snapshot
+        previous = _snapshot
+        config = _read_config_file()
+        # Keep the pre-read signature so a write racing with the read triggers another reload
+        _snapshot_signature = signature
+        _snapshot = config
+    _notify_settings_listeners(previous, config)
+    return config
+
+def _copy_value(value):
+    # The snapshot (and the metadata cache, which shares this) only holds JSON
+    # types, so a plain recursive copy is much cheaper than copy.deepcopy
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_value(v) for v in value)
+    return value
+
+def invalidate_settings_cache():
+    """Force the next settings access to re-read config.json."""
+    global _snapshot_signature
+    with _snapshot_lock:
+        _snapshot_signature = ('invalidated',)
+
+def add_settings_listener(callback):
+    """Register callback(changed_sections) to be called when the config changes."""
+    with _snapshot_lock:
+        if callback not in _settings_listeners:
+            _settings_listeners.append(callback)
+
+def remove_settings_listener(callback):
+    with _snapshot_lock:
+        if callback in _settings_listeners:
+            _settings_listeners.remove(callback)
+
+def load_config():
+    return _copy_value(_get_snapshot())
+
 def load_env_config():
     """Load configuration from environment variable or .env file if it exists."""
     # First try to load from environment variable
@@ -181,6 +262,8 @@ def save_config(config):
                         dst.write(src.read())
                 except Exception as e:
                     logging.error(f"Failed to restore backup: {str(e)}")
+        finally:
+            invalidate_settings_cache()
 
 # Helper function to safely parse boolean values
 def parse_bool(value):
@@ -191,19 +274,22 @@ def parse_bool(value):
     return bool(value)
 
 def get_setting(section, key=None, default=None):
-    config = load_config()
+    config = _get_snapshot()
     
     if section == 'Content Sources':
         content_sources = config.get(section, {})
         if not isinstance(content_sources, dict):
             logging.warning(f"'Content Sources' setting is not a dictionary. Resetting to empty dict.")
             content_sources = {}
-        return content_sources
+        return _copy_value(content_sources)
 
     if key is None:
-        return config.get(section, {})
+        return _copy_value(config.get(section, {}))
     
     value = config.get(section, {}).get(key, default)
+    if isinstance(value, (dict, list)):
+        # Never hand out references into the shared snapshot
+        value = _copy_value(value)
     
     # Handle boolean values
     if isinstance(value, str) and value.lower() in ('true', 'false'):
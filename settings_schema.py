@@ -108,6 +108,31 @@ SETTINGS_SCHEMA = {
             "description": "API key for the debrid service",
             "default": "demo_key",
             "sensitive": True
+        },
+        "cache_status_positive_ttl_hours": {
+            "type": "integer",
+            "description": "How long a torrent found cached is remembered before its cache status is checked again (in hours)",
+            "default": 24,
+            "min": 0
+        },
+        "cache_status_negative_ttl_hours": {
+            "type": "integer",
+            "description": "How long an uncached or invalid torrent is remembered before its cache status is checked again (in hours)",
+            "default": 6,
+            "min": 0
+        },
+        "cache_probe_concurrency": {
+            "type": "integer",
+            "description": "Number of ranked results whose cache status is checked concurrently when adding an item. The best ranked acceptable result still wins; 1 checks one result at a time",
+            "default": 1,
+            "min": 1,
+            "max": 8
+        },
+        "torrent_file_cache_max_size_mb": {
+            "type": "integer",
+            "description": "Maximum size of the cache of downloaded .torrent files (e.g. Jackett/Prowlarr links) in MB; least recently used files are evicted first",
+            "default": 200,
+            "min": 1
         }
     },
     "TMDB": {
@@ -141,6 +166,18 @@ SETTINGS_SCHEMA = {
             "type": "string",
             "description": "Metadata Battery URL. Leave as default unless you have set up the Metadata Battery in a different location.",
             "default": "http://localhost:50051"
+        },
+        "cache_max_entries": {
+            "type": "integer",
+            "description": "Maximum number of metadata lookups kept in memory; least recently used entries are dropped first. 0 disables the cache",
+            "default": 2000,
+            "min": 0
+        },
+        "cache_ttl_seconds": {
+            "type": "integer",
+            "description": "How long a metadata lookup is served from memory before the database is read again (in seconds)",
+            "default": 300,
+            "min": 0
         }
     },
     "Queue": {
@@ -240,6 +277,25 @@ SETTINGS_SCHEMA = {
             "description": "Check Trakt for early releases",
             "default": False
         },
+        "enable_scrape_cache": {
+            "type": "boolean",
+            "description": "Cache raw scraper results on disk so repeated scrapes of the same item (e.g. upgrade checks) are only re-filtered",
+            "default": True
+        },
+        "scrape_cache_ttl_minutes": {
+            "type": "dict",
+            "description": "Override how long cached results stay fresh (in minutes), keyed by scraper type or instance name. Defaults: 10 for Jackett/Prowlarr, 15 for others. 0 disables caching for that scraper",
+            "default": {},
+            "schema": {
+                "*": {"type": "integer", "min": 0}
+            }
+        },
+        "scrape_cache_max_size_mb": {
+            "type": "integer",
+            "description": "Maximum size of the scrape result cache in MB; least recently used entries are evicted first",
+            "default": 100,
+            "min": 1
+        },
         "versions": {
             "type": "dict",
             "description": "Scraping versions configuration",
@@ -333,6 +389,11 @@ SETTINGS_SCHEMA = {
             "description": "Enable caching of Plex removal operations before executing them",
             "default": True
         },
+        "parallel_task_execution": {
+            "type": "boolean",
+            "description": "Run content source checks and maintenance tasks on a worker pool (database writers one at a time) instead of one after another in the main loop",
+            "default": False
+        },
         "content_source_check_period": {
             "type": "dict",
             "description": "Override Content Source checking period (in minutes) - note that a minimum of 5 minutes is recommended",
@@ -452,6 +513,23 @@ SETTINGS_SCHEMA = {
             "description": "Disable content source caching",
             "default": False
         },
+        "content_source_full_sync_hours": {
+            "type": "integer",
+            "description": "Content sources only re-download their lists when the upstream reports a change (ETag, Trakt activity, Overseerr modified date). A full download is still forced at least this often (in hours)",
+            "default": 24,
+            "min": 1
+        },
+        "library_index_full_rebuild_hours": {
+            "type": "integer",
+            "description": "Local file lookups use an index of the library that is refreshed by re-listing only the folders whose modification time changed. The whole library is re-listed at least this often (in hours), for mounts that don't update folder modification times",
+            "default": 24,
+            "min": 1
+        },
+        "library_index_find_fallback": {
+            "type": "boolean",
+            "description": "When a file isn't in the library index, search the whole library for it with find. Slow on large mounts, and items still waiting for their file are searched on every check",
+            "default": False
+        },
         "do_not_add_plex_watch_history_items_to_queue": {
             "type": "boolean",
             "description": "Do not add Plex watch history items to queue",
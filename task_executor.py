@@ -0,0 +1,178 @@
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrency classes. INLINE tasks run on the main program loop in order, which
+# is what every queue needs since they mutate item state. The other classes run
+# on the worker pool, each bounded by its own limit.
+INLINE = 'inline'
+IO_BOUND = 'io'
+DB_WRITER = 'db_writer'
+DEBRID_API = 'debrid_api'
+
+CONCURRENCY_LIMITS = {
+    IO_BOUND: 4,
+    DB_WRITER: 1,
+    DEBRID_API: 1,
+}
+
+TASK_CONCURRENCY_CLASSES = {
+    'task_heartbeat': IO_BOUND,
+    'task_check_service_connectivity': IO_BOUND,
+    'task_send_notifications': IO_BOUND,
+    'task_sync_time': IO_BOUND,
+    'task_generate_airtime_report': IO_BOUND,
+    'task_refresh_plex_tokens': IO_BOUND,
+    'task_refresh_download_stats': DEBRID_API,
+    'task_plex_full_scan': DB_WRITER,
+    'task_refresh_release_dates': DB_WRITER,
+    'task_check_trakt_early_releases': DB_WRITER,
+    'task_update_show_ids': DB_WRITER,
+    'task_update_show_titles': DB_WRITER,
+    'task_update_movie_ids': DB_WRITER,
+    'task_update_movie_titles': DB_WRITER,
+    'task_get_plex_watch_history': DB_WRITER,
+    'task_check_database_health': DB_WRITER,
+    'task_run_library_maintenance': DB_WRITER,
+    'task_verify_symlinked_files': DB_WRITER,
+    # Queues and tasks that move items between queues (task_reconcile_queues,
+    # task_check_plex_files, task_local_library_scan) stay INLINE
+}
+
+def get_task_concurrency_class(task_name):
+    if task_name in TASK_CONCURRENCY_CLASSES:
+        return TASK_CONCURRENCY_CLASSES[task_name]
+    if task_name.startswith('task_') and task_name.endswith('_wanted'):
+        # Content source pulls are mostly network-bound but finish with a bulk
+        # add_wanted_items, so they share the single database writer slot
+        return DB_WRITER
+    return INLINE
+
+class RunningTasks:
+    """
+    One lock per task name. Keeps the set-like interface (`in`, iteration,
+    add/discard) that ProgramRunner.currently_running_tasks always exposed, but
+    acquiring is atomic so a task can never be started twice concurrently.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, task_name):
+        with self._guard:
+            lock = self._locks.get(task_name)
+            if lock is None:
+                lock = self._locks[task_name] = threading.Lock()
+            return lock
+
+    def try_acquire(self, task_name):
+        return self._lock_for(task_name).acquire(blocking=False)
+
+    def release(self, task_name):
+        lock = self._lock_for(task_name)
+        if lock.locked():
+            lock.release()
+
+    # Set-style aliases used throughout the code base
+    add = try_acquire
+    discard = release
+
+    def __contains__(self, task_name):
+        with self._guard:
+            lock = self._locks.get(task_name)
+        return lock is not None and lock.locked()
+
+    def __iter__(self):
+        with self._guard:
+            locks = list(self._locks.items())
+        return iter([task_name for task_name, lock in locks if lock.locked()])
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+class TaskExecutor:
+    """Runs tasks inline or on a bounded worker pool and records their wall time."""
+
+    def __init__(self, limits=None):
+        self.limits = dict(CONCURRENCY_LIMITS if limits is None else limits)
+        self._slots = {name: threading.BoundedSemaphore(limit) for name, limit in self.limits.items()}
+        self._pool = None
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix='program_task')
+        return self._pool
+
+    def try_reserve(self, concurrency_class):
+        """Reserve a worker slot for concurrency_class, returns False if the class is saturated"""
+        return self._slots[concurrency_class].acquire(blocking=False)
+
+    def release_reservation(self, concurrency_class):
+        """Give back a slot taken with try_reserve that was not used for submit"""
+        self._slots[concurrency_class].release()
+
+    def submit(self, task_name, concurrency_class, func, on_done=None):
+        """
+        Run func on the worker pool. The caller must already hold a slot from
+        try_reserve(concurrency_class); it is released when the task finishes.
+        """
+        def worker():
+            try:
+                self.run(task_name, func)
+            finally:
+                self._slots[concurrency_class].release()
+                if on_done:
+                    on_done()
+
+        try:
+            return self._get_pool().submit(worker)
+        except RuntimeError:
+            # Pool shut down, give the slot back
+            self._slots[concurrency_class].release()
+            raise
+
+    def run(self, task_name, func):
+        """Run func in the current thread, logging errors and recording wall time"""
+        start_time = time.time()
+        error = None
+        try:
+            return func()
+        except Exception as e:
+            error = str(e)
+            logging.error(f"Error running task {task_name}: {error}")
+            logging.error(traceback.format_exc())
+        finally:
+            self._record(task_name, start_time, time.time() - start_time, error)
+
+    def _record(self, task_name, start_time, duration, error):
+        with self._stats_lock:
+            stats = self._stats.setdefault(task_name, {
+                'run_count': 0,
+                'total_duration': 0.0,
+                'max_duration': 0.0,
+                'error_count': 0,
+            })
+            stats['run_count'] += 1
+            stats['total_duration'] += duration
+            stats['max_duration'] = max(stats['max_duration'], duration)
+            stats['last_duration'] = duration
+            stats['last_started'] = start_time
+            stats['avg_duration'] = stats['total_duration'] / stats['run_count']
+            if error is not None:
+                stats['error_count'] += 1
+                stats['last_error'] = error
+
+    def get_task_stats(self):
+        """Return a copy of the per-task wall time statistics (seconds)"""
+        with self._stats_lock:
+            return {task_name: dict(stats) for task_name, stats in self._stats.items()}
+
+    def shutdown(self, wait=False):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
@@ -0,0 +1,97 @@
+import heapq
+import threading
+import time
+
+class TaskScheduler:
+    """
+    Keeps the next due time of every ProgramRunner task in a heap so the main
+    loop can sleep until something is actually due, and lets other threads
+    (queue transitions, webhooks) wake it early for a specific task.
+    """
+
+    def __init__(self):
+        self._heap = []  # (due_time, task_name), may contain stale entries
+        self._due_times = {}  # task_name -> currently scheduled due time
+        self._signalled = set()
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+
+    def schedule(self, task_name, due_time):
+        """Schedule task_name to become due at due_time, replacing any earlier schedule"""
+        with self._lock:
+            self._due_times[task_name] = due_time
+            heapq.heappush(self._heap, (due_time, task_name))
+
+    def ensure_scheduled(self, task_name, due_time):
+        """Schedule task_name at due_time unless it already has a pending schedule"""
+        with self._lock:
+            if task_name in self._due_times:
+                return
+            self._due_times[task_name] = due_time
+            heapq.heappush(self._heap, (due_time, task_name))
+
+    def unschedule(self, task_name):
+        with self._lock:
+            self._due_times.pop(task_name, None)
+            self._signalled.discard(task_name)
+
+    def signal(self, task_name):
+        """Mark task_name as having new work and wake the main loop immediately"""
+        with self._lock:
+            self._signalled.add(task_name)
+        self._wake_event.set()
+
+    def wake(self):
+        """Wake the main loop without marking any task"""
+        self._wake_event.set()
+
+    def pop_due_tasks(self, now=None):
+        """
+        Remove and return the tasks that are due.
+
+        Returns:
+            tuple: (due, signalled) where due is the set of tasks whose due time has
+            passed or that were signalled, and signalled is the subset that was signalled
+            and should run regardless of its interval. Returned tasks must be scheduled
+            again by the caller.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = set()
+            while self._heap and self._heap[0][0] <= now:
+                due_time, task_name = heapq.heappop(self._heap)
+                # Skip entries superseded by a later schedule() or unschedule()
+                if self._due_times.get(task_name) == due_time:
+                    del self._due_times[task_name]
+                    due.add(task_name)
+            signalled = self._signalled
+            self._signalled = set()
+            for task_name in signalled:
+                self._due_times.pop(task_name, None)
+            due |= signalled
+            return due, signalled
+
+    def next_due_time(self):
+        with self._lock:
+            while self._heap and self._due_times.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def wait(self, max_wait):
+        """Sleep until the next task is due, a task is signalled, or max_wait seconds pass"""
+        # Clear first, so a signal arriving from here on always ends the wait
+        self._wake_event.clear()
+        with self._lock:
+            if self._signalled:
+                return
+        next_due = self.next_due_time()
+        timeout = max_wait if next_due is None else min(max_wait, next_due - time.time())
+        if timeout > 0:
+            self._wake_event.wait(timeout)
+
+    def get_schedule(self):
+        """Return a copy of the scheduled due times keyed by task name"""
+        with self._lock:
+            return dict(self._due_times)
+
+task_scheduler = TaskScheduler()
@@ -0,0 +1,25 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+class StoreTestCase(unittest.TestCase):
+    """Base for tests of the SQLite stores: each test gets a fresh temporary directory for their files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def make_store(self, store_class, *args, **kwargs):
+        return store_class(os.path.join(self.temp_dir.name, store_class.DB_FILENAME), *args, **kwargs)
+
+    def patch_settings(self, module, settings):
+        """Answer module's get_setting calls from settings, falling back to the caller's default"""
+        self.start_patch(patch.object(module, 'get_setting',
+                                      side_effect=lambda section, key, default=None: settings.get(key, default)))
+
+    def start_patch(self, patcher):
+        started = patcher.start()
+        self.addCleanup(patcher.stop)
+        return started
@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api_tracker
+from api_tracker import APIRateLimiter, APITracker, DEFAULT_TIMEOUT, RateLimitExceeded
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status = 404 if self.path == '/missing' else 200
+        body = b'ok'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAPITracker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.api = APITracker()
+        self.addCleanup(self.api.session.close)
+
+    def test_connections_are_reused_and_logged(self):
+        with patch.object(api_tracker, 'api_logger') as logger:
+            for _ in range(3):
+                self.assertEqual(self.api.get(f'{self.base_url}/items?page=1').text, 'ok')
+
+        lines = [call.args[0] for call in logger.info.call_args_list]
+        self.assertEqual(len(lines), 3)
+        self.assertIn('conn=new', lines[0])
+        self.assertTrue(all('conn=reused' in line for line in lines[1:]))
+        # Query parameters stay out of the log
+        self.assertTrue(all('/items 200' in line and 'page=1' not in line for line in lines))
+
+    def test_raise_for_status_is_optional(self):
+        with self.assertRaises(self.api.exceptions.HTTPError):
+            self.api.get(f'{self.base_url}/missing')
+        self.assertEqual(self.api.get(f'{self.base_url}/missing', raise_for_status=False).status_code, 404)
+
+    def test_default_timeout_and_host_semaphore(self):
+        with patch.object(self.api.session, 'request') as request:
+            self.api.get('https://api.real-debrid.com/rest/1.0/user')
+            self.api.get('https://api.real-debrid.com/rest/1.0/user', timeout=5)
+            self.api.get('http://jackett.local:9117/api/v2.0/indexers/all/results')
+
+        self.assertEqual(request.call_args_list[0].kwargs['timeout'], DEFAULT_TIMEOUT)
+        self.assertEqual(request.call_args_list[1].kwargs['timeout'], 5)
+        # Hosts without limits, like self-hosted indexers, keep waiting as long as they need
+        self.assertNotIn('timeout', request.call_args_list[2].kwargs)
+        semaphore = self.api._get_host_semaphore('https', 'api.real-debrid.com')
+        self.assertIs(semaphore, self.api._get_host_semaphore('https', 'api.real-debrid.com'))
+        self.assertEqual(semaphore._initial_value, api_tracker.HOST_LIMITS['api.real-debrid.com']['concurrency'])
+
+
+class TestAPIRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.limiter = APIRateLimiter()
+        self.now = 1000.0
+        patcher = patch.object(api_tracker.time, 'time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        limits = patch.dict(api_tracker.DOMAIN_RATE_LIMITS, {'example.com': ((10, 3), (60, 5))})
+        limits.start()
+        self.addCleanup(limits.stop)
+
+    def test_budget_slides_with_the_window(self):
+        for _ in range(3):
+            self.limiter.check_limits('example.com')
+        self.assertEqual(self.limiter.get_remaining('example.com'), 0)
+        self.assertEqual(self.limiter.get_budget('example.com')[10]['resets_in'], 10)
+
+        self.now += 10
+        self.assertEqual(self.limiter.get_remaining('example.com'), 2)
+        self.assertEqual(self.limiter.get_budget('example.com')[60]['count'], 3)
+
+    def test_blocks_until_budget_frees_up(self):
+        def sleep(seconds):
+            self.now += seconds
+
+        for _ in range(3):
+            self.limiter.check_limits('example.com')
+        with patch.object(api_tracker.time, 'sleep', side_effect=sleep) as sleeper:
+            self.limiter.check_limits('example.com')
+        sleeper.assert_called_once_with(10)
+        self.assertEqual(self.limiter.get_budget('example.com')[60]['count'], 4)
+
+    def test_refuses_calls_that_would_wait_too_long(self):
+        for _ in range(3):
+            self.limiter.check_limits('example.com')
+        self.now += 10
+        for _ in range(2):
+            self.limiter.check_limits('example.com')
+
+        # The 60 second window is exhausted for another 50 seconds
+        self.limiter.max_wait = 30
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter.check_limits('example.com')
+        self.assertIn('example.com', self.limiter.blocked_domains)
+
+        self.limiter.reset_limits()
+        self.assertTrue(self.limiter.check_limits('example.com', block=False))
+        self.assertEqual(self.limiter.blocked_domains, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import queues.torrent_processor as torrent_processor_module
+from queues.torrent_processor import TorrentProcessor
+
+
+def make_hash(n):
+    return f'{n:040x}'
+
+
+class FakeProvider:
+    API_BASE_URL = 'https://api.real-debrid.com/rest/1.0'
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self._all_torrent_ids = {}
+        self.checked = []
+        self.removed = []
+        self.lock = threading.Lock()
+
+    def is_cached(self, magnet, temp_file_path=None, result_title=None, result_index=None, remove_uncached=True, torrent_data=None):
+        info_hash = magnet.rsplit(':', 1)[-1]
+        with self.lock:
+            self.checked.append(info_hash)
+        status = self.statuses[info_hash]
+        if status is not None and (status or not remove_uncached):
+            self._all_torrent_ids[info_hash] = f'T{info_hash[-1]}'
+        return status
+
+    def get_cached_torrent_id(self, info_hash):
+        return self._all_torrent_ids.get(info_hash)
+
+    def get_cached_torrent_title(self, info_hash):
+        return f'Title {info_hash[-1]}'
+
+    def get_torrent_info(self, torrent_id):
+        return {'id': torrent_id, 'filename': torrent_id, 'files': [{'path': '/movie.mkv'}]}
+
+    def remove_torrent(self, torrent_id, removal_reason=''):
+        with self.lock:
+            self.removed.append(torrent_id)
+
+
+class TestCacheProbing(unittest.TestCase):
+    def setUp(self):
+        self.results = [{'title': f'Result {n}', 'magnet': f'magnet:?xt=urn:btih:{make_hash(n)}'} for n in range(1, 7)]
+        patcher = patch.object(TorrentProcessor, 'process_torrent', side_effect=lambda link: (link, None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.rate_limiter = MagicMock()
+        self.rate_limiter.get_remaining.return_value = 100
+        for patcher in (patch.object(torrent_processor_module.api, 'rate_limiter', self.rate_limiter),
+                        patch.object(torrent_processor_module, 'add_to_not_wanted'),
+                        patch('database.torrent_tracking.get_torrent_history', return_value=[]),
+                        patch('database.torrent_tracking.record_torrent_addition')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_processor(self, statuses, concurrency):
+        provider = FakeProvider(statuses)
+        processor = TorrentProcessor(provider)
+        with patch.object(torrent_processor_module, 'get_setting', return_value=concurrency):
+            info, link = processor.process_results(self.results, accept_uncached=False, item={'id': 1, 'title': 'Movie'})
+        return provider, info, link
+
+    def wait_for(self, condition):
+        deadline = time.time() + 2
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_sequential_mode_stops_at_first_cached_result(self):
+        statuses = {make_hash(n): n >= 2 for n in range(1, 7)}
+        provider, info, link = self.run_processor(statuses, 1)
+
+        self.assertEqual(link, self.results[1]['magnet'])
+        self.assertEqual(provider.checked, [make_hash(1), make_hash(2)])
+        self.assertEqual(provider.removed, [])
+
+    def test_concurrent_probes_keep_rank_order_and_clean_up_losers(self):
+        statuses = {make_hash(n): n in (2, 3) for n in range(1, 7)}
+        third_started = threading.Event()
+        is_cached = FakeProvider.is_cached
+
+        def gated_is_cached(provider, magnet, *args, **kwargs):
+            # Hold the winner back until the lower ranked probe is running, so it can't be cancelled
+            if magnet.endswith(make_hash(3)):
+                third_started.set()
+            elif magnet.endswith(make_hash(2)):
+                third_started.wait(1)
+            return is_cached(provider, magnet, *args, **kwargs)
+
+        with patch.object(FakeProvider, 'is_cached', gated_is_cached):
+            provider, info, link = self.run_processor(statuses, 3)
+
+        # Result 3 is cached too and may finish first, but result 2 ranks higher
+        self.assertEqual(link, self.results[1]['magnet'])
+        self.assertEqual(info['id'], 'T2')
+        self.wait_for(lambda: 'T3' in provider.removed)
+        self.assertEqual(provider.removed, ['T3'])
+        self.assertNotIn(make_hash(6), provider.checked)
+
+    def test_probe_window_shrinks_with_api_budget(self):
+        self.rate_limiter.get_remaining.return_value = 0
+        statuses = {make_hash(n): n == 4 for n in range(1, 7)}
+        provider, info, link = self.run_processor(statuses, 4)
+
+        self.assertEqual(link, self.results[3]['magnet'])
+        # Only the result being decided on is probed when there's no budget to look ahead
+        self.assertEqual(provider.checked, [make_hash(n) for n in range(1, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
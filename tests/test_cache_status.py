@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import debrid.common.cache_status as cache_status_module
+import debrid.real_debrid.client as client_module
+from debrid.common.cache_status import CacheStatusStore, CACHED, UNCACHED, INVALID
+from debrid.real_debrid.client import RealDebridProvider
+from tests.store_test_case import StoreTestCase
+
+HASH = 'a' * 40
+
+
+class TestCacheStatusStore(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patch_settings(cache_status_module, {'cache_status_positive_ttl_hours': 24, 'cache_status_negative_ttl_hours': 6})
+        self.now = 100000.0
+        self.start_patch(patch.object(cache_status_module.time, 'time', side_effect=lambda: self.now))
+        self.store = self.make_store(CacheStatusStore)
+
+    def test_positive_and_negative_ttls(self):
+        self.store.put('real_debrid', HASH.upper(), CACHED, 'Show.S01', [{'path': '/a.mkv', 'bytes': 1}])
+        self.store.put('real_debrid', 'b' * 40, UNCACHED)
+
+        entry = self.store.get('real_debrid', HASH)
+        self.assertEqual((entry['status'], entry['filename'], entry['files']), (CACHED, 'Show.S01', [{'path': '/a.mkv', 'bytes': 1}]))
+
+        self.now += 7 * 3600
+        self.assertIsNotNone(self.store.get('real_debrid', HASH))
+        self.assertIsNone(self.store.get('real_debrid', 'b' * 40))
+        self.now += 18 * 3600
+        self.assertIsNone(self.store.get('real_debrid', HASH))
+
+    def test_invalidate_and_stats(self):
+        self.store.put('real_debrid', HASH, INVALID)
+        self.store.put('real_debrid', 'b' * 40, CACHED)
+        self.assertEqual(self.store.invalidate('real_debrid', HASH), 1)
+        self.assertIsNone(self.store.get('real_debrid', HASH))
+        # A hash without a provider is forgotten for every provider
+        self.store.put('other_debrid', 'b' * 40, CACHED)
+        self.assertEqual(self.store.invalidate(info_hash='B' * 40), 2)
+        self.store.put('real_debrid', 'b' * 40, CACHED)
+
+        stats = self.store.get_stats()
+        self.assertEqual(stats['entries'], {CACHED: 1})
+        self.assertEqual((stats['stores'], stats['misses']), (4, 1))
+
+
+class TestRealDebridCacheCheck(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patch_settings(cache_status_module, {})
+        self.start_patch(patch.object(client_module, 'cache_status_store', self.make_store(CacheStatusStore)))
+        self.start_patch(patch.object(RealDebridProvider, '_load_api_key', return_value='key'))
+        self.provider = RealDebridProvider()
+
+    def test_second_check_is_served_from_store(self):
+        info = {'status': 'downloaded', 'filename': 'Show.S01', 'files': [{'path': '/Show.S01E01.mkv', 'bytes': 10}]}
+        magnet = f'magnet:?xt=urn:btih:{HASH}'
+        with patch.object(self.provider, 'add_torrent', return_value='T1') as add_torrent, \
+                patch.object(self.provider, 'get_torrent_info', return_value=info), \
+                patch.object(self.provider, 'update_status'):
+            self.assertTrue(self.provider.is_cached(magnet))
+            self.assertTrue(self.provider.is_cached(magnet))
+        add_torrent.assert_called_once()
+
+    def test_invalid_torrents_are_remembered(self):
+        info = {'status': 'downloaded', 'filename': 'Sample', 'files': [{'path': '/readme.txt', 'bytes': 10}]}
+        with patch.object(self.provider, 'add_torrent', return_value='T1') as add_torrent, \
+                patch.object(self.provider, 'get_torrent_info', return_value=info), \
+                patch.object(self.provider, 'update_status'), \
+                patch.object(self.provider, 'remove_torrent'), \
+                patch.object(client_module, 'add_to_not_wanted'):
+            self.assertIsNone(self.provider.is_cached(HASH))
+            self.assertIsNone(self.provider.is_cached(HASH))
+        add_torrent.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import pickle
+import sys
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import content_checkers.content_cache_management as content_cache_management
+from content_checkers.content_cache_management import (
+    ContentSourceCache, load_source_cache, save_source_cache, should_process_item, update_cache_for_item
+)
+from tests.store_test_case import StoreTestCase
+
+
+class TestContentSourceCache(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store = self.make_store(ContentSourceCache)
+        self.start_patch(patch.object(content_cache_management, 'content_source_cache', self.store))
+        self.start_patch(patch.object(content_cache_management, 'DB_CONTENT_DIR', self.temp_dir.name))
+        self.patch_settings(content_cache_management, {'disable_content_source_caching': False})
+
+    def test_processed_items_are_skipped_on_the_next_run(self):
+        movie = {'imdb_id': 'tt1', 'media_type': 'movie'}
+        show = {'tmdb_id': 2, 'media_type': 'tv', 'requested_seasons': [1]}
+
+        cache = load_source_cache('Overseerr_1')
+        self.assertTrue(should_process_item(movie, 'Overseerr_1', cache))
+        update_cache_for_item(movie, 'Overseerr_1', cache)
+        update_cache_for_item(show, 'Overseerr_1', cache)
+        save_source_cache('Overseerr_1', cache)
+
+        cache = load_source_cache('Overseerr_1')
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(should_process_item(movie, 'Overseerr_1', cache))
+        self.assertFalse(should_process_item(show, 'Overseerr_1', cache))
+        # Other sources and changed season requests aren't covered by the entry
+        self.assertTrue(should_process_item(movie, 'MDBList_1', load_source_cache('MDBList_1')))
+        self.assertTrue(should_process_item(dict(show, requested_seasons=[1, 2]), 'Overseerr_1', cache))
+        cache.close()
+
+    def test_expired_entries_are_reprocessed_and_cleaned_up(self):
+        old = datetime.now() - timedelta(days=content_cache_management.CACHE_EXPIRY_DAYS + 1)
+        conn = self.store._connect()
+        self.store.upsert(conn, 'Trakt Watchlist_1', [('stale', {'timestamp': old, 'data': {}})])
+        self.assertEqual(self.store.count(conn, 'Trakt Watchlist_1'), 0)
+
+        conn.execute("INSERT INTO content_source_cache VALUES ('Trakt Watchlist_1', 'imdb_tt1_movie_Trakt Watchlist_1', '{}', ?)",
+                     (old.timestamp(),))
+        conn.commit()
+        conn.close()
+        cache = load_source_cache('Trakt Watchlist_1')
+        self.assertTrue(should_process_item({'imdb_id': 'tt1', 'media_type': 'movie'}, 'Trakt Watchlist_1', cache))
+        update_cache_for_item({'imdb_id': 'tt2', 'media_type': 'movie'}, 'Trakt Watchlist_1', cache)
+        save_source_cache('Trakt Watchlist_1', cache)
+
+        self.assertEqual(self.store.get_stats()['entries'], {'Trakt Watchlist_1': 1})
+
+    def test_pickle_cache_is_migrated(self):
+        pickle_path = content_cache_management.get_cache_file_path('MDBList_1')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump({'imdb_tt1_movie_MDBList_1': {'timestamp': datetime.now(), 'data': {'imdb_id': 'tt1'}}}, f)
+
+        cache = load_source_cache('MDBList_1')
+        self.assertFalse(os.path.exists(pickle_path))
+        self.assertEqual(cache.get('imdb_tt1_movie_MDBList_1')['data'], {'imdb_id': 'tt1'})
+        self.assertFalse(should_process_item({'imdb_id': 'tt1', 'media_type': 'movie'}, 'MDBList_1', cache))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import content_checkers.content_cache_management as content_cache_management
+import content_checkers.content_sync as content_sync
+import content_checkers.overseerr as overseerr
+import content_checkers.trakt as trakt
+from content_checkers.mdb_list import fetch_items_from_mdblist
+
+
+def make_response(payload=None, status_code=200, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    return response
+
+
+def make_request(request_id, updated_at, tmdb_id=None):
+    return {'id': request_id, 'updatedAt': updated_at, 'media': {'mediaType': 'movie', 'tmdbId': tmdb_id or request_id}}
+
+
+class TestConditionalFetch(unittest.TestCase):
+    def test_unmodified_list_is_served_from_sync_state(self):
+        sync_state = {}
+        entry = content_sync.get_sync_entry(sync_state, 'https://mdblist.com/lists/user/list')
+        responses = [make_response([{'imdb_id': 'tt1'}], headers={'ETag': '"v1"'}), make_response(status_code=304)]
+
+        with patch.object(content_sync.api, 'get', side_effect=responses) as get:
+            first = fetch_items_from_mdblist('mdblist.com/lists/user/list', entry)
+            second = fetch_items_from_mdblist('mdblist.com/lists/user/list', entry)
+
+        self.assertEqual(first, second)
+        self.assertNotIn('If-None-Match', get.call_args_list[0].kwargs['headers'])
+        self.assertEqual(get.call_args_list[1].kwargs['headers']['If-None-Match'], '"v1"')
+
+    def test_full_sync_is_forced_after_the_interval(self):
+        entry = {}
+        content_sync.remember(entry, ['old'], etag='"v1"', synced_at=1)
+        with patch.object(content_sync.api, 'get', return_value=make_response(['new'])) as get:
+            self.assertEqual(content_sync.conditional_get_json('https://example.com/list', entry), ['new'])
+        self.assertNotIn('If-None-Match', get.call_args.kwargs['headers'])
+        # Without validators there is nothing to revalidate, so nothing is kept
+        self.assertEqual(entry, {})
+
+    def test_sync_state_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = content_cache_management.ContentSourceCache(os.path.join(temp_dir, 'content_source_cache.db'))
+            with patch.object(content_cache_management, 'content_source_cache', store), \
+                    patch.object(content_cache_management, 'DB_CONTENT_DIR', temp_dir):
+                content_cache_management.save_sync_state('MDBList_1', {'url': {'etag': '"v1"', 'payload': [1]}})
+                self.assertEqual(content_cache_management.load_sync_state('MDBList_1'), {'url': {'etag': '"v1"', 'payload': [1]}})
+                self.assertEqual(content_cache_management.load_sync_state('MDBList_2'), {})
+
+
+class TestTraktListSync(unittest.TestCase):
+    def test_list_is_only_downloaded_when_its_updated_at_changes(self):
+        list_url = 'https://trakt.tv/users/someone/lists/favourites'
+        summary = {'updated_at': '2024-01-01T00:00:00.000Z'}
+        items = [{'movie': {'ids': {'imdb': 'tt1'}}}]
+
+        def fetch(endpoint, headers=None):
+            return items if endpoint.endswith('/items') else summary
+
+        sync_state = {}
+        with patch.object(trakt, 'ensure_trakt_auth', return_value='token'), \
+                patch.object(trakt, 'fetch_items_from_trakt', side_effect=fetch) as fetch_items:
+            for _ in range(2):
+                result = trakt.get_wanted_from_trakt_lists(list_url, {'1080p': True}, sync_state)
+                self.assertEqual(result[0][0], [{'imdb_id': 'tt1', 'media_type': 'movie'}])
+            summary['updated_at'] = '2024-02-01T00:00:00.000Z'
+            trakt.get_wanted_from_trakt_lists(list_url, {'1080p': True}, sync_state)
+
+        item_fetches = [call for call in fetch_items.call_args_list if call.args[0].endswith('/items')]
+        self.assertEqual(len(item_fetches), 2)
+
+
+class TestOverseerrDeltaSync(unittest.TestCase):
+    def setUp(self):
+        self.requests = {1: make_request(1, '2024-01-01T00:00:00.000Z'), 2: make_request(2, '2024-01-02T00:00:00.000Z')}
+        self.urls = []
+        sources = {'Overseerr_1': {'enabled': True, 'url': 'http://overseerr', 'api_key': 'key'}}
+        for patcher in (patch.object(overseerr, 'get_all_settings', return_value={'Content Sources': sources}),
+                        patch.object(overseerr, 'get_setting', return_value=False),
+                        patch.object(overseerr.api, 'get', side_effect=self.serve)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def serve(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        query = dict(part.split('=') for part in url.split('?', 1)[1].split('&'))
+        ordered = sorted(self.requests.values(), key=lambda request: request['updatedAt'], reverse=True)
+        skip, take = int(query['skip']), int(query['take'])
+        return make_response({'pageInfo': {'results': len(ordered)}, 'results': ordered[skip:skip + take]})
+
+    def wanted_tmdb_ids(self, sync_state):
+        return sorted(item['tmdb_id'] for item in overseerr.get_wanted_from_overseerr({}, sync_state)[0][0])
+
+    def test_only_modified_requests_are_paged(self):
+        sync_state = {}
+        self.assertEqual(self.wanted_tmdb_ids(sync_state), [1, 2])
+        self.assertEqual(sync_state['http://overseerr']['cursor'], '2024-01-02T00:00:00.000Z')
+
+        # Unchanged: one request for the newest page
+        self.urls.clear()
+        self.assertEqual(self.wanted_tmdb_ids(sync_state), [1, 2])
+        self.assertEqual(len(self.urls), 1)
+        self.assertIn('sort=modified', self.urls[0])
+
+        # A new and an updated request are merged in without a full download
+        self.urls.clear()
+        self.requests[1] = make_request(1, '2024-01-03T00:00:00.000Z', tmdb_id=10)
+        self.requests[3] = make_request(3, '2024-01-04T00:00:00.000Z')
+        self.assertEqual(self.wanted_tmdb_ids(sync_state), [2, 3, 10])
+        self.assertEqual(len(self.urls), 1)
+        self.assertEqual(sync_state['http://overseerr']['cursor'], '2024-01-04T00:00:00.000Z')
+
+    def test_deleted_requests_trigger_a_full_fetch(self):
+        sync_state = {}
+        self.wanted_tmdb_ids(sync_state)
+        del self.requests[1]
+
+        self.urls.clear()
+        self.assertEqual(self.wanted_tmdb_ids(sync_state), [2])
+        self.assertEqual(len(self.urls), 2)
+        self.assertNotIn('sort=modified', self.urls[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
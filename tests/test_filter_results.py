@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scraper.functions.filter_results  # noqa: F401
+# scraper.functions re-exports the filter_results function under the module's name
+filter_module = sys.modules['scraper.functions.filter_results']
+ResultFilter = filter_module.ResultFilter
+
+
+def make_result(title, parsed_title, size='5 GB', year=2020, resolution='1080p'):
+    return {
+        'title': title,
+        'original_title': title,
+        'size': size,
+        'scraper': 'torrentio',
+        'parsed_info': {
+            'title': parsed_title,
+            'year': year,
+            'resolution': resolution,
+            'season_episode_info': {'season_pack': 'N/A', 'seasons': [], 'episodes': []},
+        },
+    }
+
+
+class TestResultFilter(unittest.TestCase):
+    def setUp(self):
+        self.version_settings = {
+            'max_resolution': '1080p',
+            'resolution_wanted': '<=',
+            'min_size_gb': 0.5,
+            'max_size_gb': 20,
+            'filter_out': ['CAM', r'x26[45]'],
+            'filter_in': [],
+            'similarity_threshold': 0.8,
+        }
+        patcher = patch.object(filter_module, 'get_setting', return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self, **overrides):
+        args = dict(tmdb_id='1', title='Some Movie', year=2020, content_type='movie', season=None, episode=None,
+                    multi=False, version_settings=self.version_settings, runtime=100, episode_count=1,
+                    season_episode_counts={}, genres=[], matching_aliases=['Ein Film'])
+        args.update(overrides)
+        return ResultFilter(**args)
+
+    def test_filter_reasons_are_recorded(self):
+        results = [
+            make_result('Some Movie 2020 1080p', 'Some Movie'),
+            make_result('Some Movie 2020 2160p', 'Some Movie', resolution='2160p'),
+            make_result('Some Movie 2017 1080p', 'Some Movie', year=2017),
+            make_result('Different Title 2020 1080p', 'Different Title'),
+            make_result('Some Movie 2020 CAM x264', 'Some Movie'),
+            make_result('Some Movie 2020 1080p tiny', 'Some Movie', size='0.1 GB'),
+        ]
+        filtered, pre_size = self.build().apply(results)
+
+        self.assertEqual([r['title'] for r in filtered], ['Some Movie 2020 1080p'])
+        self.assertEqual(results[0]['filter_reason'], 'Passed all filters')
+        self.assertTrue(results[1]['filter_reason'].startswith('Resolution mismatch'))
+        self.assertTrue(results[2]['filter_reason'].startswith('Year mismatch'))
+        self.assertTrue(results[3]['filter_reason'].startswith('Title similarity too low'))
+        self.assertEqual(results[4]['filter_reason'], 'Matching filter_out pattern(s): CAM, x26[45]')
+        self.assertTrue(results[5]['filter_reason'].startswith('Size too small'))
+        # Everything that got as far as the size check is reported as pre-size
+        self.assertEqual(len(pre_size), 3)
+
+    def test_alias_match_passes_similarity(self):
+        results = [make_result('Ein Film 2020 1080p', 'Ein Film')]
+        filtered, _ = self.build().apply(results)
+        self.assertEqual(filtered, results)
+
+    def test_filter_in_requires_a_match(self):
+        self.version_settings['filter_in'] = ['"web-dl"', 'REMUX']
+        results = [
+            make_result('Some Movie 2020 1080p WEB-DL', 'Some Movie'),
+            make_result('Some Movie 2020 1080p BluRay', 'Some Movie'),
+        ]
+        filtered, _ = self.build().apply(results)
+        self.assertEqual(filtered, results[:1])
+        self.assertEqual(results[1]['filter_reason'], 'Not matching any filter_in patterns')
+
+    def test_backreferences_keep_their_own_groups(self):
+        # Merged into one alternation, \1 in the second pattern would refer to the first pattern's group
+        self.version_settings['filter_out'] = ['(TS)', r'(\d)\1x']
+        results = [make_result('Some Movie 2020 1080p 22x', 'Some Movie')]
+        filtered, _ = self.build().apply(results)
+        self.assertEqual(filtered, [])
+        self.assertEqual(results[0]['filter_reason'], r'Matching filter_out pattern(s): (\d)\1x')
+
+    def test_ufc_threshold_applies_per_result(self):
+        results = [
+            make_result('UFC 300 Pereira vs Hill 1080p', 'UFC 300 Pereira vs Hill', year=2024),
+            make_result('Some Movi Extended 2020 1080p', 'Some Movi Extended'),
+        ]
+        filtered, _ = self.build(title='UFC 300').apply(results)
+        self.assertEqual(filtered, results[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utilities.library_index as library_index_module
+import utilities.local_library_scan as local_library_scan
+from utilities.library_index import LibraryIndex
+from tests.store_test_case import StoreTestCase
+
+
+class TestLibraryIndex(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = os.path.join(self.temp_dir.name, 'mount')
+        # Laid out like a zurg mount: torrent folders under a top-level directory
+        self.torrents = os.path.join(self.root, '__all__')
+        for n in range(20):
+            self.add_file(f'Show.S01E{n:02d}', f'Show.S01E{n:02d}.mkv')
+        self.patch_settings(library_index_module, {})
+        self.index = self.make_store(LibraryIndex)
+
+    def add_file(self, folder, filename, mtime=None):
+        path = os.path.join(self.torrents, folder)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, filename), 'w') as f:
+            f.write('x')
+        if mtime is not None:
+            # Make the change visible even on filesystems with coarse timestamps
+            os.utime(path, ns=(mtime, mtime))
+            os.utime(self.torrents, ns=(mtime, mtime))
+
+    def freeze_mtimes(self):
+        # Like a FUSE mount that never updates directory mtimes
+        for path, _, _ in os.walk(self.root):
+            os.utime(path, ns=(10 ** 9, 10 ** 9))
+
+    def test_refresh_only_lists_changed_directories(self):
+        self.assertEqual(self.index.find('Show.S01E03.mkv', self.root),
+                         os.path.join(self.torrents, 'Show.S01E03', 'Show.S01E03.mkv'))
+        self.assertIsNone(self.index.find('Movie.2020.mkv', self.root))
+
+        self.add_file('Movie.2020', 'Movie.2020.mkv', mtime=10 ** 9)
+        shutil.rmtree(os.path.join(self.torrents, 'Show.S01E05'))
+        os.utime(self.torrents, ns=(2 * 10 ** 9, 2 * 10 ** 9))
+        self.assertEqual(self.index.get_stats(check=True)['roots'][self.root]['stale_dirs'], 2)
+
+        summary = self.index.refresh(self.root)
+        # The root, the top-level directory and the new folder are listed, the other folders are only stat'ed
+        self.assertEqual((summary['dirs_listed'], summary['dirs_removed']), (3, 1))
+        found = self.index.find_many(['Movie.2020.mkv', 'Show.S01E05.mkv', 'Show.S01E06.mkv'], self.root)
+        self.assertEqual(sorted(found), ['Movie.2020.mkv', 'Show.S01E06.mkv'])
+
+        status = self.index.get_stats(check=True)['roots'][self.root]
+        self.assertEqual((status['files'], status['dirs'], status['stale_dirs']), (20, 22, 0))
+
+    def test_lookups_refresh_a_stale_index(self):
+        self.index.find('Show.S01E01.mkv', self.root)
+        self.add_file('Movie.2021', 'Movie.2021.mkv', mtime=10 ** 9)
+        with patch.object(library_index_module, 'REFRESH_INTERVAL_SECONDS', 0):
+            self.assertIsNotNone(self.index.find('Movie.2021.mkv', self.root))
+
+    def test_folders_added_without_mtime_changes_are_found(self):
+        self.freeze_mtimes()
+        self.index.refresh(self.root, full=True)
+        self.add_file('Movie.2022', 'Movie.2022.mkv')
+        self.add_file('Show.S01E04', 'Show.S01E04.srt')
+        self.freeze_mtimes()
+
+        # New torrent folders show up because the top-level directories are always listed
+        self.index.refresh(self.root)
+        self.assertEqual(sorted(self.index.find_many(['Movie.2022.mkv', 'Show.S01E04.srt'], self.root)), ['Movie.2022.mkv'])
+        # A miss doesn't walk the mount, a file in a folder the refresh skipped waits for the full rebuild
+        self.assertIsNone(self.index.find('Show.S01E04.srt', self.root))
+        self.assertEqual(self.index.get_stats()['rebuilds'], 1)
+        self.index.refresh(self.root, full=True)
+        self.assertIsNotNone(self.index.find('Show.S01E04.srt', self.root))
+
+    def test_find_file_uses_the_index(self):
+        with patch.object(local_library_scan, 'library_index', self.index), \
+                patch('subprocess.run') as run:
+            self.assertEqual(local_library_scan.find_file('Show.S01E07.mkv', self.root),
+                             os.path.join(self.torrents, 'Show.S01E07', 'Show.S01E07.mkv'))
+        run.assert_not_called()
+
+    def test_find_file_only_runs_find_when_enabled(self):
+        settings = {'library_index_find_fallback': False}
+        self.patch_settings(local_library_scan, settings)
+        with patch.object(local_library_scan, 'library_index', self.index), \
+                patch('subprocess.run') as run:
+            run.return_value.stdout = '/elsewhere/Movie.2023.mkv\n'
+            self.assertIsNone(local_library_scan.find_file('Movie.2023.mkv', self.root))
+            run.assert_not_called()
+
+            settings['library_index_find_fallback'] = True
+            self.assertEqual(local_library_scan.find_file('Movie.2023.mkv', self.root), '/elsewhere/Movie.2023.mkv')
+        run.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -142,7 +142,7 @@ class TestLocalLibraryScan(unittest.TestCase):
         with patch('debrid.get_debrid_provider') as mock_get_provider:
             # Mock debrid provider to indicate file is downloading
             mock_provider = MagicMock()
-            mock_provider.get_torrent_info.return_value = {'progress': 50}
+            mock_provider.get_torrents_status.return_value = {'123': {'progress': 50}}
             mock_get_provider.return_value = mock_provider
 
             item = self._create_test_item('test.mkv', 'Wrong.Folder')
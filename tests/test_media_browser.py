@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database.media_browser as media_browser
+from database.media_browser import (MediaCountCache, build_media_filter, decode_cursor, fetch_page,
+                                    iter_media_items)
+
+COLUMNS = ['id', 'title', 'type', 'year', 'state']
+
+
+class TestMediaBrowser(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db_path = os.path.join(self.temp_dir.name, 'media_items.db')
+        self.conn = self.connect()
+        self.addCleanup(self.conn.close)
+        self.conn.execute('CREATE TABLE media_items (id INTEGER PRIMARY KEY, title TEXT, type TEXT, year INTEGER, state TEXT)')
+        # Repeated and missing years make the id tie-breaker and NULL handling matter
+        self.conn.executemany('INSERT INTO media_items (id, title, type, year, state) VALUES (?, ?, ?, ?, ?)', [
+            (n, f"{'ABC'[n % 3]}Title {n}", 'movie' if n % 2 else 'episode', None if n % 7 == 0 else 2000 + n % 5,
+             'Collected') for n in range(1, 251)
+        ])
+        self.conn.commit()
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def expected_ids(self, where_clauses, params, sort_column, sort_order):
+        where = f" WHERE {' AND '.join(where_clauses)}" if where_clauses else ''
+        return [row['id'] for row in self.conn.execute(
+            f"SELECT id FROM media_items{where} ORDER BY {sort_column} {sort_order}, id {sort_order}", params)]
+
+    def test_cursors_walk_every_row_once_in_both_directions(self):
+        where_clauses, params = build_media_filter(COLUMNS, content_type='movie')
+        for sort_column in ('id', 'year', 'title'):
+            for sort_order in ('asc', 'desc'):
+                with self.subTest(sort_column=sort_column, sort_order=sort_order):
+                    pages = []
+                    page = fetch_page(self.conn, ['title'], where_clauses, params, sort_column, sort_order, 20)
+                    self.assertIsNone(page['prev_cursor'])
+                    while True:
+                        pages.append([item['id'] for item in page['items']])
+                        if not page['next_cursor']:
+                            break
+                        page = fetch_page(self.conn, ['title'], where_clauses, params, sort_column, sort_order, 20,
+                                          after=page['next_cursor'])
+                    self.assertEqual(sum(pages, []), self.expected_ids(where_clauses, params, sort_column, sort_order))
+
+                    # Paging back from the last page returns the same pages
+                    back = []
+                    while page['prev_cursor']:
+                        page = fetch_page(self.conn, ['title'], where_clauses, params, sort_column, sort_order, 20,
+                                          before=page['prev_cursor'])
+                        back.insert(0, [item['id'] for item in page['items']])
+                    self.assertEqual(back, pages[:-1])
+
+    def test_malformed_cursor_starts_from_the_first_page(self):
+        self.assertIsNone(decode_cursor('not a cursor'))
+        page = fetch_page(self.conn, ['title'], [], [], 'id', 'asc', 5, after='not a cursor')
+        self.assertEqual([item['id'] for item in page['items']], [1, 2, 3, 4, 5])
+
+    def test_filters_reject_unknown_columns_and_group_the_digit_letter(self):
+        self.assertEqual(build_media_filter(COLUMNS, 'title; DROP TABLE media_items', 'x'), ([], []))
+        where_clauses, params = build_media_filter(COLUMNS, content_type='movie', letter='#')
+        self.assertEqual(where_clauses[0], 'type = ?')
+        self.assertTrue(where_clauses[1].startswith('(') and where_clauses[1].endswith(')'))
+        self.assertEqual(len(params), 14)
+
+    def test_count_is_cached_until_media_items_change(self):
+        cache = MediaCountCache()
+        where_clauses, params = build_media_filter(COLUMNS, content_type='movie')
+        with patch.object(media_browser, 'get_latest_media_item_change', return_value=10):
+            self.assertEqual(cache.get(self.conn, where_clauses, params), 125)
+            self.conn.execute("DELETE FROM media_items WHERE id = 1")
+            self.assertEqual(cache.get(self.conn, where_clauses, params), 125)
+        with patch.object(media_browser, 'get_latest_media_item_change', return_value=11):
+            self.assertEqual(cache.get(self.conn, where_clauses, params), 124)
+        self.assertEqual((cache.get_stats()['hits'], cache.get_stats()['misses']), (1, 2))
+
+    def test_export_reads_in_batches(self):
+        with patch.object(media_browser, 'get_db_connection', side_effect=self.connect), \
+                patch.object(media_browser, 'fetch_page', wraps=fetch_page) as pager:
+            items = list(iter_media_items(['title'], [], [], 'year', 'desc', batch_size=100))
+        self.assertEqual([item['id'] for item in items], self.expected_ids([], [], 'year', 'desc'))
+        self.assertEqual(pager.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
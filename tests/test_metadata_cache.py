@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cli_battery.app.direct_api as direct_api_module
+import cli_battery.app.metadata_cache as metadata_cache_module
+from cli_battery.app.direct_api import DirectAPI
+from cli_battery.app.metadata_cache import MetadataCache, MISS
+from cli_battery.app.metadata_manager import MetadataManager
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.stamp_path = os.path.join(self.temp_dir.name, 'metadata_cache.stamp')
+        self.settings = {'cache_max_entries': 3, 'cache_ttl_seconds': 60}
+        self.now = 1000.0
+        for patcher in (patch.object(metadata_cache_module, 'get_setting',
+                                     side_effect=lambda section, key, default=None: self.settings.get(key, default)),
+                        patch.object(metadata_cache_module.time, 'time', side_effect=lambda: self.now)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cache = MetadataCache(self.stamp_path)
+
+    def test_entries_expire_and_least_recently_used_are_evicted(self):
+        for n in range(3):
+            self.cache.put(('show', f'tt{n}'), ({'title': n}, 'battery'), [f'tt{n}'])
+        self.cache.get(('show', 'tt0'))
+        self.cache.put(('show', 'tt3'), ({'title': 3}, 'battery'), ['tt3'])
+
+        self.assertIs(self.cache.get(('show', 'tt1')), MISS)
+        self.assertEqual(self.cache.get(('show', 'tt0')), ({'title': 0}, 'battery'))
+
+        self.now += 61
+        self.assertIs(self.cache.get(('show', 'tt0')), MISS)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['expired']), (2, 2, 1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_cached_values_cannot_be_mutated_by_callers(self):
+        self.cache.put(('show', 'tt1'), ({'seasons': {'1': {}}}, 'battery'), ['tt1'])
+        value, _ = self.cache.get(('show', 'tt1'))
+        value['seasons'].clear()
+        self.assertEqual(self.cache.get(('show', 'tt1'))[0], {'seasons': {'1': {}}})
+
+    def test_invalidation_by_imdb_id_and_from_other_processes(self):
+        self.cache.put(('show', 'tt1'), ({'title': 1}, 'battery'), ['tt1'])
+        self.cache.put(('tmdb_to_imdb', '55', 'show'), ('tt1', 'battery'), ['tt1'])
+        self.cache.put(('show', 'tt2'), ({'title': 2}, 'battery'), ['tt2'])
+
+        self.assertEqual(self.cache.invalidate('tt1'), 2)
+        self.assertIs(self.cache.get(('tmdb_to_imdb', '55', 'show')), MISS)
+        # Our own write doesn't clear the rest of our cache
+        self.assertEqual(self.cache.get(('show', 'tt2'))[0], {'title': 2})
+
+        other_process = MetadataCache(self.stamp_path)
+        other_process.put(('show', 'tt2'), ({'title': 2}, 'battery'), ['tt2'])
+        os.utime(self.stamp_path, ns=(1, 1))  # A write made elsewhere
+        self.now += 2
+        self.assertIs(other_process.get(('show', 'tt2')), MISS)
+        self.assertEqual(other_process.get_stats()['remote_invalidations'], 1)
+
+
+class TestDirectAPICaching(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache = MetadataCache(os.path.join(self.temp_dir.name, 'metadata_cache.stamp'))
+        patcher = patch.object(direct_api_module, 'metadata_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_lookups_hit_the_cache(self):
+        with patch.object(MetadataManager, 'get_show_metadata', return_value=({'title': 'Show'}, 'battery')) as get_show, \
+                patch.object(MetadataManager, 'tmdb_to_imdb', return_value=('tt1', 'battery')) as tmdb_to_imdb:
+            for _ in range(3):
+                self.assertEqual(DirectAPI.get_show_metadata('tt1'), ({'title': 'Show'}, 'battery'))
+                self.assertEqual(DirectAPI.tmdb_to_imdb('55', media_type='show'), ('tt1', 'battery'))
+            self.cache.invalidate('tt1', broadcast=False)
+            DirectAPI.tmdb_to_imdb('55', media_type='show')
+
+        get_show.assert_called_once()
+        self.assertEqual(tmdb_to_imdb.call_count, 2)
+
+    def test_failed_lookups_are_not_cached(self):
+        with patch.object(MetadataManager, 'get_show_aliases', return_value=(None, None)) as get_aliases:
+            DirectAPI.get_show_aliases('tt1')
+            DirectAPI.get_show_aliases('tt1')
+        self.assertEqual(get_aliases.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cli_battery.app.database import Base, Item, Metadata, Session as DbSession
+import cli_battery.app.direct_api as direct_api_module
+from cli_battery.app.direct_api import DirectAPI
+from cli_battery.app.metadata_cache import MetadataCache
+from cli_battery.app.metadata_manager import MetadataManager
+
+
+class TestGetMetadataMany(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        engine = create_engine(f"sqlite:///{os.path.join(self.temp_dir.name, 'cli_battery.db')}")
+        Base.metadata.create_all(engine)
+        DbSession.remove()
+        DbSession.configure(bind=engine)
+        self.addCleanup(engine.dispose)
+        self.addCleanup(DbSession.remove)
+
+        cache = MetadataCache(os.path.join(self.temp_dir.name, 'metadata_cache.stamp'))
+        cache_patcher = patch.object(direct_api_module, 'metadata_cache', cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        self.stale = set()
+        patcher = patch.object(MetadataManager, 'is_metadata_stale', side_effect=lambda updated_at: updated_at in self.stale)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.add_item('tt001', 'movie', {'title': 'Stored Movie', 'year': 2001})
+        self.add_item('tt002', 'show', {'title': 'Stored Show', 'seasons': {'1': {'episodes': {}}}})
+        self.add_item('tt003', 'show', {'title': 'Show Without Seasons'})
+
+    def add_item(self, imdb_id, item_type, metadata, updated_at=None):
+        # Timestamps are set explicitly, the column defaults import the main app's metadata module
+        updated_at = updated_at or datetime(2024, 1, 1)
+        with DbSession() as session:
+            item = Item(imdb_id=imdb_id, title=metadata['title'], type=item_type, created_at=updated_at, updated_at=updated_at)
+            session.add(item)
+            session.flush()
+            for key, value in metadata.items():
+                if key == 'seasons':
+                    MetadataManager._replace_seasons(item, value, session)
+                    continue
+                session.add(Metadata(item_id=item.id, key=key, value=json.dumps(value), provider='Trakt', last_updated=updated_at))
+            session.commit()
+
+    def test_hits_come_from_database_and_misses_from_trakt(self):
+        fetched = []
+        lock = threading.Lock()
+
+        def fetch(imdb_id):
+            with lock:
+                fetched.append(imdb_id)
+            return {'title': f'Fetched {imdb_id}'}, 'trakt'
+
+        with patch.object(MetadataManager, 'get_movie_metadata', side_effect=fetch), \
+                patch.object(MetadataManager, 'get_show_metadata', side_effect=fetch):
+            results = list(DirectAPI.get_metadata_many({'tt001': 'movie', 'tt002': 'tv', 'tt003': 'show', 'tt004': 'movie'}))
+
+        # Hits are yielded first, straight from the bulk query
+        self.assertEqual(results[0], ('tt001', {'title': 'Stored Movie', 'year': 2001}, 'battery'))
+        self.assertEqual(results[1][0], 'tt002')
+        self.assertEqual(results[1][2], 'battery')
+        self.assertEqual(sorted(fetched), ['tt003', 'tt004'])
+        self.assertEqual({result[0]: result[2] for result in results[2:]}, {'tt003': 'trakt', 'tt004': 'trakt'})
+
+    def test_stale_and_mistyped_items_are_refreshed(self):
+        stale_time = datetime(2020, 1, 1)
+        self.stale.add(stale_time)
+        self.add_item('tt005', 'movie', {'title': 'Old Movie'}, updated_at=stale_time)
+
+        with patch.object(MetadataManager, 'get_movie_metadata', return_value=({'title': 'Fresh'}, 'trakt')) as get_movie, \
+                patch.object(MetadataManager, 'get_show_metadata', return_value=({'title': 'Show'}, 'trakt')) as get_show:
+            results = dict((imdb_id, source) for imdb_id, _, source in DirectAPI.get_metadata_many(['tt005', 'tt002']))
+
+        self.assertEqual(results, {'tt005': 'trakt', 'tt002': 'trakt'})
+        get_movie.assert_any_call('tt005')
+        get_movie.assert_any_call('tt002')
+        get_show.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
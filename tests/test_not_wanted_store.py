@@ -0,0 +1,72 @@
+import os
+import pickle
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import not_wanted_magnets
+from not_wanted_magnets import MAGNETS, URLS, NotWantedStore
+from tests.store_test_case import StoreTestCase
+
+HASH = 'AB' * 20
+
+
+class TestNotWantedStore(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.magnets_file = os.path.join(self.temp_dir.name, 'not_wanted_magnets.pkl')
+        self.urls_file = os.path.join(self.temp_dir.name, 'not_wanted_urls.pkl')
+        self.store = self.make_store(NotWantedStore)
+        self.start_patch(patch.object(not_wanted_magnets, 'not_wanted_store', self.store))
+        self.start_patch(patch.object(not_wanted_magnets, 'NOT_WANTED_MAGNETS_FILE', self.magnets_file))
+        self.start_patch(patch.object(not_wanted_magnets, 'NOT_WANTED_URLS_FILE', self.urls_file))
+        self.patch_settings(not_wanted_magnets, {})
+
+    def test_pickled_lists_are_migrated_once(self):
+        with open(self.magnets_file, 'wb') as f:
+            pickle.dump({HASH, None}, f)
+        with open(self.urls_file, 'wb') as f:
+            pickle.dump({'https://example.com/dl?file=Show.S01E01.mkv&token=1'}, f)
+
+        self.assertEqual(not_wanted_magnets.get_not_wanted_magnets(), {HASH})
+        self.assertFalse(os.path.exists(self.magnets_file))
+        self.assertFalse(os.path.exists(self.urls_file))
+        # Bare hashes match magnets regardless of case, URLs match on their file name
+        self.assertTrue(not_wanted_magnets.is_magnet_not_wanted(f'magnet:?xt=urn:btih:{HASH.lower()}&dn=x'))
+        self.assertTrue(not_wanted_magnets.is_url_not_wanted('https://other.host/dl?file=Show.S01E01.mkv'))
+        self.assertFalse(not_wanted_magnets.is_url_not_wanted('https://other.host/dl?file=Show.S01E02.mkv'))
+
+    def test_scrape_results_are_filtered_in_one_batch(self):
+        not_wanted_magnets.add_to_not_wanted(HASH.lower())
+        not_wanted_magnets.add_to_not_wanted(HASH)
+        not_wanted_magnets.add_to_not_wanted_urls('https://example.com/files/Movie.2020.mkv')
+        self.assertEqual(self.store.get_stats()['entries'], {MAGNETS: 1, URLS: 1})
+
+        results = [{'title': 'bad hash', 'magnet': f'magnet:?xt=urn:btih:{HASH}'},
+                   {'title': 'bad url', 'magnet': 'https://mirror.example.com/Movie.2020.mkv'},
+                   {'title': 'good', 'magnet': f'magnet:?xt=urn:btih:{"cd" * 20}'},
+                   {'title': 'no magnet', 'magnet': None}]
+        with patch.object(self.store, 'find', wraps=self.store.find) as find:
+            filtered = not_wanted_magnets.filter_not_wanted_results(results)
+        self.assertEqual([result['title'] for result in filtered], ['good', 'no magnet'])
+        self.assertEqual(find.call_count, 2)
+
+        with patch.object(not_wanted_magnets, 'get_setting', return_value=True):
+            self.assertEqual(len(not_wanted_magnets.filter_not_wanted_results(results)), 4)
+
+    def test_removal_and_purge(self):
+        not_wanted_magnets.add_to_not_wanted(HASH)
+        not_wanted_magnets.add_to_not_wanted_urls('https://example.com/files/Movie.2020.mkv')
+        self.assertTrue(not_wanted_magnets.remove_from_not_wanted(HASH))
+        self.assertFalse(not_wanted_magnets.remove_from_not_wanted(HASH))
+
+        not_wanted_magnets.add_to_not_wanted(HASH)
+        not_wanted_magnets.purge_not_wanted_magnets_file()
+        self.assertEqual(not_wanted_magnets.get_not_wanted_magnets(), set())
+        self.assertEqual(len(not_wanted_magnets.get_not_wanted_urls()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
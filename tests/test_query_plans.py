@@ -0,0 +1,131 @@
+import os
+import re
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database.database_reading as database_reading
+import database.wanted_items as wanted_items
+import queues.wanted_queue as wanted_queue_module
+from database.core import get_db_connection
+from database.database_reading import get_all_media_items, get_media_item_presence
+from database.migrations import add_media_item_indexes, add_statistics_indexes
+from database.schema_management import create_tables
+from database.wanted_items import add_wanted_items
+from queues.wanted_queue import WantedQueue
+
+SEED_ROWS = 100000
+STATES = ['Wanted', 'Scraping', 'Adding', 'Checking', 'Sleeping', 'Unreleased', 'Blacklisted', 'Upgrading',
+          'Collected', 'Collected', 'Collected', 'Collected']
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?media_items\b')
+
+
+class TestMediaItemQueryPlans(unittest.TestCase):
+    """The core media_items queries must be answered from an index on a realistically sized database"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.env_patcher = patch.dict(os.environ, {'USER_DB_CONTENT': cls.temp_dir.name})
+        cls.env_patcher.start()
+        create_tables()
+        add_statistics_indexes()
+        add_media_item_indexes()
+
+        def seed_row(n):
+            state = STATES[n % len(STATES)]
+            filled_by_file = f'Item.{n}.mkv' if state in ('Checking', 'Collected', 'Upgrading') else None
+            if n % 4 == 0:
+                return (f'tt{n:07d}', str(n), f'Movie {n}', 'movie', None, None, '1080p', state, filled_by_file, None)
+            show = n // 100
+            return (f'tt{9000000 + show:07d}', str(500000 + show), f'Show {show}', 'episode', n % 10 + 1, n % 100,
+                    '1080p' if n % 3 else '2160p', state, filled_by_file, f'T{n}' if filled_by_file else None)
+
+        conn = get_db_connection()
+        conn.executemany('''
+            INSERT INTO media_items (imdb_id, tmdb_id, title, type, season_number, episode_number, version, state,
+                                     filled_by_file, filled_by_torrent_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (seed_row(n) for n in range(SEED_ROWS)))
+        conn.commit()
+        conn.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env_patcher.stop()
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        # Record the SQL the real code paths run, with their parameters expanded
+        self.statements = []
+
+        def traced_connection(db_path=None):
+            conn = get_db_connection(db_path)
+            conn.set_trace_callback(self.statements.append)
+            return conn
+
+        for module in (database_reading, wanted_items, wanted_queue_module):
+            patcher = patch.object(module, 'get_db_connection', side_effect=traced_connection)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assert_no_full_scans(self, statements):
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT') and 'media_items' in sql]
+        self.assertTrue(selects, "No media_items queries were captured")
+        conn = get_db_connection()
+        try:
+            for sql in selects:
+                plan = [row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+                scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+                self.assertFalse(scans, f"Full table scan in query plan {plan} for:\n{sql}")
+        finally:
+            conn.close()
+
+    def test_get_all_media_items(self):
+        get_all_media_items(state='Wanted')
+        get_all_media_items(state=['Checking', 'Upgrading'], media_type='episode')
+        get_all_media_items(tmdb_id='500123')
+        get_all_media_items(state='Collected', media_type='movie', tmdb_id='4')
+        self.assert_no_full_scans(self.statements)
+
+    def test_media_item_presence(self):
+        self.assertEqual(get_media_item_presence(imdb_id='tt0000004'), 'Sleeping')
+        get_media_item_presence(tmdb_id='500001')
+        self.assert_no_full_scans(self.statements)
+
+    def test_wanted_queue_reconciliation(self):
+        queue = WantedQueue()
+        with patch.object(wanted_queue_module, 'remove_from_media_items'):
+            for item in ({'id': 1, 'imdb_id': 'tt0000008', 'tmdb_id': '8', 'type': 'movie', 'version': '1080p'},
+                         {'id': 2, 'imdb_id': 'tt9000001', 'tmdb_id': '500001', 'type': 'episode', 'version': '1080p',
+                          'season_number': 2, 'episode_number': 1}):
+                queue._reconcile_with_existing_items(item)
+        self.assert_no_full_scans(self.statements)
+
+    def test_add_wanted_items_existing_lookups(self):
+        items = [{'imdb_id': f'tt{n:07d}', 'tmdb_id': str(n), 'title': f'Movie {n}'} for n in range(0, 4000, 4)]
+        items += [{'imdb_id': 'tt9000002', 'tmdb_id': '500002', 'title': 'Show 2', 'season_number': 1, 'episode_number': e}
+                  for e in range(1, 30)]
+        with patch.object(wanted_items, 'load_config', return_value={'Content Sources': {}}), \
+                patch.object(wanted_items, 'get_manual_blacklist', return_value={}), \
+                patch.object(wanted_items, 'update_show_title'), \
+                patch('settings.get_setting', side_effect=lambda section, key, default=None: default):
+            add_wanted_items(items, {'1080p': True})
+        self.assert_no_full_scans(self.statements)
+
+    def test_checking_and_file_lookups(self):
+        # The Checking sweep in task_check_plex_files and the file matching done by collection and upgrades
+        self.assert_no_full_scans([
+            'SELECT id, filled_by_title, filled_by_file FROM media_items WHERE state = "Checking"',
+            "SELECT * FROM media_items WHERE filled_by_file = 'Item.3.mkv' AND id != 3 AND state != 'Checking'",
+            "SELECT id, state FROM media_items WHERE filled_by_file IN ('Item.8.mkv', 'Item.9.mkv') "
+            "OR upgrading_from IN ('Item.8.mkv', 'Item.9.mkv')",
+            "SELECT id, state FROM media_items WHERE filled_by_torrent_id = 'T9'",
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+
+from database.core import get_db_connection
+from database.schema_management import create_tables
+from database.migrations import add_change_tracking
+from database.database_reading import get_changed_media_items, get_latest_media_item_change
+from queue_manager import QueueManager
+
+
+class FakeQueue:
+    def __init__(self):
+        self.items = []
+        self.prepared = []
+
+    def update(self):
+        pass
+
+    def prepare_items(self, items):
+        self.prepared.extend(item['id'] for item in items)
+
+
+class TestMediaItemChangeTracking(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        patcher = patch.dict(os.environ, {'USER_DB_CONTENT': self.temp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        create_tables()
+        add_change_tracking()
+
+    def insert_item(self, state):
+        conn = get_db_connection()
+        cursor = conn.execute(
+            "INSERT INTO media_items (imdb_id, title, state, type) VALUES (?, ?, ?, ?)",
+            ('tt0000001', 'Test', state, 'movie'))
+        conn.commit()
+        conn.close()
+        return cursor.lastrowid
+
+    def execute(self, query, params):
+        conn = get_db_connection()
+        conn.execute(query, params)
+        conn.commit()
+        conn.close()
+
+    def test_changes_are_logged_for_every_write(self):
+        start = get_latest_media_item_change()
+        wanted_id = self.insert_item('Wanted')
+        collected_id = self.insert_item('Wanted')
+        deleted_id = self.insert_item('Wanted')
+        self.execute("UPDATE media_items SET state = 'Collected' WHERE id = ?", (collected_id,))
+        self.execute("DELETE FROM media_items WHERE id = ?", (deleted_id,))
+
+        latest_seq, changed_ids, rows = get_changed_media_items(start, ['Wanted', 'Scraping'])
+
+        self.assertEqual(latest_seq, get_latest_media_item_change())
+        self.assertEqual(changed_ids, {wanted_id, collected_id, deleted_id})
+        self.assertEqual([row['id'] for row in rows], [wanted_id])
+
+    def test_no_changes_since_cursor(self):
+        self.insert_item('Wanted')
+        latest = get_latest_media_item_change()
+        self.assertEqual(get_changed_media_items(latest), (latest, set(), []))
+
+
+class TestQueueManagerIncrementalUpdate(unittest.TestCase):
+    def setUp(self):
+        self.manager = object.__new__(QueueManager)
+        self.manager.queues = {'Wanted': FakeQueue(), 'Scraping': FakeQueue()}
+        self.manager.queues['Wanted'].items = [{'id': 1, 'state': 'Wanted'}, {'id': 2, 'state': 'Wanted'}]
+        self.manager.queues['Scraping'].items = [{'id': 3, 'state': 'Scraping'}]
+        self.manager.item_states = {1: 'Wanted', 2: 'Wanted', 3: 'Scraping'}
+
+    def test_items_are_patched_in_place(self):
+        wanted_items = self.manager.queues['Wanted'].items
+        rows = [
+            {'id': 1, 'state': 'Scraping'},
+            {'id': 2, 'state': 'Wanted', 'title': 'Renamed'},
+            {'id': 4, 'state': 'Wanted'},
+        ]
+
+        # Item 3 left every queue (e.g. Collected), so no row is returned for it
+        self.manager._apply_item_changes({1, 2, 3, 4}, rows)
+
+        self.assertIs(self.manager.queues['Wanted'].items, wanted_items)
+        self.assertEqual([item['id'] for item in wanted_items], [2, 4])
+        self.assertEqual(wanted_items[0]['title'], 'Renamed')
+        self.assertEqual([item['id'] for item in self.manager.queues['Scraping'].items], [1])
+        self.assertEqual(self.manager.item_states, {1: 'Scraping', 2: 'Wanted', 4: 'Wanted'})
+        self.assertEqual(sorted(self.manager.queues['Wanted'].prepared), [2, 4])
+        self.assertEqual(self.manager.queues['Scraping'].prepared, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
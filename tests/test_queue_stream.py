@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from routes.queues_routes import QueueStreamBroadcaster, diff_queue_snapshots
+
+
+def make_snapshot(wanted, checking=(), running=True):
+    return {
+        'contents': {
+            'Wanted': {str(item['id']): item for item in wanted},
+            'Checking': {str(item['id']): item for item in checking},
+        },
+        'queue_counts': {'Wanted': len(wanted), 'Checking': len(checking)},
+        'hidden_counts': {},
+        'program_running': running,
+        'program_initializing': False,
+        'initialization_status': None,
+    }
+
+
+def read_events(stream, count):
+    events = []
+    while len(events) < count:
+        chunk = next(stream)
+        if chunk.startswith('id: '):
+            events.append(json.loads(chunk.split('data: ', 1)[1]))
+    return events
+
+
+class TestDiffQueueSnapshots(unittest.TestCase):
+    def test_delta_lists_items_by_id(self):
+        old = make_snapshot([{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}],
+                            [{'id': 3, 'title': 'C', 'progress': 10}])
+        new = make_snapshot([{'id': 2, 'title': 'B'}, {'id': 4, 'title': 'D'}],
+                            [{'id': 3, 'title': 'C', 'progress': 55}], running=False)
+
+        delta = diff_queue_snapshots(old, new)
+        self.assertEqual(delta['queues']['Wanted'], {'added': {'4': {'id': 4, 'title': 'D'}}, 'changed': {},
+                                                     'removed': ['1'], 'order': ['2', '4']})
+        self.assertEqual(delta['queues']['Checking']['changed']['3']['progress'], 55)
+        self.assertNotIn('order', delta['queues']['Checking'])
+        # Only the fields that changed are sent
+        self.assertIs(delta['program_running'], False)
+        self.assertNotIn('queue_counts', delta)
+
+        self.assertIsNone(diff_queue_snapshots(new, make_snapshot([{'id': 2, 'title': 'B'}, {'id': 4, 'title': 'D'}],
+                                                                 [{'id': 3, 'title': 'C', 'progress': 55}],
+                                                                 running=False)))
+
+
+class TestQueueStreamBroadcaster(unittest.TestCase):
+    def setUp(self):
+        self.snapshots = [make_snapshot([{'id': 1, 'title': 'A'}])]
+        self.builds = 0
+        self.broadcaster = QueueStreamBroadcaster(build_snapshot=self.build)
+        self.broadcaster.KEEPALIVE_SECONDS = 0
+        # The tests drive the producer by calling publish_once
+        patcher = patch.object(self.broadcaster, '_ensure_producer')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self):
+        self.builds += 1
+        return self.snapshots[-1]
+
+    def test_one_build_serves_every_subscriber(self):
+        first, second = self.broadcaster.stream(), self.broadcaster.stream()
+        self.broadcaster.publish_once()
+        snapshots = read_events(first, 1) + read_events(second, 1)
+        self.assertEqual([event['type'] for event in snapshots], ['snapshot', 'snapshot'])
+        self.assertEqual(snapshots[0]['contents']['Wanted'], [{'id': 1, 'title': 'A'}])
+        self.assertEqual(snapshots[0]['keys']['Wanted'], ['1'])
+
+        # Nothing changed, nothing is sent
+        self.broadcaster.publish_once()
+        self.assertEqual(next(first), ': keepalive\n\n')
+
+        self.snapshots.append(make_snapshot([{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}]))
+        self.broadcaster.publish_once()
+        for stream in (first, second):
+            delta = read_events(stream, 1)[0]
+            self.assertEqual(delta['type'], 'delta')
+            self.assertEqual(delta['base_version'], snapshots[0]['version'])
+            self.assertEqual(list(delta['queues']['Wanted']['added']), ['2'])
+        self.assertEqual(self.builds, 3)
+        self.assertEqual(self.broadcaster.get_stats()['subscribers'], 2)
+
+        first.close()
+        self.assertEqual(self.broadcaster.get_stats()['subscribers'], 1)
+
+    def test_reconnecting_client_resumes_from_its_version(self):
+        self.broadcaster.publish_once()
+        version = read_events(self.broadcaster.stream(), 1)[0]['version']
+        self.snapshots.append(make_snapshot([]))
+        self.broadcaster.publish_once()
+
+        resumed = read_events(self.broadcaster.stream(since_version=version), 1)[0]
+        self.assertEqual((resumed['type'], resumed['base_version']), ('delta', version))
+        self.assertEqual(resumed['queues']['Wanted']['removed'], ['1'])
+
+        # A version that is no longer kept gets a fresh snapshot
+        stale = read_events(self.broadcaster.stream(since_version=version - 5), 1)[0]
+        self.assertEqual((stale['type'], stale['version']), ('snapshot', version + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraper.functions.rank_results import (
+    PercentileIndex, rank_result_key, rank_results
+)
+from scraper.functions.other_functions import smart_search, compile_smart_search
+
+
+def make_result(title, size, bitrate, episode=1):
+    return {
+        'title': title,
+        'size': size,
+        'bitrate': bitrate,
+        'scraper': 'jackett',
+        'season_pack': 'N/A',
+        'parsed_info': {'title': 'Some Show', 'year': 2020, 'season': 1, 'episode': episode, 'resolution_rank': 3},
+    }
+
+
+class TestRankResults(unittest.TestCase):
+    def setUp(self):
+        self.version_settings = {
+            'preferred_filter_in': [['REMUX', 1000], ['"web-dl"', 200]],
+            'preferred_filter_out': [[r'x26[45]', 50], ['CAM', 500]],
+        }
+        self.results = [
+            make_result('Some Show S01E01 1080p REMUX', 20.0, 9000),
+            make_result('Some Show S01E01 720p WEB-DL x264', 1.5, 2500),
+            make_result('Some Show S01E02 CAM', 0.7, 800, episode=2),
+            make_result('Some Show S01E01 1080p WEB-DL', 1.5, 3000),
+        ]
+        self.args = ('Some Show', 2020, 1, 1, False, 'episode', self.version_settings)
+
+    def test_percentile_index_matches_linear_count(self):
+        values = [1.5, 20.0, 0.7, 1.5]
+        index = PercentileIndex(values)
+        for value in values + [0.1, 100.0]:
+            expected = sum(1 for v in values if v <= value) / len(values)
+            self.assertEqual(index.rank(value), expected)
+        self.assertEqual(PercentileIndex([]).rank(5), 0)
+
+    def test_batch_keys_match_single_result_keys(self):
+        batch_keys = rank_results(self.results, *self.args)
+        single_keys = [rank_result_key(result, self.results, *self.args) for result in self.results]
+        self.assertEqual(batch_keys, single_keys)
+        best = min(zip(batch_keys, self.results), key=lambda pair: pair[0])[1]
+        self.assertIn('REMUX', best['title'])
+
+    def test_compiled_filter_matches_smart_search(self):
+        titles = ['Movie.2020.REMUX.x265', 'Movie 2020 web-dl', 'Movie (2020) CAM']
+        for pattern in ['remux', '"WEB-DL"', r'x26[45]', r'(2020', r'\(2020\)']:
+            compiled = compile_smart_search(pattern)
+            for title in titles:
+                with self.subTest(pattern=pattern, title=title):
+                    self.assertEqual(compiled.search(title) is not None, smart_search(pattern, title))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraper.functions.common import extract_info_hash, result_identity_key
+from scraper.functions.deduplicate_results import deduplicate_results
+
+HEX_HASH = 'c12fe1c06bba254a9dc9f519b335aa7c1367a88a'
+BASE32_HASH = 'YEX6DQDLXISUVHOJ6UM3GNNKPQJWPKEK'
+
+
+class TestResultIdentity(unittest.TestCase):
+    def test_extract_info_hash(self):
+        self.assertEqual(extract_info_hash(f'magnet:?xt=urn:btih:{HEX_HASH.upper()}&dn=x'), HEX_HASH)
+        self.assertEqual(extract_info_hash(f'magnet:?xt=urn:btih:{BASE32_HASH}&tr=udp://a'), HEX_HASH)
+        self.assertIsNone(extract_info_hash('http://jackett/dl/file.torrent'))
+        self.assertIsNone(extract_info_hash(''))
+
+    def test_identity_key_prefers_info_hash(self):
+        with_trackers = {'magnet': f'magnet:?xt=urn:btih:{HEX_HASH}&tr=udp://tracker'}
+        base32 = {'magnet': f'magnet:?xt=urn:btih:{BASE32_HASH}'}
+        self.assertEqual(result_identity_key(with_trackers), result_identity_key(base32))
+
+        link = {'magnet': 'http://jackett/dl/file.torrent&tr=x'}
+        self.assertEqual(result_identity_key(link), 'http://jackett/dl/file.torrent')
+        self.assertEqual(result_identity_key({'title': 'Some Title', 'size': 1.234}), 'some title_1.23')
+
+    def test_deduplicate_merges_same_hash_from_different_scrapers(self):
+        results = [
+            {'title': 'Some.Movie.2020.1080p', 'size': 5.0, 'magnet': f'magnet:?xt=urn:btih:{HEX_HASH}', 'seeders': 3},
+            {'title': 'Some Movie 2020 1080p', 'size': 5.1, 'magnet': f'magnet:?xt=urn:btih:{BASE32_HASH}&tr=x', 'seeders': 9},
+        ]
+        deduplicated = deduplicate_results(results)
+        self.assertEqual(len(deduplicated), 1)
+        self.assertEqual(deduplicated[0]['seeders'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scraper.scrape_cache as scrape_cache_module
+from scraper.scrape_cache import ScrapeCache
+from tests.store_test_case import StoreTestCase
+
+
+class TestScrapeCache(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.settings = {'enable_scrape_cache': True, 'scrape_cache_ttl_minutes': {}, 'scrape_cache_max_size_mb': 100}
+        self.patch_settings(scrape_cache_module, self.settings)
+        self.cache = self.make_store(ScrapeCache)
+        self.query = ScrapeCache.make_query_key('tt1', 'Some Show', 2020, 'episode', 1, 2, False)
+        self.results = [{'title': 'Some Show S01E02 1080p', 'magnet': 'magnet:?xt=urn:btih:abc', 'size': 1.5}]
+
+    def test_hit_after_store_and_miss_when_settings_change(self):
+        self.assertIsNone(self.cache.get(self.query, 'Torrentio', {'enabled': True}))
+        self.cache.put(self.query, 'Torrentio', 'Torrentio', {'enabled': True}, self.results, imdb_id='tt1')
+
+        self.assertEqual(self.cache.get(self.query, 'Torrentio', {'enabled': True}), self.results)
+        # Different instance settings (e.g. changed opts) must not reuse old results
+        self.assertIsNone(self.cache.get(self.query, 'Torrentio', {'enabled': True, 'opts': 'x'}))
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores']), (1, 2, 1))
+        self.assertEqual(stats['entries'], 1)
+
+    def test_ttl_overrides_and_expiry(self):
+        self.settings['scrape_cache_ttl_minutes'] = {'Jackett': 5, 'My Jackett': 0}
+        self.assertEqual(ScrapeCache.get_ttl_seconds('Other Jackett', 'Jackett'), 300)
+        self.assertEqual(ScrapeCache.get_ttl_seconds('Torrentio', 'Torrentio'), 900)
+
+        # A TTL of 0 disables caching for that instance
+        self.cache.put(self.query, 'My Jackett', 'Jackett', {}, self.results)
+        self.assertIsNone(self.cache.get(self.query, 'My Jackett', {}))
+
+        with patch.object(scrape_cache_module.time, 'time', return_value=1000.0):
+            self.cache.put(self.query, 'Other Jackett', 'Jackett', {}, self.results)
+        with patch.object(scrape_cache_module.time, 'time', return_value=1000.0 + 301):
+            self.assertIsNone(self.cache.get(self.query, 'Other Jackett', {}))
+
+    def test_size_bounded_eviction_drops_least_recently_used(self):
+        big_results = [{'title': 'x' * 1000}] * 300  # ~300KB per entry
+        self.settings['scrape_cache_max_size_mb'] = 1
+        now = scrape_cache_module.time.time()
+        for i in range(5):
+            with patch.object(scrape_cache_module.time, 'time', return_value=now - 10 + i):
+                self.cache.put(f'query{i}', 'Torrentio', 'Torrentio', {}, big_results)
+
+        stats = self.cache.get_stats()
+        self.assertLessEqual(stats['size_bytes'], 1024 * 1024)
+        self.assertGreater(stats['evictions'], 0)
+        # The newest entry survives, the oldest was evicted
+        self.assertIsNotNone(self.cache.get('query4', 'Torrentio', {}))
+        self.assertIsNone(self.cache.get('query0', 'Torrentio', {}))
+
+    def test_empty_results_are_not_cached(self):
+        self.cache.put(self.query, 'Torrentio', 'Torrentio', {}, [])
+        self.assertIsNone(self.cache.get(self.query, 'Torrentio', {}))
+        self.assertEqual(self.cache.get_stats()['stores'], 0)
+
+    def test_invalidate_by_imdb_id(self):
+        self.cache.put(self.query, 'Torrentio', 'Torrentio', {}, self.results, imdb_id='tt1')
+        other = ScrapeCache.make_query_key('tt2', 'Other', 2021, 'movie', None, None, False)
+        self.cache.put(other, 'Torrentio', 'Torrentio', {}, self.results, imdb_id='tt2')
+
+        self.assertEqual(self.cache.invalidate('tt1'), 1)
+        self.assertIsNone(self.cache.get(self.query, 'Torrentio', {}))
+        self.assertIsNotNone(self.cache.get(other, 'Torrentio', {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import tempfile
+
+import settings
+
+
+class TestSettingsSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.config_file = os.path.join(self.temp_dir.name, 'config.json')
+        lock_file = os.path.join(self.temp_dir.name, '.config.lock')
+        open(lock_file, 'w').close()
+
+        for name, value in (('CONFIG_FILE', self.config_file), ('LOCK_FILE', lock_file)):
+            patcher = patch(f'settings.{name}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.write_config({'Queue': {'wake_limit': '24'}, 'Scraping': {'versions': {'Default': {'filter_out': ['CAM']}}}})
+        settings.invalidate_settings_cache()
+        settings.get_setting('Queue', 'wake_limit')
+
+    def write_config(self, config):
+        with open(self.config_file, 'w') as f:
+            json.dump(config, f)
+        # Make sure the mtime changes even on filesystems with coarse timestamps
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_repeated_reads_do_not_reparse(self):
+        settings.invalidate_settings_cache()
+        with patch('settings._read_config_file', wraps=settings._read_config_file) as read:
+            for _ in range(50):
+                self.assertEqual(settings.get_setting('Queue', 'wake_limit'), '24')
+        self.assertEqual(read.call_count, 1)
+
+    def test_reloads_when_file_changes(self):
+        self.assertEqual(settings.get_setting('Queue', 'wake_limit'), '24')
+        self.write_config({'Queue': {'wake_limit': '48'}})
+        self.assertEqual(settings.get_setting('Queue', 'wake_limit'), '48')
+
+    def test_set_setting_is_visible_immediately(self):
+        settings.set_setting('Queue', 'wake_limit', '12')
+        self.assertEqual(settings.get_setting('Queue', 'wake_limit'), '12')
+
+    def test_returned_values_do_not_alias_snapshot(self):
+        versions = settings.get_setting('Scraping', 'versions')
+        versions['Default']['filter_out'].append('TS')
+        settings.load_config()['Queue']['wake_limit'] = '99'
+        self.assertEqual(settings.get_setting('Scraping', 'versions')['Default']['filter_out'], ['CAM'])
+        self.assertEqual(settings.get_setting('Queue', 'wake_limit'), '24')
+
+    def test_listener_receives_changed_sections(self):
+        changes = []
+        settings.add_settings_listener(changes.append)
+        self.addCleanup(settings.remove_settings_listener, changes.append)
+
+        settings.get_setting('Queue', 'wake_limit')
+        self.write_config({'Queue': {'wake_limit': '48'}, 'Scraping': {'versions': {'Default': {'filter_out': ['CAM']}}}})
+        settings.get_setting('Queue', 'wake_limit')
+
+        self.assertEqual(changes, [{'Queue'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cli_battery.app.database as battery_database
+from cli_battery.app.database import Base, Item, Metadata, Season, Episode, Session as DbSession
+import cli_battery.app.metadata_manager as metadata_manager_module
+from cli_battery.app.metadata_cache import MetadataCache
+from cli_battery.app.metadata_manager import MetadataManager
+
+SEASONS = {
+    1: {'episode_count': 2, 'episodes': {
+        1: {'title': 'Pilot', 'overview': 'First', 'runtime': 45, 'first_aired': '2020-01-05T02:00:00.000Z', 'imdb_id': 'tt101'},
+        2: {'title': 'Second', 'overview': 'Next', 'runtime': 44, 'first_aired': '2020-01-12T02:00:00.000Z', 'imdb_id': 'tt102'},
+    }},
+    2: {'episode_count': 1, 'episodes': {
+        1: {'title': 'Return', 'overview': '', 'runtime': 50, 'first_aired': None, 'imdb_id': None},
+    }},
+}
+
+
+class TestShowSeasonStorage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        engine = create_engine(f"sqlite:///{os.path.join(self.temp_dir.name, 'cli_battery.db')}")
+        Base.metadata.create_all(engine)
+        self.addCleanup(engine.dispose)
+        # init_db returns the patched engine, so importing the metadata module doesn't rebind the session
+        cache = MetadataCache(os.path.join(self.temp_dir.name, 'metadata_cache.stamp'))
+        for patcher in (patch.object(battery_database, 'engine', engine),
+                        patch.object(metadata_manager_module, 'metadata_cache', cache),
+                        patch.object(MetadataManager, 'is_metadata_stale', return_value=False)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        DbSession.remove()
+        DbSession.configure(bind=engine)
+        self.addCleanup(DbSession.remove)
+
+    def add_show(self, imdb_id, show_data):
+        with DbSession() as session:
+            item = Item(imdb_id=imdb_id, title=show_data['title'], type='show')
+            session.add(item)
+            session.flush()
+            MetadataManager.update_show_metadata(item, show_data, session)
+
+    def test_seasons_are_stored_in_tables_and_served_from_them(self):
+        self.add_show('tt100', {'title': 'Show', 'airs': {'time': '21:00'}, 'seasons': SEASONS})
+
+        with DbSession() as session:
+            self.assertEqual(session.query(Metadata).filter_by(key='seasons').count(), 0)
+            self.assertEqual(session.query(Season).count(), 2)
+            self.assertEqual(session.query(Episode).count(), 3)
+
+        metadata, source = MetadataManager.get_show_metadata('tt100')
+        self.assertEqual(source, 'battery')
+        self.assertEqual(metadata['airs'], {'time': '21:00'})
+        self.assertEqual(sorted(metadata['seasons']), ['1', '2'])
+        self.assertEqual(metadata['seasons']['1']['episodes']['1'], SEASONS[1]['episodes'][1])
+        self.assertIsNone(metadata['seasons']['2']['episodes']['1']['first_aired'])
+
+    def test_targeted_lookups(self):
+        self.add_show('tt100', {'title': 'Show', 'seasons': SEASONS})
+
+        episode, source = MetadataManager.get_episode('tt100', 1, 2)
+        self.assertEqual((episode['title'], episode['first_aired'], source), ('Second', '2020-01-12T02:00:00.000Z', 'battery'))
+        self.assertEqual(MetadataManager.get_season_counts('tt100'), ({1: 2, 2: 1}, 'battery'))
+
+    def test_legacy_seasons_blob_is_migrated(self):
+        with DbSession() as session:
+            item = Item(imdb_id='tt200', title='Old Show', type='show', created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1))
+            session.add(item)
+            session.flush()
+            for key, value in (('title', 'Old Show'), ('seasons', json.loads(json.dumps(SEASONS)))):
+                session.add(Metadata(item_id=item.id, key=key, value=json.dumps(value), provider='trakt', last_updated=datetime(2024, 1, 1)))
+            session.commit()
+
+        metadata, source = MetadataManager.get_show_metadata('tt200')
+        self.assertEqual(source, 'battery')
+        self.assertEqual(metadata['seasons']['1']['episode_count'], 2)
+
+        with DbSession() as session:
+            self.assertEqual(session.query(Metadata).filter_by(key='seasons').count(), 0)
+        self.assertEqual(MetadataManager.get_season_counts('tt200'), ({1: 2, 2: 1}, 'battery'))
+        self.assertEqual(MetadataManager.get_show_metadata('tt200')[0]['seasons'], metadata['seasons'])
+
+
+if __name__ == '__main__':
+    unittest.main()
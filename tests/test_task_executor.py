@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from task_executor import (
+    TaskExecutor, RunningTasks, get_task_concurrency_class,
+    INLINE, IO_BOUND, DB_WRITER, DEBRID_API
+)
+
+
+class TestRunningTasks(unittest.TestCase):
+    def test_lock_is_exclusive_per_task(self):
+        running = RunningTasks()
+        self.assertTrue(running.try_acquire('task_a'))
+        self.assertFalse(running.try_acquire('task_a'))
+        self.assertTrue(running.try_acquire('task_b'))
+        self.assertIn('task_a', running)
+        self.assertEqual(set(running), {'task_a', 'task_b'})
+
+        running.release('task_a')
+        self.assertNotIn('task_a', running)
+        # Releasing twice (safe_process_queue does) is harmless
+        running.discard('task_a')
+        self.assertTrue(running.try_acquire('task_a'))
+
+    def test_unknown_task_not_running(self):
+        self.assertNotIn('never_started', RunningTasks())
+
+
+class TestTaskExecutor(unittest.TestCase):
+    def test_concurrency_classes(self):
+        self.assertEqual(get_task_concurrency_class('Scraping'), INLINE)
+        self.assertEqual(get_task_concurrency_class('task_reconcile_queues'), INLINE)
+        self.assertEqual(get_task_concurrency_class('task_Trakt Watchlist_1_wanted'), DB_WRITER)
+        self.assertEqual(get_task_concurrency_class('task_refresh_download_stats'), DEBRID_API)
+        self.assertEqual(get_task_concurrency_class('task_heartbeat'), IO_BOUND)
+
+    def test_run_records_wall_time_and_errors(self):
+        executor = TaskExecutor()
+        self.assertEqual(executor.run('task_ok', lambda: 42), 42)
+
+        def failing():
+            raise ValueError("boom")
+
+        with self.assertLogs(level='ERROR'):
+            self.assertIsNone(executor.run('task_fail', failing))
+
+        stats = executor.get_task_stats()
+        self.assertEqual(stats['task_ok']['run_count'], 1)
+        self.assertGreaterEqual(stats['task_ok']['last_duration'], 0)
+        self.assertEqual(stats['task_fail']['error_count'], 1)
+        self.assertEqual(stats['task_fail']['last_error'], 'boom')
+
+    def test_class_limit_is_enforced(self):
+        executor = TaskExecutor(limits={DB_WRITER: 1})
+        release = threading.Event()
+        done = threading.Event()
+
+        self.assertTrue(executor.try_reserve(DB_WRITER))
+        executor.submit('task_slow', DB_WRITER, release.wait, on_done=done.set)
+        # The only writer slot is busy until the first task finishes
+        self.assertFalse(executor.try_reserve(DB_WRITER))
+
+        release.set()
+        self.assertTrue(done.wait(5))
+        self.assertTrue(executor.try_reserve(DB_WRITER))
+        executor.release_reservation(DB_WRITER)
+        executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
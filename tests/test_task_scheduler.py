@@ -0,0 +1,70 @@
+import unittest
+import threading
+import time
+
+from task_scheduler import TaskScheduler
+
+
+class TestTaskScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = TaskScheduler()
+
+    def test_pop_due_tasks_returns_only_due_tasks(self):
+        now = time.time()
+        self.scheduler.schedule('Wanted', now - 1)
+        self.scheduler.schedule('Checking', now + 300)
+
+        due, signalled = self.scheduler.pop_due_tasks(now)
+
+        self.assertEqual(due, {'Wanted'})
+        self.assertEqual(signalled, set())
+        self.assertEqual(self.scheduler.next_due_time(), now + 300)
+
+    def test_reschedule_supersedes_earlier_entry(self):
+        now = time.time()
+        self.scheduler.schedule('Scraping', now - 1)
+        self.scheduler.schedule('Scraping', now + 5)
+
+        due, _ = self.scheduler.pop_due_tasks(now)
+
+        self.assertEqual(due, set())
+        self.assertEqual(self.scheduler.get_schedule(), {'Scraping': now + 5})
+
+    def test_ensure_scheduled_keeps_existing_entry(self):
+        now = time.time()
+        self.scheduler.schedule('Adding', now + 5)
+        self.scheduler.ensure_scheduled('Adding', now + 60)
+        self.assertEqual(self.scheduler.get_schedule(), {'Adding': now + 5})
+
+    def test_signal_makes_task_due_and_wakes_waiter(self):
+        self.scheduler.schedule('Scraping', time.time() + 3600)
+        timer = threading.Timer(0.05, self.scheduler.signal, args=('Scraping',))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        start = time.monotonic()
+        self.scheduler.wait(max_wait=5)
+        self.assertLess(time.monotonic() - start, 1)
+
+        due, signalled = self.scheduler.pop_due_tasks()
+        self.assertEqual(due, {'Scraping'})
+        self.assertEqual(signalled, {'Scraping'})
+        self.assertNotIn('Scraping', self.scheduler.get_schedule())
+
+    def test_wait_returns_immediately_when_already_signalled(self):
+        self.scheduler.signal('Adding')
+        start = time.monotonic()
+        self.scheduler.wait(max_wait=5)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_wait_sleeps_until_next_due_time(self):
+        self.scheduler.schedule('Wanted', time.time() + 0.1)
+        start = time.monotonic()
+        self.scheduler.wait(max_wait=5)
+        elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertLess(elapsed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
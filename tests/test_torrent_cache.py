@@ -0,0 +1,77 @@
+import hashlib
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import bencodepy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import debrid.common.torrent as torrent_module
+import debrid.common.torrent_cache as torrent_cache_module
+from debrid.common.torrent import fetch_torrent_file, torrent_data_to_magnet
+from debrid.common.torrent_cache import TorrentFileCache
+from queues.torrent_processor import TorrentProcessor
+from tests.store_test_case import StoreTestCase
+
+
+def make_torrent(name, padding=0):
+    info = {b'name': name.encode(), b'piece length': 16384, b'pieces': b'x' * 20, b'length': 1, b'padding': b'p' * padding}
+    data = bencodepy.encode({b'announce': b'udp://tracker.example:80', b'info': info})
+    return data, hashlib.sha1(bencodepy.encode(info)).hexdigest()
+
+
+class TestTorrentFileCache(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.settings = {'torrent_file_cache_max_size_mb': 200}
+        self.patch_settings(torrent_cache_module, self.settings)
+        self.cache = self.make_store(TorrentFileCache)
+        self.start_patch(patch.object(torrent_module, 'torrent_file_cache', self.cache))
+
+    def mock_download(self, *contents):
+        responses = [MagicMock(content=content) for content in contents]
+        return patch.object(torrent_module.api, 'get', side_effect=responses)
+
+    def test_each_url_is_downloaded_and_hashed_once(self):
+        data, info_hash = make_torrent('Some.Movie.2020.1080p')
+        with self.mock_download(data, data) as get:
+            self.assertEqual(fetch_torrent_file('http://jackett/dl/1'), (info_hash, data))
+            self.assertEqual(fetch_torrent_file('http://jackett/dl/1'), (info_hash, data))
+            # A second indexer link to the same release is stored against the same hash
+            self.assertEqual(fetch_torrent_file('http://prowlarr/dl/9'), (info_hash, data))
+        self.assertEqual(get.call_count, 2)
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['files'], stats['urls'], stats['hits']), (1, 2, 1))
+
+    def test_invalid_downloads_are_not_stored(self):
+        with self.mock_download(b'<html>login</html>'):
+            self.assertIsNone(fetch_torrent_file('http://jackett/dl/2'))
+        self.assertEqual(self.cache.get_stats()['files'], 0)
+
+    def test_least_recently_used_files_are_evicted(self):
+        self.settings['torrent_file_cache_max_size_mb'] = 0.01  # ~10KB
+        first, first_hash = make_torrent('First', padding=4000)
+        second, _ = make_torrent('Second', padding=4000)
+        third, _ = make_torrent('Third', padding=4000)
+        self.cache.put('http://a/1', first_hash, first)
+        self.cache.put('http://a/2', make_torrent('Second', padding=4000)[1], second)
+        self.cache.put('http://a/3', make_torrent('Third', padding=4000)[1], third)
+
+        self.assertIsNone(self.cache.get_by_url('http://a/1'))
+        self.assertIsNone(self.cache.get_by_hash(first_hash))
+        self.assertIsNotNone(self.cache.get_by_url('http://a/3'))
+
+    def test_processor_works_from_memory(self):
+        data, info_hash = make_torrent('Some.Show.S01')
+        with self.mock_download(data):
+            magnet, torrent_data = TorrentProcessor(MagicMock()).process_torrent('http://jackett/dl/3')
+        self.assertIsNone(magnet)
+        self.assertEqual(torrent_data, data)
+        self.assertTrue(torrent_data_to_magnet(torrent_data).startswith(f'magnet:?xt=urn:btih:{info_hash}&dn=Some.Show.S01'))
+
+
+if __name__ == '__main__':
+    unittest.main()
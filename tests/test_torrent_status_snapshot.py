@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import debrid.real_debrid.client as client_module
+from debrid.real_debrid.client import RealDebridProvider
+from queues.checking_queue import CheckingQueue
+
+
+class TestTorrentStatusSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.torrents = [{'id': f'T{n}', 'hash': f'{n:040x}', 'filename': f'Torrent {n}',
+                          'status': 'downloading', 'progress': n % 100} for n in range(2500)]
+        self.requests = []
+        self.now = 1000.0
+        for patcher in (patch.object(client_module, 'make_request', side_effect=self.serve),
+                        patch.object(client_module.time, 'time', side_effect=lambda: self.now),
+                        patch.object(RealDebridProvider, '_load_api_key', return_value='key')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.provider = RealDebridProvider()
+
+    def serve(self, method, endpoint, api_key, data=None, params=None, **kwargs):
+        self.requests.append(endpoint)
+        if endpoint == '/torrents':
+            start = (params['page'] - 1) * params['limit']
+            return self.torrents[start:start + params['limit']] or None
+        if endpoint == '/torrents/info/NEW':
+            return {'id': 'NEW', 'status': 'downloading', 'progress': 5}
+        raise Exception("404 Client Error: Not Found")
+
+    def test_one_listing_answers_every_torrent_in_flight(self):
+        ids = [f'T{n}' for n in range(0, 2500, 10)]
+        statuses = self.provider.get_torrents_status(ids)
+        self.assertEqual(self.requests, ['/torrents'] * 3)
+        self.assertEqual(statuses['T2490']['progress'], 90)
+
+        # Within the snapshot lifetime every caller shares the listing
+        self.requests.clear()
+        self.provider.get_torrents_status(['T1', 'T2'])
+        self.assertEqual(len(self.provider.list_active_torrents()), 2500)
+        self.assertEqual(self.requests, [])
+
+        self.now += RealDebridProvider.TORRENT_SNAPSHOT_SECONDS
+        self.provider.get_torrents_status(['T1'])
+        self.assertEqual(self.requests, ['/torrents'] * 3)
+
+    def test_torrents_missing_from_the_listing_are_confirmed_individually(self):
+        with patch('database.torrent_tracking.mark_torrent_removed'):
+            statuses = self.provider.get_torrents_status(['T1', 'NEW', 'GONE'])
+        self.assertEqual(statuses['NEW']['progress'], 5)
+        self.assertIsNone(statuses['GONE'])
+        self.assertEqual(self.requests.count('/torrents/info/NEW'), 1)
+        self.assertEqual(self.requests.count('/torrents/info/GONE'), 1)
+
+
+class TestCheckingQueueProgress(unittest.TestCase):
+    def test_progress_for_all_torrents_comes_from_one_status_call(self):
+        queue = object.__new__(CheckingQueue)
+        queue.debrid_provider = MagicMock()
+        queue.debrid_provider.get_torrents_status.return_value = {'T1': {'progress': 100}, 'T2': None}
+
+        self.assertEqual(queue.get_torrents_progress(['T1', 'T2']), {'T1': 100, 'T2': None})
+        queue.debrid_provider.get_torrents_status.assert_called_once_with(['T1', 'T2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
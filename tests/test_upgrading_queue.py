@@ -143,11 +143,11 @@ class TestUpgradingQueueDuplicateAddition(unittest.TestCase):
     @patch('logging.getLogger')
     @patch('api_tracker.api')
     @patch('debrid.real_debrid.api.make_request')
-    @patch('queues.torrent_processor.requests.Session', new_callable=MagicMock)
-    @patch('queues.torrent_processor.bencodepy.decode')
+    @patch('queues.torrent_processor.api', new_callable=MagicMock)
+    @patch('debrid.common.torrent.bencodepy.decode')
     @patch('queues.torrent_processor.download_and_extract_hash')
     @patch('queues.torrent_processor.extract_hash_from_magnet')
-    @patch('queues.torrent_processor.extract_hash_from_file')
+    @patch('queues.torrent_processor.extract_hash_from_data')
     @patch('pickle.load')
     @patch('pickle.dump')
     @patch('os.environ.get')
@@ -162,9 +162,9 @@ class TestUpgradingQueueDuplicateAddition(unittest.TestCase):
     @patch('debrid.real_debrid.client.RealDebridProvider', autospec=True)
     def test_duplicate_torrent_addition(self, mock_provider_class, mock_http_pool, mock_https_pool, mock_media_matcher_class, 
                                       mock_get_debrid_provider, mock_wake_manager, mock_scrape, mock_path_open, mock_path_exists, 
-                                      mock_environ_get, mock_pickle_dump, mock_pickle_load, mock_extract_hash_file, 
+                                      mock_environ_get, mock_pickle_dump, mock_pickle_load, mock_extract_hash_data, 
                                       mock_extract_hash_magnet, mock_download_hash, mock_bencode_decode, 
-                                      mock_torrent_processor_session, mock_make_request, mock_api, mock_logger, 
+                                      mock_torrent_processor_api, mock_make_request, mock_api, mock_logger, 
                                       mock_get_api_key, mock_send_notification, mock_get_item, mock_update_state, 
                                       mock_update_item, mock_get_setting, mock_is_magnet_not_wanted, 
                                       mock_is_url_not_wanted, mock_client_session):
@@ -179,7 +179,7 @@ class TestUpgradingQueueDuplicateAddition(unittest.TestCase):
         
         # Configure hash extraction mocks
         mock_extract_hash_magnet.side_effect = extract_hash_from_magnet  # Use real function
-        mock_extract_hash_file.return_value = "e39c91a7c884b31dab39e2a84f69dce53a43b856"  # Return test hash
+        mock_extract_hash_data.return_value = "e39c91a7c884b31dab39e2a84f69dce53a43b856"  # Return test hash
         mock_download_hash.return_value = "e39c91a7c884b31dab39e2a84f69dce53a43b856"  # Return test hash
         mock_bencode_decode.return_value = {b'info_hash': b'e39c91a7c884b31dab39e2a84f69dce53a43b856'}
         
@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database.wanted_items as wanted_items
+from database.core import get_db_connection
+from database.schema_management import create_tables
+from database.wanted_items import add_wanted_items
+
+
+def episode(season, number, imdb_id='tt100', title='Some Show'):
+    return {'imdb_id': imdb_id, 'tmdb_id': 100, 'title': title, 'year': 2020, 'season_number': season,
+            'episode_number': number, 'episode_title': f'Episode {number}', 'airtime': '20:00'}
+
+
+class TestAddWantedItemsBulk(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.settings = {}
+        self.blacklist = {}
+        for patcher in (patch.dict(os.environ, {'USER_DB_CONTENT': self.temp_dir.name}),
+                        patch.object(wanted_items, 'load_config', return_value={'Content Sources': {}}),
+                        patch.object(wanted_items, 'get_manual_blacklist', side_effect=lambda: self.blacklist),
+                        patch('settings.get_setting', side_effect=lambda section, key, default=None: self.settings.get(key, default))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        create_tables()
+
+    def rows(self):
+        conn = get_db_connection()
+        try:
+            return sorted((row['imdb_id'], row['season_number'], row['episode_number'], row['version'])
+                          for row in conn.execute('SELECT * FROM media_items'))
+        finally:
+            conn.close()
+
+    def test_existing_duplicate_and_blacklisted_items_are_skipped(self):
+        add_wanted_items([episode(1, 1)], {'1080p': True})
+        self.blacklist = {'tt200': {'media_type': 'movie', 'title': 'Banned', 'year': 2000}}
+
+        batch = [episode(1, 1), episode(1, 2), episode(1, 2), episode(2, 1),
+                 {'imdb_id': 'tt200', 'tmdb_id': 200, 'title': 'Banned', 'year': 2000}]
+        with patch.object(wanted_items, 'update_show_title', wraps=wanted_items.update_show_title) as update_title:
+            add_wanted_items(batch, {'1080p': True, '4k': True})
+
+        self.assertEqual(self.rows(), [
+            ('tt100', 1, 1, '1080p'),
+            ('tt100', 1, 2, '1080p'), ('tt100', 1, 2, '4k'),
+            ('tt100', 2, 1, '1080p'), ('tt100', 2, 1, '4k'),
+        ])
+        # Checked once per show rather than once per episode and version
+        update_title.assert_called_once()
+        self.assertEqual(update_title.call_args.args[1:], ('tt100', '100', 'Some Show'))
+
+    def test_watched_items_are_skipped_with_one_lookup_per_batch(self):
+        self.settings['do_not_add_plex_watch_history_items_to_queue'] = True
+        watch_conn = get_db_connection(os.path.join(self.temp_dir.name, 'watch_history.db'))
+        watch_conn.execute('CREATE TABLE watch_history (id INTEGER PRIMARY KEY, title TEXT, type TEXT, watched_at TIMESTAMP, imdb_id TEXT, '
+                           'tmdb_id TEXT, season INTEGER, episode INTEGER, show_title TEXT)')
+        watch_conn.execute("INSERT INTO watch_history (title, type, tmdb_id) VALUES ('Seen', 'movie', '300')")
+        watch_conn.execute("INSERT INTO watch_history (title, type, imdb_id, season, episode, show_title) "
+                           "VALUES ('Episode 1', 'episode', 'tt100', 1, 1, 'Some Show')")
+        watch_conn.commit()
+        watch_conn.close()
+
+        statements = []
+        real_loader = wanted_items._load_watch_history_keys
+
+        def traced_loader(conn, movie_ids, episode_ids):
+            conn.set_trace_callback(statements.append)
+            return real_loader(conn, movie_ids, episode_ids)
+
+        with patch.object(wanted_items, '_load_watch_history_keys', side_effect=traced_loader):
+            add_wanted_items([episode(1, 1), episode(1, 2), {'imdb_id': 'tt300', 'tmdb_id': 300, 'title': 'Seen'},
+                              {'imdb_id': 'tt301', 'tmdb_id': 301, 'title': 'Unseen'}], {'1080p': True})
+
+        self.assertEqual(self.rows(), [('tt100', 1, 2, '1080p'), ('tt301', None, None, '1080p')])
+        self.assertEqual(len([sql for sql in statements if 'FROM watch_history' in sql]), 2)
+
+    def test_watched_items_match_int_tmdb_ids(self):
+        self.settings['do_not_add_plex_watch_history_items_to_queue'] = True
+        watch_conn = get_db_connection(os.path.join(self.temp_dir.name, 'watch_history.db'))
+        watch_conn.execute('CREATE TABLE watch_history (id INTEGER PRIMARY KEY, title TEXT, type TEXT, watched_at TIMESTAMP, imdb_id TEXT, '
+                           'tmdb_id TEXT, season INTEGER, episode INTEGER, show_title TEXT)')
+        watch_conn.execute("INSERT INTO watch_history (title, type, tmdb_id) VALUES ('The Matrix', 'movie', '603')")
+        watch_conn.execute("INSERT INTO watch_history (title, type, tmdb_id, season, episode, show_title) "
+                           "VALUES ('Episode 1', 'episode', '100', 1, 1, 'Some Show')")
+        watch_conn.commit()
+        watch_conn.close()
+
+        # Only tmdb ids, as ints the way Trakt returns them
+        add_wanted_items([{'imdb_id': None, 'tmdb_id': 603, 'title': 'The Matrix', 'year': 1999},
+                          dict(episode(1, 1), imdb_id=None), dict(episode(1, 2), imdb_id=None)], {'1080p': True})
+
+        conn = get_db_connection()
+        try:
+            rows = [(row['tmdb_id'], row['season_number'], row['episode_number']) for row in conn.execute('SELECT * FROM media_items')]
+        finally:
+            conn.close()
+        self.assertEqual(rows, [('100', 1, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import logging
 import sys
 import os
 from typing import Dict, Any, Optional, List
-import requests
+from api_tracker import api
 import time
 from datetime import datetime, timedelta
 
@@ -36,7 +36,7 @@ def _make_request(endpoint: str, params: Dict[str, Any] = None) -> Optional[Dict
         # Make request
         url = f"{JIKAN_API_URL}/{endpoint}"
         logging.debug(f"Making request to {url} with params: {params}")
-        response = requests.get(url, params=params, timeout=10)
+        response = api.get(url, params=params, timeout=10, raise_for_status=False)
         last_request_time = datetime.now()
         
         if response.status_code == 200:
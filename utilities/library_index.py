@@ -0,0 +1,274 @@
+"""
+Filename index of the mounted library.
+
+Every indexed root (the original files path, the Plex mount) is kept in library_index.db
+as one row per file plus one row per directory holding the directory's mtime. A refresh
+stats the known directories and only lists the ones whose mtime changed, so a new torrent
+folder on a large rclone/zurg mount costs one listing instead of a walk of the whole tree.
+Some FUSE mounts don't keep directory mtimes current, so the root and its top-level
+directories (where such mounts add torrent folders) are listed on every refresh, and each
+root is also rebuilt from scratch every library_index_full_rebuild_hours. A miss is only a
+lookup: items still waiting for their file miss on every check.
+
+Usage: python -m utilities.library_index [status [--check] | rebuild [root ...]]
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from settings import get_setting
+from utilities.sqlite_store import SQLiteStore
+
+DEFAULT_FULL_REBUILD_HOURS = 24
+# Lookups refresh a root first when its last refresh is older than this
+REFRESH_INTERVAL_SECONDS = 30
+# Directories up to this depth below the root are listed on every refresh, whatever their mtime
+ALWAYS_LIST_DEPTH = 1
+# Keep IN (...) lists well below SQLite's bound parameter limit
+LOOKUP_BATCH_SIZE = 450
+
+def get_library_roots() -> List[str]:
+    """The configured library locations that exist on this machine"""
+    roots = []
+    for section, key in (('File Management', 'original_files_path'), ('Plex', 'mounted_file_location')):
+        root = get_setting(section, key, '')
+        if root and os.path.isdir(root) and os.path.normpath(root) not in roots:
+            roots.append(os.path.normpath(root))
+    return roots
+
+class LibraryIndex(SQLiteStore):
+    DB_FILENAME = 'library_index.db'
+    STATS = ('lookups', 'hits', 'refreshes', 'rebuilds', 'dirs_listed')
+
+    def __init__(self, db_path: Optional[str] = None):
+        super().__init__(db_path)
+        # Serialises refreshes so concurrent lookups share one walk
+        self._refresh_lock = threading.RLock()
+
+    def _create_schema(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS library_files (
+                root TEXT NOT NULL,
+                directory TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                PRIMARY KEY (root, directory, filename)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_library_files_filename ON library_files(root, filename)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS library_dirs (
+                root TEXT NOT NULL,
+                path TEXT NOT NULL,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (root, path)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS library_roots (
+                root TEXT PRIMARY KEY,
+                refreshed_at REAL NOT NULL,
+                rebuilt_at REAL NOT NULL,
+                refresh_seconds REAL NOT NULL,
+                dirs_listed INTEGER NOT NULL
+            )
+        ''')
+
+    @staticmethod
+    def get_full_rebuild_seconds() -> float:
+        try:
+            return float(get_setting('Debug', 'library_index_full_rebuild_hours', DEFAULT_FULL_REBUILD_HOURS)) * 3600
+        except (TypeError, ValueError):
+            return DEFAULT_FULL_REBUILD_HOURS * 3600
+
+    def refresh(self, root: str, full: bool = False) -> Dict[str, Any]:
+        """Bring root's entries up to date, listing every directory when full is set"""
+        root = os.path.normpath(root)
+        with self._refresh_lock:
+            conn = self._connect()
+            try:
+                return self._refresh(conn, root, full)
+            finally:
+                conn.close()
+
+    def _refresh(self, conn, root: str, full: bool) -> Dict[str, Any]:
+        started = time.time()
+        known = {}
+        children = defaultdict(list)
+        if not full:
+            for row in conn.execute('SELECT path, parent, mtime_ns FROM library_dirs WHERE root = ?', (root,)):
+                known[row['path']] = row['mtime_ns']
+                children[row['parent']].append(row['path'])
+
+        seen = set()
+        listed = {}  # directory -> (parent, mtime_ns, filenames)
+        stack = [(root, None, 0)]
+        while stack:
+            path, parent, depth = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(path)
+            if depth > ALWAYS_LIST_DEPTH and known.get(path) == mtime_ns:
+                # Nothing was added to or removed from this directory, but its subdirectories may have changed
+                stack.extend((child, path, depth + 1) for child in children.get(path, ()))
+                continue
+
+            filenames = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, path, depth + 1))
+                            elif entry.is_file():
+                                filenames.append(entry.name)
+                        except OSError:
+                            continue
+            except OSError as e:
+                logging.warning(f"Could not list {path} for the library index: {e}")
+                stack.extend((child, path, depth + 1) for child in children.get(path, ()))
+                continue
+            listed[path] = (parent, mtime_ns, filenames)
+
+        removed = [path for path in known if path not in seen]
+        now = time.time()
+        with conn:
+            if full:
+                conn.execute('DELETE FROM library_files WHERE root = ?', (root,))
+                conn.execute('DELETE FROM library_dirs WHERE root = ?', (root,))
+            conn.executemany('DELETE FROM library_files WHERE root = ? AND directory = ?',
+                             [(root, path) for path in removed + list(listed)])
+            conn.executemany('DELETE FROM library_dirs WHERE root = ? AND path = ?', [(root, path) for path in removed])
+            conn.executemany('INSERT INTO library_files (root, directory, filename) VALUES (?, ?, ?)',
+                             [(root, path, filename) for path, (_, _, filenames) in listed.items() for filename in filenames])
+            conn.executemany('INSERT OR REPLACE INTO library_dirs (root, path, parent, mtime_ns) VALUES (?, ?, ?, ?)',
+                             [(root, path, parent, mtime_ns) for path, (parent, mtime_ns, _) in listed.items()])
+            previous = conn.execute('SELECT rebuilt_at FROM library_roots WHERE root = ?', (root,)).fetchone()
+            rebuilt_at = now if full or previous is None else previous['rebuilt_at']
+            conn.execute('''
+                INSERT OR REPLACE INTO library_roots (root, refreshed_at, rebuilt_at, refresh_seconds, dirs_listed)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (root, now, rebuilt_at, now - started, len(listed)))
+
+        self._count('rebuilds' if full else 'refreshes')
+        self._count('dirs_listed', len(listed))
+        summary = {'root': root, 'full': full, 'dirs_checked': len(seen), 'dirs_listed': len(listed),
+                   'dirs_removed': len(removed), 'seconds': round(now - started, 3)}
+        logging.debug(f"Library index refresh: {summary}")
+        return summary
+
+    def _refresh_if_stale(self, root: str):
+        with self._refresh_lock:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT refreshed_at, rebuilt_at FROM library_roots WHERE root = ?', (root,)).fetchone()
+                now = time.time()
+                if row is None or now - row['rebuilt_at'] >= self.get_full_rebuild_seconds():
+                    self._refresh(conn, root, full=True)
+                elif now - row['refreshed_at'] >= REFRESH_INTERVAL_SECONDS:
+                    self._refresh(conn, root, full=False)
+            finally:
+                conn.close()
+
+    def find_many(self, filenames: Iterable[str], root: str) -> Dict[str, List[str]]:
+        """Map each filename found anywhere under root to the paths it was indexed at"""
+        root = os.path.normpath(root)
+        filenames = list(dict.fromkeys(filename for filename in filenames if filename))
+        if not filenames:
+            return {}
+        self._refresh_if_stale(root)
+
+        found = self._lookup(filenames, root)
+        self._count('lookups', len(filenames))
+        self._count('hits', len(found))
+        return found
+
+    def _lookup(self, filenames: List[str], root: str) -> Dict[str, List[str]]:
+        found = defaultdict(list)
+        conn = self._connect()
+        try:
+            for start in range(0, len(filenames), LOOKUP_BATCH_SIZE):
+                batch = filenames[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                for row in conn.execute(f'''
+                    SELECT directory, filename FROM library_files
+                    WHERE root = ? AND filename IN ({placeholders})
+                    ORDER BY directory
+                ''', [root] + batch):
+                    found[row['filename']].append(os.path.join(row['directory'], row['filename']))
+        finally:
+            conn.close()
+        return dict(found)
+
+    def find(self, filename: str, root: str) -> Optional[str]:
+        """The first indexed path of filename under root that still exists"""
+        for path in self.find_many([filename], root).get(filename, ()):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _count_stale_dirs(self, conn, root: str) -> int:
+        # Directories whose mtime no longer matches the index, without updating anything
+        stale = 0
+        for row in conn.execute('SELECT path, mtime_ns FROM library_dirs WHERE root = ?', (root,)).fetchall():
+            try:
+                if os.stat(row['path']).st_mtime_ns != row['mtime_ns']:
+                    stale += 1
+            except OSError:
+                stale += 1
+        return stale
+
+    def get_stats(self, check: bool = False) -> Dict[str, Any]:
+        """
+        Per-root size and age of the index. With check, every indexed directory is
+        stat'ed to count how many changed since the last refresh.
+        """
+        stats = super().get_stats(check=check)
+        stats['hit_rate'] = stats['hits'] / stats['lookups'] if stats['lookups'] else 0.0
+        return stats
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any], check: bool = False):
+        stats['roots'] = {}
+        now = time.time()
+        rebuild_seconds = self.get_full_rebuild_seconds()
+        for row in conn.execute('SELECT * FROM library_roots ORDER BY root').fetchall():
+            root = row['root']
+            status = {
+                'files': conn.execute('SELECT COUNT(*) FROM library_files WHERE root = ?', (root,)).fetchone()[0],
+                'dirs': conn.execute('SELECT COUNT(*) FROM library_dirs WHERE root = ?', (root,)).fetchone()[0],
+                'seconds_since_refresh': round(now - row['refreshed_at'], 1),
+                'seconds_since_rebuild': round(now - row['rebuilt_at'], 1),
+                'rebuild_due': now - row['rebuilt_at'] >= rebuild_seconds,
+                'last_refresh_seconds': round(row['refresh_seconds'], 3),
+                'last_dirs_listed': row['dirs_listed'],
+            }
+            if check:
+                status['stale_dirs'] = self._count_stale_dirs(conn, root)
+            stats['roots'][root] = status
+
+library_index = LibraryIndex()
+
+def rebuild_library_index(roots: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Rebuild the index for roots, or for every configured library location"""
+    summaries = []
+    for root in roots or get_library_roots():
+        try:
+            summaries.append(library_index.refresh(root, full=True))
+        except Exception as e:
+            logging.error(f"Error rebuilding library index for {root}: {e}")
+    return summaries
+
+if __name__ == '__main__':
+    import json
+    args = sys.argv[1:]
+    if args and args[0] == 'rebuild':
+        print(json.dumps(rebuild_library_index(args[1:]), indent=2))
+    else:
+        print(json.dumps(library_index.get_stats(check='--check' in args), indent=2))
@@ -11,6 +11,7 @@ from utilities.anidb_functions import format_filename_with_anidb
 from database.database_writing import update_media_item_state, update_media_item
 from utilities.post_processing import handle_state_change
 from database import get_media_item_by_id
+from utilities.library_index import library_index
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to be safe for symlinks."""
@@ -252,7 +253,18 @@ def create_symlink(source_path: str, dest_path: str, media_item_id: int = None)
         return False
 
 def find_file(filename: str, search_path: str) -> Optional[str]:
-    """Find a file by name using the find command."""
+    """
+    Find a file by name under search_path using the library index. Running find over
+    the whole mount for anything the index missed is opt-in (Debug library_index_find_fallback),
+    since items still waiting for their file miss on every check.
+    """
+    try:
+        found_path = library_index.find(filename, search_path)
+        if found_path or not get_setting('Debug', 'library_index_find_fallback', False):
+            return found_path
+    except Exception as e:
+        logging.error(f"Error searching the library index, falling back to find: {str(e)}")
+
     try:
         import subprocess
         result = subprocess.run(
@@ -321,7 +333,7 @@ def check_local_file_for_item(item: Dict[str, Any], is_webhook: bool = False, ex
                     try:
                         from debrid import get_debrid_provider
                         debrid_provider = get_debrid_provider()
-                        torrent_info = debrid_provider.get_torrent_info(torrent_id)
+                        torrent_info = debrid_provider.get_torrents_status([torrent_id]).get(torrent_id)
                         if torrent_info:
                             progress = torrent_info.get('progress', 0)
                             is_downloading = progress > 0 and progress < 100
@@ -396,7 +408,7 @@ def check_local_file_for_item(item: Dict[str, Any], is_webhook: bool = False, ex
                         from debrid import get_debrid_provider
                         debrid_provider = get_debrid_provider()
                         torrent_id = item.get('filled_by_torrent_id')
-                        torrent_info = debrid_provider.get_torrent_info(torrent_id)
+                        torrent_info = debrid_provider.get_torrents_status([torrent_id]).get(torrent_id)
                         if torrent_info:
                             progress = torrent_info.get('progress', 0)
                             is_downloading = progress > 0 and progress < 100
@@ -571,15 +583,15 @@ def local_library_scan(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]
         # Keep track of processed files to avoid duplicates
         processed_files = set()
         
-        # Walk through the original files directory
-        for root, _, files in os.walk(original_path):
-            for file in files:
-                # Skip if not a media file
-                if not any(file.lower().endswith(ext) for ext in media_extensions):
-                    continue
-                    
-                if file in target_files and file not in processed_files:
-                    source_file = os.path.join(root, file)
+        # Look the files up in the index of the original files directory
+        found_paths = library_index.find_many(target_files, original_path)
+        for file, paths in found_paths.items():
+            # Skip if not a media file
+            if not any(file.lower().endswith(ext) for ext in media_extensions):
+                continue
+
+            for source_file in paths:
+                if file not in processed_files:
                     item = target_files[file]
                     
                     try:
@@ -657,13 +669,14 @@ def recent_local_library_scan(items: List[Dict[str, Any]], max_files: int = 500)
             logging.debug("No files to scan for")
             return {}
             
-        # Get all media files sorted by modification time
+        # Get all matching media files sorted by modification time
         media_files = []
-        for root, _, files in os.walk(original_path):
-            for file in files:
-                if file in target_files:
-                    full_path = os.path.join(root, file)
+        for paths in library_index.find_many(target_files, original_path).values():
+            for full_path in paths:
+                try:
                     media_files.append((full_path, os.path.getmtime(full_path)))
+                except OSError:
+                    continue
                     
         # Sort by modification time and take the most recent
         media_files.sort(key=lambda x: x[1], reverse=True)
@@ -200,7 +200,8 @@ def scrape_sync(imdb_id, tmdb_id, title, year, movie_or_episode, season, episode
                  f"version={version}")
 
     # Call the scrape function with the version
-    scrape_result, filtered_out_results = scrape(imdb_id, tmdb_id, title, year, movie_or_episode, version, season, episode, multi, genres)
+    scrape_result, filtered_out_results = scrape(imdb_id, tmdb_id, title, year, movie_or_episode, version, season, episode, multi, genres,
+                                                 bypass_scrape_cache=True)
 
     # Log the type and structure of scrape_result
     #logger.debug(f"Type of scrape_result: {type(scrape_result)}")
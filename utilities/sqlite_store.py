@@ -0,0 +1,70 @@
+"""
+Base for the small stores that keep their own SQLite file next to media_items.db
+(scrape cache, cache statuses, torrent files, content source caches, ...).
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+class SQLiteStore:
+    """
+    A store lives in DB_FILENAME under USER_DB_CONTENT, or at db_path when one is
+    given. _create_schema runs on the first connection to each path, and every
+    name in STATS gets an in-memory counter reported by get_stats.
+    """
+
+    DB_FILENAME: str = ''
+    STATS: Tuple[str, ...] = ()
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path
+        self._initialized_path = None
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys(self.STATS, 0)
+
+    def _get_db_path(self) -> str:
+        if self._db_path:
+            return self._db_path
+        db_content_dir = os.environ.get('USER_DB_CONTENT', '/user/db_content')
+        return os.path.join(db_content_dir, self.DB_FILENAME)
+
+    def _connect(self):
+        # Imported here, the database package imports modules that use these stores
+        from database.core import get_db_connection
+        db_path = self._get_db_path()
+        conn = get_db_connection(db_path)
+        if self._initialized_path != db_path:
+            self._create_schema(conn)
+            conn.commit()
+            self._initialized_path = db_path
+        return conn
+
+    def _create_schema(self, conn):
+        raise NotImplementedError
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    def _add_entry_stats(self, conn, stats: Dict[str, Any], **options):
+        """Add what the database holds (entry counts, sizes) to stats"""
+
+    def get_stats(self, **options) -> Dict[str, Any]:
+        """The counters plus the entry stats, options are passed on to _add_entry_stats"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        if 'hits' in stats and 'misses' in stats:
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        conn = None
+        try:
+            conn = self._connect()
+            self._add_entry_stats(conn, stats, **options)
+        except Exception as e:
+            logging.error(f"Error reading {self.DB_FILENAME} stats: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+        return stats